@@ -1,5 +1,7 @@
 from __future__ import annotations
 import sqlite3
+import subprocess
+import threading
 from typing import Optional, Dict, Mapping, Any
 import json
 from datetime import datetime
@@ -13,6 +15,8 @@ from src.db import (
     insert_code_collaborative_metrics,
     get_metrics_id,
     insert_code_collaborative_summary,
+    get_code_collaborative_checkpoint,
+    store_code_collaborative_checkpoint,
     get_files_for_project,
     get_files_for_version,
 )
@@ -24,7 +28,8 @@ from src.integrations.github.github_api import get_authenticated_user
 from src.utils.framework_detector import detect_frameworks
 from src.utils.language_detector import detect_languages
 from src.utils.helpers import zip_paths  
-from src.integrations.github.github_analysis import fetch_github_metrics
+from src.utils.git_history import repository_head
+from src.integrations.github.github_analysis import sync_github_metrics
 from src.integrations.github.db_repo_metrics import store_github_repo_metrics, get_github_repo_metrics, print_github_metrics_summary, store_github_detailed_metrics
 from src.analysis.code_collaborative.github_collaboration.build_collab_metrics import run_collaboration_analysis
 from src.analysis.code_collaborative.github_collaboration.print_collaboration_summary import print_collaboration_summary
@@ -45,7 +50,9 @@ from .code_collaborative_analysis_helper import (
     collect_repo_authors,
     prompt_user_identity_choice,
     read_git_history,
-    compute_metrics,
+    accumulate_history,
+    metrics_from_history,
+    resume_history,
     print_project_card,
     print_portfolio_summary,
     prompt_collab_descriptions,
@@ -56,33 +63,41 @@ try:
 except ModuleNotFoundError:
     import constants
 
-_CODE_RUN_METRICS: list[dict] = []
-_manual_descs_store: dict[str, str] = {}  # filled once per run for collab projects
+class CodeRun:
+    """
+    State of one collaborative code analysis run: the manual contribution descriptions collected
+    up front (CLI, non-LLM path) and the metrics of each project analysed, for the portfolio
+    summary. Create one per run and pass it down; projects of the same run may share it across
+    threads.
+    """
+
+    def __init__(self, manual_descs: dict[str, str] | None = None):
+        self.manual_descs = dict(manual_descs or {})
+        self._metrics: list[dict] = []
+        self._lock = threading.Lock()
+
+    def manual_desc(self, project_name: str) -> str:
+        """Retrieve a stored description for a project if available."""
+        return self.manual_descs.get(project_name, "") or ""
 
-def set_manual_descs_store(descs: dict[str, str] | None) -> None:
-    """Store user-provided project descriptions for this analysis run."""
-    global _manual_descs_store
-    _manual_descs_store = descs or {}
+    def add_metrics(self, metrics: dict) -> None:
+        with self._lock:
+            self._metrics.append(metrics)
 
-def get_manual_desc(project_name: str) -> str:
-    """Retrieve a stored description for a project if available."""
-    if not _manual_descs_store:
-        return ""
-    return _manual_descs_store.get(project_name, "") or ""
+    @property
+    def metrics(self) -> list[dict]:
+        """Metrics of the projects analysed so far, in completion order."""
+        with self._lock:
+            return list(self._metrics)
 
-def print_code_portfolio_summary() -> None:
+def print_code_portfolio_summary(metrics: list[dict]) -> None:
     """
-    Print a single combined portfolio summary for all code projects
-    analyzed so far in this run, then clear the accumulator.
-    Call this from project_analysis.py after your last code project.
+    Print a single combined portfolio summary for the code projects of one run
+    (e.g. CodeRun.metrics). Call this from project_analysis.py after your last code project.
     """
-    if not _CODE_RUN_METRICS:
+    if not metrics:
         return
-    print_portfolio_summary(_CODE_RUN_METRICS)
-    _CODE_RUN_METRICS.clear()
-    # Manual descriptions are run-scoped; clear to avoid leaking into future runs/tests.
-    global _manual_descs_store
-    _manual_descs_store = {}
+    print_portfolio_summary(metrics)
 
 def analyze_code_project(conn: sqlite3.Connection,
                          user_id: int,
@@ -93,13 +108,14 @@ def analyze_code_project(conn: sqlite3.Connection,
                          *,
                          allow_prompts: bool = True,
                          api_inputs: dict[str, Any] | None = None,
-                         skip_github_prompt: bool = False) -> Optional[dict]:
+                         skip_github_prompt: bool = False,
+                         code_run: CodeRun | None = None) -> Optional[dict]:
     # 1) get base dirs from the uploaded zip
     zip_data_dir, zip_name, _ = zip_paths(zip_path)
     # Capture any pre-collected manual description (non-LLM path)
     desc = (
         (api_inputs or {}).get("manual_contribution_summary")
-        or get_manual_desc(project_name)
+        or (code_run.manual_desc(project_name) if code_run is not None else "")
     )
     key_role_override = (api_inputs or {}).get("key_role")
     github_state = (api_inputs or {}).get("integrations", {}).get("github", {}).get("state")
@@ -176,7 +192,11 @@ def analyze_code_project(conn: sqlite3.Connection,
     aliases = load_user_github(conn, user_id)
 
     if not aliases["emails"] and not aliases["names"]:
-        authors = collect_repo_authors(repo_dir)
+        try:
+            authors = collect_repo_authors(repo_dir)
+        except subprocess.TimeoutExpired as e:
+            _print_git_timeout(project_name, e)
+            return None
         if not authors:
             print(f"\n[skip] {project_name}: no authors found in Git history.")
             return None
@@ -207,14 +227,29 @@ def analyze_code_project(conn: sqlite3.Connection,
                 save_user_github(conn, user_id, sel_emails, sel_names)
                 aliases = load_user_github(conn, user_id)
 
-    # 4) read commits
-    commits = read_git_history(repo_dir)
-    if not commits:
-        print(f"\n[skip] {project_name}: no commits detected.")
-        return None
+    # 4) read commits: only those since the last analysed commit when the stored state still applies,
+    #    otherwise the full history (first run, identity change, or rewritten history)
+    head = repository_head(repo_dir)
+    history_state = None
+    checkpoint = get_code_collaborative_checkpoint(conn, user_id, project_name) if head else None
+    if checkpoint:
+        history_state = resume_history(repo_dir, checkpoint[0], checkpoint[1], aliases)
+        if constants.VERBOSE:
+            mode = "resumed from" if history_state is not None else "rebuilding; stale checkpoint"
+            print(f"[debug] git history {mode} {checkpoint[0][:12]}")
+    if history_state is None:
+        try:
+            commits = read_git_history(repo_dir)
+        except subprocess.TimeoutExpired as e:
+            _print_git_timeout(project_name, e)
+            return None
+        if not commits:
+            print(f"\n[skip] {project_name}: no commits detected.")
+            return None
+        history_state = accumulate_history(commits, aliases)
 
     # 5) compute metrics
-    metrics = compute_metrics(project_name, repo_dir, commits, aliases)
+    metrics = metrics_from_history(project_name, repo_dir, history_state)
     metrics["project_name"] = project_name
 
     # 5.1) attach manual description if it was collected up-front
@@ -314,6 +349,8 @@ def analyze_code_project(conn: sqlite3.Connection,
     # 8) save aggregated git metrics into DB
     db_payload = _build_db_payload_from_metrics(metrics, repo_dir)
     insert_code_collaborative_metrics(conn, user_id, project_name, db_payload)
+    if head:
+        store_code_collaborative_checkpoint(conn, user_id, project_name, head, history_state)
     metrics_id = get_metrics_id(conn, user_id, project_name)
 
     # 8.1) if we have a manual description, persist it as a non-LLM summary
@@ -330,13 +367,21 @@ def analyze_code_project(conn: sqlite3.Connection,
     # 9) print
     print_project_card(metrics)
     # accumulate for portfolio summary
-    _CODE_RUN_METRICS.append(metrics)
+    if code_run is not None:
+        code_run.add_metrics(metrics)
 
     print("=" * 80)
     print()
     return metrics
 
 
+def _print_git_timeout(project_name: str, error: subprocess.TimeoutExpired) -> None:
+    print(
+        f"\n[git error] {project_name}: git log produced no output for {error.timeout:g}s and was "
+        "stopped; Git history was not analysed (raise GIT_LOG_IDLE_TIMEOUT for slow repositories)."
+    )
+
+
 def _handle_no_git_repo(conn, user_id, project_name):
     """
     Called when no local .git is found for a collaborative project.
@@ -421,14 +466,15 @@ def _enhance_with_github(
         if constants.VERBOSE:
             print("Collecting GitHub repository metrics...")
 
-        # fetch metrics via github REST API then stoe metrics in db
-        metrics = fetch_github_metrics(token, owner, repo, gh_username)
-        collab_profile = run_collaboration_analysis(token, owner, repo, gh_username)
+        # delta-sync repo activity since the last run, then rebuild metrics from the synced items
+        metrics = sync_github_metrics(conn, user_id, project_name, token, owner, repo, gh_username)
 
         if not metrics:
             print("[GitHub] Failed to fetch metrics. Skipping GitHub.")
             return
 
+        collab_profile = run_collaboration_analysis(token, owner, repo, gh_username, raw_metrics=metrics)
+
         store_github_repo_metrics(conn, user_id, project_name, owner, repo, metrics)
         store_github_detailed_metrics(conn, user_id, project_name, owner, repo, metrics)
         store_collaboration_profile(conn, user_id, project_name, owner, repo, collab_profile)
@@ -1,13 +1,13 @@
 from __future__ import annotations
 import os
 import datetime as dt
-import subprocess
 from collections import Counter, defaultdict
 from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 import sqlite3
 import json
 
 from src.utils.extension_catalog import get_languages_for_extension
+from src.utils.git_history import read_git_commits, read_git_commits_since
 from src.utils.helpers import ensure_table 
 from src.db.git_identities import (
     ensure_user_github_table,
@@ -197,17 +197,12 @@ def _match_git_path(db_path: str, git_paths: set[str]) -> str | None:
 
 
 def collect_repo_authors(repo_dir: str) -> List[Tuple[str, str, int]]:
-    out = _run_git(repo_dir, ["log", "--pretty=format:%an%x09%ae"])
-    if not out:
-        return []
     counts = Counter()
-    for line in out.splitlines():
-        parts = line.split("\t")
-        if len(parts) >= 2:
-            an = (parts[0] or "").strip()
-            ae = (parts[1] or "").strip().lower()
-            if an or ae:
-                counts[(an, ae)] += 1
+    for commit in read_git_commits(repo_dir):
+        an = (commit.author_name or "").strip()
+        ae = (commit.author_email or "").strip().lower()
+        if an or ae:
+            counts[(an, ae)] += 1
     ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0][0].lower(), kv[0][1]))
     return [(an, ae, c) for (an, ae), c in ranked]
 
@@ -242,120 +237,14 @@ def prompt_user_identity_choice(author_list: List[Tuple[str, str, int]]) -> Tupl
 # ------------------------------------------------------------
 # 3. git parsing
 # ------------------------------------------------------------
-def _run_git(repo_dir: str, args: List[str]) -> str:
-    cmd = ["git", "-C", repo_dir] + args
-    try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        return out.decode("utf-8", errors="replace")
-    except subprocess.CalledProcessError as e:
-        msg = e.output.decode("utf-8", errors="replace")
-        print(f"[git error] {' '.join(cmd)}\n{msg}")
-        return ""
-
-
 def read_git_history(repo_dir: str) -> List[dict]:
-    fmt = r"%H%x09%an%x09%ae%x09%ad%x09%P%x09%s%x09%B"
-    log_numstat = _run_git(
-        repo_dir,
-        ["log", "--date=iso-strict", f"--pretty=format:{fmt}", "--numstat", "--no-renames"],
-    )
-    log_namestatus = _run_git(
-        repo_dir,
-        ["log", "--date=iso-strict", "--name-status", f"--pretty=format:{fmt}"],
-    )
-    return _parse_git_logs(log_numstat, log_namestatus)
-
-
-def _parse_git_logs(log_numstat: str, log_namestatus: str) -> List[dict]:
-    name_status_map = {}
-    cur_hash = None
-    for line in log_namestatus.splitlines():
-        if "\t" in line:
-            parts = line.split("\t")
-            if 2 <= len(parts) < 7:
-                if cur_hash:
-                    name_status_map.setdefault(cur_hash, []).append(parts)
-                continue
-        fields = line.split("\t")
-        if len(fields) >= 7:
-            cur_hash = fields[0]
-
-    commits = []
-    header = None
-    pending_files: List[str] = []
-
-    def looks_like_hash(s: str) -> bool:
-        return len(s) >= 7 and all(c in "0123456789abcdef" for c in s[:7].lower())
-
-    def flush(header_fields, files_rows):
-        if not header_fields:
-            return
-        ch, an, ae, ad, parents, subj, body = header_fields[:7]
-        parents_list = [p for p in parents.split() if p]
-        is_merge = len(parents_list) > 1
-        try:
-            authored_at = dt.datetime.fromisoformat(ad.replace("Z", "+00:00"))
-        except Exception:
-            authored_at = None
-
-        files = []
-        for row in files_rows:
-            parts = row.split("\t")
-            if len(parts) == 3:
-                add_s, del_s, path = parts
-                if add_s == "-" or del_s == "-":
-                    additions, deletions, is_binary = 0, 0, True
-                else:
-                    try:
-                        additions = int(add_s)
-                        deletions = int(del_s)
-                    except ValueError:
-                        additions, deletions = 0, 0
-                    is_binary = False
-                files.append(
-                    {
-                        "path": path,
-                        "additions": additions,
-                        "deletions": deletions,
-                        "is_binary": is_binary,
-                    }
-                )
-
-        ns_counts = Counter()
-        for row in name_status_map.get(ch, []):
-            code = row[0]
-            if code.startswith("R"):
-                ns_counts["R"] += 1
-            elif code in ("A", "M", "D"):
-                ns_counts[code] += 1
-
-        commits.append(
-            {
-                "hash": ch,
-                "author_name": an,
-                "author_email": ae,
-                "authored_at": authored_at,
-                "parents": parents_list,
-                "is_merge": is_merge,
-                "subject": subj,
-                "body": body or "",
-                "files": files,
-                "name_status": dict(ns_counts),
-            }
-        )
+    """
+    Every commit (newest first) as a dict: hash, author, authored_at, parents/is_merge, subject,
+    full body, per-file numstat ("files") and A/M/D/R counts ("name_status").
+    Parsed in one git log pass and cached per HEAD commit (see src/utils/git_history.py).
+    """
+    return [commit.as_dict() for commit in read_git_commits(repo_dir)]
 
-    for line in log_numstat.splitlines():
-        fields = line.split("\t")
-        if len(fields) >= 7 and looks_like_hash(fields[0]):
-            flush(header, pending_files)
-            header = fields[:7]
-            pending_files = []
-        else:
-            if not line.strip():
-                continue
-            pending_files.append(line)
-    flush(header, pending_files)
-    return commits
 
 def is_git_repo(path: str) -> bool:
     """
@@ -376,17 +265,27 @@ def is_git_repo(path: str) -> bool:
 # ------------------------------------------------------------
 # 4. metrics
 # ------------------------------------------------------------
+# compute_metrics = metrics_from_history(accumulate_history(...)). The history state in between is
+# JSON-serialisable and mergeable, so a re-analysis can fold the commits made since the last run
+# into the stored state instead of walking the whole history again.
+HISTORY_STATE_VERSION = 1
+_RECENT_DAYS = 365  # widest "last N days" window reported (L365)
+
+
 def compute_metrics(project: str,
                     path: str,
                     commits: List[dict],
                     aliases: Dict[str, set]) -> dict:
-    total_commits = len(commits)
-    merges = sum(1 for c in commits if c["is_merge"])
+    return metrics_from_history(project, path, accumulate_history(commits, aliases))
+
+
+def _aliases_key(aliases: Dict[str, set]) -> list:
+    return [sorted(aliases.get("emails") or ()), sorted(aliases.get("names") or ())]
+
 
+def accumulate_history(commits: List[dict], aliases: Dict[str, set]) -> dict:
+    """Aggregate `commits` (newest first) into a history state; see merge_history_states."""
     your_commits = [c for c in commits if _is_authored_by_user(c, aliases)]
-    coauth_commits = [c for c in commits if _is_coauthored_by_user(c, aliases)]
-    num_yours = len(your_commits)
-    num_coauth = len(coauth_commits)
 
     add_sum = del_sum = file_touch = new_files = renames = 0
     lang_loc = Counter()
@@ -414,71 +313,165 @@ def compute_metrics(project: str,
                 file_loc[p] += loc
                 file_commits[p] += 1  # Count this commit for this file
 
-    net = add_sum - del_sum
-
-    first_dt = min((c["authored_at"] for c in commits if c["authored_at"]), default=None)
-    last_dt = max((c["authored_at"] for c in commits if c["authored_at"]), default=None)
-    l30 = _count_in_last_days(your_commits, 30)
-    l90 = _count_in_last_days(your_commits, 90)
-    l365 = _count_in_last_days(your_commits, 365)
-    longest_streak, current_streak = _streaks(
-        [c["authored_at"].date() for c in your_commits if c["authored_at"]]
-    )
-
     dow = Counter()
     hod = Counter()
     for c in your_commits:
         t = c.get("authored_at")
         if t:
             dow[t.strftime("%a")] += 1
-            hod[t.hour] += 1
-    top_days = ", ".join([d for d, _ in dow.most_common(2)]) if dow else "—"
-    top_hours = _top_hours(hod)
+            hod[str(t.hour)] += 1
 
-    langs_pct = _top_share(lang_loc, label_from_ext=True)
-    folders_pct = _top_share(folder_loc, limit=3)
-    top_files = [f for f, _ in file_loc.most_common(5)]
+    first_dt = min((c["authored_at"] for c in commits if c["authored_at"]), default=None)
+    last_dt = max((c["authored_at"] for c in commits if c["authored_at"]), default=None)
+    your_times = [c["authored_at"] for c in your_commits if c.get("authored_at")]
 
     return {
-        "project": project,
-        "path": path,
+        "version": HISTORY_STATE_VERSION,
+        "aliases": _aliases_key(aliases),
         "totals": {
-            "commits_all": total_commits,
-            "commits_yours": num_yours,
-            "commits_coauth": num_coauth,
-            "merges": merges,
+            "commits_all": len(commits),
+            "commits_yours": len(your_commits),
+            "commits_coauth": sum(1 for c in commits if _is_coauthored_by_user(c, aliases)),
+            "merges": sum(1 for c in commits if c["is_merge"]),
         },
         "loc": {
             "added": add_sum,
             "deleted": del_sum,
-            "net": net,
             "files_touched": file_touch,
             "new_files": new_files,
             "renames": renames,
         },
+        "first": first_dt.isoformat() if first_dt else None,
+        "last": last_dt.isoformat() if last_dt else None,
+        "recent": [t.isoformat() for t in _within_recent_window(your_times)],
+        "active_dates": sorted({t.date().isoformat() for t in your_times}),
+        "days": dict(dow),
+        "hours": dict(hod),
+        "languages": dict(lang_loc),
+        "folders": dict(folder_loc),
+        "file_loc": dict(file_loc),
+        "file_commits": dict(file_commits),
+    }
+
+
+def merge_history_states(newer: dict, older: dict) -> dict:
+    """
+    Combine the states of two disjoint commit ranges, `newer` holding the later commits.
+    Counters keep `newer`'s keys first, the order a single newest-first walk would have produced,
+    so ties in the "top" lists come out the same as after a full rebuild.
+    """
+    def _merge_counts(a: dict, b: dict) -> dict:
+        merged = dict(a)
+        for key, value in b.items():
+            merged[key] = merged.get(key, 0) + value
+        return merged
+
+    times = [dt.datetime.fromisoformat(t) for t in (newer["first"], newer["last"], older["first"], older["last"]) if t]
+    # Newest first, as a single walk lists them
+    recent = sorted((dt.datetime.fromisoformat(t) for t in newer["recent"] + older["recent"]), reverse=True)
+
+    return {
+        "version": HISTORY_STATE_VERSION,
+        "aliases": newer["aliases"],
+        "totals": _merge_counts(newer["totals"], older["totals"]),
+        "loc": _merge_counts(newer["loc"], older["loc"]),
+        # min/max compare instants; isoformat() keeps the winning commit's own UTC offset.
+        "first": min(times).isoformat() if times else None,
+        "last": max(times).isoformat() if times else None,
+        "recent": [t.isoformat() for t in _within_recent_window(recent)],
+        "active_dates": sorted(set(newer["active_dates"]) | set(older["active_dates"])),
+        **{
+            key: _merge_counts(newer[key], older[key])
+            for key in ("days", "hours", "languages", "folders", "file_loc", "file_commits")
+        },
+    }
+
+
+def history_state_matches(state: Optional[dict], aliases: Dict[str, set]) -> bool:
+    """True when a stored state can be resumed: same format and counted for the same identities."""
+    return (
+        isinstance(state, dict)
+        and state.get("version") == HISTORY_STATE_VERSION
+        and state.get("aliases") == _aliases_key(aliases)
+    )
+
+
+def resume_history(repo_dir: str, last_sha: str, state: Optional[dict], aliases: Dict[str, set]) -> Optional[dict]:
+    """
+    Fold the commits made after `last_sha` into a stored history state.
+    Returns None when the state can't be reused (older format, other identities, or `last_sha` is
+    no longer in HEAD's history after a rebase/force-push); the caller then rebuilds it in full.
+    """
+    if not last_sha or not history_state_matches(state, aliases):
+        return None
+    since = read_git_commits_since(repo_dir, last_sha)
+    if since is None:
+        return None
+    _, commits = since
+    if not commits:
+        return state
+    return merge_history_states(accumulate_history([c.as_dict() for c in commits], aliases), state)
+
+
+def metrics_from_history(project: str, path: str, state: dict) -> dict:
+    """The compute_metrics result for a history state."""
+    totals = state["totals"]
+    loc = state["loc"]
+    your_times = [{"authored_at": dt.datetime.fromisoformat(t)} for t in state["recent"]]
+    longest_streak, current_streak = _streaks([dt.date.fromisoformat(d) for d in state["active_dates"]])
+
+    dow = Counter(state["days"])
+    hod = Counter({int(h): n for h, n in state["hours"].items()})
+    top_days = ", ".join([d for d, _ in dow.most_common(2)]) if dow else "—"
+
+    file_loc = Counter(state["file_loc"])
+
+    return {
+        "project": project,
+        "path": path,
+        "totals": {
+            "commits_all": totals["commits_all"],
+            "commits_yours": totals["commits_yours"],
+            "commits_coauth": totals["commits_coauth"],
+            "merges": totals["merges"],
+        },
+        "loc": {
+            "added": loc["added"],
+            "deleted": loc["deleted"],
+            "net": loc["added"] - loc["deleted"],
+            "files_touched": loc["files_touched"],
+            "new_files": loc["new_files"],
+            "renames": loc["renames"],
+        },
         "history": {
-            "first": first_dt,
-            "last": last_dt,
-            "L30": l30,
-            "L90": l90,
-            "L365": l365,
+            "first": dt.datetime.fromisoformat(state["first"]) if state["first"] else None,
+            "last": dt.datetime.fromisoformat(state["last"]) if state["last"] else None,
+            "L30": _count_in_last_days(your_times, 30),
+            "L90": _count_in_last_days(your_times, 90),
+            "L365": _count_in_last_days(your_times, 365),
             "longest_streak": longest_streak,
             "current_streak": current_streak,
             "top_days": top_days,
-            "top_hours": top_hours,
+            "top_hours": _top_hours(hod),
         },
         "focus": {
-            "languages": langs_pct,
-            "folders": folders_pct,
-            "top_files": top_files,
+            "languages": _top_share(Counter(state["languages"]), label_from_ext=True),
+            "folders": _top_share(Counter(state["folders"]), limit=3),
+            "top_files": [f for f, _ in file_loc.most_common(5)],
         },
         "file_contributions": {
-            "file_loc": dict(file_loc),  # Convert Counter to dict
-            "file_commits": dict(file_commits),
+            "file_loc": dict(state["file_loc"]),
+            "file_commits": dict(state["file_commits"]),
         },
     }
 
 
+def _within_recent_window(times: List[dt.datetime]) -> List[dt.datetime]:
+    # Commits older than the widest window can never count again, so the state drops them.
+    cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=_RECENT_DAYS)
+    return [t for t in times if t >= cutoff]
+
+
 def _is_authored_by_user(commit: dict, aliases: Dict[str, set]) -> bool:
     ae = (commit.get("author_email") or "").lower()
     an = (commit.get("author_name") or "").lower()
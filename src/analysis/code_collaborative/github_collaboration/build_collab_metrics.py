@@ -6,8 +6,10 @@ from src.integrations.github.github_analysis import fetch_github_metrics
 from src.analysis.code_collaborative.github_collaboration.compute_gh_collaboration_profile import compute_collaboration_profile, compute_skill_levels
 from .models import RawUserCollabMetrics, RawTeamCollabMetrics
 
-def build_collaboration_metrics(token, owner, repo, username):
-    raw_metrics = fetch_github_metrics(token, owner, repo, username)
+def build_collaboration_metrics(token, owner, repo, username, raw_metrics=None):
+    # Callers that already fetched the metrics pass them in to avoid a second collection
+    if raw_metrics is None:
+        raw_metrics = fetch_github_metrics(token, owner, repo, username)
 
     # ===== REST METRICS =====
     commits_daily = raw_metrics["commits"]
@@ -108,12 +110,13 @@ def build_collaboration_metrics(token, owner, repo, username):
 
     return user, team
 
-def run_collaboration_analysis(token, owner, repo, username):
+def run_collaboration_analysis(token, owner, repo, username, raw_metrics=None):
     user, team = build_collaboration_metrics(
         token,
         owner,
         repo,
-        username
+        username,
+        raw_metrics=raw_metrics,
     )
 
     profile = compute_collaboration_profile(user, team)
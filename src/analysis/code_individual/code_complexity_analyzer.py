@@ -6,21 +6,39 @@ This module analyzes code complexity and structure metrics using:
 - Lizard: Code metrics including LOC, CCN, token count, parameters
 
 Provides comprehensive code quality metrics for individual coding projects.
+
+Per-file results are cached by file content (file_complexity_cache), so a new version of a
+project only re-analyses the files that changed; the remaining files are spread over a
+process pool when there are enough of them to pay for it.
+
+Configuration (environment):
+ - COMPLEXITY_WORKERS: processes used for uncached files (default: CPU count; 1 = in-process)
+ - COMPLEXITY_PROCESS_MIN_FILES: uncached files needed before the pool is used (default 32)
 """
 
+import math
 import os
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import radon
 from radon.complexity import cc_visit, cc_rank
 from radon.metrics import mi_visit, mi_rank
 from radon.raw import analyze as raw_analyze
 import lizard
+from src.utils.analysis_pool import run_in_pool
+from src.utils.deduplication.fingerprints import current_content_hash
 from src.utils.extension_catalog import get_languages_for_extension
 try:
     from src import constants
 except ModuleNotFoundError:
     import constants
 
+COMPLEXITY_WORKERS = int(os.getenv("COMPLEXITY_WORKERS", "0")) or (os.cpu_count() or 1)
+COMPLEXITY_PROCESS_MIN_FILES = int(os.getenv("COMPLEXITY_PROCESS_MIN_FILES", "32"))
+
+# Tool versions behind cached results: upgrading radon or lizard invalidates the cache.
+COMPLEXITY_ANALYZER = f"radon-{radon.__version__}/lizard-{lizard.version}"
+
 # Directories to exclude from analysis (third-party dependencies, build artifacts, etc.)
 EXCLUDE_DIRECTORIES = {
     # JavaScript/TypeScript/Node.js
@@ -199,6 +217,7 @@ def analyze_code_complexity(conn, user_id: int, project_name: str, zip_path: str
 
     radon_results = []
     lizard_results = []
+    candidates = []  # (full_path, file_name, is_python, extension)
 
     if constants.VERBOSE:
         print(f"\n{'='*80}")
@@ -238,14 +257,12 @@ def analyze_code_complexity(conn, user_id: int, project_name: str, zip_path: str
         if not languages:
             continue
 
-        # Analyze with Radon (Python only)
-        is_python = 'Python' in languages
-        radon_data = analyze_with_radon(full_path, file_name, is_python)
+        # Radon is Python only; Lizard is multi-language
+        candidates.append((full_path, file_name, 'Python' in languages, file_ext))
+
+    for radon_data, lizard_data in _complexity_for_files(conn, candidates):
         if radon_data:
             radon_results.append(radon_data)
-
-        # Analyze with Lizard (multi-language)
-        lizard_data = analyze_with_lizard(full_path, file_name)
         if lizard_data:
             lizard_results.append(lizard_data)
 
@@ -259,6 +276,72 @@ def analyze_code_complexity(conn, user_id: int, project_name: str, zip_path: str
     }
 
 
+FileComplexity = Tuple[Optional[Dict], Optional[Dict]]
+
+
+def _complexity_for_files(conn, candidates: List[Tuple[str, str, bool, str]]) -> List[FileComplexity]:
+    """
+    (radon, lizard) results for each (full_path, file_name, is_python, extension) candidate, in order.
+    Files whose content was analysed before come from file_complexity_cache; the rest are analysed
+    (see _analyze_files) and stored for the next version.
+    """
+    from src.db.code_metrics import get_cached_file_complexity, store_cached_file_complexity
+
+    keys = []
+    for full_path, _, _, file_ext in candidates:
+        try:
+            keys.append((current_content_hash(full_path), file_ext))
+        except OSError:
+            keys.append(None)
+    cached = get_cached_file_complexity(conn, [k for k in keys if k], COMPLEXITY_ANALYZER)
+
+    results: List[Optional[FileComplexity]] = [None] * len(candidates)
+    misses = []
+    for index, key in enumerate(keys):
+        hit = cached.get(key) if key else None
+        if hit is None:
+            misses.append(index)
+            continue
+        # Cached rows carry the name of the file they were computed for; report this one's.
+        file_name = candidates[index][1]
+        results[index] = tuple({**data, 'file_name': file_name} if data else None for data in hit)
+
+    analysed = _analyze_files([candidates[i][:3] for i in misses])
+    new_entries = []
+    for index, (radon_data, lizard_data) in zip(misses, analysed):
+        results[index] = (radon_data, lizard_data)
+        # A missing Lizard result means the analysis failed; leave it uncached so it is retried.
+        if keys[index] and lizard_data is not None:
+            new_entries.append((*keys[index], radon_data, lizard_data))
+    store_cached_file_complexity(conn, new_entries, COMPLEXITY_ANALYZER)
+
+    if constants.VERBOSE:
+        print(f"Complexity cache: {len(candidates) - len(misses)} hit(s), {len(misses)} file(s) analysed")
+    return results
+
+
+def _analyze_file(file_path: str, file_name: str, is_python: bool) -> FileComplexity:
+    return analyze_with_radon(file_path, file_name, is_python), analyze_with_lizard(file_path, file_name)
+
+
+def _analyze_batch(batch: List[Tuple[str, str, bool]]) -> List[FileComplexity]:
+    # Runs in a worker process.
+    return [_analyze_file(*job) for job in batch]
+
+
+def _analyze_files(jobs: List[Tuple[str, str, bool]], workers: Optional[int] = None) -> List[FileComplexity]:
+    """Run radon and lizard on (file_path, file_name, is_python) jobs; large sets go to a process pool."""
+    workers = max(1, int(workers or COMPLEXITY_WORKERS))
+    if workers == 1 or len(jobs) < COMPLEXITY_PROCESS_MIN_FILES:
+        return [_analyze_file(*job) for job in jobs]
+
+    # A few batches per worker keeps IPC overhead low while still balancing uneven file sizes.
+    size = max(1, math.ceil(len(jobs) / (workers * 4)))
+    batches = [(jobs[start:start + size],) for start in range(0, len(jobs), size)]
+    per_batch = run_in_pool(_analyze_batch, batches, workers=workers, executor_kind="process")
+    return [result for batch in per_batch for result in batch]
+
+
 def analyze_with_radon(file_path: str, file_name: str, is_python: bool) -> Optional[Dict]:
     """
     Analyze a single file using Radon for:
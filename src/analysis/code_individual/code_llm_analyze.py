@@ -4,7 +4,8 @@ import re
 from typing import Any, Dict, Optional
 from src.utils.helpers import extract_code_file, extract_readme_file, read_file_content
 from dotenv import load_dotenv
-from groq import Groq
+from groq import AsyncGroq
+from src.utils.llm_gateway import chat_completion, chat_completion_batch
 from src.utils.language_detector import detect_languages
 from src.utils.framework_detector import detect_frameworks
 from .code_llm_analyze_helper import _infer_project_root_folder, _readme_mentions_detected_tech
@@ -15,7 +16,8 @@ except ModuleNotFoundError:
     import constants
 
 load_dotenv()
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+# Retries and rate limiting are handled by the LLM gateway.
+client = AsyncGroq(api_key=os.environ.get("GROQ_API_KEY"), max_retries=0)
 
 
 def run_code_llm_analysis(
@@ -252,8 +254,13 @@ def run_code_llm_analysis(
     # 4. Call the existing LLM helpers
     #    - Project summary: README + light code context
     #    - Contribution summary: CODE-ONLY context (no README content)
-    project_summary = generate_code_llm_project_summary(project_context, readme_tech_ok)
-    contribution_summary = generate_code_llm_contribution_summary(contribution_context)
+    #    Both prompts are independent, so they are sent together.
+    project_response, contribution_response = chat_completion_batch(client, [
+        _project_summary_request(project_context, readme_tech_ok),
+        _contribution_summary_request(contribution_context),
+    ])
+    project_summary = _project_summary_from_response(project_response)
+    contribution_summary = _contribution_summary_from_response(contribution_response)
 
     display_code_llm_results(
         project_name,
@@ -295,6 +302,14 @@ def generate_code_llm_project_summary(project_context: str, readme_tech_ok: bool
     if not project_context or not project_context.strip():
         return "[Project summary unavailable: no context found]"
 
+    try:
+        response = chat_completion(client, **_project_summary_request(project_context, readme_tech_ok))
+    except Exception as e:
+        response = e
+    return _project_summary_from_response(response)
+
+
+def _project_summary_request(project_context: str, readme_tech_ok: bool) -> Dict[str, Any]:
     prompt = f"""
 You are describing a software project at a high level for documentation.
 
@@ -327,29 +342,39 @@ Context (README if available + TECH STACK + code context):
 
 Output one concise paragraph (80–110 words) written in PRESENT TENSE starting with "A project that..." or "An application that...".
 """
-    try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You write concise, factual project summaries based on technical documentation.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_tokens=220,
-        )
-        return _sanitize_resume_paragraph(completion.choices[0].message.content.strip())
-    except Exception as e:
-        print(f"Error generating project summary: {e}")
-        return "[Project summary unavailable due to API error]"
+    return {
+        "model": "llama-3.1-8b-instant",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You write concise, factual project summaries based on technical documentation.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.2,
+        "max_tokens": 220,
+    }
+
+
+def _project_summary_from_response(response) -> str:
+    if isinstance(response, str):
+        return _sanitize_resume_paragraph(response.strip())
+    print(f"Error generating project summary: {response}")
+    return "[Project summary unavailable due to API error]"
 
 def generate_code_llm_contribution_summary(project_context):
     """
     Produce a first-person contribution paragraph with implementation detail.
     Focus on what was built, key files, and impact.
     """
+    try:
+        response = chat_completion(client, **_contribution_summary_request(project_context))
+    except Exception as e:
+        response = e
+    return _contribution_summary_from_response(response)
+
+
+def _contribution_summary_request(project_context: str) -> Dict[str, Any]:
     prompt = f"""
 You are describing ONE contributor’s personal role in building this project.
 
@@ -367,27 +392,28 @@ Context (from source code & comments):
 Output one strong paragraph starting with a past-tense action verb (e.g., Implemented, Designed, Developed).
 DO NOT begin with "Here's a paragraph" or any sort of preamble and go into the paragrpah directly.
 """
-    try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a precise technical résumé writer focusing on contributions "
-                        "within collaborative codebases."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.15,
-            max_tokens=220,
-        )
-        raw = completion.choices[0].message.content.strip()
-        return _sanitize_resume_paragraph(raw)
-    except Exception as e:
-        print(f"Error generating contribution summary: {e}")
-        return "[Contribution summary unavailable due to API error]"
+    return {
+        "model": "llama-3.1-8b-instant",
+        "messages": [
+            {
+                "role": "system",
+                "content": (
+                    "You are a precise technical résumé writer focusing on contributions "
+                    "within collaborative codebases."
+                ),
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.15,
+        "max_tokens": 220,
+    }
+
+
+def _contribution_summary_from_response(response) -> str:
+    if isinstance(response, str):
+        return _sanitize_resume_paragraph(response.strip())
+    print(f"Error generating contribution summary: {response}")
+    return "[Contribution summary unavailable due to API error]"
 
 
 def _sanitize_resume_paragraph(text: str) -> str:
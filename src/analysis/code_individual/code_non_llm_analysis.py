@@ -3,7 +3,8 @@ from .git_individual_analyzer import analyze_git_individual_project, display_git
 from src.db.git_individual_metrics import (
     git_individual_metrics_exists,
     insert_git_individual_metrics,
-    update_git_individual_metrics
+    update_git_individual_metrics,
+    store_git_individual_checkpoint,
 )
 from src.db.git_metrics_helpers import extract_git_metrics
 try:
@@ -42,6 +43,7 @@ def run_code_non_llm_analysis(
     except TypeError:
         # Backward compatibility for tests/callers monkeypatching the old signature.
         git_data = analyze_git_individual_project(conn, user_id, project_name, zip_path)
+    checkpoint = git_data.pop("history_checkpoint", None) if git_data else None
     if summary and git_data:
         summary.metrics["git"] = git_data
     if git_data and git_data.get('has_git'):
@@ -54,6 +56,10 @@ def run_code_non_llm_analysis(
                 update_git_individual_metrics(conn, user_id, project_name, *metrics)
             else:
                 insert_git_individual_metrics(conn, user_id, project_name, *metrics)
+            if checkpoint:
+                store_git_individual_checkpoint(
+                    conn, user_id, project_name, checkpoint["commit"], checkpoint["state"]
+                )
 
             # Calculate totals for logging
             total_lines_added = metrics[7]  # index for total_lines_added
@@ -10,14 +10,19 @@ Analyzes git repositories in individual projects to extract:
 
 This is different from collaborative analysis - focuses on overall repository
 health and activity patterns rather than individual contributor metrics.
+
+History is read once per repository (src/utils/git_history.py) and shared with
+the collaborative analyzer. The HEAD analysed last is stored with the metrics, so
+a re-analysis only reads the commits made since then.
 """
 
 import os
-import subprocess
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict, Counter
 import pandas as pd
+from src.db.git_individual_metrics import get_git_individual_checkpoint
+from src.utils.git_history import GitCommit, read_git_commits, read_git_commits_since, repository_head
 from src.utils.helpers import is_git_repo
 from src.integrations.github.github_oauth import github_oauth
 from src.integrations.github.token_store import get_github_token
@@ -134,9 +139,20 @@ def analyze_git_individual_project(
         print(f"Repository found at: {repo_path}")
         print(f"{'='*80}\n")
 
-    # Extract git metrics
-    commit_stats = get_commit_statistics(repo_path)
-    timeline_data = get_lines_timeline(repo_path)
+    # Extract git metrics: fold only the commits made since the last analysed HEAD into the stored
+    # history state when it still applies, otherwise read the full history
+    head = repository_head(repo_path)
+    checkpoint = get_git_individual_checkpoint(conn, user_id, project_name) if conn and head else None
+    state = resume_history_state(repo_path, *checkpoint) if checkpoint else None
+    if state is not None:
+        commit_stats = commit_statistics_from_state(state)
+        timeline_data = list(state['timeline'])
+    else:
+        commit_stats = get_commit_statistics(repo_path)
+        # Both fail alike (e.g. a hung git log, already reported): don't walk the history again
+        timeline_data = get_lines_timeline(repo_path) if commit_stats else []
+        # Same (cached) history the two calls above just read
+        state = build_history_state(read_git_commits(repo_path)) if head and commit_stats else None
     weekly_changes = calculate_weekly_changes(timeline_data)
     activity_timeline = generate_activity_timeline(timeline_data)
 
@@ -147,6 +163,8 @@ def analyze_git_individual_project(
         "timeline_data": timeline_data,
         "weekly_changes": weekly_changes,
         "activity_timeline": activity_timeline,
+        # Resume point for the next run; stored with the metrics, not part of the summary
+        "history_checkpoint": {"commit": head, "state": state} if state is not None else None,
     }
 
 
@@ -221,87 +239,7 @@ def get_commit_statistics(repo_path: str) -> Dict:
     """
 
     try:
-        # Get total commit count
-        result = subprocess.run(
-            ['git', '-C', repo_path, 'rev-list', '--count', '--no-merges','HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        total_commits = int(result.stdout.strip()) if result.returncode == 0 else 0
-
-        # Get first and last commit dates
-        first_commit_result = subprocess.run(
-            ['git', '-C', repo_path, 'log', '--reverse', '--format=%ai', '--no-merges'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        last_commit_result = subprocess.run(
-            ['git', '-C', repo_path, 'log', '--format=%ai', '--no-merges', '--max-count=1'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        # Get first line from reversed output for first commit
-        first_commit_date = None
-        if first_commit_result.returncode == 0 and first_commit_result.stdout.strip():
-            first_commit_date = first_commit_result.stdout.strip().split('\n')[0]
-
-        last_commit_date = last_commit_result.stdout.strip() if last_commit_result.returncode == 0 else None
-
-        # Calculate time span
-        time_span_days = 0
-        if first_commit_date and last_commit_date:
-            first_dt = datetime.fromisoformat(first_commit_date.split()[0])
-            last_dt = datetime.fromisoformat(last_commit_date.split()[0])
-            time_span_days = (last_dt - first_dt).days
-
-        # Calculate averages
-        time_span_weeks = max(time_span_days / 7, 1)
-        time_span_months = max(time_span_days / 30, 1)
-
-        avg_commits_per_week = total_commits / time_span_weeks if time_span_weeks > 0 else 0
-        avg_commits_per_month = total_commits / time_span_months if time_span_months > 0 else 0
-
-        # Get unique authors
-        authors_result = subprocess.run(
-            ['git', '-C', repo_path, 'log', '--format=%an','--no-merges'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        unique_authors = len(set(authors_result.stdout.strip().split('\n'))) if authors_result.returncode == 0 else 0
-
-        # Get recent commit messages (last 10)
-        messages_result = subprocess.run(
-            ['git', '-C', repo_path, 'log', '--format=%ai|%s', '--no-merges','--max-count=10'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        commit_messages = []
-        if messages_result.returncode == 0:
-            for line in messages_result.stdout.strip().split('\n'):
-                if '|' in line:
-                    date, message = line.split('|', 1)
-                    commit_messages.append({'date': date, 'message': message})
-
-        return {
-            'total_commits': total_commits,
-            'first_commit_date': first_commit_date,
-            'last_commit_date': last_commit_date,
-            'time_span_days': time_span_days,
-            'average_commits_per_week': round(avg_commits_per_week, 2),
-            'average_commits_per_month': round(avg_commits_per_month, 2),
-            'unique_authors': unique_authors,
-            'recent_commits': commit_messages
-        }
+        return commit_statistics_from_state(build_history_state(read_git_commits(repo_path)))
 
     except Exception as e:
         print(f"Error getting commit statistics: {e}")
@@ -322,66 +260,125 @@ def get_lines_timeline(repo_path: str) -> List[Dict]:
     """
 
     try:
-        # Get commit data with numstat (lines added/deleted)
-        result = subprocess.run(
-            ['git', '-C', repo_path, 'log', '--numstat', '--format=%H|%ai', '--no-merges'],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-
-        if result.returncode != 0:
-            return []
-
-        timeline = []
-        current_commit = None
-        current_date = None
-
-        for line in result.stdout.strip().split('\n'):
-            if '|' in line:
-                # Commit line
-                parts = line.split('|')
-                current_commit = parts[0][:7]  # Short hash
-                current_date = parts[1]
-            elif line.strip() and current_commit:
-                # Numstat line: added    deleted    filename
-                parts = line.split('\t')
-                if len(parts) >= 3:
-                    try:
-                        added = int(parts[0]) if parts[0].isdigit() else 0
-                        deleted = int(parts[1]) if parts[1].isdigit() else 0
-
-                        # Parse timestamp
-                        dt = datetime.fromisoformat(current_date.split()[0])
-                        timestamp = int(dt.timestamp())
-
-                        # Find or create entry for this commit
-                        existing = next((t for t in timeline if t['commit_hash'] == current_commit), None)
-
-                        if existing:
-                            existing['lines_added'] += added
-                            existing['lines_deleted'] += deleted
-                            existing['net_lines'] = existing['lines_added'] - existing['lines_deleted']
-                        else:
-                            timeline.append({
-                                'commit_hash': current_commit,
-                                'date': current_date,
-                                'timestamp': timestamp,
-                                'lines_added': added,
-                                'lines_deleted': deleted,
-                                'net_lines': added - deleted
-                            })
-
-                    except (ValueError, IndexError):
-                        continue
-
-        return sorted(timeline, key=lambda x: x['timestamp'])
+        return build_history_state(read_git_commits(repo_path))['timeline']
 
     except Exception as e:
         print(f"Error getting lines timeline: {e}")
         return []
 
 
+# The commit statistics and the lines timeline are both derived from a history state: a JSON-able
+# summary of the commits that can be stored with the metrics and extended with later commits
+# (merge_history_states) instead of re-reading the whole history.
+HISTORY_STATE_VERSION = 1
+
+
+def build_history_state(commits: Tuple[GitCommit, ...]) -> Dict:
+    """History state for `commits` (newest first). Merge commits are left out of every statistic."""
+    commits = [c for c in commits if not c.is_merge]
+
+    timeline = []
+    for commit in commits:
+        # Merges carry no numstat of their own; commits without file changes are skipped
+        if not commit.files:
+            continue
+
+        # Binary files count as 0 lines added/deleted
+        added = sum(f.additions for f in commit.files)
+        deleted = sum(f.deletions for f in commit.files)
+        dt = datetime.fromisoformat(commit.date.split()[0])
+
+        timeline.append({
+            'commit_hash': commit.hash[:7],  # Short hash
+            'date': commit.date,
+            'timestamp': int(dt.timestamp()),
+            'lines_added': added,
+            'lines_deleted': deleted,
+            'net_lines': added - deleted
+        })
+
+    return {
+        'version': HISTORY_STATE_VERSION,
+        'total_commits': len(commits),
+        # History is newest first
+        'first_commit_date': commits[-1].date if commits else None,
+        'last_commit_date': commits[0].date if commits else None,
+        'authors': sorted({c.author_name for c in commits}),
+        # Recent commit messages (last 10)
+        'recent_commits': [{'date': c.date, 'message': c.subject} for c in commits[:10]],
+        'timeline': sorted(timeline, key=lambda x: x['timestamp']),
+    }
+
+
+def merge_history_states(newer: Dict, older: Dict) -> Dict:
+    """
+    Combine the states of two disjoint commit ranges, `newer` holding the later commits.
+    Same-day timeline entries keep newer commits first, as a single newest-first walk would.
+    """
+    return {
+        'version': HISTORY_STATE_VERSION,
+        'total_commits': newer['total_commits'] + older['total_commits'],
+        'first_commit_date': older['first_commit_date'] or newer['first_commit_date'],
+        'last_commit_date': newer['last_commit_date'] or older['last_commit_date'],
+        'authors': sorted(set(newer['authors']) | set(older['authors'])),
+        'recent_commits': sorted(
+            newer['recent_commits'] + older['recent_commits'],
+            key=lambda c: datetime.fromisoformat(c['date']),
+            reverse=True,
+        )[:10],
+        'timeline': sorted(newer['timeline'] + older['timeline'], key=lambda x: x['timestamp']),
+    }
+
+
+def resume_history_state(repo_path: str, last_sha: str, state: Optional[Dict]) -> Optional[Dict]:
+    """
+    Fold the commits made after `last_sha` into a stored history state.
+    Returns None when the state can't be reused (older format, or `last_sha` is no longer in
+    HEAD's history after a rebase/force-push); the caller then rebuilds it from the full history.
+    """
+    if not last_sha or not isinstance(state, dict) or state.get('version') != HISTORY_STATE_VERSION:
+        return None
+    since = read_git_commits_since(repo_path, last_sha)
+    if since is None:
+        return None
+    _, commits = since
+    if not commits:
+        return state
+    return merge_history_states(build_history_state(commits), state)
+
+
+def commit_statistics_from_state(state: Dict) -> Dict:
+    """The get_commit_statistics result for a history state."""
+    total_commits = state['total_commits']
+    first_commit_date = state['first_commit_date']
+    last_commit_date = state['last_commit_date']
+
+    # Calculate time span
+    time_span_days = 0
+    if first_commit_date and last_commit_date:
+        first_dt = datetime.fromisoformat(first_commit_date.split()[0])
+        last_dt = datetime.fromisoformat(last_commit_date.split()[0])
+        time_span_days = (last_dt - first_dt).days
+
+    # Calculate averages
+    time_span_weeks = max(time_span_days / 7, 1)
+    time_span_months = max(time_span_days / 30, 1)
+
+    avg_commits_per_week = total_commits / time_span_weeks if time_span_weeks > 0 else 0
+    avg_commits_per_month = total_commits / time_span_months if time_span_months > 0 else 0
+
+    return {
+        'total_commits': total_commits,
+        'first_commit_date': first_commit_date,
+        'last_commit_date': last_commit_date,
+        'time_span_days': time_span_days,
+        'average_commits_per_week': round(avg_commits_per_week, 2),
+        'average_commits_per_month': round(avg_commits_per_month, 2),
+        'unique_authors': len(state['authors']),
+        'recent_commits': list(state['recent_commits'])
+    }
+
+
 def calculate_weekly_changes(timeline_data: List[Dict]) -> Dict:
     """
     Calculate weekly aggregation of additions, deletions, and net lines.
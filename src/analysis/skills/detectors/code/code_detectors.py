@@ -6,7 +6,8 @@ Each detector should return:
 """
 
 import re
-from typing import Tuple, List, Dict
+from dataclasses import dataclass
+from typing import Callable, Tuple, List, Dict, Optional
 
 # Compiling patterns with regex (one per detector for all lines instead of one per detector per line)
 PY_DICT_PATTERN = re.compile(r'^\s*\w+\s*=\s*(dict\s*\(|\{\s*["\']?\w+["\']?\s*:)', re.IGNORECASE)
@@ -41,6 +42,34 @@ POLYMORPHISM_PATTERN = re.compile(r'(@override|@Override|virtual\s+\w+|abstract\
 
 # HELPER FUNCTIONS
 
+# A line check can only pass when the line contains one of these (case, needle) pairs, where case
+# is "" (as written), "lower" or "upper" (needle tested against line.lower() / line.upper()).
+Needles = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class LineRule:
+    """
+    A detector that reports the first line where `accepts(line)` and `pattern.search(line)` both hold.
+    `accepts` carries the detector's comment skipping and cheap substring checks; when it is built
+    from the _any_in* helpers below, `needles` lists the substrings it requires (None = unknown).
+    The scan engine (line_scanner.py) uses `needles` to rule out whole files at once.
+    """
+    pattern: re.Pattern
+    accepts: Callable[[str], bool]
+
+    @property
+    def needles(self) -> Optional[Needles]:
+        return getattr(self.accepts, "needles", None)
+
+
+def _first_matching_line(lines: List[str], file_name: str, rule: LineRule) -> Tuple[bool, List[Dict]]:
+    for i, line in enumerate(lines, 1):
+        if rule.accepts(line) and rule.pattern.search(line):
+            return (True, [{"file": file_name, "line": i}])
+    return (False, [])
+
+
 def _is_comment_line(line: str) -> bool:
     """Check if a line is a comment."""
     stripped = line.strip()
@@ -58,45 +87,81 @@ def _is_likely_in_string(line: str, pattern_match_pos: int) -> bool:
     return (single_quotes % 2 == 1) or (double_quotes % 2 == 1)
 
 
+def _requiring(check: Callable[[str], bool], needles: Optional[Needles]) -> Callable[[str], bool]:
+    check.needles = needles
+    return check
+
+
+def _any_in(*needles: str) -> Callable[[str], bool]:
+    """Fast string check: does the line contain any of `needles`?"""
+    def check(line: str) -> bool:
+        return any(n in line for n in needles)
+    return _requiring(check, tuple(("", n) for n in needles))
+
+
+def _any_in_lower(*needles: str) -> Callable[[str], bool]:
+    """Like _any_in, against the lowercased line (needles must be lowercase)."""
+    def check(line: str) -> bool:
+        lowered = line.lower()
+        return any(n in lowered for n in needles)
+    return _requiring(check, tuple(("lower", n) for n in needles))
+
+
+def _any_in_upper(*needles: str) -> Callable[[str], bool]:
+    """Like _any_in, against the uppercased line (needles must be uppercase)."""
+    def check(line: str) -> bool:
+        uppered = line.upper()
+        return any(n in uppered for n in needles)
+    return _requiring(check, tuple(("upper", n) for n in needles))
+
+
+def _either(a: Callable[[str], bool], b: Callable[[str], bool]) -> Callable[[str], bool]:
+    a_needles, b_needles = getattr(a, "needles", None), getattr(b, "needles", None)
+    needles = a_needles + b_needles if a_needles and b_needles else None
+    return _requiring(lambda line: a(line) or b(line), needles)
+
+
+def _all_of(a: Callable[[str], bool], b: Callable[[str], bool]) -> Callable[[str], bool]:
+    needles = getattr(a, "needles", None) or getattr(b, "needles", None)
+    return _requiring(lambda line: a(line) and b(line), needles)
+
+
+def _not_prefixed(*prefixes: str) -> Callable[[str], bool]:
+    """True unless the stripped line starts with one of `prefixes` (comment skipping)."""
+    return lambda line: not line.strip().startswith(prefixes)
+
+
+def _code_line(check: Callable[[str], bool]) -> Callable[[str], bool]:
+    """Skip comment lines, then apply `check`."""
+    return _requiring(lambda line: not _is_comment_line(line) and check(line), getattr(check, "needles", None))
+
+
 # OOP DETECTORS
 
+_CLASSES_RULE = LineRule(CLASSES_PATTERN, _any_in("class "))
+
 def detect_classes(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect class definitions such as `class Foo:`."""
     # Must be at start of line (possibly after whitespace) to avoid strings/comments
-    for i, line in enumerate(lines, 1):
-        # Fast string check first
-        if "class " not in line:
-            continue
-        if CLASSES_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _CLASSES_RULE)
 
-    return (False, [])
 
+_INHERITANCE_RULE = LineRule(INHERITANCE_PATTERN, _any_in("class"))
 
 def detect_inheritance(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect class inheritance such as `class Foo(Bar):`."""
     # Matches: class Dog(Animal), class User extends Base, class Foo : public Bar
     # Must have something in parentheses or 'extends' keyword
     # Must be at start of line to avoid strings
-    for i, line in enumerate(lines, 1):
-        if INHERITANCE_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _INHERITANCE_RULE)
 
-    return (False, [])
 
+_POLYMORPHISM_RULE = LineRule(POLYMORPHISM_PATTERN, _any_in_lower("@override", "abstract", "virtual"))
 
 def detect_polymorphism(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect overridden methods or same method names across classes."""
     # Matches: @override, @Override, virtual void, abstract class
-    for i, line in enumerate(lines, 1):
-        # Fast string checks first
-        line_lower = line.lower()
-        if "@override" not in line_lower and "abstract" not in line_lower and "virtual" not in line_lower:
-            continue
-        if POLYMORPHISM_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _POLYMORPHISM_RULE)
 
 
 # DATA STRUCTURE DETECTORS
@@ -155,34 +220,22 @@ def detect_hash_maps(lines: List[str], file_name: str):
     return (False, [])
 
 
+_SETS_RULE = LineRule(SETS_PATTERN, _any_in_lower("set(", "hashset", "set<", " set "))
+
 def detect_sets(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect set literals, set() calls, or other set usage."""
     # Matches: HashSet, set(), Set<String>, set =
-    for i, line in enumerate(lines, 1):
-        # Fast string checks first
-        line_lower = line.lower()
-        if "set(" not in line_lower and "hashset" not in line_lower and "set<" not in line_lower and " set " not in line_lower:
-            continue
-        if SETS_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _SETS_RULE)
 
-    return (False, [])
 
+_QUEUE_STACK_RULE = LineRule(QUEUE_STACK_PATTERN, _any_in_lower("queue", "stack", "deque", ".push(", ".pop("))
 
 def detect_queues_or_stacks(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """
     Detect simple queue/stack usage (append/pop patterns or collections.deque).
     """
     # Matches: Queue, Stack, Deque, .push(), .pop(), .enqueue, .dequeue
-    for i, line in enumerate(lines, 1):
-        # Fast string checks first
-        line_lower = line.lower()
-        if "queue" not in line_lower and "stack" not in line_lower and "deque" not in line_lower and ".push(" not in line_lower and ".pop(" not in line_lower:
-            continue
-        if QUEUE_STACK_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _QUEUE_STACK_RULE)
 
 
 # ALGORITHM DETECTORS
@@ -210,22 +263,15 @@ def detect_recursion(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]
     return (False, [])
 
 
+_SORT_SEARCH_RULE = LineRule(
+    SORT_SEARCH_PATTERN,
+    _all_of(_not_prefixed("#", "//"), _any_in_lower("sort", "search")),
+)
+
 def detect_sorting_or_search(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect calls to `sort`, `sorted`, or binary search patterns."""
     # Matches: .sort(), sorted(), Arrays.sort, Collections.sort, binary_search, binarySearch
-    for i, line in enumerate(lines, 1):
-        # Skip comment lines
-        stripped = line.strip()
-        if stripped.startswith('#') or stripped.startswith('//'):
-            continue
-        # Fast string checks first
-        line_lower = line.lower()
-        if ".sort(" not in line_lower and "sorted(" not in line_lower and "sort" not in line_lower and "search" not in line_lower:
-            continue
-        if SORT_SEARCH_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _SORT_SEARCH_RULE)
 
 
 # CODE QUALITY DETECTORS
@@ -252,17 +298,12 @@ def detect_large_functions(lines: List[str], file_name: str) -> Tuple[bool, List
     return (False, [])
 
 
+_COMMENT_DOCSTRING_RULE = LineRule(COMMENT_DOCSTRING_PATTERN, _any_in("#", "//", "/*", '"""', "'''", "<!--"))
+
 def detect_comments_docstrings(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect comments or docstrings for clarity/documentation."""
     # Matches: #, //, /* */, """, ''', <!--
-    for i, line in enumerate(lines, 1):
-        # Fast string checks first
-        if "#" not in line and "//" not in line and "/*" not in line and '"""' not in line and "'''" not in line and "<!--" not in line:
-            continue
-        if COMMENT_DOCSTRING_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _COMMENT_DOCSTRING_RULE)
 
 
 def detect_duplicate_code(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
@@ -273,18 +314,15 @@ def detect_duplicate_code(lines: List[str], file_name: str) -> Tuple[bool, List[
 
 # STRUCTURE / SOFTWARE ENGINEERING
 
+_MODULAR_RULE = LineRule(
+    MODULAR_PATTERN,
+    _either(_any_in_lower("import ", "from ", "require("), _any_in("#include")),
+)
+
 def detect_modular_design(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect evidence of modular design (imports, multiple modules)."""
     # Matches: import, from X import, require(), #include
-    for i, line in enumerate(lines, 1):
-        # Fast string checks first
-        line_lower = line.lower()
-        if "import " not in line_lower and "from " not in line_lower and "require(" not in line_lower and "#include" not in line:
-            continue
-        if MODULAR_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _MODULAR_RULE)
 
 
 def detect_test_files(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
@@ -309,100 +347,73 @@ def detect_ci_workflows(lines: List[str], file_name: str) -> Tuple[bool, List[Di
 
 # TESTING DETECTORS
 
+_ASSERTION_RULE = LineRule(
+    ASSERTION_PATTERN,
+    _code_line(_any_in_lower("assert", "expect(", "should.", "chai.")),
+)
+
 def detect_assertions(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect test assertions."""
     # Matches: assert, expect, should, chai.
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        line_lower = line.lower()
-        if "assert" not in line_lower and "expect(" not in line_lower and "should." not in line_lower and "chai." not in line_lower:
-            continue
-        if ASSERTION_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _ASSERTION_RULE)
 
-    return (False, [])
 
+_MOCKING_FIXTURE_RULE = LineRule(
+    MOCKING_FIXTURE_PATTERN,
+    _either(_any_in_lower("mock", "fixture", "stub"), _any_in("@patch", "@fixture")),
+)
 
 def detect_mocking_or_fixtures(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect mocking or fixture usage in tests."""
     # Matches: mock, Mock, @patch, fixture, stub
-    for i, line in enumerate(lines, 1):
-        # Fast string checks first
-        line_lower = line.lower()
-        if "mock" not in line_lower and "@patch" not in line and "@fixture" not in line and "fixture" not in line_lower and "stub" not in line_lower:
-            continue
-        if MOCKING_FIXTURE_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _MOCKING_FIXTURE_RULE)
 
 
 # ERROR HANDLING & SECURITY
 
+_ERROR_HANDLING_RULE = LineRule(
+    ERROR_HANDLING_PATTERN,
+    _code_line(_any_in_lower("try:", "except", "catch", "throw", "raises(")),
+)
+
 def detect_error_handling(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect error handling patterns."""
     # Matches: try:, except, catch, throw, raises
     # Must be at start of line or after whitespace for try/except
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        line_lower = line.lower()
-        if "try:" not in line_lower and "except" not in line_lower and "catch" not in line_lower and "throw" not in line_lower and "raises(" not in line_lower:
-            continue
-        if ERROR_HANDLING_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _ERROR_HANDLING_RULE)
 
-    return (False, [])
 
+_INPUT_VALIDATION_RULE = LineRule(
+    INPUT_VALIDATOR_PATTERN,
+    _code_line(_any_in_lower("validate", "validator", "sanitize")),
+)
 
 def detect_input_validation(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect input validation patterns."""
     # Matches: validate, validator, sanitize, schema.validate
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        line_lower = line.lower()
-        if "validate" not in line_lower and "validator" not in line_lower and "sanitize" not in line_lower:
-            continue
-        if INPUT_VALIDATOR_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _INPUT_VALIDATION_RULE)
 
-    return (False, [])
 
+_ENV_USAGE_RULE = LineRule(
+    ENV_USAGE_PATTERN,
+    _code_line(_either(_any_in("process.env", "os.environ", "getenv", "load_dotenv"), _any_in_lower("dotenv"))),
+)
 
 def detect_env_variable_usage(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect environment variable usage."""
     # Matches: process.env, os.environ, getenv, .env (but not "environment" variable)
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        if "process.env" not in line and "os.environ" not in line and "getenv" not in line and "dotenv" not in line.lower() and "load_dotenv" not in line:
-            continue
-        if ENV_USAGE_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _ENV_USAGE_RULE)
 
-    return (False, [])
 
+_CRYPTO_RULE = LineRule(
+    CRYPTO_PATTERN,
+    _code_line(_any_in_lower("hashlib", "bcrypt", "crypto", "encrypt", "decrypt", "jwt")),
+)
 
 def detect_crypto_usage(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect cryptography and security library usage."""
     # Matches: hashlib, bcrypt, crypto imports/usage, encrypt/decrypt functions
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        line_lower = line.lower()
-        if "hashlib" not in line_lower and "bcrypt" not in line_lower and "crypto" not in line_lower and "encrypt" not in line_lower and "decrypt" not in line_lower and "jwt" not in line_lower:
-            continue
-        if CRYPTO_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _CRYPTO_RULE)
 
 
 # ARCHITECTURE DETECTORS
@@ -417,85 +428,91 @@ def detect_mvc_folders(lines: List[str], file_name: str) -> Tuple[bool, List[Dic
     return False, []
 
 
+_API_ROUTES_RULE = LineRule(
+    API_ROUTES_PATTERN,
+    _code_line(_any_in("@app.route", "@router", "app.get(", "app.post(", "@GetMapping", "@PostMapping")),
+)
+
 def detect_api_routes(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect API route definitions."""
     # Matches: @app.route, @router., app.get(, @GetMapping, @PostMapping
     # Must be at start of line (decorator) or actual function call
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        if "@app.route" not in line and "@router" not in line and "app.get(" not in line and "app.post(" not in line and "@GetMapping" not in line and "@PostMapping" not in line:
-            continue
-        if API_ROUTES_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _API_ROUTES_RULE)
 
 
 # FRONTEND DETECTORS
 
+_COMPONENTS_RULE = LineRule(
+    COMPONENTS_PATTERN,
+    _code_line(_any_in("React.Component", "extends Component", "Vue.component", "@Component", "createComponent")),
+)
+
 def detect_components(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect frontend component usage."""
     # Matches: React.Component, extends Component, Vue.component, @Component
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        if "React.Component" not in line and "extends Component" not in line and "Vue.component" not in line and "@Component" not in line and "createComponent" not in line:
-            continue
-        if COMPONENTS_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _COMPONENTS_RULE)
 
 
 # BACKEND DETECTORS
 
+_SERIALIZATION_RULE = LineRule(
+    SERIALIZATION_PATTERN,
+    _code_line(_any_in_lower("json.stringify", "json.dumps", "serialize", "tojson", "jsonserializer", "pickle.dump")),
+)
+
 def detect_serialization(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect data serialization patterns."""
     # Matches: JSON.stringify, json.dumps, serialize, toJSON, JsonSerializer
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        line_lower = line.lower()
-        if "json.stringify" not in line_lower and "json.dumps" not in line_lower and "serialize" not in line_lower and "tojson" not in line_lower and "jsonserializer" not in line_lower and "pickle.dump" not in line_lower:
-            continue
-        if SERIALIZATION_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _SERIALIZATION_RULE)
 
-    return (False, [])
 
+_DB_QUERY_RULE = LineRule(
+    DB_QUERY_PATTERN,
+    _code_line(_either(
+        _any_in_upper("SELECT", "INSERT", "UPDATE", "DELETE"),
+        _any_in("cursor.execute", ".query(", ".findOne", ".findMany", ".find(", ".save("),
+    )),
+)
 
 def detect_database_queries(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect database query usage."""
     # Matches: SELECT, INSERT, UPDATE, cursor.execute, query(, findOne
     # For SQL keywords, require word boundaries or start of string
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        line_upper = line.upper()
-        if "SELECT" not in line_upper and "INSERT" not in line_upper and "UPDATE" not in line_upper and "DELETE" not in line_upper and "cursor.execute" not in line and ".query(" not in line and ".findOne" not in line and ".findMany" not in line and ".find(" not in line and ".save(" not in line:
-            continue
-        if DB_QUERY_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
+    return _first_matching_line(lines, file_name, _DB_QUERY_RULE)
 
-    return (False, [])
 
+_CACHING_RULE = LineRule(
+    CACHING_PATTERN,
+    _code_line(_either(
+        _any_in("@cached", "@lru_cache", ".cache(", "cache.get", "cache.set"),
+        _any_in_lower("redis", "memcached"),
+    )),
+)
 
 def detect_caching(lines: List[str], file_name: str) -> Tuple[bool, List[Dict]]:
     """Detect caching implementation."""
     # Matches: @cached, @lru_cache, Redis, memcached, .cache
-    for i, line in enumerate(lines, 1):
-        if _is_comment_line(line):
-            continue
-        # Fast string checks first
-        line_lower = line.lower()
-        if "@cached" not in line and "@lru_cache" not in line and "redis" not in line_lower and "memcached" not in line_lower and ".cache(" not in line and "cache.get" not in line and "cache.set" not in line:
-            continue
-        if CACHING_PATTERN.search(line):
-            return (True, [{"file": file_name, "line": i}])
-
-    return (False, [])
+    return _first_matching_line(lines, file_name, _CACHING_RULE)
+
+# Detectors that are a single LineRule, so line_scanner can gate them on the whole file first.
+LINE_RULES: Dict[Callable, LineRule] = {
+    detect_classes: _CLASSES_RULE,
+    detect_inheritance: _INHERITANCE_RULE,
+    detect_polymorphism: _POLYMORPHISM_RULE,
+    detect_sets: _SETS_RULE,
+    detect_queues_or_stacks: _QUEUE_STACK_RULE,
+    detect_sorting_or_search: _SORT_SEARCH_RULE,
+    detect_comments_docstrings: _COMMENT_DOCSTRING_RULE,
+    detect_modular_design: _MODULAR_RULE,
+    detect_assertions: _ASSERTION_RULE,
+    detect_mocking_or_fixtures: _MOCKING_FIXTURE_RULE,
+    detect_error_handling: _ERROR_HANDLING_RULE,
+    detect_input_validation: _INPUT_VALIDATION_RULE,
+    detect_env_variable_usage: _ENV_USAGE_RULE,
+    detect_crypto_usage: _CRYPTO_RULE,
+    detect_api_routes: _API_ROUTES_RULE,
+    detect_components: _COMPONENTS_RULE,
+    detect_serialization: _SERIALIZATION_RULE,
+    detect_database_queries: _DB_QUERY_RULE,
+    detect_caching: _CACHING_RULE,
+}
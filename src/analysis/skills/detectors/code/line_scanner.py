@@ -0,0 +1,146 @@
+"""
+src/analysis/skills/detectors/code/line_scanner.py
+
+Runs the content detectors over a project's files.
+
+Most detectors are a single LineRule (see code_detectors.LINE_RULES): "the first line that passes
+the detector's cheap checks and matches its regex". Every rule's cheap check requires one of a few
+substrings (LineRule.needles), so each file is joined into one buffer (lower/upper-cased copies
+are made once and shared by all rules) and each rule first looks its needles up in that buffer.
+Most rules miss most files; those are settled by a few C-level substring searches instead of a
+Python loop over every line, and a rule whose needles do occur is checked line by line from the
+first line carrying one. Stateful or whole-file detectors (detect_recursion,
+detect_large_functions, ...) run as before.
+
+Results keep the detector contract: {detector_name: (hit, evidence)} per file.
+Large projects are fanned out across a process pool.
+
+Configuration (environment):
+ - CODE_SCAN_WORKERS: processes used for large projects (default: CPU count; 1 disables the pool)
+ - CODE_SCAN_PROCESS_MIN_FILES: files needed before the pool is worth its start-up cost (default 400)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.analysis.skills.detectors.code.code_detector_registry import CODE_DETECTOR_FUNCTIONS
+from src.analysis.skills.detectors.code.code_detectors import LINE_RULES, LineRule, Needles
+from src.utils.analysis_pool import run_in_pool
+
+
+CODE_SCAN_WORKERS = int(os.getenv("CODE_SCAN_WORKERS", "0")) or (os.cpu_count() or 1)
+CODE_SCAN_PROCESS_MIN_FILES = int(os.getenv("CODE_SCAN_PROCESS_MIN_FILES", "400"))
+
+DetectorResult = Tuple[bool, List[Dict[str, Any]]]
+
+
+class _FileText:
+    """One file's lines joined into a single buffer, with case-folded copies made on first use."""
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self._variants: Dict[str, str] = {"": "\n".join(lines)}
+        self._starts: List[int] | None = None
+
+    def variant(self, case: str) -> str:
+        if case not in self._variants:
+            text = self._variants[""]
+            self._variants[case] = text.lower() if case == "lower" else text.upper()
+        return self._variants[case]
+
+    def line_index(self, case: str, offset: int) -> int:
+        # lower()/upper() can change the length of some characters; then offsets no longer line up.
+        if len(self.variant(case)) != len(self._variants[""]):
+            return 0
+        if self._starts is None:
+            self._starts = list(accumulate((len(line) + 1 for line in self.lines[:-1]), initial=0))
+        return bisect_right(self._starts, offset) - 1
+
+
+def _first_candidate_line(text: _FileText, needles: Needles | None) -> int | None:
+    """
+    Index of the first line that could pass a rule requiring one of `needles`, or None if no line can.
+    Needles never contain a newline, so a needle in the joined buffer is a needle on some line.
+    """
+    if not needles:
+        return 0
+    first = None
+    for case, needle in needles:
+        pos = text.variant(case).find(needle)
+        if pos != -1:
+            index = text.line_index(case, pos)
+            first = index if first is None else min(first, index)
+            if first == 0:
+                break
+    return first
+
+
+def _scan_rules(lines: List[str], file_name: str, rules: Dict[str, LineRule]) -> Dict[str, DetectorResult]:
+    found: Dict[str, DetectorResult] = {}
+    if not rules:
+        return found
+
+    text = _FileText(lines)
+    for name, rule in rules.items():
+        found[name] = (False, [])
+        start = _first_candidate_line(text, rule.needles)
+        if start is None:
+            continue
+        for i in range(start, len(lines)):
+            line = lines[i]
+            if rule.accepts(line) and rule.pattern.search(line):
+                found[name] = (True, [{"file": file_name, "line": i + 1}])
+                break
+    return found
+
+
+def scan_file_lines(
+    file_name: str,
+    lines: List[str],
+    detectors: Dict[str, Callable[[List[str], str], DetectorResult]],
+) -> Dict[str, DetectorResult]:
+    """Run every detector on one file; LineRule detectors share the file buffer and its case-folded copies."""
+    rules = {name: LINE_RULES[fn] for name, fn in detectors.items() if fn in LINE_RULES}
+    results = _scan_rules(lines, file_name, rules)
+    for name, fn in detectors.items():
+        if name not in rules:
+            results[name] = fn(lines, file_name)
+    return {name: results[name] for name in detectors}
+
+
+def _scan_batch(batch: List[Tuple[str, List[str]]], detector_names: Tuple[str, ...]) -> List[Dict[str, DetectorResult]]:
+    # Runs in a worker process: detectors are looked up by name in the worker's own registry.
+    detectors = {name: CODE_DETECTOR_FUNCTIONS[name] for name in detector_names}
+    return [scan_file_lines(file_name, lines, detectors) for file_name, lines in batch]
+
+
+def scan_code_files(
+    files: List[Tuple[str, List[str]]],
+    detectors: Dict[str, Callable[[List[str], str], DetectorResult]],
+    *,
+    workers: int | None = None,
+) -> List[Dict[str, DetectorResult]]:
+    """
+    Scan (file_name, lines) pairs and return one {detector_name: (hit, evidence)} dict per file, in order.
+    The process pool is only used for registry detectors (workers re-import them by name).
+    """
+    workers = max(1, int(workers or CODE_SCAN_WORKERS))
+    use_pool = (
+        workers > 1
+        and len(files) >= CODE_SCAN_PROCESS_MIN_FILES
+        and all(CODE_DETECTOR_FUNCTIONS.get(name) is fn for name, fn in detectors.items())
+    )
+    if not use_pool:
+        return [scan_file_lines(file_name, lines, detectors) for file_name, lines in files]
+
+    # A few batches per worker keeps IPC overhead low while still balancing uneven file sizes.
+    size = max(1, math.ceil(len(files) / (workers * 4)))
+    names = tuple(detectors)
+    batches = [(files[start:start + size], names) for start in range(0, len(files), size)]
+    per_batch = run_in_pool(_scan_batch, batches, workers=workers, executor_kind="process")
+    return [result for batch in per_batch for result in batch]
@@ -0,0 +1,82 @@
+"""
+src/analysis/skills/detectors/text/keyword_matcher.py
+
+Aho-Corasick matcher for the text detectors' phrase lists.
+
+The detectors ask "which of these phrases occur in the (lowercased) text?" for a few dozen
+phrases. Asked one phrase at a time that is a full scan of the document per phrase, and the
+whole-word checks (re.search(r"\\bphrase\\b")) are slower still. KeywordAutomaton compiles every
+phrase into one automaton, with failure links folded into the transitions, so a single pass
+over the text reports every occurrence of every phrase, overlapping ones included. The result
+is the same as running `phrase in text` for each phrase.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+def is_word_boundary(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is delimited like re's \\b...\\b (no word character either side)."""
+    before = text[start - 1] if start > 0 else ""
+    after = text[end] if end < len(text) else ""
+    return not (before and (before.isalnum() or before == "_")) and not (
+        after and (after.isalnum() or after == "_")
+    )
+
+
+class KeywordAutomaton:
+    """Multi-phrase substring matcher, built once and reused for every document."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+
+        # Trie
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[str, ...]] = [()]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                if ch not in goto[state]:
+                    goto.append({})
+                    output.append(())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            output[state] += (keyword,)
+
+        # Failure links in BFS order, folded into a full transition table: every state maps each
+        # keyword character straight to its next state, so scanning never follows a failure chain.
+        alphabet = {ch for keyword in self.keywords for ch in keyword}
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict() for _ in goto]
+        delta[0] = {ch: goto[0].get(ch, 0) for ch in alphabet}
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            output[state] += output[fail[state]]
+            for ch in alphabet:
+                if ch in goto[state]:
+                    nxt = goto[state][ch]
+                    fail[nxt] = delta[fail[state]][ch]
+                    delta[state][ch] = nxt
+                    queue.append(nxt)
+                else:
+                    delta[state][ch] = delta[fail[state]][ch]
+
+        # Transitions back to the root are the .get() default
+        self._next = [{ch: nxt for ch, nxt in row.items() if nxt} for row in delta]
+        self._output = output
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """{keyword: start offsets of every occurrence} for the keywords found in text."""
+        hits: Dict[str, List[int]] = {}
+        steps = [row.get for row in self._next]
+        output = self._output
+        state = 0
+        for i, ch in enumerate(text):
+            state = steps[state](ch, 0)
+            if output[state]:
+                for keyword in output[state]:
+                    hits.setdefault(keyword, []).append(i - len(keyword) + 1)
+        return hits
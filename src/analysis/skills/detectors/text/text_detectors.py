@@ -2,8 +2,8 @@ import re
 from collections import Counter
 from typing import Any, Dict, Optional
 
-from nltk.corpus import stopwords
-from src.analysis.text_individual.alt_analyze import analyze_linguistic_complexity
+from src.analysis.skills.detectors.text.keyword_matcher import KeywordAutomaton, is_word_boundary
+from src.analysis.skills.detectors.text.text_document import TextDocument, TextInput, as_text_document
 
 # Feedback plumbing
 try:
@@ -67,10 +67,70 @@ def _emit_feedback(
     )
 
 
+# ---------------------------------------------------------------------
+# Phrase vocabularies (matched as substrings of the lowercased text)
+# ---------------------------------------------------------------------
+TRANSITION_WORDS = ["however", "in addition", "moreover", "furthermore", "overall"]
+
+CLAIM_WORDS = ["i argue", "this paper argues", "i propose", "the thesis is", "the point is"]
+EVIDENCE_WORDS = ["according to", "the study shows", "data from", "research indicates", "evidence suggests"]
+REASONING_WORDS = ["because", "therefore", "as a result", "thus", "hence", "this implies"]
+CONCLUSION_WORDS = ["in conclusion", "to conclude", "overall", "in sum", "in closing"]
+
+# Whole-word matches only
+ABSTRACT_KEYWORDS = [
+    "concept", "framework", "theory", "model", "analysis",
+    "interpretation", "implication", "assumption",
+    "perspective", "principle", "underlying",
+]
+CONNECTORS = [
+    "therefore", "thus", "hence", "consequently",
+    "as a result", "this implies", "this suggests",
+    "this indicates", "results in", "leads to",
+]
+INTERPRETATION_PATTERNS = [
+    "this shows", "this means", "this demonstrates",
+    "we can infer", "the implication is",
+]
+
+SECTION_MARKERS = ["introduction", "method", "conclusion", "overview"]
+
+RESEARCH_PHRASE = "according to"
+RESEARCH_TERMS = ["study", "journal", "paper", "research", "dataset"]
+
+VISUAL_TERMS = ["result", "graph", "table", "figure"]
+STAT_TERMS = ["correlation", "regression"]
+TREND_TERMS = ["increase", "decrease", "trend"]
+INTERPRETATION_TERMS = ["shows", "indicates", "suggests"]
+
+# One automaton over every vocabulary: a document is scanned once for all detectors
+_KEYWORDS = KeywordAutomaton(
+    TRANSITION_WORDS + CLAIM_WORDS + EVIDENCE_WORDS + REASONING_WORDS + CONCLUSION_WORDS
+    + ABSTRACT_KEYWORDS + CONNECTORS + INTERPRETATION_PATTERNS + SECTION_MARKERS
+    + [RESEARCH_PHRASE] + RESEARCH_TERMS
+    + VISUAL_TERMS + STAT_TERMS + TREND_TERMS + INTERPRETATION_TERMS
+)
+
+
+def _found(doc: TextDocument, phrases) -> list:
+    """The phrases occurring in the document, in list order (same as `[p for p in phrases if p in lower]`)."""
+    hits = doc.keyword_hits(_KEYWORDS)
+    return [p for p in phrases if p in hits]
+
+
+def _found_whole_words(doc: TextDocument, words) -> list:
+    """The words occurring in the document as whole words (same as re.search(rf"\b{w}\b", lower))."""
+    hits = doc.keyword_hits(_KEYWORDS)
+    return [
+        w for w in words
+        if any(is_word_boundary(doc.lower, start, start + len(w)) for start in hits.get(w, ()))
+    ]
+
+
 # ---------------------------------------------------------------------
 # 1) CLARITY
 # ---------------------------------------------------------------------
-def detect_sentence_clarity(file_text: str, file_name: str, feedback_ctx=None):
+def detect_sentence_clarity(file_text: TextInput, file_name: str, feedback_ctx=None):
     """
     Checks for 5 types of writing issues:
       1. Fragments / run-on sentences
@@ -82,11 +142,7 @@ def detect_sentence_clarity(file_text: str, file_name: str, feedback_ctx=None):
     Score = (# criteria passed) / 5
     Evidence = all sentences that violated each rule.
     """
-    sentences = [
-        s.strip()
-        for s in re.split(r"(?<=[\.!?])\s+", file_text.strip())
-        if s.strip()
-    ]
+    sentences = as_text_document(file_text).sentences
 
     if not sentences:
         _emit_feedback(
@@ -252,7 +308,7 @@ def detect_sentence_clarity(file_text: str, file_name: str, feedback_ctx=None):
 # ---------------------------------------------------------------------
 # 2) STRUCTURE
 # ---------------------------------------------------------------------
-def detect_paragraph_structure(file_text: str, file_name: str, feedback_ctx=None):
+def detect_paragraph_structure(file_text: TextInput, file_name: str, feedback_ctx=None):
     """
     Criteria (max 4 points):
       1. >= 3 paragraphs
@@ -260,7 +316,8 @@ def detect_paragraph_structure(file_text: str, file_name: str, feedback_ctx=None
       3. Paragraphs not excessively long (< 250 words)
       4. Paragraph-level transitions detected (keywords)
     """
-    paragraphs = [p.strip() for p in re.split(r"\n\s*\n+", file_text) if p.strip()]
+    doc = as_text_document(file_text)
+    paragraphs = doc.paragraphs
     if not paragraphs:
         _emit_feedback(
             feedback_ctx,
@@ -334,9 +391,7 @@ def detect_paragraph_structure(file_text: str, file_name: str, feedback_ctx=None
         )
 
     # C4: transitions
-    transitions = ["however", "in addition", "moreover", "furthermore", "overall"]
-    text_lower = file_text.lower()
-    found_transitions = [t for t in transitions if t in text_lower]
+    found_transitions = _found(doc, TRANSITION_WORDS)
     if found_transitions:
         score += 1
     else:
@@ -357,7 +412,7 @@ def detect_paragraph_structure(file_text: str, file_name: str, feedback_ctx=None
 # ---------------------------------------------------------------------
 # 3) VOCABULARY
 # ---------------------------------------------------------------------
-def detect_vocabulary_diversity(file_text: str, file_name: str, feedback_ctx=None):
+def detect_vocabulary_diversity(file_text: TextInput, file_name: str, feedback_ctx=None):
     """
     Criteria (max 4 points):
       1. lexical_diversity >= 0.35
@@ -365,7 +420,7 @@ def detect_vocabulary_diversity(file_text: str, file_name: str, feedback_ctx=Non
       3. FK grade >= 10
       4. FK grade >= 13
     """
-    metrics = analyze_linguistic_complexity(file_text)
+    metrics = as_text_document(file_text).linguistic_complexity
     lex = float(metrics.get("lexical_diversity", 0) or 0)
     grade = float(metrics.get("flesch_kincaid_grade", 0) or 0)
 
@@ -441,7 +496,7 @@ def detect_vocabulary_diversity(file_text: str, file_name: str, feedback_ctx=Non
 # ---------------------------------------------------------------------
 # 4) ARGUMENTATION
 # ---------------------------------------------------------------------
-def detect_argument_structure(file_text: str, file_name: str, feedback_ctx=None):
+def detect_argument_structure(file_text: TextInput, file_name: str, feedback_ctx=None):
     """
     Criteria (max 4 points):
       1. 1+ claim markers
@@ -449,19 +504,14 @@ def detect_argument_structure(file_text: str, file_name: str, feedback_ctx=None)
       3. 1+ reasoning terms
       4. 1+ conclusion markers
     """
-    text_lower = file_text.lower()
-
-    claim_words = ["i argue", "this paper argues", "i propose", "the thesis is", "the point is"]
-    evidence_words = ["according to", "the study shows", "data from", "research indicates", "evidence suggests"]
-    reasoning_words = ["because", "therefore", "as a result", "thus", "hence", "this implies"]
-    conclusion_words = ["in conclusion", "to conclude", "overall", "in sum", "in closing"]
+    doc = as_text_document(file_text)
 
     score = 0
     total = 4
     ev = {}
 
     # Claims
-    found_claims = [w for w in claim_words if w in text_lower]
+    found_claims = _found(doc, CLAIM_WORDS)
     ev["claims"] = found_claims
     if found_claims:
         score += 1
@@ -478,7 +528,7 @@ def detect_argument_structure(file_text: str, file_name: str, feedback_ctx=None)
         )
 
     # Evidence
-    found_evidence = [w for w in evidence_words if w in text_lower]
+    found_evidence = _found(doc, EVIDENCE_WORDS)
     ev["evidence"] = found_evidence
     if found_evidence:
         score += 1
@@ -495,7 +545,7 @@ def detect_argument_structure(file_text: str, file_name: str, feedback_ctx=None)
         )
 
     # Reasoning
-    found_reasoning = [w for w in reasoning_words if w in text_lower]
+    found_reasoning = _found(doc, REASONING_WORDS)
     ev["reasoning"] = found_reasoning
     if found_reasoning:
         score += 1
@@ -512,7 +562,7 @@ def detect_argument_structure(file_text: str, file_name: str, feedback_ctx=None)
         )
 
     # Conclusion
-    found_conclusions = [w for w in conclusion_words if w in text_lower]
+    found_conclusions = _found(doc, CONCLUSION_WORDS)
     ev["conclusions"] = found_conclusions
     if found_conclusions:
         score += 1
@@ -534,7 +584,7 @@ def detect_argument_structure(file_text: str, file_name: str, feedback_ctx=None)
 # ---------------------------------------------------------------------
 # 5) DEPTH
 # ---------------------------------------------------------------------
-def detect_depth_of_content(file_text: str, file_name: str, feedback_ctx=None):
+def detect_depth_of_content(file_text: TextInput, file_name: str, feedback_ctx=None):
     """
     Scoring (4 points):
       1. Abstract/conceptual vocabulary (>=5 unique whole-word matches)
@@ -542,9 +592,8 @@ def detect_depth_of_content(file_text: str, file_name: str, feedback_ctx=None):
       3. Idea density >= 0.20 AND text >= 80 words
       4. Interpretation phrases (>=2)
     """
-    text_lower = file_text.lower()
-    words = re.findall(r"[A-Za-z]+", text_lower)
-    word_count = len(words)
+    doc = as_text_document(file_text)
+    word_count = len(doc.words)
 
     if word_count < 80:
         _emit_feedback(
@@ -565,34 +614,12 @@ def detect_depth_of_content(file_text: str, file_name: str, feedback_ctx=None):
             }],
         }
 
-    abstract_keywords = [
-        "concept", "framework", "theory", "model", "analysis",
-        "interpretation", "implication", "assumption",
-        "perspective", "principle", "underlying",
-    ]
-
-    abstract_count = 0
-    for kw in abstract_keywords:
-        if re.search(rf"\b{kw}\b", text_lower):
-            abstract_count += 1
+    abstract_count = len(_found_whole_words(doc, ABSTRACT_KEYWORDS))
+    connector_hits = _found(doc, CONNECTORS)
 
-    connectors = [
-        "therefore", "thus", "hence", "consequently",
-        "as a result", "this implies", "this suggests",
-        "this indicates", "results in", "leads to",
-    ]
-    connector_hits = [c for c in connectors if c in text_lower]
-
-    stop = set(stopwords.words("english"))
-    meaningful = [w for w in words if w not in stop]
-    unique_meaningful = set(meaningful)
-    idea_density = len(unique_meaningful) / word_count if word_count else 0
+    idea_density = len(doc.meaningful_terms) / word_count if word_count else 0
 
-    interpretation_patterns = [
-        "this shows", "this means", "this demonstrates",
-        "we can infer", "the implication is",
-    ]
-    interpretation_hits = [p for p in interpretation_patterns if p in text_lower]
+    interpretation_hits = _found(doc, INTERPRETATION_PATTERNS)
 
     score = 0
     total = 4
@@ -673,7 +700,7 @@ _OUTLINE_TOKEN = re.compile(r"(^|[^a-z0-9])outline([^a-z0-9]|$)", re.IGNORECASE)
 _VERSION_TOKEN = re.compile(r"(^|[^a-z0-9])(v\s*\d+|version\s*\d+)([^a-z0-9]|$)", re.IGNORECASE)
 
 
-def detect_iterative_process(file_text: str, file_name: str, supporting_files=None, feedback_ctx=None):
+def detect_iterative_process(file_text: TextInput, file_name: str, supporting_files=None, feedback_ctx=None):
     """
     Scoring (4 points):
       1. >= 1 draft file
@@ -785,7 +812,7 @@ def detect_iterative_process(file_text: str, file_name: str, supporting_files=No
 # ---------------------------------------------------------------------
 # 7) PLANNING
 # ---------------------------------------------------------------------
-def detect_planning_behavior(file_text: str, file_name: str, supporting_files=None, feedback_ctx=None):
+def detect_planning_behavior(file_text: TextInput, file_name: str, supporting_files=None, feedback_ctx=None):
     """
     Criteria (max 4 points):
       1. Outline file present
@@ -793,7 +820,7 @@ def detect_planning_behavior(file_text: str, file_name: str, supporting_files=No
       3. Bullet lists present
       4. Numbered lists present
     """
-    text_lower = file_text.lower()
+    doc = as_text_document(file_text)
     score = 0
     total = 4
     evidence = []
@@ -829,7 +856,7 @@ def detect_planning_behavior(file_text: str, file_name: str, supporting_files=No
         )
 
     # C2 section markers
-    if any(x in text_lower for x in ["introduction", "method", "conclusion", "overview"]):
+    if _found(doc, SECTION_MARKERS):
         score += 1
         evidence.append({"section_markers": True})
     else:
@@ -845,7 +872,7 @@ def detect_planning_behavior(file_text: str, file_name: str, supporting_files=No
         )
 
     # C3 bullet lists
-    if re.search(r"[-*]\s+\w+", file_text):
+    if re.search(r"[-*]\s+\w+", doc.text):
         score += 1
         evidence.append({"bullet_list": True})
     else:
@@ -861,7 +888,7 @@ def detect_planning_behavior(file_text: str, file_name: str, supporting_files=No
         )
 
     # C4 numbered lists
-    if re.search(r"\d+\.\s+\w+", file_text):
+    if re.search(r"\d+\.\s+\w+", doc.text):
         score += 1
         evidence.append({"numbered_list": True})
     else:
@@ -882,7 +909,7 @@ def detect_planning_behavior(file_text: str, file_name: str, supporting_files=No
 # ---------------------------------------------------------------------
 # 8) RESEARCH
 # ---------------------------------------------------------------------
-def detect_evidence_of_research(file_text: str, file_name: str, feedback_ctx=None):
+def detect_evidence_of_research(file_text: TextInput, file_name: str, feedback_ctx=None):
     """
     APA criteria (2 points):
         +1 APA present (Smith, 2020)
@@ -898,8 +925,8 @@ def detect_evidence_of_research(file_text: str, file_name: str, feedback_ctx=Non
         +1 author-verb pattern ("Smith argues")
         +1 research words ("study", "journal", ...)
     """
-    text = file_text
-    lower = text.lower()
+    doc = as_text_document(file_text)
+    text = doc.text
 
     score = 0
     total = 8
@@ -981,7 +1008,7 @@ def detect_evidence_of_research(file_text: str, file_name: str, feedback_ctx=Non
             suggestion="If using numeric citations, include references like [1], [2] in the text.",
         )
 
-    if "according to" in lower:
+    if _found(doc, [RESEARCH_PHRASE]):
         score += 1
         evidence.append({"phrase": "according to"})
     else:
@@ -1011,8 +1038,7 @@ def detect_evidence_of_research(file_text: str, file_name: str, feedback_ctx=Non
             suggestion="Integrate sources with phrasing like 'Smith argues that...' or 'Jones states...'.",
         )
 
-    research_terms = ["study", "journal", "paper", "research", "dataset"]
-    if any(r in lower for r in research_terms):
+    if _found(doc, RESEARCH_TERMS):
         score += 1
         evidence.append({"research_terms": True})
     else:
@@ -1224,7 +1250,7 @@ def detect_data_collection(file_text, file_name, supporting_files=None, csv_meta
 # ---------------------------------------------------------------------
 # 10) DATA ANALYSIS
 # ---------------------------------------------------------------------
-def detect_data_analysis(file_text: str, file_name: str, supporting_files=None, feedback_ctx=None):
+def detect_data_analysis(file_text: TextInput, file_name: str, supporting_files=None, feedback_ctx=None):
     """
     Criteria (max 4 points):
       1. Mentions of results/graph/table/figure
@@ -1232,12 +1258,12 @@ def detect_data_analysis(file_text: str, file_name: str, supporting_files=None,
       3. Mentions of quantitative comparisons (increase/decrease/trend)
       4. Mentions of interpretation ("shows", "indicates", "suggests")
     """
-    lower = file_text.lower()
+    doc = as_text_document(file_text)
     score = 0
     total = 4
     evidence = []
 
-    if any(k in lower for k in ["result", "graph", "table", "figure"]):
+    if _found(doc, VISUAL_TERMS):
         score += 1
         evidence.append({"visual_reference": True})
     else:
@@ -1252,7 +1278,7 @@ def detect_data_analysis(file_text: str, file_name: str, supporting_files=None,
             suggestion="Refer to results explicitly (e.g., 'Figure 1 shows...', 'Table 2 indicates...').",
         )
 
-    if any(k in lower for k in ["correlation", "regression"]):
+    if _found(doc, STAT_TERMS):
         score += 1
         evidence.append({"stat_terms": True})
     else:
@@ -1267,7 +1293,7 @@ def detect_data_analysis(file_text: str, file_name: str, supporting_files=None,
             suggestion="Include analysis terminology (correlation, regression, mean, variance, p-value) if appropriate.",
         )
 
-    if any(k in lower for k in ["increase", "decrease", "trend"]):
+    if _found(doc, TREND_TERMS):
         score += 1
         evidence.append({"trend_reference": True})
     else:
@@ -1282,7 +1308,7 @@ def detect_data_analysis(file_text: str, file_name: str, supporting_files=None,
             suggestion="Describe patterns quantitatively (e.g., 'increased by', 'decreased', 'shows an upward trend').",
         )
 
-    if any(k in lower for k in ["shows", "indicates", "suggests"]):
+    if _found(doc, INTERPRETATION_TERMS):
         score += 1
         evidence.append({"interpretation": True})
     else:
@@ -0,0 +1,93 @@
+"""
+src/analysis/skills/detectors/text/text_document.py
+
+A text file parsed once for all text detectors.
+
+Every detector used to take the raw text and redo its own splitting: sentences and paragraphs
+by regex, a lowercased copy, a word list, and NLTK tokenisation plus textstat readability through
+analyze_linguistic_complexity (twice per file, once in detect_vocabulary_diversity and once for
+the stored offline metrics). TextDocument computes each of these on first use and keeps it, so a
+long document is lowercased, split, tokenised and scanned for keywords once however many
+detectors read it.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from functools import cached_property, lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Union
+
+from src.analysis.skills.detectors.text.keyword_matcher import KeywordAutomaton
+from src.analysis.text_individual.alt_analyze import analyze_linguistic_complexity
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[\.!?])\s+")
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n+")
+_WORD = re.compile(r"[A-Za-z]+")
+
+
+@lru_cache(maxsize=1)
+def english_stopwords() -> FrozenSet[str]:
+    """NLTK's English stopword list, loaded once per process."""
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words("english"))
+
+
+class TextDocument:
+    """Lazily computed, memoised views of one file's text."""
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self._keyword_hits: Dict[int, Dict[str, List[int]]] = {}
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Sentences split after . ! or ?, stripped, empties dropped."""
+        return [s.strip() for s in _SENTENCE_SPLIT.split(self.text.strip()) if s.strip()]
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        """Blocks separated by blank lines, stripped, empties dropped."""
+        return [p.strip() for p in _PARAGRAPH_SPLIT.split(self.text) if p.strip()]
+
+    @cached_property
+    def words(self) -> List[str]:
+        """Lowercase alphabetic runs, in order."""
+        return _WORD.findall(self.lower)
+
+    @cached_property
+    def term_counts(self) -> Counter:
+        return Counter(self.words)
+
+    @cached_property
+    def meaningful_terms(self) -> FrozenSet[str]:
+        """Distinct words that are not English stopwords."""
+        stop = english_stopwords()
+        return frozenset(w for w in self.term_counts if w not in stop)
+
+    @cached_property
+    def linguistic_complexity(self) -> Dict[str, Any]:
+        """Token counts and readability scores (see analyze_linguistic_complexity)."""
+        return analyze_linguistic_complexity(self.text)
+
+    def keyword_hits(self, automaton: KeywordAutomaton) -> Dict[str, List[int]]:
+        """Offsets in `lower` of every keyword of the automaton, from one scan per automaton."""
+        key = id(automaton)
+        if key not in self._keyword_hits:
+            self._keyword_hits[key] = automaton.scan(self.lower)
+        return self._keyword_hits[key]
+
+
+TextInput = Union[str, TextDocument]
+
+
+def as_text_document(file_text: Optional[TextInput]) -> TextDocument:
+    """Detectors accept either raw text or an already parsed TextDocument."""
+    if isinstance(file_text, TextDocument):
+        return file_text
+    return TextDocument(file_text or "")
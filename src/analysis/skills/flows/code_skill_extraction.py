@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Set
 
 from src.analysis.skills.buckets.code_buckets import CODE_SKILL_BUCKETS
 from src.analysis.skills.detectors.code.code_detector_registry import CODE_DETECTOR_FUNCTIONS
+from src.analysis.skills.detectors.code.line_scanner import scan_code_files
 from src.analysis.skills.flows.code_feedback_templates import _DETECTOR_FEEDBACK
 from src.analysis.skills.utils.skill_levels import score_to_level
 from src.db import get_project_key, insert_project_skill, upsert_project_feedback
@@ -458,11 +459,11 @@ def run_all_code_detectors(files: List[Dict[str, Any]]) -> Dict[str, Dict[str, A
         if not any(line.strip() for line in lines):
             continue
 
-        processed_files.append({"file_name": file_name, "lines": lines})
+        processed_files.append((file_name, lines))
 
-    for detector_name, detector_fn in content_detectors.items():
-        for fd in processed_files:
-            hit, evidence_list = detector_fn(fd["lines"], fd["file_name"])
+    # One sweep per file for all regex detectors; large projects fan out over processes
+    for file_results in scan_code_files(processed_files, content_detectors):
+        for detector_name, (hit, evidence_list) in file_results.items():
             if hit:
                 results[detector_name]["hits"] += 1
                 results[detector_name]["evidence"].extend(evidence_list)
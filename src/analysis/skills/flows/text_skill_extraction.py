@@ -3,11 +3,11 @@ from typing import Dict, List
 
 from src.analysis.skills.utils.skill_levels import score_to_level
 from src.analysis.skills.detectors.text.text_detector_registry import TEXT_DETECTOR_FUNCTIONS
+from src.analysis.skills.detectors.text.text_document import TextDocument
 from src.analysis.skills.buckets.text_buckets import TEXT_SKILL_BUCKETS
 from src.db import get_project_key, insert_project_skill
 
 from src.db.text_metrics import store_text_offline_metrics
-from src.analysis.text_individual.alt_analyze import analyze_linguistic_complexity
 from src.db import get_latest_version_key
 
 
@@ -46,34 +46,37 @@ def extract_text_skills(
         "project_type": "text",
     }
 
+    # Parsed once; every detector reads the same memoised sentences, tokens and readability stats
+    main_doc = TextDocument(main_text)
+
     detector_results = {}
     for name, fn in TEXT_DETECTOR_FUNCTIONS.items():
 
         # Pass extra parameters only to relevant detectors
         if name == "detect_iterative_process":
             out = fn(
-                main_text,
+                main_doc,
                 "MAIN",
                 supporting_files=supporting_texts,
                 feedback_ctx=feedback_ctx,
             )
         elif name == "detect_planning_behavior":
             out = fn(
-                main_text,
+                main_doc,
                 "MAIN",
                 supporting_files=supporting_texts,
                 feedback_ctx=feedback_ctx,
             )
         elif name == "detect_data_collection":
             out = fn(
-                main_text,
+                main_doc,
                 "MAIN",
                 csv_metadata=csv_metadata,
                 feedback_ctx=feedback_ctx,
             )
         else:
             out = fn(
-                main_text,
+                main_doc,
                 "MAIN",
                 feedback_ctx=feedback_ctx,
             )
@@ -127,7 +130,7 @@ def extract_text_skills(
     version_key = get_latest_version_key(conn, user_id, project_name)
 
     if version_key:
-        ling = analyze_linguistic_complexity(main_text)
+        ling = main_doc.linguistic_complexity
 
         project_metrics = {
             "summary": {
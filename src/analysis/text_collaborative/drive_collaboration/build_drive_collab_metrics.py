@@ -5,6 +5,7 @@ objects expected by the collaboration-skill pipeline.
 from datetime import datetime
 from typing import List, Dict
 from src.integrations.google_drive.api_calls import fetch_drive_comments
+from src.integrations.google_drive.drive_fetch import authorized_http, drive_workers, map_bounded
 from src.analysis.text_collaborative.drive_collaboration.compute_drive_collab_profile import (
     compute_text_collaboration_profile, 
     compute_skill_levels
@@ -16,10 +17,12 @@ def build_drive_collaboration_metrics(
     drive_service, 
     file_ids: List[str], 
     user_email: str,
-    user_display_name: str = None
+    user_display_name: str = None,
+    creds=None
 ) -> tuple[RawUserTextCollabMetrics, RawTeamTextCollabMetrics]:
     """
     Fetch comments from all Drive files and build metrics objects.
+    With creds, files are fetched concurrently (see drive_fetch).
     """
     # Aggregate data across all files
     all_user_comments = []
@@ -34,9 +37,14 @@ def build_drive_collaboration_metrics(
     all_team_questions = []
     all_team_files = set()
     
-    for file_id in file_ids:
-        result = fetch_drive_comments(drive_service, file_id, user_email, user_display_name)
-        
+    def fetch(file_id):
+        if creds is None:
+            return fetch_drive_comments(drive_service, file_id, user_email, user_display_name)
+        return fetch_drive_comments(drive_service, file_id, user_email, user_display_name, http=authorized_http(creds))
+
+    results = map_bounded(fetch, file_ids, drive_workers(creds))
+
+    for file_id, result in zip(file_ids, results):
         if result.get("status") != "success":
             continue
         
@@ -87,12 +95,13 @@ def run_drive_collaboration_analysis(
     drive_service,
     file_ids: List[str],
     user_email: str,
-    user_display_name: str = None
+    user_display_name: str = None,
+    creds=None
 ) -> Dict:
     """
     Run full collaboration analysis pipeline for Google Drive files.
     """
-    user, team = build_drive_collaboration_metrics(drive_service, file_ids, user_email, user_display_name)
+    user, team = build_drive_collaboration_metrics(drive_service, file_ids, user_email, user_display_name, creds=creds)
     profile = compute_text_collaboration_profile(user, team)
     
     skill_levels = compute_skill_levels(profile)
@@ -1,31 +1,59 @@
 import re
+from typing import Iterable, Iterator
+
 
 def extract_document_sections(full_text: str):
     """
     Detect headers OR paragraph previews.
     Return list of {header, preview, text}.
     """
+    return list(iter_document_sections(full_text.split("\n")))
+
+
+def _section(header, buffer):
+    section_text = "\n".join(buffer).strip()
+    return {
+        "header": header,
+        "preview": section_text[:60],
+        "text": section_text
+    }
+
+
+def iter_document_sections(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    extract_document_sections() over a stream of lines, yielding each section once the next
+    header closes it.
 
-    lines = full_text.split("\n")
-    sections = []
+    Until a header with body text has been seen the paragraph-preview fallback may still apply,
+    so the text read so far is held back; from then on sections stream.
+    """
     buffer = []
     current_header = None
+    held = []           # sections not yet known to survive the fallback
+    held_lines = []     # non-empty lines, for the paragraph fallback
+    streaming = False
 
     header_pattern = re.compile(r"^[A-Z][A-Za-z ]{2,}$")  # e.g. "Introduction", "Method"
 
     for line in lines:
         stripped = line.strip()
+        if not streaming and stripped:
+            held_lines.append(stripped)
 
         if header_pattern.match(stripped):  # header detected
             # flush previous section
             if buffer:
-                section_text = "\n".join(buffer).strip()
-                sections.append({
-                    "header": current_header,
-                    "preview": section_text[:60],
-                    "text": section_text
-                })
+                section = _section(current_header, buffer)
                 buffer = []
+                if streaming:
+                    yield section
+                elif current_header is None:
+                    held.append(section)
+                else:
+                    streaming = True
+                    yield from held
+                    yield section
+                    held = held_lines = None
 
             current_header = stripped
         else:
@@ -33,23 +61,20 @@ def extract_document_sections(full_text: str):
 
     # flush last
     if buffer:
-        section_text = "\n".join(buffer).strip()
-        sections.append({
-            "header": current_header,
-            "preview": section_text[:60],
-            "text": section_text
-        })
+        section = _section(current_header, buffer)
+        if streaming:
+            yield section
+        elif current_header is not None:
+            yield from held
+            yield section
+            streaming = True
 
     # If NO headers at all → use paragraph previews
-    if all(s["header"] is None for s in sections):
-        paragraphs = [p.strip() for p in full_text.split("\n") if p.strip()]
-        sections = []
-        for p in paragraphs:
+    if not streaming:
+        for p in held_lines:
             preview = " ".join(p.split()[:5])
-            sections.append({
+            yield {
                 "header": None,
                 "preview": preview + "...",
                 "text": p
-            })
-
-    return sections
\ No newline at end of file
+            }
@@ -52,18 +52,21 @@ def analyze_linguistic_complexity(text: str):
             'reading_level': 'N/A'
         }
 
-    tokens = [w for w in word_tokenize(text) if w.isalpha()]
+    # word_tokenize(text) is sent_tokenize + per-sentence word tokenisation; split sentences once
+    sentences = sent_tokenize(text)
+    tokens = [w for sent in sentences for w in word_tokenize(sent, preserve_line=True) if w.isalpha()]
     words = word_tokenize(text.lower())
     unique_words = set(words)
 
     word_count = len(tokens)
-    sentence_count = len(sent_tokenize(text))
+    sentence_count = len(sentences)
     char_count = len(text)
 
     lexical_diversity = len(unique_words) / word_count if word_count > 0 else 0
 
     avg_word_length = char_count / word_count if word_count else 0
     avg_sentence_length = word_count / sentence_count if sentence_count else 0
+    fk_grade = textstat.flesch_kincaid_grade(text)
 
     return {
         'word_count': word_count,
@@ -73,9 +76,9 @@ def analyze_linguistic_complexity(text: str):
         'avg_sentence_length': round(avg_sentence_length, 2),
         'lexical_diversity': round(lexical_diversity, 3),
         'flesch_reading_ease': round(textstat.flesch_reading_ease(text), 2),
-        'flesch_kincaid_grade': round(textstat.flesch_kincaid_grade(text), 2),
+        'flesch_kincaid_grade': round(fk_grade, 2),
         'smog_index': round(textstat.smog_index(text), 2),
-        'reading_level': _interpret_reading_level(textstat.flesch_kincaid_grade(text))
+        'reading_level': _interpret_reading_level(fk_grade)
     }
 
 
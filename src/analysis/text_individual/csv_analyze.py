@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 from collections import defaultdict
 
+from src.utils.csv_profile import cached_csv_profile
+
 # NOTE: All LLM + printing helpers kept only for standalone CLI usage, not pipeline.
 
 
@@ -49,11 +51,40 @@ def analyze_single_csv(df):
     return summary
 
 
+def summarize_csv_profile(profile):
+    """
+    analyze_single_csv() for a streamed profile (src.utils.csv_profile), so the file never has
+    to be loaded into one DataFrame.
+    """
+    total_rows = profile["row_count"]
+    missing_rows = profile["missing_rows"]
+    missing_pct = (missing_rows / total_rows * 100) if total_rows > 0 else 0
+
+    return {
+        "row_count": total_rows,
+        "col_count": profile["col_count"],
+        "headers": list(profile["headers"]),
+        "dtypes": dict(profile["dtypes"]),
+        "missing_rows": missing_rows,
+        "missing_pct": round(missing_pct, 2),
+    }
+
+
+def load_csv_profile(path):
+    """Safely profile a CSV file in bounded memory; None if it cannot be read."""
+    try:
+        return cached_csv_profile(path)
+    except Exception as e:
+        print(f"Error loading {path}: {e}")
+        return None
+
+
 def analyze_all_csv(parsed_files, zip_path):
     """
     Non-printing helper used by the text analysis pipeline.
 
-    Given ALL parsed_files, filter out CSVs, load them, and return metadata.
+    Given ALL parsed_files, filter out CSVs, profile them (chunked, cached by content hash),
+    and return metadata.
 
     Returns:
     {
@@ -105,11 +136,11 @@ def analyze_all_csv(parsed_files, zip_path):
         growth = []
         for f in sorted(files, key=lambda x: x["file_name"]):
             path = os.path.join(base_path, f["file_path"])
-            df = load_csv(path)
-            if df is None:
+            profile = load_csv_profile(path)
+            if profile is None:
                 continue
 
-            summary = analyze_single_csv(df)
+            summary = summarize_csv_profile(profile)
             all_file_summaries.append({
                 "file_name": f["file_name"],
                 "file_path": f["file_path"],
@@ -1,9 +1,11 @@
 import os
 from dotenv import load_dotenv
-from groq import Groq
+from groq import AsyncGroq
+from src.utils.llm_gateway import chat_completion
 
 load_dotenv()
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+# Retries and rate limiting are handled by the LLM gateway.
+client = AsyncGroq(api_key=os.environ.get("GROQ_API_KEY"), max_retries=0)
 
 
 def generate_text_llm_summary(text: str) -> str:
@@ -29,7 +31,8 @@ def generate_text_llm_summary(text: str) -> str:
     )
 
     try:
-        completion = client.chat.completions.create(
+        content = chat_completion(
+            client,
             model="llama-3.1-8b-instant",
             messages=[
                 {
@@ -44,7 +47,7 @@ def generate_text_llm_summary(text: str) -> str:
             temperature=0.25,
             max_tokens=150,
         )
-        return completion.choices[0].message.content.strip()
+        return content.strip()
     except Exception as e:
         print(f"Error generating summary: {e}")
         return "[Summary unavailable due to API error]"
@@ -70,7 +73,8 @@ Contribution description:
 Return ONLY the role title, nothing else. Do not include any explanation or punctuation."""
 
     try:
-        completion = client.chat.completions.create(
+        content = chat_completion(
+            client,
             model="llama-3.1-8b-instant",
             messages=[
                 {
@@ -85,7 +89,7 @@ Return ONLY the role title, nothing else. Do not include any explanation or punc
             temperature=0.1,
             max_tokens=20,
         )
-        role = completion.choices[0].message.content.strip()
+        role = content.strip()
         # Clean up any quotes or extra punctuation
         role = role.strip('"\'.,;:')
         return role
@@ -120,13 +124,14 @@ Write 3–5 sentences.
 """
 
     try:
-        completion = client.chat.completions.create(
+        content = chat_completion(
+            client,
             model="llama-3.1-8b-instant",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=200,
             temperature=0.5,
         )
-        return completion.choices[0].message.content.strip()
+        return content.strip()
     except Exception:
         return "I contributed to the document, but an automatic summary could not be generated."
 
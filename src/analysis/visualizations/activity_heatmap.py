@@ -9,6 +9,14 @@ Modes:
 - mode='snapshot': classify all files present in each version
 - mode='diff': classify only files touched in that version
   (added + modified vs previous version; v1 uses all files)
+
+Renderers:
+- renderer='matplotlib': the full figure (CLI output)
+- renderer='pillow': tiles, labels and legend drawn straight to PNG, without importing
+  matplotlib (API requests)
+
+Rendered PNGs are cached in activity_heatmap_cache per (project, version set, mode,
+normalisation, renderer) and reused until the project gets a new version.
 """
 
 from __future__ import annotations
@@ -23,16 +31,13 @@ from src.utils.parsing import TEXT_EXTENSIONS as PARSING_TEXT_EXTENSIONS
 
 import numpy as np
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap, BoundaryNorm
-from matplotlib.patches import Patch
-
 from src.db import (
     get_project_key,
     get_file_diff_between_versions,
     get_version_keys_ordered_for_project,
+    heatmap_version_set,
+    get_cached_heatmap_png,
+    store_cached_heatmap_png,
 )
 
 from src.analysis.activity_type.code.rules import infer_activity_from_filename
@@ -44,6 +49,10 @@ from src.analysis.activity_type.text.activity_type import (
 )
 
 HeatmapMode = Literal["snapshot", "diff"]
+HeatmapRenderer = Literal["matplotlib", "pillow"]
+
+# GitHub light theme palette (0 + 4 greens)
+GITHUB_COLORS = ["#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39"]
 
 # these are common "ignore" directories that would add noise to the activity classification and are not relevant to the analysis
 EXCLUDE_DIRS_DEFAULT = {
@@ -263,6 +272,22 @@ def build_project_activity_heatmap_matrix(
     title = f"{project_name} • Activity vs Version ({mode}, {value_label})"
     return mat, y_labels, col_labels, title
 
+def _bucket_bounds(data: np.ndarray) -> List[float]:
+    """Bucket boundaries: 0 is its own bucket, the rest come from quantiles of the non-zero values."""
+    nz = data[data > 0]
+    if nz.size == 0:
+        return [0.0, 1e-9, 1.0, 2.0, 3.0, 4.0]  # arbitrary; everything will map to 0 anyway
+
+    q = np.quantile(nz, [0.25, 0.50, 0.75, 0.90])
+    bounds = [0.0, 1e-9, float(q[0]), float(q[1]), float(q[2]), float(nz.max()) + 1e-9]
+
+    # Ensure strictly increasing bounds (avoid edge cases when values are uniform)
+    for i in range(2, len(bounds)):
+        if bounds[i] <= bounds[i - 1]:
+            bounds[i] = bounds[i - 1] + 1e-9
+    return bounds
+
+
 def render_heatmap_png(
     matrix: np.ndarray,
     row_labels,
@@ -271,28 +296,19 @@ def render_heatmap_png(
     *,
     dpi: int = 180,
 ) -> bytes:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap, BoundaryNorm
+    from matplotlib.patches import Patch
+
     n_rows, n_cols = matrix.shape
 
-    # --- GitHub light theme palette (0 + 4 greens) ---
-    github_colors = ["#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39"]
+    github_colors = GITHUB_COLORS
     cmap = ListedColormap(github_colors)
 
     data = np.array(matrix, dtype=float)
-
-    # Build bucket boundaries (0 is its own bucket, rest based on quantiles of non-zero values)
-    nz = data[data > 0]
-    if nz.size == 0:
-        bounds = [0.0, 1e-9, 1.0, 2.0, 3.0, 4.0]  # arbitrary; everything will map to 0 anyway
-    else:
-        q = np.quantile(nz, [0.25, 0.50, 0.75, 0.90])
-        bounds = [0.0, 1e-9, float(q[0]), float(q[1]), float(q[2]), float(nz.max()) + 1e-9]
-
-        # Ensure strictly increasing bounds (avoid edge cases when values are uniform)
-        for i in range(2, len(bounds)):
-            if bounds[i] <= bounds[i - 1]:
-                bounds[i] = bounds[i - 1] + 1e-9
-
-    norm = BoundaryNorm(bounds, cmap.N, clip=True)
+    norm = BoundaryNorm(_bucket_bounds(data), cmap.N, clip=True)
 
     # Size tuned for tiles
     fig_w = max(6.0, min(18.0, 0.60 * n_cols + 2.5))
@@ -354,6 +370,92 @@ def render_heatmap_png(
     return buf.getvalue()
 
 
+def _load_font(size: int):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 only ships the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def render_heatmap_png_fast(
+    matrix: np.ndarray,
+    row_labels,
+    col_labels,
+    title: str,
+    *,
+    cell: int = 28,
+    gap: int = 3,
+    pad: int = 16,
+) -> bytes:
+    """
+    Same tiles, buckets and legend as render_heatmap_png, drawn directly with Pillow.
+    Much cheaper than a matplotlib figure; column labels are horizontal instead of rotated.
+    """
+    from PIL import Image, ImageDraw
+
+    data = np.array(matrix, dtype=float)
+    n_rows, n_cols = data.shape
+    bounds = np.array(_bucket_bounds(data))
+    buckets = np.clip(np.searchsorted(bounds, data, side="right") - 1, 0, len(GITHUB_COLORS) - 1)
+
+    font = _load_font(13)
+    title_font = _load_font(15)
+    measure = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+    def text_size(text: str, f) -> Tuple[int, int]:
+        left, top, right, bottom = measure.textbbox((0, 0), text, font=f)
+        return int(right - left), int(bottom - top)
+
+    row_labels = [str(label) for label in row_labels]
+    col_labels = [str(label) for label in col_labels]
+    label_w = max((text_size(label, font)[0] for label in row_labels), default=0) + 10
+    col_w = max([cell] + [text_size(label, font)[0] + 6 for label in col_labels])
+    text_h = text_size("Ag", font)[1]
+    title_w, title_h = text_size(title, title_font)
+
+    grid_x = pad + label_w
+    grid_y = pad + title_h + 12
+    grid_w = n_cols * col_w
+    grid_h = n_rows * cell
+    legend_y = grid_y + grid_h + text_h + 16
+    width = max(grid_x + grid_w, pad + title_w) + pad
+    height = legend_y + cell // 2 + pad
+
+    img = Image.new("RGB", (int(width), int(height)), "white")
+    draw = ImageDraw.Draw(img)
+    draw.text((pad, pad), title, fill="#24292f", font=title_font)
+
+    for r in range(n_rows):
+        y0 = grid_y + r * cell
+        draw.text((pad, y0 + (cell - text_h) // 2), row_labels[r], fill="#24292f", font=font)
+        for c in range(n_cols):
+            x0 = grid_x + c * col_w
+            draw.rectangle(
+                (x0 + gap // 2, y0 + gap // 2, x0 + col_w - gap, y0 + cell - gap),
+                fill=GITHUB_COLORS[int(buckets[r, c])],
+            )
+
+    for c, label in enumerate(col_labels):
+        x0 = grid_x + c * col_w
+        draw.text((x0 + (col_w - text_size(label, font)[0]) // 2, grid_y + grid_h + 6), label, fill="#24292f", font=font)
+
+    # Small "Less → More" legend (like GitHub)
+    swatch = cell // 2
+    x = grid_x
+    draw.text((x, legend_y + (swatch - text_h) // 2), "Less", fill="#57606a", font=font)
+    x += text_size("Less", font)[0] + 6
+    for color in GITHUB_COLORS:
+        draw.rectangle((x, legend_y, x + swatch, legend_y + swatch), fill=color)
+        x += swatch + 4
+    draw.text((x + 2, legend_y + (swatch - text_h) // 2), "More", fill="#57606a", font=font)
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
 def build_project_activity_heatmap_png(
     conn: sqlite3.Connection,
     user_id: int,
@@ -362,6 +464,7 @@ def build_project_activity_heatmap_png(
     mode: HeatmapMode = "diff",
     normalize: bool = True,
     include_unclassified_text: bool = True,
+    renderer: HeatmapRenderer = "matplotlib",
 ) -> bytes:
     mat, y, x, title = build_project_activity_heatmap_matrix(
         conn,
@@ -371,9 +474,50 @@ def build_project_activity_heatmap_png(
         normalize=normalize,
         include_unclassified_text=include_unclassified_text,
     )
+    if renderer == "pillow":
+        return render_heatmap_png_fast(mat, y, x, title)
     return render_heatmap_png(mat, y, x, title)
 
 
+def get_project_activity_heatmap_png(
+    conn: sqlite3.Connection,
+    user_id: int,
+    project_name: str,
+    *,
+    mode: HeatmapMode = "diff",
+    normalize: bool = True,
+    include_unclassified_text: bool = True,
+    renderer: HeatmapRenderer = "pillow",
+) -> bytes:
+    """
+    PNG bytes for the project's heatmap, from activity_heatmap_cache when it was rendered
+    from the project's current versions with the same options, otherwise rendered and stored.
+    """
+    project_key = get_project_key(conn, user_id, project_name)
+    if project_key is None:
+        raise ValueError(f"Project '{project_name}' not found")
+
+    version_pairs = get_version_keys_ordered_for_project(conn, int(project_key))
+    version_set = heatmap_version_set([vk for vk, _created_at in version_pairs])
+    key = (user_id, int(project_key), mode, normalize, include_unclassified_text, renderer)
+
+    png = get_cached_heatmap_png(conn, key, version_set)
+    if png is not None:
+        return png
+
+    png = build_project_activity_heatmap_png(
+        conn,
+        user_id,
+        project_name,
+        mode=mode,
+        normalize=normalize,
+        include_unclassified_text=include_unclassified_text,
+        renderer=renderer,
+    )
+    store_cached_heatmap_png(conn, key, version_set, png)
+    return png
+
+
 def write_project_activity_heatmap(
     conn: sqlite3.Connection,
     user_id: int,
@@ -383,6 +527,7 @@ def write_project_activity_heatmap(
     normalize: bool = True,
     include_unclassified_text: bool = True,
     out_dir: Optional[str] = None,
+    renderer: HeatmapRenderer = "matplotlib",
 ) -> str:
     project_key = get_project_key(conn, user_id, project_name)
     if project_key is None:
@@ -394,22 +539,28 @@ def write_project_activity_heatmap(
     base_dir = out_dir or os.path.join("data", "artifacts", "heatmaps")
     os.makedirs(base_dir, exist_ok=True)
 
-    fname = f"u{user_id}_p{project_key}_{_safe_slug(project_name)}_{mode}_vk{latest_vk}.png"
+    value_tag = "pct" if normalize else "count"
+    text_tag = "" if include_unclassified_text else "_classified"
+    fname = (
+        f"u{user_id}_p{project_key}_{_safe_slug(project_name)}_{mode}_{value_tag}{text_tag}"
+        f"_{renderer}_vk{latest_vk}.png"
+    )
     out_path = os.path.join(base_dir, fname)
 
     # cache: versioned filename means safe reuse
     if os.path.exists(out_path):
         return out_path
 
-    png = build_project_activity_heatmap_png(
+    png = get_project_activity_heatmap_png(
         conn,
         user_id,
         project_name,
         mode=mode,
         normalize=normalize,
         include_unclassified_text=include_unclassified_text,
+        renderer=renderer,
     )
     with open(out_path, "wb") as f:
         f.write(png)
 
-    return out_path
\ No newline at end of file
+    return out_path
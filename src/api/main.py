@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
@@ -20,12 +22,21 @@ from src.api.routes import (
     portfolio_settings_router,
 )
 from src.api.auth.routes import router as auth_router
+from src.services.analysis_jobs_service import recover_analysis_jobs, shutdown_analysis_workers
 
 from fastapi.middleware.cors import CORSMiddleware
 
 _ALLOWED_ORIGINS = ["http://localhost:5173", "http://127.0.0.1:5173"]
 
-app = FastAPI(title="Capstone API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume analysis jobs that were queued or running when the server last stopped.
+    recover_analysis_jobs()
+    yield
+    shutdown_analysis_workers(wait=False)
+
+
+app = FastAPI(title="Capstone API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
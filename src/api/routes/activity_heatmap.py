@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from sqlite3 import Connection
 
 from src.api.dependencies import get_db, get_current_user_id
 from src.api.schemas.common import ApiResponse
 from src.api.schemas.activity_heatmap import ActivityHeatmapInfoDTO, ActivityHeatmapDataDTO, HeatmapMode
 from src.services.activity_heatmap_service import (
-    get_activity_heatmap_png_path,
+    get_activity_heatmap_png_bytes,
     get_activity_heatmap_data,
     build_activity_heatmap_png_url,
 )
@@ -54,7 +54,7 @@ def get_activity_heatmap_info(
     conn: Connection = Depends(get_db),
 ):
     try:
-        project_name, _path = get_activity_heatmap_png_path(
+        project_name, _png = get_activity_heatmap_png_bytes(
             conn,
             user_id,
             project_id,
@@ -93,7 +93,7 @@ def get_activity_heatmap_png(
     conn: Connection = Depends(get_db),
 ):
     try:
-        _project_name, path = get_activity_heatmap_png_path(
+        _project_name, png = get_activity_heatmap_png_bytes(
             conn,
             user_id,
             project_id,
@@ -111,4 +111,4 @@ def get_activity_heatmap_png(
     except Exception:
         raise HTTPException(status_code=500, detail="Failed to generate heatmap")
 
-    return FileResponse(path, media_type="image/png")
\ No newline at end of file
+    return Response(content=png, media_type="image/png")
\ No newline at end of file
@@ -14,6 +14,8 @@ from src.api.schemas.uploads import (
     DedupResolveRequestDTO,
     RunAnalysisRequestDTO,
     RunAnalysisReadyDTO,
+    AnalysisJobDTO,
+    AnalysisJobListDTO,
     UploadProjectFilesDTO,
     MainFileRequestDTO,
     MainFileSectionsResponseDTO,
@@ -51,6 +53,11 @@ from src.services.uploads_service import (
     _resolve_project_key_to_name,
 )
 from src.services.uploads_run_service import run_analysis_preflight
+from src.services.analysis_jobs_service import (
+    get_analysis_job_for_upload,
+    list_analysis_jobs,
+    cancel_analysis_job,
+)
 from src.api.schemas.uploads import SupportingFilesRequestDTO
 from src.services.uploads_supporting_contributions_service import (
     set_project_supporting_text_files,
@@ -152,6 +159,40 @@ def post_upload_run_preflight(
     return ApiResponse(success=True, data=RunAnalysisReadyDTO(**data), error=None)
 
 
+@router.get("/upload/{upload_id}/jobs", response_model=ApiResponse[AnalysisJobListDTO])
+def get_upload_analysis_jobs(
+    upload_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    user_id: int = Depends(get_current_user_id),
+    conn: Connection = Depends(get_db),
+):
+    jobs = list_analysis_jobs(conn, user_id, upload_id, limit=limit)
+    dto = AnalysisJobListDTO(jobs=[AnalysisJobDTO(**job) for job in jobs])
+    return ApiResponse(success=True, data=dto, error=None)
+
+
+@router.get("/upload/{upload_id}/jobs/{job_id}", response_model=ApiResponse[AnalysisJobDTO])
+def get_upload_analysis_job(
+    upload_id: int,
+    job_id: int,
+    user_id: int = Depends(get_current_user_id),
+    conn: Connection = Depends(get_db),
+):
+    job = get_analysis_job_for_upload(conn, user_id, upload_id, job_id)
+    return ApiResponse(success=True, data=AnalysisJobDTO(**job), error=None)
+
+
+@router.post("/upload/{upload_id}/jobs/{job_id}/cancel", response_model=ApiResponse[AnalysisJobDTO])
+def post_upload_analysis_job_cancel(
+    upload_id: int,
+    job_id: int,
+    user_id: int = Depends(get_current_user_id),
+    conn: Connection = Depends(get_db),
+):
+    job = cancel_analysis_job(conn, user_id, upload_id, job_id)
+    return ApiResponse(success=True, data=AnalysisJobDTO(**job), error=None)
+
+
 @router.post("/upload/{upload_id}/dedup/resolve", response_model=ApiResponse[UploadDTO])
 def post_upload_dedup_resolve(
     upload_id: int,
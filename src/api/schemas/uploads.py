@@ -92,7 +92,7 @@ class ContributedSectionsRequestDTO(BaseModel):
 
 
 RunScope = Literal["all", "individual", "collaborative"]
-RunMode = Literal["run", "check"]
+RunMode = Literal["run", "check", "queue"]
 
 
 class RunAnalysisRequestDTO(BaseModel):
@@ -107,6 +107,32 @@ class RunAnalysisReadyDTO(BaseModel):
     ready: bool = True
     warnings: List[Dict[str, Any]] = []
     errors: List[Dict[str, Any]] = []
+    job_id: Optional[int] = None  # set when mode="queue"
+
+
+AnalysisJobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class AnalysisJobDTO(BaseModel):
+    job_id: int
+    upload_id: int
+    scope: RunScope
+    status: AnalysisJobStatus
+    attempts: int = 0
+    max_attempts: int = 1
+    cancel_requested: bool = False
+    progress_done: int = 0
+    progress_total: int = 0
+    current_project: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class AnalysisJobListDTO(BaseModel):
+    jobs: List[AnalysisJobDTO]
 class ManualProjectSummaryRequestDTO(BaseModel):
     summary_text: str = ""
 
@@ -77,6 +77,30 @@ from .code_metrics import (
     insert_code_complexity_metrics,
     update_code_complexity_metrics,
     get_code_complexity_metrics,
+    get_cached_file_complexity,
+    store_cached_file_complexity,
+)
+# LLM response cache
+from .llm_cache import (
+    get_cached_llm_response,
+    store_cached_llm_response,
+    clear_llm_response_cache,
+)
+from .extracted_text_cache import (
+    get_cached_extracted_text,
+    store_cached_extracted_text,
+    clear_extracted_text_cache,
+)
+from .heatmap_cache import (
+    heatmap_version_set,
+    get_cached_heatmap_png,
+    store_cached_heatmap_png,
+    invalidate_heatmap_cache,
+)
+# GitHub REST conditional-request cache
+from .github_http_cache import (
+    get_github_http_cache,
+    store_github_http_cache,
 )
 # Code metrics helpers (data extraction/transformation)
 from .code_metrics_helpers import (
@@ -87,6 +111,7 @@ from .code_metrics_helpers import (
 from .contributions import (
     store_text_contribution_revision,
     store_text_contribution_summary,
+    get_text_contribution_revision_words,
 )
 
 # Token operations
@@ -167,6 +192,9 @@ from .project_summaries import (
     get_project_summary_by_name,
     get_all_projects_with_dates,
     get_all_user_project_summaries,
+    get_unscored_project_summaries,
+    store_project_rank_scores,
+    get_project_ranking_rows,
     set_project_dates,
     get_project_dates,
     clear_project_dates,
@@ -182,6 +210,8 @@ from .code_collaborative import (
     get_code_collaborative_metrics,
     get_metrics_id,
     insert_code_collaborative_summary,
+    get_code_collaborative_checkpoint,
+    store_code_collaborative_checkpoint,
 )
 
 # resume snapshots
@@ -201,7 +231,9 @@ from .git_individual_metrics import (
     git_individual_metrics_exists,
     insert_git_individual_metrics,
     update_git_individual_metrics,
-    get_git_individual_metrics
+    get_git_individual_metrics,
+    get_git_individual_checkpoint,
+    store_git_individual_checkpoint,
 )
 
 # git metrics helpers (data extraction/transformation)
@@ -215,6 +247,7 @@ from .portfolio import (
     get_code_collaborative_non_llm_summary,
     get_text_duration,
     get_code_individual_duration,
+    load_portfolio_projects,
 )
 
 # deduplication
@@ -227,6 +260,12 @@ from .deduplication import (
     insert_project,
     insert_project_version,
     insert_version_files,
+    index_version_minhash,
+    get_version_minhash,
+    find_lsh_candidate_versions,
+    find_versions_sharing_files,
+    get_cached_content_hashes,
+    store_cached_content_hashes,
     _lookup_existing_name
 )
 
@@ -248,6 +287,13 @@ from .uploads import (
     mark_upload_failed,
     delete_upload,
 )
+# analysis jobs (background upload runs)
+from .analysis_jobs import (
+    create_analysis_job,
+    get_analysis_job,
+    list_analysis_jobs_for_upload,
+    get_active_job_for_upload,
+)
 from .project_thumbnails import (
     upsert_project_thumbnail,
     get_project_thumbnail_path,
@@ -311,9 +357,24 @@ __all__ = [
     "insert_code_complexity_metrics",
     "update_code_complexity_metrics",
     "get_code_complexity_metrics",
+    "get_cached_file_complexity",
+    "store_cached_file_complexity",
+    "get_cached_llm_response",
+    "store_cached_llm_response",
+    "clear_llm_response_cache",
+    "get_cached_extracted_text",
+    "store_cached_extracted_text",
+    "clear_extracted_text_cache",
+    "heatmap_version_set",
+    "get_cached_heatmap_png",
+    "store_cached_heatmap_png",
+    "invalidate_heatmap_cache",
+    "get_github_http_cache",
+    "store_github_http_cache",
     "extract_complexity_metrics",
     "store_text_contribution_revision",
     "store_text_contribution_summary",
+    "get_text_contribution_revision_words",
     "save_token_placeholder",
     "insert_project_skill",
     "get_project_skills",
@@ -346,17 +407,25 @@ __all__ = [
     "get_code_collaborative_metrics",
     "get_metrics_id",
     "insert_code_collaborative_summary",
+    "get_code_collaborative_checkpoint",
+    "store_code_collaborative_checkpoint",
     "get_all_user_project_summaries",
+    "get_unscored_project_summaries",
+    "store_project_rank_scores",
+    "get_project_ranking_rows",
     "get_project_summary_row",
     "get_code_activity_percentages",
     "get_code_collaborative_duration",
     "get_code_collaborative_non_llm_summary",
     "get_text_duration",
     "get_code_individual_duration",
+    "load_portfolio_projects",
     "git_individual_metrics_exists",
     "insert_git_individual_metrics",
     "update_git_individual_metrics",
     "get_git_individual_metrics",
+    "get_git_individual_checkpoint",
+    "store_git_individual_checkpoint",
     "extract_git_metrics",
     "set_project_dates",
     "get_project_dates",
@@ -371,6 +440,12 @@ __all__ = [
     "insert_project",
     "insert_project_version",
     "insert_version_files",
+    "index_version_minhash",
+    "get_version_minhash",
+    "find_lsh_candidate_versions",
+    "find_versions_sharing_files",
+    "get_cached_content_hashes",
+    "store_cached_content_hashes",
     "get_project_rank",
     "get_all_project_ranks",
     "get_user_by_id",
@@ -390,6 +465,10 @@ __all__ = [
     "patch_upload_state",
     "mark_upload_failed",
     "delete_upload",
+    "create_analysis_job",
+    "get_analysis_job",
+    "list_analysis_jobs_for_upload",
+    "get_active_job_for_upload",
     "upsert_project_thumbnail",
     "get_project_thumbnail_path",
     "delete_project_thumbnail",
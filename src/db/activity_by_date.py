@@ -4,33 +4,103 @@ src/db/activity_by_date.py
 Aggregates activity counts by date for the GitHub-style contribution heatmap.
 Uses project date ranges (start_date to end_date): for each day in a project's
 range, that project counts toward that day. More projects overlapping a day = darker green.
+
+Project ranges are kept as intervals of day numbers. Counts for a window of days come
+from a difference array (+1 at each start, -1 after each end) and its prefix sum, and
+the projects active on a day are only worked out for the days that are asked for, so
+the cost follows the window being shown, not how many days the projects span.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Set
-from collections import defaultdict
+from __future__ import annotations
 
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set
 
-def get_activity_counts_by_date(
+import numpy as np
+
+
+def _day(value: date | str) -> np.datetime64:
+    return np.datetime64(value if isinstance(value, date) else value[:10], "D")
+
+
+class ActivityByDate:
+    """Project date intervals for one user, queried by day window."""
+
+    def __init__(self, names: List[str], starts: np.ndarray, ends: np.ndarray):
+        order = np.array(sorted(range(len(names)), key=lambda i: names[i]), dtype=np.intp)
+        self.names = [names[i] for i in order]
+        self.starts = starts[order]
+        self.ends = ends[order]
+
+    def __bool__(self) -> bool:
+        return len(self.names) > 0
+
+    @property
+    def first_day(self) -> Optional[date]:
+        """Earliest day any project is active, or None without projects."""
+        return self.starts.min().astype(date) if self else None
+
+    @property
+    def years(self) -> List[int]:
+        """Calendar years in which at least one project is active."""
+        start_years = self.starts.astype("datetime64[Y]").astype(int) + 1970
+        end_years = self.ends.astype("datetime64[Y]").astype(int) + 1970
+        years: Set[int] = set()
+        for first, last in zip(start_years.tolist(), end_years.tolist()):
+            years.update(range(first, last + 1))
+        return sorted(years)
+
+    def counts_between(self, start: date | str, end: date | str) -> np.ndarray:
+        """Number of active projects on each day from start to end (inclusive)."""
+        origin = _day(start)
+        length = int((_day(end) - origin).astype(int)) + 1
+        if length <= 0:
+            return np.zeros(0, dtype=np.int64)
+        first = (self.starts - origin).astype(np.int64)
+        last = (self.ends - origin).astype(np.int64)
+        visible = (last >= 0) & (first < length)
+        diff = np.zeros(length + 1, dtype=np.int64)
+        np.add.at(diff, np.clip(first[visible], 0, None), 1)
+        np.add.at(diff, np.clip(last[visible] + 1, None, length), -1)
+        return np.cumsum(diff[:-1])
+
+    def projects_on(self, day: date | str) -> List[str]:
+        """Names of the projects active on a day, sorted."""
+        d = _day(day)
+        active = np.flatnonzero((self.starts <= d) & (self.ends >= d))
+        return [self.names[i] for i in active]
+
+    def projects_between(self, start: date | str, end: date | str) -> Dict[str, List[str]]:
+        """date (YYYY-MM-DD) -> sorted names of active projects, for active days from start to end."""
+        origin = _day(start)
+        days = origin + np.flatnonzero(self.counts_between(start, end))
+        if not len(days):
+            return {}
+        active = (self.starts[:, None] <= days) & (self.ends[:, None] >= days)
+        return {
+            str(day): [self.names[i] for i in np.flatnonzero(active[:, col])]
+            for col, day in enumerate(days)
+        }
+
+
+def load_activity_by_date(
     conn,
     user_id: int,
     project_ids: Optional[Set[int]] = None,
-) -> tuple[Dict[str, int], Dict[str, list[str]]]:
+) -> ActivityByDate:
     """
-    Returns (counts, projects_by_date).
-    counts: date (YYYY-MM-DD) -> count of projects active that day.
-    projects_by_date: date -> list of project names active that day.
-    A project is "active" on a day if that day falls between its start_date and end_date.
-    If project_ids is provided, only those projects are included.
+    Load the date intervals of a user's projects (only those in project_ids if given).
+    Projects without both dates, with unparseable dates, or ending before they start are left out.
     """
     from src.services.project_dates_service import list_project_dates
 
-    projects_by_date: Dict[str, set] = defaultdict(set)
-
     items = list_project_dates(conn, user_id)
     if project_ids is not None:
         items = [item for item in items if item.project_summary_id in project_ids]
 
+    names: List[str] = []
+    starts: List[date] = []
+    ends: List[date] = []
     for item in items:
         start = item.start_date
         end = item.end_date
@@ -46,13 +116,34 @@ def get_activity_counts_by_date(
         if start_dt > end_dt:
             continue
 
-        # Add this project to every day in its range
-        d = start_dt
-        while d <= end_dt:
-            key = d.strftime("%Y-%m-%d")
-            projects_by_date[key].add(item.project_name)
-            d += timedelta(days=1)
+        names.append(item.project_name)
+        starts.append(start_dt)
+        ends.append(end_dt)
+
+    return ActivityByDate(
+        names,
+        np.array(starts, dtype="datetime64[D]"),
+        np.array(ends, dtype="datetime64[D]"),
+    )
+
 
+def get_activity_counts_by_date(
+    conn,
+    user_id: int,
+    project_ids: Optional[Set[int]] = None,
+) -> tuple[Dict[str, int], Dict[str, list[str]]]:
+    """
+    Returns (counts, projects_by_date) for every day any project is active.
+    counts: date (YYYY-MM-DD) -> count of projects active that day.
+    projects_by_date: date -> list of project names active that day.
+    A project is "active" on a day if that day falls between its start_date and end_date.
+    If project_ids is provided, only those projects are included.
+
+    Materialises the whole span; the heatmap grid uses load_activity_by_date instead.
+    """
+    activity = load_activity_by_date(conn, user_id, project_ids=project_ids)
+    if not activity:
+        return {}, {}
+    projects_by_date = activity.projects_between(activity.first_day, activity.ends.max().astype(date))
     counts = {d: len(projs) for d, projs in projects_by_date.items()}
-    projects_dict = {d: sorted(projs) for d, projs in projects_by_date.items()}
-    return counts, projects_dict
+    return counts, projects_by_date
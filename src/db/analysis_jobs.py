@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+# Keep statuses aligned with the CHECK constraint on analysis_jobs in tables.sql
+JOB_STATUSES = {"queued", "running", "succeeded", "failed", "cancelled"}
+ACTIVE_JOB_STATUSES = {"queued", "running"}
+
+_JOB_COLUMNS = """
+    job_id, user_id, upload_id, scope, force_rerun, status, attempts, max_attempts,
+    cancel_requested, progress_done, progress_total, current_project, result_json,
+    error, created_at, started_at, finished_at, updated_at
+"""
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _row_to_job(row) -> Dict[str, Any]:
+    result = None
+    if row[12]:
+        try:
+            result = json.loads(row[12])
+        except json.JSONDecodeError:
+            result = None
+
+    return {
+        "job_id": row[0],
+        "user_id": row[1],
+        "upload_id": row[2],
+        "scope": row[3],
+        "force_rerun": bool(row[4]),
+        "status": row[5],
+        "attempts": row[6],
+        "max_attempts": row[7],
+        "cancel_requested": bool(row[8]),
+        "progress_done": row[9],
+        "progress_total": row[10],
+        "current_project": row[11],
+        "result": result,
+        "error": row[13],
+        "created_at": row[14],
+        "started_at": row[15],
+        "finished_at": row[16],
+        "updated_at": row[17],
+    }
+
+
+def create_analysis_job(
+    conn: sqlite3.Connection,
+    user_id: int,
+    upload_id: int,
+    scope: str,
+    *,
+    force_rerun: bool = False,
+    max_attempts: int = 1,
+) -> int:
+    """
+    Insert a queued job row and return job_id.
+    """
+    now = _utc_now_iso()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO analysis_jobs (
+            user_id, upload_id, scope, force_rerun, status, max_attempts, created_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)
+        """,
+        (user_id, upload_id, scope, int(bool(force_rerun)), max(1, int(max_attempts)), now, now),
+    )
+    conn.commit()
+    return int(cur.lastrowid)
+
+
+def get_analysis_job(conn: sqlite3.Connection, job_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Return a job row as a dict (result_json parsed), or None if not found.
+    """
+    row = conn.execute(
+        f"SELECT {_JOB_COLUMNS} FROM analysis_jobs WHERE job_id = ?",
+        (job_id,),
+    ).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def list_analysis_jobs_for_upload(
+    conn: sqlite3.Connection,
+    upload_id: int,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """
+    List jobs for an upload, most recent first.
+    """
+    rows = conn.execute(
+        f"""
+        SELECT {_JOB_COLUMNS}
+        FROM analysis_jobs
+        WHERE upload_id = ?
+        ORDER BY job_id DESC
+        LIMIT ?
+        """,
+        (upload_id, limit),
+    ).fetchall()
+    return [_row_to_job(r) for r in rows]
+
+
+def get_active_job_for_upload(conn: sqlite3.Connection, upload_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Return the queued/running job for an upload, if any.
+    """
+    row = conn.execute(
+        f"""
+        SELECT {_JOB_COLUMNS}
+        FROM analysis_jobs
+        WHERE upload_id = ? AND status IN ('queued', 'running')
+        ORDER BY job_id DESC
+        LIMIT 1
+        """,
+        (upload_id,),
+    ).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def list_job_ids_by_status(conn: sqlite3.Connection, statuses: set[str]) -> List[int]:
+    """
+    Return job ids in the given statuses, oldest first.
+    """
+    if not statuses:
+        return []
+    placeholders = ",".join("?" * len(statuses))
+    rows = conn.execute(
+        f"SELECT job_id FROM analysis_jobs WHERE status IN ({placeholders}) ORDER BY job_id ASC",
+        tuple(sorted(statuses)),
+    ).fetchall()
+    return [int(r[0]) for r in rows]
+
+
+def claim_analysis_job(conn: sqlite3.Connection, job_id: int) -> bool:
+    """
+    Atomically move a queued job to running and bump its attempt counter.
+    Returns False if another worker already claimed it or it was cancelled.
+    """
+    now = _utc_now_iso()
+    cur = conn.execute(
+        """
+        UPDATE analysis_jobs
+        SET status = 'running',
+            attempts = attempts + 1,
+            started_at = COALESCE(started_at, ?),
+            error = NULL,
+            updated_at = ?
+        WHERE job_id = ? AND status = 'queued' AND cancel_requested = 0
+        """,
+        (now, now, job_id),
+    )
+    conn.commit()
+    return cur.rowcount == 1
+
+
+def update_analysis_job_progress(
+    conn: sqlite3.Connection,
+    job_id: int,
+    *,
+    done: int,
+    total: int,
+    current_project: Optional[str] = None,
+) -> None:
+    conn.execute(
+        """
+        UPDATE analysis_jobs
+        SET progress_done = ?, progress_total = ?, current_project = ?, updated_at = ?
+        WHERE job_id = ?
+        """,
+        (done, total, current_project, _utc_now_iso(), job_id),
+    )
+    conn.commit()
+
+
+def requeue_analysis_job(conn: sqlite3.Connection, job_id: int, error: Optional[str] = None) -> None:
+    """
+    Put a running job back in the queue (retry after a failed attempt, or recovery after restart).
+    """
+    conn.execute(
+        """
+        UPDATE analysis_jobs
+        SET status = 'queued', error = ?, current_project = NULL, updated_at = ?
+        WHERE job_id = ? AND status IN ('queued', 'running')
+        """,
+        (error, _utc_now_iso(), job_id),
+    )
+    conn.commit()
+
+
+def finish_analysis_job(
+    conn: sqlite3.Connection,
+    job_id: int,
+    status: str,
+    *,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Move a job to a terminal status (succeeded / failed / cancelled).
+    """
+    if status not in JOB_STATUSES - ACTIVE_JOB_STATUSES:
+        raise ValueError(f"Invalid terminal job status: {status}")
+
+    now = _utc_now_iso()
+    conn.execute(
+        """
+        UPDATE analysis_jobs
+        SET status = ?, result_json = ?, error = ?, current_project = NULL,
+            finished_at = ?, updated_at = ?
+        WHERE job_id = ?
+        """,
+        (
+            status,
+            json.dumps(result, ensure_ascii=False) if result is not None else None,
+            error,
+            now,
+            now,
+            job_id,
+        ),
+    )
+    conn.commit()
+
+
+def request_analysis_job_cancel(conn: sqlite3.Connection, job_id: int) -> Optional[str]:
+    """
+    Flag a job for cancellation.
+    Queued jobs are cancelled immediately; running jobs stop at the next project boundary.
+    Returns the job status after the request, or None if the job does not exist.
+    """
+    now = _utc_now_iso()
+    conn.execute(
+        """
+        UPDATE analysis_jobs
+        SET status = 'cancelled', cancel_requested = 1, finished_at = ?, updated_at = ?
+        WHERE job_id = ? AND status = 'queued'
+        """,
+        (now, now, job_id),
+    )
+    conn.execute(
+        """
+        UPDATE analysis_jobs
+        SET cancel_requested = 1, updated_at = ?
+        WHERE job_id = ? AND status = 'running'
+        """,
+        (now, job_id),
+    )
+    conn.commit()
+
+    row = conn.execute("SELECT status FROM analysis_jobs WHERE job_id = ?", (job_id,)).fetchone()
+    return row[0] if row else None
+
+
+def is_analysis_job_cancel_requested(conn: sqlite3.Connection, job_id: int) -> bool:
+    row = conn.execute(
+        "SELECT cancel_requested FROM analysis_jobs WHERE job_id = ?",
+        (job_id,),
+    ).fetchone()
+    return bool(row and row[0])
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import json
 import sqlite3
 from typing import Any, Mapping, Optional
 
@@ -155,6 +156,59 @@ def get_metrics_id(
     return row[0] if row else None
 
 
+def get_code_collaborative_checkpoint(
+    conn: sqlite3.Connection,
+    user_id: int,
+    project_name: str,
+) -> Optional[tuple[str, dict]]:
+    """
+    Return (last_commit_sha, history_state) stored with the collaborative metrics,
+    or None if there is no row or no usable resume point.
+    """
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        return None
+    row = conn.execute(
+        """
+        SELECT last_commit_sha, history_state_json
+        FROM code_collaborative_metrics
+        WHERE user_id = ? AND project_key = ?
+        """,
+        (user_id, pk),
+    ).fetchone()
+    if not row or not row[0] or not row[1]:
+        return None
+    try:
+        return row[0], json.loads(row[1])
+    except (TypeError, ValueError):
+        return None
+
+
+def store_code_collaborative_checkpoint(
+    conn: sqlite3.Connection,
+    user_id: int,
+    project_name: str,
+    last_commit_sha: str,
+    history_state: Mapping[str, Any],
+) -> None:
+    """
+    Record the HEAD commit the stored metrics were computed at, plus the history
+    state needed to fold later commits into them. The metrics row must already exist.
+    """
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        return
+    conn.execute(
+        """
+        UPDATE code_collaborative_metrics
+        SET last_commit_sha = ?, history_state_json = ?
+        WHERE user_id = ? AND project_key = ?
+        """,
+        (last_commit_sha, json.dumps(history_state), user_id, pk),
+    )
+    conn.commit()
+
+
 def insert_code_collaborative_summary(
     conn: sqlite3.Connection,
     metrics_id: int,
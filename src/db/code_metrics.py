@@ -1,6 +1,9 @@
 import sqlite3
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Tuple
+
+# Keys per SELECT when looking up cached file complexity (stays well under SQLite's variable limit).
+_CACHE_LOOKUP_BATCH = 300
 
 
 def update_code_complexity_metrics(
@@ -183,3 +186,62 @@ def code_complexity_metrics_exists(
         (version_key,),
     ).fetchone()
     return result is not None
+
+
+def get_cached_file_complexity(
+    conn: sqlite3.Connection,
+    keys: Iterable[Tuple[str, str]],
+    analyzer: str,
+) -> Dict[Tuple[str, str], Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """
+    Look up file_complexity_cache rows for (content_hash, extension) keys produced by `analyzer`.
+    Returns {key: (radon_result, lizard_result)} for the keys that are cached.
+    """
+    keys = list(dict.fromkeys(keys))
+    found: Dict[Tuple[str, str], Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+    try:
+        for start in range(0, len(keys), _CACHE_LOOKUP_BATCH):
+            batch = keys[start:start + _CACHE_LOOKUP_BATCH]
+            placeholders = ", ".join("(?, ?)" for _ in batch)
+            rows = conn.execute(
+                f"""
+                SELECT content_hash, extension, radon_json, lizard_json
+                FROM file_complexity_cache
+                WHERE analyzer = ? AND (content_hash, extension) IN (VALUES {placeholders})
+                """,
+                [analyzer, *(v for key in batch for v in key)],
+            ).fetchall()
+            for r in rows:
+                found[(r[0], r[1])] = (
+                    json.loads(r[2]) if r[2] else None,
+                    json.loads(r[3]) if r[3] else None,
+                )
+    except sqlite3.OperationalError:
+        # Schema not initialised (e.g. a bare connection): behave as an empty cache.
+        return {}
+    return found
+
+
+def store_cached_file_complexity(
+    conn: sqlite3.Connection,
+    entries: Iterable[Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+    analyzer: str,
+) -> None:
+    """Insert (content_hash, extension, radon_result, lizard_result) rows into file_complexity_cache."""
+    rows = [
+        (content_hash, ext, analyzer, json.dumps(radon) if radon else None, json.dumps(lizard) if lizard else None)
+        for content_hash, ext, radon, lizard in entries
+    ]
+    if not rows:
+        return
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO file_complexity_cache (content_hash, extension, analyzer, radon_json, lizard_json)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+    except sqlite3.OperationalError:
+        pass
@@ -14,14 +14,24 @@ import os
 
 DEFAULT_DB = Path(os.getenv("APP_DB_PATH", "local_storage.db"))
 
-def connect(db_path: str | Path | None = None) -> sqlite3.Connection:
+def connect(
+    db_path: str | Path | None = None,
+    *,
+    timeout: float = 5.0,
+    factory: type[sqlite3.Connection] = sqlite3.Connection,
+) -> sqlite3.Connection:
+    """
+    Open a connection to the app database.
+    `timeout` is how long a writer waits for another connection's write lock before failing;
+    `factory` is the sqlite3.Connection subclass to open.
+    """
     target = str(db_path) if db_path is not None else os.getenv("APP_DB_PATH", "local_storage.db")
     if target != ":memory:":
         Path(target).parent.mkdir(parents=True, exist_ok=True)
 
     # FastAPI may finalize sync generator dependencies in a different worker thread.
     # Allow the same connection object to be used across threads for request lifetime.
-    conn = sqlite3.connect(target, check_same_thread=False)
+    conn = sqlite3.connect(target, check_same_thread=False, timeout=timeout, factory=factory)
     conn.execute("PRAGMA foreign_keys=ON;")
     if target != ":memory:":
         conn.execute("PRAGMA journal_mode=WAL;")
@@ -82,6 +92,22 @@ def init_schema(conn: sqlite3.Connection) -> None:
     # Legacy migration: ensure version_key exists on files (schema now has version_key, no project_name)
     _ensure_column(conn, "files", "version_key", "INTEGER")
 
+    # Incremental git analysis: resume point stored with the metrics
+    for table in ("git_individual_metrics", "code_collaborative_metrics"):
+        _ensure_column(conn, table, "last_commit_sha", "TEXT")
+        _ensure_column(conn, table, "history_state_json", "TEXT")
+
+    # Materialised project ranking scores (recomputed after summary writes)
+    _ensure_column(conn, "project_summaries", "rank_score", "REAL")
+    _ensure_column(conn, "project_summaries", "rank_score_version", "INTEGER")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_project_summaries_rank "
+        "ON project_summaries (user_id, rank_score DESC)"
+    )
+
+    # LRU eviction of cached GitHub responses
+    _ensure_column(conn, "github_http_cache", "last_used_at", "REAL")
+
     # Store extraction folder name for legacy versions (no upload_id linkage)
     _backfill_extraction_root(conn)
 
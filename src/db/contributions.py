@@ -32,6 +32,18 @@ def store_text_contribution_revision(conn: sqlite3.Connection, revision: Dict[st
     conn.commit()
 
 
+def get_text_contribution_revision_words(conn: sqlite3.Connection, user_id: int, drive_file_id: str) -> Dict[str, int]:
+    """
+    Return {revision_id: words_added} for the revisions already stored for a Drive file.
+    """
+    rows = conn.execute("""
+        SELECT revision_id, words_added
+        FROM text_contribution_revisions
+        WHERE user_id = ? AND drive_file_id = ?
+    """, (user_id, drive_file_id)).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
 def store_text_contribution_summary(conn: sqlite3.Connection, summary: Dict[str, Any]) -> None:
     """
     Store or update a text contribution summary record.
@@ -1,5 +1,14 @@
 import sqlite3
 
+import numpy as np
+
+from src.utils.deduplication.minhash import lsh_band_keys, minhash_signature, version_tokens
+
+from .heatmap_cache import invalidate_heatmap_cache
+
+# Values bound per IN (...) query; keeps each statement well under SQLite's bound-parameter limit.
+_SQL_BATCH = 200
+
 def find_existing_version_by_strict_fp(
     conn,
     user_id: int,
@@ -123,6 +132,8 @@ def insert_project_version(
         """,
         (project_key, upload_id, fingerprint_strict, fingerprint_loose),
     )
+    # Heatmaps rendered from the previous version set are stale now
+    invalidate_heatmap_cache(conn, project_key)
     return int(cur.lastrowid)
 
 # Insert all (relpath, file_hash) pairs for a version.
@@ -138,10 +149,163 @@ def insert_version_files(
         """,
         [(version_key, rel, h) for (rel, h) in entries],
     )
-    
+    if _has_lsh_index(conn):
+        index_version_minhash(conn, version_key, entries)
+
+
 def _lookup_existing_name(conn: sqlite3.Connection, project_key: int) -> str | None:
     row = conn.execute(
         "SELECT display_name FROM projects WHERE project_key = ?",
         (project_key,),
     ).fetchone()
     return row[0] if row else None
+
+
+# near-duplicate index (MinHash + LSH bands)
+
+def _has_lsh_index(conn) -> bool:
+    """False on connections whose schema predates the LSH tables (callers then compare exhaustively)."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'version_lsh_bands'"
+    ).fetchone()
+    return row is not None
+
+def index_version_minhash(conn, version_key: int, entries: list[tuple[str, str]] | None = None) -> None:
+    """Store the MinHash signature and LSH bands for a version (entries default to its version_files rows)."""
+    if entries is None:
+        entries = conn.execute(
+            "SELECT relpath, file_hash FROM version_files WHERE version_key = ?",
+            (version_key,),
+        ).fetchall()
+    signature = minhash_signature(version_tokens(entries))
+    conn.execute(
+        "INSERT OR REPLACE INTO version_minhash(version_key, signature) VALUES (?, ?)",
+        (version_key, signature.tobytes()),
+    )
+    conn.execute("DELETE FROM version_lsh_bands WHERE version_key = ?", (version_key,))
+    conn.executemany(
+        "INSERT INTO version_lsh_bands(band, bucket, version_key) VALUES (?, ?, ?)",
+        [(band, bucket, version_key) for band, bucket in lsh_band_keys(signature)],
+    )
+
+def get_version_minhash(conn, version_key: int):
+    row = conn.execute(
+        "SELECT signature FROM version_minhash WHERE version_key = ?",
+        (version_key,),
+    ).fetchone()
+    return np.frombuffer(row[0], dtype=np.uint64) if row else None
+
+def find_lsh_candidate_versions(conn, entries: list[tuple[str, str]], version_keys) -> set[int] | None:
+    """
+    Return the subset of `version_keys` sharing at least one LSH band with `entries`.
+    Versions indexed before the LSH tables existed are indexed on the way.
+    Returns None when this database has no LSH index, meaning "compare against everything".
+    """
+    if not _has_lsh_index(conn):
+        return None
+    version_keys = {int(vk) for vk in version_keys}
+    if not version_keys:
+        return set()
+
+    keys = sorted(version_keys)
+    indexed: set[int] = set()
+    for start in range(0, len(keys), _SQL_BATCH):
+        batch = keys[start:start + _SQL_BATCH]
+        rows = conn.execute(
+            f"SELECT version_key FROM version_minhash WHERE version_key IN ({', '.join('?' * len(batch))})",
+            batch,
+        ).fetchall()
+        indexed.update(r[0] for r in rows)
+    missing = version_keys - indexed
+    if missing:
+        with conn:
+            for vk in sorted(missing):
+                index_version_minhash(conn, vk)
+
+    band_keys = lsh_band_keys(minhash_signature(version_tokens(entries)))
+    band_values = [v for key in band_keys for v in key]
+    band_placeholders = ", ".join("(?, ?)" for _ in band_keys)
+    found: set[int] = set()
+    for start in range(0, len(keys), _SQL_BATCH):
+        batch = keys[start:start + _SQL_BATCH]
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT version_key
+            FROM version_lsh_bands
+            WHERE (band, bucket) IN (VALUES {band_placeholders})
+              AND version_key IN ({', '.join('?' * len(batch))})
+            """,
+            band_values + batch,
+        ).fetchall()
+        found.update(r[0] for r in rows)
+    return found
+
+def find_versions_sharing_files(conn, entries: list[tuple[str, str]], version_keys) -> set[int]:
+    """Versions in `version_keys` with at least one identical relpath or file hash (exact, for small uploads)."""
+    keys = sorted({int(vk) for vk in version_keys})
+    found: set[int] = set()
+    for column, values in (("relpath", {rel for rel, _ in entries}), ("file_hash", {h for _, h in entries})):
+        values = sorted(values)
+        for start in range(0, len(values), _SQL_BATCH):
+            batch = values[start:start + _SQL_BATCH]
+            for key_start in range(0, len(keys), _SQL_BATCH):
+                # Versions already found need not match again
+                key_batch = [vk for vk in keys[key_start:key_start + _SQL_BATCH] if vk not in found]
+                if not key_batch:
+                    continue
+                rows = conn.execute(
+                    f"""
+                    SELECT DISTINCT version_key FROM version_files
+                    WHERE {column} IN ({', '.join('?' * len(batch))})
+                      AND version_key IN ({', '.join('?' * len(key_batch))})
+                    """,
+                    batch + key_batch,
+                ).fetchall()
+                found.update(r[0] for r in rows)
+    return found
+
+
+
+def get_cached_content_hashes(conn, keys) -> dict[tuple, str]:
+    """
+    Look up file_hash_cache rows for (size_bytes, modified, crc32, normalized) keys.
+    Returns {key: content_hash} for the keys that are cached.
+    """
+    keys = list(dict.fromkeys(keys))
+    found: dict[tuple, str] = {}
+    try:
+        for start in range(0, len(keys), _SQL_BATCH):
+            batch = keys[start:start + _SQL_BATCH]
+            placeholders = ", ".join("(?, ?, ?, ?)" for _ in batch)
+            rows = conn.execute(
+                f"""
+                SELECT size_bytes, modified, crc32, normalized, content_hash
+                FROM file_hash_cache
+                WHERE (size_bytes, modified, crc32, normalized) IN (VALUES {placeholders})
+                """,
+                [v for key in batch for v in key],
+            ).fetchall()
+            for r in rows:
+                found[(r[0], r[1], r[2], r[3])] = r[4]
+    except sqlite3.OperationalError:
+        # Schema not initialised (e.g. a bare connection): behave as an empty cache.
+        return {}
+    return found
+
+
+def store_cached_content_hashes(conn, entries) -> None:
+    """Insert (size_bytes, modified, crc32, normalized, content_hash) rows into file_hash_cache."""
+    entries = list(entries)
+    if not entries:
+        return
+    try:
+        with conn:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO file_hash_cache (size_bytes, modified, crc32, normalized, content_hash)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                entries,
+            )
+    except sqlite3.OperationalError:
+        pass
@@ -13,7 +13,7 @@ def delete_project_everywhere(
 
     This removes:
       - dedup registry (projects, project_versions, version_files), which cascades into version_key-keyed metric tables
-      - project_summaries, project_skills, project_feedback, project_rankings, thumbnails
+      - project_summaries, project_skills, project_feedback, project_rankings, thumbnails, cached heatmaps
       - files/config_files
       - per-project activity metrics
       - GitHub + Drive + code contribution tables
@@ -67,6 +67,10 @@ def delete_project_everywhere(
                 "DELETE FROM project_thumbnails WHERE user_id = ? AND project_key = ?",
                 (user_id, pk),
             )
+            cur.execute(
+                "DELETE FROM activity_heatmap_cache WHERE user_id = ? AND project_key = ?",
+                (user_id, pk),
+            )
             cur.execute(
                 "DELETE FROM config_files WHERE user_id = ? AND project_key = ?",
                 (user_id, pk),
@@ -135,6 +139,14 @@ def delete_project_everywhere(
                 "DELETE FROM github_pr_review_comments WHERE user_id = ? AND project_key = ?",
                 (user_id, pk),
             )
+            cur.execute(
+                "DELETE FROM github_sync_items WHERE user_id = ? AND project_key = ?",
+                (user_id, pk),
+            )
+            cur.execute(
+                "DELETE FROM github_sync_state WHERE user_id = ? AND project_key = ?",
+                (user_id, pk),
+            )
 
             # Delete version_files first (depends on project_versions), then versions, then project row
             cur.execute(
@@ -0,0 +1,90 @@
+"""
+Database functions for the extracted-text cache (extracted_text_cache).
+
+Rows are keyed by (file_hash, extension) and hold the zlib-compressed text extracted from a
+file with that content. Reads refresh last_used_at; writes evict the least recently used rows
+once the compressed payloads exceed the size budget.
+"""
+
+import sqlite3
+import time
+import zlib
+from typing import Optional
+
+
+def get_cached_extracted_text(
+    conn: sqlite3.Connection,
+    file_hash: str,
+    extension: str,
+) -> Optional[str]:
+    """Return the cached text for a file's content hash and extension, or None."""
+    try:
+        row = conn.execute(
+            "SELECT payload FROM extracted_text_cache WHERE file_hash = ? AND extension = ?",
+            (file_hash, extension),
+        ).fetchone()
+        if not row:
+            return None
+        with conn:
+            conn.execute(
+                "UPDATE extracted_text_cache SET last_used_at = ? WHERE file_hash = ? AND extension = ?",
+                (time.time(), file_hash, extension),
+            )
+    except sqlite3.OperationalError:
+        # Schema not initialised or the database is busy: behave as a miss.
+        return None
+    try:
+        return zlib.decompress(row[0]).decode("utf-8")
+    except (zlib.error, UnicodeDecodeError):
+        return None
+
+
+def store_cached_extracted_text(
+    conn: sqlite3.Connection,
+    file_hash: str,
+    extension: str,
+    text: str,
+    max_bytes: Optional[int] = None,
+) -> None:
+    """Insert or replace the text for a content hash, then evict LRU rows beyond `max_bytes`."""
+    payload = zlib.compress(text.encode("utf-8"), 6)
+    now = time.time()
+    try:
+        with conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO extracted_text_cache
+                    (file_hash, extension, payload, stored_size, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (file_hash, extension, sqlite3.Binary(payload), len(payload), now, now),
+            )
+            if max_bytes:
+                conn.execute(
+                    """
+                    DELETE FROM extracted_text_cache
+                    WHERE (file_hash, extension) IN (
+                        SELECT file_hash, extension
+                        FROM (
+                            SELECT file_hash, extension,
+                                   SUM(stored_size) OVER (
+                                       ORDER BY last_used_at DESC, file_hash, extension
+                                   ) AS running_size
+                            FROM extracted_text_cache
+                        )
+                        WHERE running_size > ?
+                    )
+                    """,
+                    (max_bytes,),
+                )
+    except sqlite3.OperationalError:
+        pass
+
+
+def clear_extracted_text_cache(conn: sqlite3.Connection) -> None:
+    """Remove every cached extraction."""
+    try:
+        with conn:
+            conn.execute("DELETE FROM extracted_text_cache")
+    except sqlite3.OperationalError:
+        pass
@@ -2,6 +2,8 @@
 Database functions for storing and retrieving git individual metrics.
 """
 
+import json
+
 from .projects import get_project_key
 from .deduplication import insert_project
 
@@ -177,3 +179,40 @@ def get_git_individual_metrics(conn, user_id, project_name):
         'busiest_month_commits': row[17],
         'last_analyzed': row[18]
     }
+
+
+def get_git_individual_checkpoint(conn, user_id, project_name):
+    """
+    Return (last_commit_sha, history_state) stored with a project's git metrics,
+    or None if the project has no metrics or no usable resume point.
+    """
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        return None
+    row = conn.execute("""
+        SELECT last_commit_sha, history_state_json
+        FROM git_individual_metrics
+        WHERE user_id = ? AND project_key = ?
+    """, (user_id, pk)).fetchone()
+    if not row or not row[0] or not row[1]:
+        return None
+    try:
+        return row[0], json.loads(row[1])
+    except (TypeError, ValueError):
+        return None
+
+
+def store_git_individual_checkpoint(conn, user_id, project_name, last_commit_sha, history_state):
+    """
+    Record the HEAD commit the stored metrics were computed at, plus the history state
+    needed to fold later commits into them. The metrics row must already exist.
+    """
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        return
+    conn.execute("""
+        UPDATE git_individual_metrics
+        SET last_commit_sha = ?, history_state_json = ?
+        WHERE user_id = ? AND project_key = ?
+    """, (last_commit_sha, json.dumps(history_state), user_id, pk))
+    conn.commit()
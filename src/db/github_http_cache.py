@@ -0,0 +1,79 @@
+"""
+src/db/github_http_cache.py
+
+ETag-validated GitHub REST responses (github_http_cache), used for conditional requests.
+Stores evict rows older than a TTL and the least recently used rows beyond a size cap.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Any, Optional, Tuple
+
+
+def get_github_http_cache(
+    conn: sqlite3.Connection,
+    token_key: str,
+    url: str,
+) -> Optional[Tuple[str, Any]]:
+    """Return (etag, parsed body) stored for this token and URL, or None. A hit marks the row as recently used."""
+    try:
+        row = conn.execute(
+            "SELECT etag, body_json FROM github_http_cache WHERE token_key = ? AND url = ?",
+            (token_key, url),
+        ).fetchone()
+        if not row:
+            return None
+        with conn:
+            conn.execute(
+                "UPDATE github_http_cache SET last_used_at = ? WHERE token_key = ? AND url = ?",
+                (time.time(), token_key, url),
+            )
+    except sqlite3.OperationalError:
+        # Schema not initialised or the database is busy: behave as a miss.
+        return None
+    try:
+        return row[0], json.loads(row[1])
+    except (TypeError, ValueError):
+        return None
+
+
+def store_github_http_cache(
+    conn: sqlite3.Connection,
+    token_key: str,
+    url: str,
+    etag: str,
+    body: Any,
+    max_entries: Optional[int] = None,
+    ttl_seconds: Optional[float] = None,
+) -> None:
+    """Insert or replace the response stored for this token and URL, then evict expired and least recently used rows."""
+    try:
+        with conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO github_http_cache (token_key, url, etag, body_json, fetched_at, last_used_at)
+                VALUES (?, ?, ?, ?, datetime('now'), ?)
+                """,
+                (token_key, url, etag, json.dumps(body), time.time()),
+            )
+            if ttl_seconds:
+                conn.execute(
+                    "DELETE FROM github_http_cache WHERE fetched_at < datetime('now', ?)",
+                    (f"-{int(ttl_seconds)} seconds",),
+                )
+            if max_entries:
+                conn.execute(
+                    """
+                    DELETE FROM github_http_cache
+                    WHERE (token_key, url) IN (
+                        SELECT token_key, url
+                        FROM github_http_cache
+                        ORDER BY COALESCE(last_used_at, 0) DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (max_entries,),
+                )
+    except sqlite3.OperationalError:
+        pass
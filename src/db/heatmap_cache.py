@@ -0,0 +1,78 @@
+"""
+Database functions for the activity heatmap render cache (activity_heatmap_cache).
+
+Rows are keyed by (user_id, project_key, mode, normalize, include_unclassified_text, renderer) and
+remember the version set they were rendered from. A row whose version set no longer matches the
+project's versions counts as a miss, and adding a version drops the project's rows outright.
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Optional, Sequence, Tuple
+
+HeatmapCacheKey = Tuple[int, int, str, bool, bool, str]
+
+
+def heatmap_version_set(version_keys: Sequence[int]) -> str:
+    """Stable fingerprint of a project's ordered version keys."""
+    return hashlib.sha256(",".join(str(int(vk)) for vk in version_keys).encode()).hexdigest()
+
+
+def _key_params(key: HeatmapCacheKey) -> tuple:
+    user_id, project_key, mode, normalize, include_unclassified_text, renderer = key
+    return (int(user_id), int(project_key), mode, int(bool(normalize)), int(bool(include_unclassified_text)), renderer)
+
+
+def get_cached_heatmap_png(
+    conn: sqlite3.Connection,
+    key: HeatmapCacheKey,
+    version_set: str,
+) -> Optional[bytes]:
+    """Return the cached PNG for the key if it was rendered from `version_set`, else None."""
+    try:
+        row = conn.execute(
+            """
+            SELECT png, version_set
+            FROM activity_heatmap_cache
+            WHERE user_id = ? AND project_key = ? AND mode = ?
+              AND normalize = ? AND include_unclassified_text = ? AND renderer = ?
+            """,
+            _key_params(key),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Schema not initialised or the database is busy: behave as a miss.
+        return None
+    if not row or row[1] != version_set:
+        return None
+    return bytes(row[0])
+
+
+def store_cached_heatmap_png(
+    conn: sqlite3.Connection,
+    key: HeatmapCacheKey,
+    version_set: str,
+    png: bytes,
+) -> None:
+    """Insert or replace the cached PNG for the key."""
+    try:
+        with conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO activity_heatmap_cache
+                    (user_id, project_key, mode, normalize, include_unclassified_text, renderer,
+                     version_set, png, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (*_key_params(key), version_set, sqlite3.Binary(png), time.time()),
+            )
+    except sqlite3.OperationalError:
+        pass
+
+
+def invalidate_heatmap_cache(conn: sqlite3.Connection, project_key: int) -> None:
+    """Drop every cached heatmap of a project (called when a version is added)."""
+    try:
+        conn.execute("DELETE FROM activity_heatmap_cache WHERE project_key = ?", (int(project_key),))
+    except sqlite3.OperationalError:
+        pass
@@ -0,0 +1,101 @@
+"""
+Database functions for the LLM response cache (llm_response_cache).
+
+Rows are keyed by (model, prompt_hash, max_tokens, temperature). Reads refresh last_used_at and
+hit_count; writes evict rows older than the TTL and then the least recently used rows beyond
+the size limit.
+"""
+
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+LLMCacheKey = Tuple[str, str, int, float]
+
+
+def get_cached_llm_response(
+    conn: sqlite3.Connection,
+    key: LLMCacheKey,
+    ttl_seconds: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Return the cached response for (model, prompt_hash, max_tokens, temperature), or None.
+    Entries older than `ttl_seconds` count as missing. A hit marks the entry as recently used.
+    """
+    now = time.time()
+    try:
+        row = conn.execute(
+            """
+            SELECT response, created_at
+            FROM llm_response_cache
+            WHERE model = ? AND prompt_hash = ? AND max_tokens = ? AND temperature = ?
+            """,
+            key,
+        ).fetchone()
+        if not row:
+            return None
+        if ttl_seconds and row[1] < now - ttl_seconds:
+            return None
+        with conn:
+            conn.execute(
+                """
+                UPDATE llm_response_cache
+                SET last_used_at = ?, hit_count = hit_count + 1
+                WHERE model = ? AND prompt_hash = ? AND max_tokens = ? AND temperature = ?
+                """,
+                (now, *key),
+            )
+    except sqlite3.OperationalError:
+        # Schema not initialised or the database is busy: behave as a miss.
+        return None
+    return row[0]
+
+
+def store_cached_llm_response(
+    conn: sqlite3.Connection,
+    key: LLMCacheKey,
+    response: str,
+    max_entries: Optional[int] = None,
+    ttl_seconds: Optional[float] = None,
+) -> None:
+    """Insert or replace a cached response, then evict expired and least recently used rows."""
+    now = time.time()
+    try:
+        with conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_response_cache
+                    (model, prompt_hash, max_tokens, temperature, response, created_at, last_used_at, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (*key, response, now, now),
+            )
+            if ttl_seconds:
+                conn.execute(
+                    "DELETE FROM llm_response_cache WHERE created_at < ?",
+                    (now - ttl_seconds,),
+                )
+            if max_entries:
+                conn.execute(
+                    """
+                    DELETE FROM llm_response_cache
+                    WHERE (model, prompt_hash, max_tokens, temperature) IN (
+                        SELECT model, prompt_hash, max_tokens, temperature
+                        FROM llm_response_cache
+                        ORDER BY last_used_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (max_entries,),
+                )
+    except sqlite3.OperationalError:
+        pass
+
+
+def clear_llm_response_cache(conn: sqlite3.Connection) -> None:
+    """Remove every cached LLM response."""
+    try:
+        with conn:
+            conn.execute("DELETE FROM llm_response_cache")
+    except sqlite3.OperationalError:
+        pass
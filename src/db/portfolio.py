@@ -269,3 +269,166 @@ def get_code_individual_duration(
         return None
 
     return first, last
+
+
+def _with_manual_dates(
+    manual: Tuple[Optional[str], Optional[str]],
+    auto: Tuple[Optional[str], Optional[str]],
+) -> Tuple[Optional[str], Optional[str]]:
+    return manual[0] or auto[0], manual[1] or auto[1]
+
+
+def load_portfolio_projects(
+    conn: sqlite3.Connection,
+    user_id: int,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load everything the portfolio views need for all of a user's summarised projects,
+    in a fixed number of set-based queries regardless of how many projects there are.
+
+    Returns a dict keyed by project display name. Each value has the keys of
+    get_project_summary_row plus:
+      - is_public, manual_rank, rank_score
+      - thumbnail_path
+      - text_duration / collaborative_duration / individual_duration: what
+        get_text_duration / get_code_collaborative_duration / get_code_individual_duration
+        return for the project (manual dates take priority)
+      - activity_percentages: {scope: [(activity_type, percent), ...]} as returned by
+        get_code_activity_percentages with source='combined'
+      - non_llm_summary: as returned by get_code_collaborative_non_llm_summary
+    """
+    rows = conn.execute(
+        """
+        SELECT
+            ps.project_summary_id,
+            ps.user_id,
+            ps.project_key,
+            p.display_name,
+            ps.project_type,
+            ps.project_mode,
+            ps.summary_json,
+            ps.created_at,
+            ps.manual_start_date,
+            ps.manual_end_date,
+            ps.is_public,
+            ps.rank_score,
+            pr.manual_rank,
+            pt.image_path
+        FROM project_summaries ps
+        JOIN projects p ON p.project_key = ps.project_key
+        LEFT JOIN project_rankings pr
+            ON pr.user_id = ps.user_id AND pr.project_key = ps.project_key
+        LEFT JOIN project_thumbnails pt
+            ON pt.user_id = ps.user_id AND pt.project_key = ps.project_key
+        WHERE ps.user_id = ?
+        """,
+        (user_id,),
+    ).fetchall()
+
+    by_key: Dict[int, Dict[str, Any]] = {}
+    manual_dates: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+    for (
+        project_summary_id, row_user_id, project_key, display_name, project_type, project_mode,
+        summary_json, created_at, manual_start, manual_end, is_public, rank_score, manual_rank,
+        thumbnail_path,
+    ) in rows:
+        try:
+            summary_parsed = json.loads(summary_json)
+        except json.JSONDecodeError:
+            summary_parsed = {}
+        manual_dates[project_key] = (manual_start, manual_end)
+        by_key[project_key] = {
+            "project_summary_id": project_summary_id,
+            "user_id": row_user_id,
+            "project_key": project_key,
+            "project_name": display_name,
+            "project_type": project_type,
+            "project_mode": project_mode,
+            "created_at": created_at,
+            "summary_json": summary_json,
+            "summary": summary_parsed,
+            "is_public": bool(is_public),
+            "manual_rank": manual_rank,
+            "rank_score": rank_score,
+            "thumbnail_path": thumbnail_path,
+            "text_duration": None,
+            "collaborative_duration": None,
+            "individual_duration": None,
+            "activity_percentages": {},
+            "non_llm_summary": None,
+        }
+    if not by_key:
+        return {}
+
+    # Text: the contribution dates of each project's latest version
+    for project_key, start, end in conn.execute(
+        """
+        SELECT pv.project_key, tac.start_date, tac.end_date
+        FROM project_versions pv
+        JOIN projects p ON p.project_key = pv.project_key
+        LEFT JOIN text_activity_contribution tac ON tac.version_key = pv.version_key
+        WHERE p.user_id = ?
+          AND pv.version_key = (
+              SELECT MAX(version_key) FROM project_versions WHERE project_key = pv.project_key
+          )
+        """,
+        (user_id,),
+    ):
+        if project_key in by_key:
+            by_key[project_key]["text_duration"] = _with_manual_dates(manual_dates[project_key], (start, end))
+
+    # Code: first/last commit dates. Rows come newest first so each project ends up with its
+    # oldest row, the one the single-project getters pick.
+    for project_key, first, last in conn.execute(
+        """
+        SELECT project_key, first_commit_at, last_commit_at
+        FROM code_collaborative_metrics
+        WHERE user_id = ?
+        ORDER BY id DESC
+        """,
+        (user_id,),
+    ):
+        if project_key in by_key:
+            by_key[project_key]["collaborative_duration"] = _with_manual_dates(
+                manual_dates[project_key], (first, last)
+            )
+
+    for project_key, first, last in conn.execute(
+        """
+        SELECT project_key, first_commit_date, last_commit_date
+        FROM git_individual_metrics
+        WHERE user_id = ?
+        ORDER BY id DESC
+        """,
+        (user_id,),
+    ):
+        if project_key in by_key:
+            duration = _with_manual_dates(manual_dates[project_key], (first, last))
+            by_key[project_key]["individual_duration"] = duration if any(duration) else None
+
+    for project_key, scope, activity_type, percent in conn.execute(
+        """
+        SELECT project_key, scope, activity_type, percent
+        FROM code_activity_metrics
+        WHERE user_id = ? AND source = 'combined' AND percent > 0
+        ORDER BY percent DESC
+        """,
+        (user_id,),
+    ):
+        if project_key in by_key:
+            by_key[project_key]["activity_percentages"].setdefault(scope, []).append((activity_type, percent))
+
+    # Oldest first, so the latest summary of each project is the one left standing
+    for project_key, content in conn.execute(
+        """
+        SELECT project_key, content
+        FROM code_collaborative_summary
+        WHERE user_id = ? AND summary_type = 'non-llm'
+        ORDER BY created_at ASC, id ASC
+        """,
+        (user_id,),
+    ):
+        if project_key in by_key:
+            by_key[project_key]["non_llm_summary"] = content
+
+    return {project["project_name"]: project for project in by_key.values()}
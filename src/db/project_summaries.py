@@ -90,6 +90,81 @@ def get_all_user_project_summaries(conn, user_id):
     return [dict(zip(col_names, row)) for row in rows]
 
 
+def get_unscored_project_summaries(conn, user_id, score_version):
+    """
+    Summaries whose ranking score is missing (never scored, or the summary was rewritten since)
+    or was computed with a different scoring version.
+    """
+    rows = conn.execute(
+        """
+        SELECT project_summary_id, project_type, summary_json
+        FROM project_summaries
+        WHERE user_id = ?
+          AND (rank_score IS NULL OR rank_score_version IS NOT ?)
+        """,
+        (user_id, score_version),
+    ).fetchall()
+    return [
+        {"project_summary_id": row[0], "project_type": row[1], "summary_json": row[2]}
+        for row in rows
+    ]
+
+
+def store_project_rank_scores(conn, scores, score_version):
+    """Store ranking scores; scores is a list of (project_summary_id, score)."""
+    conn.executemany(
+        """
+        UPDATE project_summaries
+        SET rank_score = ?, rank_score_version = ?
+        WHERE project_summary_id = ?
+        """,
+        [(score, score_version, project_summary_id) for project_summary_id, score in scores],
+    )
+    conn.commit()
+
+
+def get_project_ranking_rows(conn, user_id, respect_manual_ranking=True):
+    """
+    Ranked projects from the stored scores: manual ranks first (ascending), then score (descending).
+    Rows carry project_summary_id, project_key, project_name, score, manual_rank and summary_text.
+    """
+    manual_rank = "pr.manual_rank" if respect_manual_ranking else "NULL"
+    rows = conn.execute(
+        f"""
+        SELECT
+            ps.project_summary_id,
+            ps.project_key,
+            p.display_name AS project_name,
+            COALESCE(ps.rank_score, 0.0) AS score,
+            {manual_rank} AS manual_rank,
+            json_extract(ps.summary_json, '$.summary_text') AS summary_text
+        FROM project_summaries ps
+        JOIN projects p
+            ON p.project_key = ps.project_key
+        LEFT JOIN project_rankings pr
+            ON pr.user_id = ps.user_id AND pr.project_key = ps.project_key
+        WHERE ps.user_id = ?
+        ORDER BY
+            ({manual_rank} IS NULL) ASC,
+            {manual_rank} ASC,
+            score DESC,
+            ps.created_at DESC
+        """,
+        (user_id,),
+    ).fetchall()
+    return [
+        {
+            "project_summary_id": row[0],
+            "project_key": row[1],
+            "project_name": row[2],
+            "score": row[3],
+            "manual_rank": row[4],
+            "summary_text": row[5] or "",
+        }
+        for row in rows
+    ]
+
+
 def get_project_summaries_list(conn, user_id):
     """
     Retrieve a list of all project summaries for a user.
@@ -173,7 +248,7 @@ def update_project_summary_json(conn, user_id, project_name, summary_json) -> bo
     cur = conn.execute(
         """
         UPDATE project_summaries
-        SET summary_json = ?
+        SET summary_json = ?, rank_score = NULL
         WHERE user_id = ? AND project_key = ?
         """,
         (summary_json, user_id, int(project_key)),
@@ -8,10 +8,15 @@ Manages project-level database operations:
 """
 
 import sqlite3
+import time
 from datetime import datetime
 from typing import Optional, Dict, List
 import json
 import hashlib
+try:
+    from src import constants
+except ModuleNotFoundError:
+    import constants
 
 from .deduplication import insert_project, insert_project_version
 from .uploads import create_upload
@@ -26,41 +31,37 @@ def _get_or_create_project_key(conn: sqlite3.Connection, user_id: int, project_n
     return insert_project(conn, user_id, name)
 
 
-def store_parsed_files(conn: sqlite3.Connection, files_info: list[dict], user_id: int) -> None:
+def store_parsed_files(conn: sqlite3.Connection, files_info: list[dict], user_id: int) -> dict:
     """
     Insert parsed metadata into the 'files' table.
     Config files are inserted into 'config_files' instead.
     Each file is linked to the user.
-    """
 
+    Project keys are resolved once per project name and all rows go in with executemany
+    inside a single transaction. Returns ingest stats:
+    {"files": int, "config_files": int, "seconds": float, "rows_per_second": float}.
+    """
+    stats = {"files": 0, "config_files": 0, "seconds": 0.0, "rows_per_second": 0.0}
     if not files_info:
-        return # nothing to insert
-    
-    cur = conn.cursor()
+        return stats # nothing to insert
+
+    started = time.perf_counter()
+    project_keys: dict[str, int] = {}
+    config_rows = []
+    file_rows = []
     for f in files_info:
         # Store config files in config_files table (keyed by project_key)
         if f.get("file_type") == "config":
-            project_key = _get_or_create_project_key(conn, user_id, f.get("project_name"))
-            cur.execute("""
-                INSERT INTO config_files (
-                    user_id, project_key, file_name, file_path
-                ) VALUES (?, ?, ?, ?)
-            """, (
-                user_id,
-                project_key,
-                f.get("file_name"),
-                f.get("file_path"),
-            ))
+            name = f.get("project_name") or "default"
+            if name not in project_keys:
+                project_keys[name] = _get_or_create_project_key(conn, user_id, name)
+            config_rows.append((user_id, project_keys[name], f.get("file_name"), f.get("file_path")))
         else:
             # Store regular files in files table (versioned only; version_key required)
             vk = f.get("version_key")
             if vk is None:
                 continue  # skip rows without version_key
-            cur.execute("""
-                INSERT INTO files (
-                    user_id, version_key, file_name, file_path, extension, file_type, size_bytes, created, modified
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            file_rows.append((
                 user_id,
                 int(vk),
                 f.get("file_name"),
@@ -71,8 +72,30 @@ def store_parsed_files(conn: sqlite3.Connection, files_info: list[dict], user_id
                 f.get("created"),
                 f.get("modified"),
             ))
-    
-    conn.commit()
+
+    with conn:
+        conn.executemany("""
+            INSERT INTO config_files (
+                user_id, project_key, file_name, file_path
+            ) VALUES (?, ?, ?, ?)
+        """, config_rows)
+        conn.executemany("""
+            INSERT INTO files (
+                user_id, version_key, file_name, file_path, extension, file_type, size_bytes, created, modified
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, file_rows)
+
+    elapsed = time.perf_counter() - started
+    total = len(config_rows) + len(file_rows)
+    stats.update(
+        files=len(file_rows),
+        config_files=len(config_rows),
+        seconds=elapsed,
+        rows_per_second=total / elapsed if elapsed > 0 else float(total),
+    )
+    if constants.VERBOSE:
+        print(f"[DB] Stored {total} parsed file rows in {elapsed:.3f}s ({stats['rows_per_second']:.0f} rows/s)")
+    return stats
 
 
 def _validate_classification(classification: str) -> None:
@@ -121,6 +121,40 @@ CREATE TABLE IF NOT EXISTS version_files (
 CREATE INDEX IF NOT EXISTS idx_version_files_hash 
     ON version_files(file_hash);
 
+CREATE INDEX IF NOT EXISTS idx_version_files_relpath
+    ON version_files(relpath);
+
+-- MinHash signature per project version (see src/utils/deduplication/minhash.py)
+-- and its LSH band buckets, so near-duplicate candidates are found by index lookups.
+CREATE TABLE IF NOT EXISTS version_minhash (
+    version_key INTEGER PRIMARY KEY,
+    signature   BLOB NOT NULL,
+    FOREIGN KEY (version_key) REFERENCES project_versions(version_key) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS version_lsh_bands (
+    band        INTEGER NOT NULL,
+    bucket      INTEGER NOT NULL,
+    version_key INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, version_key),
+    FOREIGN KEY (version_key) REFERENCES project_versions(version_key) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_version_lsh_bands_version
+    ON version_lsh_bands(version_key);
+
+-- Content hashes of ZIP members keyed by what the ZIP central directory already records
+-- (size, modified time, CRC32), so re-uploading unchanged files skips rehashing them.
+-- `normalized` = 1 when the hash was taken with CRLF -> LF normalisation (text extensions).
+CREATE TABLE IF NOT EXISTS file_hash_cache (
+    size_bytes   INTEGER NOT NULL,
+    modified     TEXT NOT NULL,
+    crc32        INTEGER NOT NULL,
+    normalized   INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    PRIMARY KEY (size_bytes, modified, crc32, normalized)
+) WITHOUT ROWID;
+
 CREATE INDEX IF NOT EXISTS idx_version_files_version 
     ON version_files(version_key);
 
@@ -176,6 +210,47 @@ CREATE TABLE IF NOT EXISTS non_llm_code_individual(
 
 );
 
+-- Per-file radon/lizard results keyed by file content, so unchanged files in a new version are not re-analysed.
+-- `extension` is part of the key because lizard picks its parser (and radon its eligibility) from it;
+-- `analyzer` records the tool versions the JSON came from.
+CREATE TABLE IF NOT EXISTS file_complexity_cache (
+    content_hash TEXT NOT NULL,
+    extension    TEXT NOT NULL,
+    analyzer     TEXT NOT NULL,
+    radon_json   TEXT,
+    lizard_json  TEXT,
+    PRIMARY KEY (content_hash, extension, analyzer)
+) WITHOUT ROWID;
+
+
+-- LLM RESPONSE CACHE
+-- Groq completions keyed by request (see src/utils/llm_gateway.py); evicted by age and LRU.
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    model        TEXT NOT NULL,
+    prompt_hash  TEXT NOT NULL,   -- SHA-256 of the JSON-encoded messages
+    max_tokens   INTEGER NOT NULL,
+    temperature  REAL NOT NULL,
+    response     TEXT NOT NULL,
+    created_at   REAL NOT NULL,   -- unix time
+    last_used_at REAL NOT NULL,
+    hit_count    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (model, prompt_hash, max_tokens, temperature)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_used ON llm_response_cache(last_used_at);
+
+CREATE TABLE IF NOT EXISTS extracted_text_cache (
+    file_hash    TEXT NOT NULL,   -- content hash, as stored in version_files.file_hash
+    extension    TEXT NOT NULL,   -- '.pdf', '.docx', '.csv'
+    payload      BLOB NOT NULL,   -- zlib-compressed UTF-8 text (JSON for CSV profiles)
+    stored_size  INTEGER NOT NULL,
+    created_at   REAL NOT NULL,   -- unix time
+    last_used_at REAL NOT NULL,
+    PRIMARY KEY (file_hash, extension)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_extracted_text_cache_last_used ON extracted_text_cache(last_used_at);
+
 
 -- TEXT CONTRIBUTION TABLES
 
@@ -329,6 +404,10 @@ CREATE TABLE IF NOT EXISTS git_individual_metrics (
     busiest_month TEXT,
     busiest_month_commits INTEGER,
 
+    -- Resume point for incremental re-analysis (last analysed HEAD + mergeable aggregates)
+    last_commit_sha TEXT,
+    history_state_json TEXT,
+
     last_analyzed TEXT DEFAULT (datetime('now')),
 
     UNIQUE (user_id, project_key),
@@ -352,6 +431,8 @@ CREATE TABLE IF NOT EXISTS project_summaries (
     manual_start_date   TEXT,  -- Manual override for start date (ISO format YYYY-MM-DD)
     manual_end_date     TEXT,  -- Manual override for end date (ISO format YYYY-MM-DD)
     is_public           INTEGER NOT NULL DEFAULT 0,
+    rank_score          REAL,     -- materialised ranking score; NULL until (re)scored after a summary write
+    rank_score_version  INTEGER,  -- scoring version rank_score was computed with
     UNIQUE(user_id, project_key),
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
     FOREIGN KEY (project_key) REFERENCES projects(project_key) ON DELETE CASCADE
@@ -542,6 +623,48 @@ CREATE TABLE IF NOT EXISTS github_pr_review_comments (
 CREATE INDEX IF NOT EXISTS idx_github_pr_review_comments_lookup
     ON github_pr_review_comments(user_id, project_key, repo_owner, repo_name);
 
+-- Raw GitHub activity (GraphQL nodes) synced per repository, upserted by natural key
+-- (PR/issue number, commit oid) so later syncs only fetch what changed since the watermark.
+CREATE TABLE IF NOT EXISTS github_sync_items (
+    user_id INTEGER NOT NULL,
+    project_key INTEGER NOT NULL,
+    repo_owner TEXT NOT NULL,
+    repo_name TEXT NOT NULL,
+    resource TEXT NOT NULL,     -- 'prs', 'issues', 'commits' or 'contributions'
+    item_key TEXT NOT NULL,     -- PR/issue number, commit oid
+    updated_at TEXT,            -- updatedAt (PRs, issues) or committedDate (commits)
+    node_json TEXT NOT NULL,
+    PRIMARY KEY (user_id, project_key, repo_owner, repo_name, resource, item_key),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (project_key) REFERENCES projects(project_key) ON DELETE CASCADE
+);
+
+-- Per-repo, per-resource watermark: the next sync asks GitHub only for items updated after it.
+CREATE TABLE IF NOT EXISTS github_sync_state (
+    user_id INTEGER NOT NULL,
+    project_key INTEGER NOT NULL,
+    repo_owner TEXT NOT NULL,
+    repo_name TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    watermark TEXT NOT NULL,    -- ISO 8601 UTC, e.g. 2024-01-01T00:00:00Z
+    synced_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (user_id, project_key, repo_owner, repo_name, resource),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (project_key) REFERENCES projects(project_key) ON DELETE CASCADE
+);
+
+-- Last 200 response per GitHub REST URL and token, replayed when a conditional
+-- request (If-None-Match) comes back 304 Not Modified.
+CREATE TABLE IF NOT EXISTS github_http_cache (
+    token_key  TEXT NOT NULL,   -- SHA-256 prefix of the token the response was fetched with
+    url        TEXT NOT NULL,
+    etag       TEXT NOT NULL,
+    body_json  TEXT NOT NULL,
+    fetched_at TEXT DEFAULT (datetime('now')),
+    last_used_at REAL,          -- unix time of the last store or replay, for LRU eviction
+    PRIMARY KEY (token_key, url)
+) WITHOUT ROWID;
+
 
 -- TEXT ACTIVITY TYPE CONTRIBUTION DATA
 
@@ -614,6 +737,9 @@ CREATE TABLE IF NOT EXISTS code_collaborative_metrics (
     folders_json    TEXT,   -- top folders by activity
     top_files_json  TEXT,   -- most edited files
     frameworks_json TEXT,
+    -- resume point for incremental re-analysis
+    last_commit_sha    TEXT,    -- HEAD the metrics were computed at
+    history_state_json TEXT,    -- mergeable aggregates behind the metrics
     -- others
     created_at      TEXT DEFAULT (datetime('now')),
     UNIQUE(user_id, project_key),
@@ -725,6 +851,22 @@ CREATE TABLE IF NOT EXISTS project_thumbnails (
 
 );
 
+-- Rendered activity heatmap PNGs, reused until the project's versions change
+CREATE TABLE IF NOT EXISTS activity_heatmap_cache (
+    user_id                   INTEGER NOT NULL,
+    project_key               INTEGER NOT NULL,
+    mode                      TEXT NOT NULL CHECK (mode IN ('diff', 'snapshot')),
+    normalize                 INTEGER NOT NULL,
+    include_unclassified_text INTEGER NOT NULL,
+    renderer                  TEXT NOT NULL,   -- 'matplotlib' or 'pillow'
+    version_set               TEXT NOT NULL,   -- SHA-256 of the ordered version keys rendered
+    png                       BLOB NOT NULL,
+    created_at                REAL NOT NULL,   -- unix time
+    PRIMARY KEY (user_id, project_key, mode, normalize, include_unclassified_text, renderer),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (project_key) REFERENCES projects(project_key) ON DELETE CASCADE
+) WITHOUT ROWID;
+
 -- USER SKILL PREFERENCES (for skills highlighting feature)
 -- Allows users to select which skills to highlight in portfolio/resume per project
 CREATE TABLE IF NOT EXISTS user_skill_preferences (
@@ -800,3 +942,36 @@ CREATE TABLE IF NOT EXISTS user_experience_entries (
 
 CREATE INDEX IF NOT EXISTS idx_user_experience_entries_user_order
     ON user_experience_entries(user_id, display_order, entry_id);
+
+
+-- ANALYSIS JOBS (background execution of POST /projects/upload/{upload_id}/run)
+-- One row per queued run; workers claim rows by flipping status from 'queued' to 'running'.
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    job_id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id          INTEGER NOT NULL,
+    upload_id        INTEGER NOT NULL,
+    scope            TEXT NOT NULL CHECK (scope IN ('all', 'individual', 'collaborative')),
+    force_rerun      INTEGER NOT NULL DEFAULT 0,
+    status           TEXT NOT NULL DEFAULT 'queued'
+                     CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    max_attempts     INTEGER NOT NULL DEFAULT 1,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    progress_done    INTEGER NOT NULL DEFAULT 0,
+    progress_total   INTEGER NOT NULL DEFAULT 0,
+    current_project  TEXT,
+    result_json      TEXT,
+    error            TEXT,
+    created_at       TEXT NOT NULL,
+    started_at       TEXT,
+    finished_at      TEXT,
+    updated_at       TEXT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (upload_id) REFERENCES uploads(upload_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_upload
+    ON analysis_jobs(upload_id, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status
+    ON analysis_jobs(status, created_at);
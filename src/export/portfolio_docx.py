@@ -32,9 +32,7 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 from src.insights.rank_projects.rank_project_importance import collect_project_data
 from src.db import (
-    get_project_summary_row,
-    get_project_thumbnail_path,
-    get_project_key,
+    load_portfolio_projects,
     get_user_profile,
 )
 
@@ -47,7 +45,6 @@ from src.insights.portfolio import (
     get_all_skills_from_summary,
 )
 from src.services.skill_preferences_service import get_highlighted_skills_for_display
-from src.db.projects import get_project_key
 
 # shared + portfolio helpers
 from src.export.shared_helpers import (
@@ -120,8 +117,9 @@ def export_portfolio_to_docx(
         doc.save(str(filepath))
         return filepath
 
+    portfolio_projects = load_portfolio_projects(conn, user_id)
     for project_name, _score in project_scores:
-        row = get_project_summary_row(conn, user_id, project_name)
+        row = portfolio_projects.get(project_name)
         if row is None:
             continue
 
@@ -137,8 +135,7 @@ def export_portfolio_to_docx(
         doc.add_heading(str(display_name), level=1)
 
         # Thumbnail right after title (left aligned)
-        pkey = get_project_key(conn, user_id, project_name)
-        thumb = get_project_thumbnail_path(conn, user_id, pkey) if pkey else None
+        thumb = row.get("thumbnail_path")
         if thumb:
             p = Path(thumb)
             if p.exists():
@@ -151,7 +148,9 @@ def export_portfolio_to_docx(
         date_line = format_date_range(summary.get("start_date"), summary.get("end_date"))
         if not date_line:
             raw_duration = (
-                format_duration(project_type, project_mode, created_at, user_id, project_name, conn) or ""
+                format_duration(
+                    project_type, project_mode, created_at, user_id, project_name, conn, preloaded=row,
+                ) or ""
             )
             date_line = reformat_duration_line(raw_duration)
         if not date_line:
@@ -159,7 +158,7 @@ def export_portfolio_to_docx(
 
         # Activity: strip percent tokens and remove prefix
         activity_line = format_activity_line(
-            project_type, project_mode, conn, user_id, project_name, summary
+            project_type, project_mode, conn, user_id, project_name, summary, preloaded=row,
         ) or ""
         activity_line = strip_percent_tokens(activity_line)
         if activity_line.lower().startswith("activity:"):
@@ -167,7 +166,7 @@ def export_portfolio_to_docx(
 
         # Skills: one line (filtered by per-project skill preferences)
         all_project_skills = get_all_skills_from_summary(summary)
-        pk = get_project_key(conn, user_id, project_name)
+        pk = row.get("project_key")
         highlighted_skills = get_highlighted_skills_for_display(
             conn=conn, user_id=user_id, context="portfolio", project_key=pk,
         ) if pk else None
@@ -186,6 +185,7 @@ def export_portfolio_to_docx(
             conn,
             user_id,
             project_name,
+            preloaded=row,
         ) or []
         contrib_bullets = _clean_bullets(contrib_bullets)
 
@@ -38,9 +38,7 @@ from reportlab.lib import utils
 
 from src.insights.rank_projects.rank_project_importance import collect_project_data
 from src.db import (
-    get_project_summary_row,
-    get_project_thumbnail_path,
-    get_project_key,
+    load_portfolio_projects,
     get_user_profile,
 )
 
@@ -53,7 +51,6 @@ from src.insights.portfolio import (
     get_all_skills_from_summary,
 )
 from src.services.skill_preferences_service import get_highlighted_skills_for_display
-from src.db.projects import get_project_key
 
 # use shared helpers
 from src.export.shared_helpers import (
@@ -218,8 +215,9 @@ def export_portfolio_to_pdf(
         doc.build(story)
         return filepath
 
+    portfolio_projects = load_portfolio_projects(conn, user_id)
     for project_name, _score in project_scores:
-        row = get_project_summary_row(conn, user_id, project_name)
+        row = portfolio_projects.get(project_name)
         if row is None:
             continue
 
@@ -237,7 +235,9 @@ def export_portfolio_to_pdf(
         date_line = format_date_range(summary.get("start_date"), summary.get("end_date"))
         if not date_line:
             raw_duration = (
-                format_duration(project_type, project_mode, created_at, user_id, project_name, conn) or ""
+                format_duration(
+                    project_type, project_mode, created_at, user_id, project_name, conn, preloaded=row,
+                ) or ""
             )
             date_line = reformat_duration_line(raw_duration)
         if not date_line:
@@ -245,7 +245,7 @@ def export_portfolio_to_pdf(
 
         # Activity: remove percent token
         activity_line = format_activity_line(
-            project_type, project_mode, conn, user_id, project_name, summary
+            project_type, project_mode, conn, user_id, project_name, summary, preloaded=row,
         ) or ""
         activity_line = strip_percent_tokens(activity_line)
         if activity_line.lower().startswith("activity:"):
@@ -253,7 +253,7 @@ def export_portfolio_to_pdf(
 
         # Skills: one line (filtered by per-project skill preferences)
         all_project_skills = get_all_skills_from_summary(summary)
-        pk = get_project_key(conn, user_id, project_name)
+        pk = row.get("project_key")
         highlighted_skills = get_highlighted_skills_for_display(
             conn=conn, user_id=user_id, context="portfolio", project_key=pk,
         ) if pk else None
@@ -272,6 +272,7 @@ def export_portfolio_to_pdf(
             conn,
             user_id,
             project_name,
+            preloaded=row,
         ) or []
         contrib_bullets = _clean_bullets(contrib_bullets)
 
@@ -285,8 +286,7 @@ def export_portfolio_to_pdf(
         # ---------------------------
         story.append(Paragraph(str(display_name), ProjectTitleStyle))
 
-        pkey = get_project_key(conn, user_id, project_name)
-        thumb = get_project_thumbnail_path(conn, user_id, pkey) if pkey else None
+        thumb = row.get("thumbnail_path")
         if thumb:
             img = _load_image_preserve_aspect(thumb, max_width=2.6 * inch)
             if img:
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import json
 import re
 from src.db import (
@@ -40,6 +40,17 @@ def _manual_overrides(summary: Dict[str, Any]) -> Dict[str, Any]:
     return overrides
 
 
+def _collaborative_non_llm_summary(
+    conn,
+    user_id: int,
+    project_name: str,
+    preloaded: Optional[Dict[str, Any]],
+) -> str | None:
+    if preloaded is not None:
+        return preloaded.get("non_llm_summary")
+    return get_code_collaborative_non_llm_summary(conn, user_id, project_name)
+
+
 def _portfolio_overrides(summary: Dict[str, Any]) -> Dict[str, Any]:
     overrides = summary.get("portfolio_overrides") or {}
     if not isinstance(overrides, dict):
@@ -76,7 +87,12 @@ def resolve_portfolio_contribution_bullets(
     conn,
     user_id: int,
     project_name: str,
+    preloaded: Optional[Dict[str, Any]] = None,
 ) -> List[str]:
+    """
+    `preloaded` is the project's entry from load_portfolio_projects; when given, nothing is
+    read from the database.
+    """
     portfolio = _portfolio_overrides(summary)
     bullets = _clean_bullets(portfolio.get("contribution_bullets"))
     if bullets:
@@ -99,8 +115,10 @@ def resolve_portfolio_contribution_bullets(
         if isinstance(llm_contrib, str) and llm_contrib.strip():
             return [llm_contrib.strip()]
 
-        if project_mode == "collaborative" and conn and user_id is not None and project_name:
-            non_llm_content = get_code_collaborative_non_llm_summary(conn, user_id, project_name)
+        if project_mode == "collaborative" and (
+            preloaded is not None or (conn and user_id is not None and project_name)
+        ):
+            non_llm_content = _collaborative_non_llm_summary(conn, user_id, project_name, preloaded)
             if isinstance(non_llm_content, str) and non_llm_content.strip():
                 return [non_llm_content.strip()]
 
@@ -121,6 +139,7 @@ def format_duration(
     user_id: int,
     project_name: str,
     conn,
+    preloaded: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Build a simple 'Duration: start – end' (or single date / N/A) line.
@@ -128,11 +147,15 @@ def format_duration(
     - text projects: use text_activity_contribution start/end (keyed by version_key)
     - code(collaborative): use code_collaborative_metrics first/last commit
     - code(individual):   use git_individual_metrics first/last commit
+    Dates come from `preloaded` (a load_portfolio_projects entry) when given.
     """
 
     # 1) Text projects
     if project_type == "text":
-        text_duration = get_text_duration(conn, user_id, project_name)
+        if preloaded is not None:
+            text_duration = preloaded.get("text_duration")
+        else:
+            text_duration = get_text_duration(conn, user_id, project_name)
         if text_duration is not None:
             start, end = text_duration
             if start and end:
@@ -144,7 +167,10 @@ def format_duration(
 
     # 2) Collaborative code
     if project_type == "code" and project_mode == "collaborative":
-        duration = get_code_collaborative_duration(conn, user_id, project_name)
+        if preloaded is not None:
+            duration = preloaded.get("collaborative_duration")
+        else:
+            duration = get_code_collaborative_duration(conn, user_id, project_name)
         if duration is not None:
             first, last = duration
             if first and last:
@@ -156,7 +182,10 @@ def format_duration(
 
     # 3) Individual code
     if project_type == "code" and (project_mode == "individual" or not project_mode):
-        duration = get_code_individual_duration(conn, user_id, project_name)
+        if preloaded is not None:
+            duration = preloaded.get("individual_duration")
+        else:
+            duration = get_code_individual_duration(conn, user_id, project_name)
         if duration is not None:
             first, last = duration
             if first and last:
@@ -270,10 +299,11 @@ def format_activity_line(
     user_id: int,
     project_name: str,
     summary: Dict[str, Any],
+    preloaded: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Build 'Activity: feature_coding 98%, testing 2%' line.
-    - Code: ONLY use code_activity_metrics (source='combined')
+    - Code: ONLY use code_activity_metrics (source='combined'), from `preloaded` when given
     - Text: use JSON-based activity percentages
     """
     activities: List[Tuple[str, float]] = []
@@ -282,13 +312,16 @@ def format_activity_line(
         scope = project_mode or "individual"
 
         # Code activity ONLY from DB
-        activities = get_code_activity_percentages(
-            conn=conn,
-            user_id=user_id,
-            project_name=project_name,
-            scope=scope,
-            source="combined",
-        )
+        if preloaded is not None:
+            activities = (preloaded.get("activity_percentages") or {}).get(scope, [])
+        else:
+            activities = get_code_activity_percentages(
+                conn=conn,
+                user_id=user_id,
+                project_name=project_name,
+                scope=scope,
+                source="combined",
+            )
 
         if not activities:
             return "Activity: N/A"
@@ -394,6 +427,7 @@ def format_summary_block(
     conn,
     user_id: int,
     project_name: str,
+    preloaded: Optional[Dict[str, Any]] = None,
 ) -> List[str]:
     """
     Build summary lines:
@@ -448,9 +482,7 @@ def format_summary_block(
             return lines
 
         if project_mode == "collaborative":
-            non_llm_content = get_code_collaborative_non_llm_summary(
-                conn, user_id, project_name
-            )
+            non_llm_content = _collaborative_non_llm_summary(conn, user_id, project_name, preloaded)
             if isinstance(non_llm_content, str) and non_llm_content.strip():
                 lines.append(f"Summary: {non_llm_content}")
                 return lines
@@ -1,9 +1,46 @@
 import json
 
-from src.db import get_all_user_project_summaries, get_project_rank
+from src.db import get_project_ranking_rows, get_unscored_project_summaries, store_project_rank_scores
 from src.models.project_summary import ProjectSummary
 from src.insights.rank_projects.extract_scores import _extract_base_scores, _extract_code_scores, _extract_text_scores
 
+# Stored scores computed with another version are recomputed on the next ranking read.
+# Bump this whenever the scoring functions or weights change.
+RANKING_SCORE_VERSION = 1
+
+
+def score_project_summary(project_type, summary_dict) -> float:
+    """Auto-score of one project summary (see combine_scores)."""
+    project_summary = ProjectSummary.from_dict(summary_dict)
+
+    is_collaborative = (project_summary.project_mode == "collaborative")
+
+    results = _extract_base_scores(project_summary, is_collaborative)
+
+    if project_type == "text":
+        results += _extract_text_scores(project_summary)
+
+    else: # project will be code
+        results += _extract_code_scores(project_summary, is_collaborative)
+
+    return combine_scores(results)
+
+
+def refresh_project_scores(conn, user_id) -> int:
+    """
+    Score the user's summaries that have no stored score yet (new or rewritten since the last
+    ranking) or were scored with another RANKING_SCORE_VERSION. Returns how many were scored.
+    """
+    rows = get_unscored_project_summaries(conn, user_id, RANKING_SCORE_VERSION)
+    scores = [
+        (row["project_summary_id"], score_project_summary(row["project_type"], json.loads(row["summary_json"])))
+        for row in rows
+    ]
+    if scores:
+        store_project_rank_scores(conn, scores, RANKING_SCORE_VERSION)
+    return len(scores)
+
+
 def collect_project_ranking_rows(conn, user_id, respect_manual_ranking: bool = True):
     """
     Return ranked project rows including DB ids + manual ranks.
@@ -21,54 +58,12 @@ def collect_project_ranking_rows(conn, user_id, respect_manual_ranking: bool = T
 
     Notes:
     - Sorting respects manual ranks first (ascending), then auto-score (descending).
+    - Scores are stored with the summaries; only summaries written since the last ranking
+      are rescored, then the ranking is a single ordered query.
     - This function is intended for API use, CLI callers can keep using collect_project_data().
     """
-    project_scores = []
-    rows = get_all_user_project_summaries(conn, user_id)
-
-    for row in rows:
-        project_name = row["project_name"]
-        project_type = row["project_type"]
-        summary_dict = json.loads(row["summary_json"])
-        project_summary = ProjectSummary.from_dict(summary_dict)
-
-        is_collaborative = (project_summary.project_mode == "collaborative")
-
-        results = _extract_base_scores(project_summary, is_collaborative)
-
-        if project_type == "text":
-            results += _extract_text_scores(project_summary)
-
-        else: # project will be code
-            results += _extract_code_scores(project_summary, is_collaborative)
-
-        auto_score = combine_scores(results)
-
-        # Get manual rank if exists
-        manual_rank = None
-        if respect_manual_ranking:
-            project_key = row.get("project_key")
-            if project_key is not None:
-                manual_rank = get_project_rank(conn, user_id, project_key)
-
-        summary_text = summary_dict.get("summary_text") or ""
-        project_scores.append({
-            "project_summary_id": row.get("project_summary_id"),
-            "project_key": row.get("project_key"),
-            "project_name": project_name,
-            "score": auto_score,
-            "manual_rank": manual_rank,
-            "summary_text": summary_text,
-        })
-
-    # Sort: manual rankings first (ascending), then auto-score (descending)
-    project_scores.sort(key=lambda x: (
-        0 if x["manual_rank"] is not None else 1,  # Manual ranks come first
-        x["manual_rank"] if x["manual_rank"] is not None else 0,  # Lower rank number = higher priority
-        -x["score"]  # Higher score = higher priority
-    ))
-
-    return project_scores
+    refresh_project_scores(conn, user_id)
+    return get_project_ranking_rows(conn, user_id, respect_manual_ranking=respect_manual_ranking)
 
 def collect_project_data(conn, user_id, respect_manual_ranking=True):
     rows = collect_project_ranking_rows(conn, user_id, respect_manual_ranking=respect_manual_ranking)
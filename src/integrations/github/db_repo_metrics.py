@@ -294,4 +294,115 @@ def store_github_detailed_metrics(conn, user_id, project_name, owner, repo, metr
     conn.commit()
     
     if constants.VERBOSE:
-        print(f"[GitHub] Stored detailed metrics: {len(user_issues)} issues, {len(user_prs)} PRs, {len(commit_timestamps)} commits, {len(reviews)} PR reviews")
\ No newline at end of file
+        print(f"[GitHub] Stored detailed metrics: {len(user_issues)} issues, {len(user_prs)} PRs, {len(commit_timestamps)} commits, {len(reviews)} PR reviews")
+
+# Natural key and last-change timestamp of the GraphQL nodes kept per synced resource
+SYNC_ITEM_FIELDS = {
+    "prs": ("number", "updatedAt"),
+    "issues": ("number", "updatedAt"),
+    "commits": ("oid", "committedDate"),
+}
+
+
+def get_github_sync_watermarks(conn, user_id, project_name, owner, repo):
+    """Return {resource: watermark} recorded by the last sync of this repo ({} if never synced)."""
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        return {}
+    rows = conn.execute("""
+        SELECT resource, watermark
+        FROM github_sync_state
+        WHERE user_id = ? AND project_key = ? AND repo_owner = ? AND repo_name = ?
+    """, (user_id, pk, owner, repo)).fetchall()
+    return dict(rows)
+
+
+def get_github_synced_commit_oids(conn, user_id, project_name, owner, repo):
+    """Return the oids of every commit stored for this repo by earlier syncs."""
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        return set()
+    rows = conn.execute("""
+        SELECT item_key
+        FROM github_sync_items
+        WHERE user_id = ? AND project_key = ? AND repo_owner = ? AND repo_name = ? AND resource = 'commits'
+    """, (user_id, pk, owner, repo)).fetchall()
+    return {row[0] for row in rows}
+
+
+def store_github_sync_items(conn, user_id, project_name, owner, repo, activity, watermark,
+                            contributions=None, replace=False):
+    """
+    Upsert the GraphQL nodes of a sync (see fetch_repo_activity_graphql) by PR/issue number and
+    commit oid, and move every resource's watermark to `watermark` in the same transaction.
+    `replace` drops what was stored for the repo first (full resync).
+    """
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        pk = insert_project(conn, user_id, project_name)
+    repo_key = (user_id, pk, owner, repo)
+
+    rows = []
+    for resource, (key_field, updated_field) in SYNC_ITEM_FIELDS.items():
+        for node in activity.get(resource, []):
+            if node.get(key_field) is None:
+                continue
+            rows.append((*repo_key, resource, str(node[key_field]), node.get(updated_field), json.dumps(node)))
+    # contributor stats are replaced wholesale; GitHub answers {"processing": True} while computing them
+    if contributions and not contributions.get("processing"):
+        rows.append((*repo_key, "contributions", "stats", None, json.dumps(contributions)))
+
+    with conn:
+        if replace:
+            conn.execute("""
+                DELETE FROM github_sync_items
+                WHERE user_id = ? AND project_key = ? AND repo_owner = ? AND repo_name = ?
+            """, repo_key)
+        conn.executemany("""
+            INSERT INTO github_sync_items (
+                user_id, project_key, repo_owner, repo_name, resource, item_key, updated_at, node_json
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, project_key, repo_owner, repo_name, resource, item_key)
+            DO UPDATE SET
+                updated_at = excluded.updated_at,
+                node_json = excluded.node_json
+        """, rows)
+        conn.executemany("""
+            INSERT INTO github_sync_state (user_id, project_key, repo_owner, repo_name, resource, watermark)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, project_key, repo_owner, repo_name, resource)
+            DO UPDATE SET
+                watermark = excluded.watermark,
+                synced_at = datetime('now')
+        """, [(*repo_key, resource, watermark) for resource in SYNC_ITEM_FIELDS])
+
+    if constants.VERBOSE:
+        print(f"[GitHub] Synced {len(rows)} changed items for {owner}/{repo} (watermark {watermark})")
+
+
+def load_github_sync_items(conn, user_id, project_name, owner, repo):
+    """
+    Return every synced node of the repo as {"prs", "issues", "commits": [...], "contributions": dict},
+    most recently updated first, or None if the repo was never synced.
+    """
+    pk = get_project_key(conn, user_id, project_name)
+    if pk is None:
+        return None
+    rows = conn.execute("""
+        SELECT resource, node_json
+        FROM github_sync_items
+        WHERE user_id = ? AND project_key = ? AND repo_owner = ? AND repo_name = ?
+        ORDER BY updated_at DESC, item_key DESC
+    """, (user_id, pk, owner, repo)).fetchall()
+    if not rows:
+        return None
+
+    items = {resource: [] for resource in SYNC_ITEM_FIELDS}
+    items["contributions"] = {}
+    for resource, node_json in rows:
+        if resource == "contributions":
+            items["contributions"] = json.loads(node_json)
+        elif resource in items:
+            items[resource].append(json.loads(node_json))
+    return items
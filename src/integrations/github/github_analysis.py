@@ -1,3 +1,11 @@
+from datetime import datetime, timedelta, timezone
+
+from .db_repo_metrics import (
+    get_github_sync_watermarks,
+    get_github_synced_commit_oids,
+    load_github_sync_items,
+    store_github_sync_items,
+)
 from .github_api import (
     get_gh_repo_commit_activity,
     get_gh_repo_issues,
@@ -5,25 +13,103 @@ from .github_api import (
     get_repo_commit_timestamps,
     get_all_issue_comments
 )
-from .github_analysis_graphql import fetch_pr_collaboration_graphql
+from .github_analysis_graphql import (
+    fetch_pr_collaboration_graphql,
+    fetch_repo_activity_graphql,
+    summarize_commits,
+    summarize_issues,
+    summarize_pr_collaboration,
+)
+
+# Watermarks are taken from the local clock before fetching; step back a little so clock skew
+# against GitHub cannot hide items updated right around the previous sync.
+SYNC_OVERLAP = timedelta(minutes=5)
 
 
 def fetch_github_metrics(token, owner, repo, gh_username):
-    # Fast REST endpoints
+    # REST: the contributor stats endpoint has no GraphQL equivalent
+    contributions = get_gh_repo_contributions(token, owner, repo, gh_username)
+
+    # GraphQL: PRs with reviews and comments, issues with comments and commit history,
+    # cursor-paginated together
+    try:
+        activity = fetch_repo_activity_graphql(token, owner, repo)
+    except Exception as e:
+        print(f"[GitHub] GraphQL collection failed ({e}); falling back to REST.")
+        return _fetch_rest_metrics(token, owner, repo, gh_username, contributions)
+
+    return _metrics_from_activity(owner, repo, gh_username, contributions, activity)
+
+
+def sync_github_metrics(conn, user_id, project_name, token, owner, repo, gh_username, full=False):
+    """
+    Delta-sync a repository into github_sync_items and return fetch_github_metrics-shaped metrics
+    computed from everything stored for it.
+
+    Only PRs and issues changed since the per-resource watermarks of the last sync, and commits
+    not stored yet, are fetched; the first sync (or full=True) reads everything and replaces what
+    was stored.
+    """
+    watermarks = {} if full else get_github_sync_watermarks(conn, user_id, project_name, owner, repo)
+    # Commits are matched by oid, not date: a merge can bring in commits older than the watermark
+    known_commits = get_github_synced_commit_oids(conn, user_id, project_name, owner, repo) if watermarks else set()
+    started = (datetime.now(timezone.utc) - SYNC_OVERLAP).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    contributions = get_gh_repo_contributions(token, owner, repo, gh_username)
+    try:
+        activity = fetch_repo_activity_graphql(token, owner, repo, watermarks, known_commits)
+    except Exception as e:
+        print(f"[GitHub] GraphQL sync failed ({e}); falling back to a full REST fetch.")
+        return _fetch_rest_metrics(token, owner, repo, gh_username, contributions)
+
+    store_github_sync_items(
+        conn, user_id, project_name, owner, repo, activity, started,
+        contributions=contributions,
+        replace=not watermarks,
+    )
+    return github_metrics_from_db(conn, user_id, project_name, owner, repo, gh_username)
+
+
+def github_metrics_from_db(conn, user_id, project_name, owner, repo, gh_username):
+    """
+    fetch_github_metrics-shaped metrics rebuilt from the synced items without any network
+    request, or None if the repository was never synced.
+    """
+    items = load_github_sync_items(conn, user_id, project_name, owner, repo)
+    if items is None:
+        return None
+    return _metrics_from_activity(owner, repo, gh_username, items["contributions"], items)
+
+
+def _metrics_from_activity(owner, repo, gh_username, contributions, activity):
+    commit_activity, commit_timestamps = summarize_commits(activity["commits"], gh_username)
+    user_issues = summarize_issues(activity["issues"], gh_username)
+    pr_collab = summarize_pr_collaboration(activity["prs"], gh_username)
+    return _build_metrics(
+        owner, repo, gh_username, contributions,
+        commit_activity, commit_timestamps, user_issues, pr_collab,
+    )
+
+
+def _fetch_rest_metrics(token, owner, repo, gh_username, contributions):
     commit_activity = get_gh_repo_commit_activity(token, owner, repo, gh_username)
     all_issue_comments = get_all_issue_comments(token, owner, repo)
     user_issues = get_gh_repo_issues(token, owner, repo, gh_username, all_issue_comments)
-    contributions = get_gh_repo_contributions(token, owner, repo, gh_username)
     commit_timestamps = get_repo_commit_timestamps(token, owner, repo)
-
-    # GraphQL: ALL PR-related collaboration
     pr_collab = fetch_pr_collaboration_graphql(
         token,
         owner,
         repo,
         gh_username
     )
+    return _build_metrics(
+        owner, repo, gh_username, contributions,
+        commit_activity, commit_timestamps, user_issues, pr_collab,
+    )
 
+
+def _build_metrics(owner, repo, gh_username, contributions,
+                   commit_activity, commit_timestamps, user_issues, pr_collab):
     # Transform graphql_prs to pull_requests format for storage functions
     user_prs = pr_collab.get("user_prs", [])
     pull_requests = {
@@ -31,7 +117,7 @@ def fetch_github_metrics(token, owner, repo, gh_username):
         "total_merged": sum(1 for pr in user_prs if pr.get("merged")),
         "user_prs": user_prs
     }
-    
+
     # Extract reviews from graphql_prs
     reviews = pr_collab.get("reviews", {})
 
@@ -39,14 +125,12 @@ def fetch_github_metrics(token, owner, repo, gh_username):
         "repository": f"{owner}/{repo}",
         "username": gh_username,
 
-        # REST
         "commits": commit_activity,
         "issues": user_issues,
         "contributions": contributions,
         "commit_timestamps": commit_timestamps,
 
-        # GraphQL
         "graphql_prs": pr_collab,
         "pull_requests": pull_requests,
         "reviews": reviews,
-    }
\ No newline at end of file
+    }
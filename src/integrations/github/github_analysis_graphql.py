@@ -1,5 +1,8 @@
+from collections import defaultdict
+from datetime import datetime
+
 from .github_graphql import gh_graphql
-from .graphql_queries import PR_REVIEW_QUERY
+from .graphql_queries import PR_REVIEW_QUERY, REPO_ACTIVITY_QUERY
 
 def fetch_pr_collaboration_graphql(token, owner, repo, username):
     """
@@ -31,8 +34,170 @@ def fetch_pr_collaboration_graphql(token, owner, repo, username):
             break
         cursor = page_info.get("endCursor")
 
-    prs = all_prs
+    return summarize_pr_collaboration(all_prs, username)
+
+
+def fetch_repo_activity_graphql(token, owner, repo, since=None, known_commits=None):
+    """
+    Fetch all PRs (with reviews and comments), issues (with comments) and default-branch commits
+    of a repository via GraphQL.
+
+    Each request reads the next page of every connection that still has one, so a repository
+    costs as many requests as its longest connection has pages (100 items each).
+    `since` maps "prs"/"issues" to an ISO 8601 watermark; only items updated at or after it are
+    fetched. PRs come newest update first and stop at the watermark.
+    `known_commits` is the set of commit oids stored by earlier syncs: only commits not in it are
+    returned, and the history walk stops once every parent of those commits is known. Commit
+    dates are no watermark, since a merge can bring in commits committed long before it.
+    Returns {"prs": [...], "issues": [...], "commits": [...]} with the raw GraphQL nodes.
+    """
+    since = since or {}
+    known = set(known_commits or ())
+    unseen_parents = set()  # parents of new commits not yet read or known
+    collected = {"prs": [], "issues": [], "commits": []}
+    cursors = {"prs": None, "issues": None, "commits": None}
+    pending = {"prs", "issues", "commits"}
+
+    while pending:
+        variables = {
+            "owner": owner,
+            "repo": repo,
+            "withPrs": "prs" in pending,
+            "prCursor": cursors["prs"],
+            "withIssues": "issues" in pending,
+            "issueCursor": cursors["issues"],
+            "issuesSince": since.get("issues"),
+            "withCommits": "commits" in pending,
+            "commitCursor": cursors["commits"],
+        }
+        repository = gh_graphql(token, REPO_ACTIVITY_QUERY, variables)["repository"] or {}
+
+        connections = {
+            "prs": repository.get("pullRequests"),
+            "issues": repository.get("issues"),
+            # Empty repositories have no default branch
+            "commits": ((repository.get("defaultBranchRef") or {}).get("target") or {}).get("history"),
+        }
+        for name in list(pending):
+            connection = connections[name]
+            if not connection:
+                pending.discard(name)
+                continue
+            nodes = connection.get("nodes") or []
+            reached_watermark = False
+            if name == "prs" and since.get("prs"):
+                fresh = [pr for pr in nodes if (pr.get("updatedAt") or "") >= since["prs"]]
+                reached_watermark = len(fresh) < len(nodes)
+                nodes = fresh
+            elif name == "commits" and known:
+                nodes = _new_commits(nodes, known, unseen_parents)
+                reached_watermark = not unseen_parents
+            collected[name].extend(nodes)
+            page_info = connection.get("pageInfo") or {}
+            if page_info.get("hasNextPage") and not reached_watermark:
+                cursors[name] = page_info.get("endCursor")
+            else:
+                pending.discard(name)
+
+    return collected
+
+
+def _new_commits(nodes, known, unseen_parents):
+    """
+    The commits of one history page not in `known`. `known` gains them and `unseen_parents`
+    tracks the parents still to be read; once it is empty every new commit has been reached.
+    """
+    fresh = []
+    for node in nodes:
+        oid = node.get("oid")
+        unseen_parents.discard(oid)
+        if oid in known:
+            continue
+        known.add(oid)
+        fresh.append(node)
+        for parent in (node.get("parents") or {}).get("nodes") or []:
+            if parent.get("oid") and parent["oid"] not in known:
+                unseen_parents.add(parent["oid"])
+    return fresh
+
+
+def summarize_commits(commits, username):
+    """
+    (user's commits per day, timestamps of all commits) from GraphQL commit history nodes,
+    matching get_gh_repo_commit_activity and get_repo_commit_timestamps.
+    """
+    daily = defaultdict(int)
+    timestamps = []
+    for commit in commits:
+        authored = commit.get("authoredDate")
+        if not authored:
+            continue
+        login = ((commit.get("author") or {}).get("user") or {}).get("login")
+        if login == username:
+            daily[authored.split("T")[0]] += 1
+        try:
+            timestamps.append(datetime.fromisoformat(authored.replace("Z", "")))
+        except ValueError:
+            # ignore malformed timestamps
+            continue
+    return dict(daily), timestamps
+
+
+def summarize_issues(issues, username):
+    """
+    The get_gh_repo_issues result from GraphQL issue nodes.
+    user_issue_comments lists the user's comments ({issue_number, body, created_at}) and
+    total_issue_comments counts every comment on issues; PR discussion comments are counted
+    separately by summarize_pr_collaboration.
+    """
+    opened = defaultdict(int)
+    closed = defaultdict(int)
+    user_issues = []
+    user_issue_comments = []
+    total_issue_comments = 0
+
+    for issue in issues:
+        created_at = (issue.get("createdAt") or "").split("T")[0]
+        closed_at = issue.get("closedAt")
+
+        opened[created_at] += 1
+        if closed_at:
+            closed[closed_at.split("T")[0]] += 1
+
+        # Collect user-assigned issues for detailed storage (only assigned, not authored)
+        assignees = [a.get("login", "") for a in (issue.get("assignees") or {}).get("nodes", [])]
+        if username in assignees:
+            user_issues.append({
+                "title": issue.get("title", ""),
+                "body": issue.get("body", "") or "",
+                "labels": [l.get("name", "").lower() for l in (issue.get("labels") or {}).get("nodes", [])],
+                "created_at": created_at,
+                "closed_at": closed_at.split("T")[0] if closed_at else None
+            })
+
+        comments = issue.get("comments") or {}
+        total_issue_comments += comments.get("totalCount", len(comments.get("nodes", [])))
+        for c in comments.get("nodes", []):
+            if (c.get("author") or {}).get("login") == username:
+                user_issue_comments.append({
+                    "issue_number": issue.get("number"),
+                    "body": c.get("body", ""),
+                    "created_at": c.get("createdAt"),
+                })
+
+    return {
+        "opened": dict(opened),
+        "closed": dict(closed),
+        "total_opened": sum(opened.values()),
+        "total_closed": sum(closed.values()),
+        "total_issue_comments": total_issue_comments,
+        "user_issue_comments": user_issue_comments,
+        "user_issues": user_issues,
+    }
+
 
+def summarize_pr_collaboration(prs, username):
+    """PR collaboration metrics (see fetch_pr_collaboration_graphql) from GraphQL PR nodes."""
     prs_opened = 0
     prs_reviewed = 0
     review_comments = []
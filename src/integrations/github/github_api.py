@@ -1,17 +1,65 @@
+import hashlib
+import os
+import re
+import threading
 import requests
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import time
 from datetime import datetime
 
+from requests.adapters import HTTPAdapter
+
+from src.db.connection import connect
+from src.db.github_http_cache import get_github_http_cache, store_github_http_cache
+
 """
 Takes GitHub OAuth token as input
 Makes authenticated API requests
 Returns a sorted, deduplicated list of repositories attached to the user's GitHub account
+
+Requests share one pooled HTTP session, and at most GITHUB_MAX_CONCURRENCY of them are in flight
+at once across all threads. Paginated endpoints fetch page 1, read the page count from its Link
+header and fetch the remaining pages concurrently. 200 responses carrying an ETag are stored
+(github_http_cache) and revalidated with If-None-Match, so an unchanged resource comes back as a
+304, which GitHub does not count against the rate limit.
+
+Configuration (environment):
+ - GITHUB_MAX_CONCURRENCY: GitHub requests in flight at once (default 8)
+ - GITHUB_HTTP_CACHE: "0" disables conditional requests (default "1")
+ - GITHUB_HTTP_CACHE_MAX_ENTRIES: stored responses kept, least recently used evicted (default 2000)
+ - GITHUB_HTTP_CACHE_TTL_DAYS: age after which a stored response is evicted (default 30)
 """
 
+GITHUB_MAX_CONCURRENCY = max(1, int(os.getenv("GITHUB_MAX_CONCURRENCY", "8")))
+GITHUB_HTTP_CACHE = os.getenv("GITHUB_HTTP_CACHE", "1").strip() not in ("0", "false", "no")
+GITHUB_HTTP_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_HTTP_CACHE_MAX_ENTRIES", "2000"))
+GITHUB_HTTP_CACHE_TTL_SECONDS = float(os.getenv("GITHUB_HTTP_CACHE_TTL_DAYS", "30")) * 86400
+
+PER_PAGE = 100
+
+GHResponse = namedtuple("GHResponse", ["data", "headers"])
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=GITHUB_MAX_CONCURRENCY))
+_request_slots = threading.BoundedSemaphore(GITHUB_MAX_CONCURRENCY)
+
+_LAST_PAGE_RE = re.compile(r'<([^>]*)>;\s*rel="last"')
+
+
+def http_session() -> requests.Session:
+    """The pooled session every GitHub REST request goes through."""
+    return _session
+
+
 # Helper function for authenticated GET requests to GitHub API
 # Raises runtime error on failure and returns parsed JSON
 def gh_get(token: str, url: str, retries: int = 6, delay: int = 2):
+    return gh_get_response(token, url, retries, delay).data
+
+
+def gh_get_response(token: str, url: str, retries: int = 6, delay: int = 2) -> GHResponse:
+    """gh_get, also returning the response headers (empty when the request failed)."""
     if not token:
         raise ValueError("GitHub token missing — user must authenticate first.")
 
@@ -19,10 +67,20 @@ def gh_get(token: str, url: str, retries: int = 6, delay: int = 2):
         "Authorization": f"Bearer {token}",
         "Accept": "application/vnd.github+json"
     }
+    token_key = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+    cached = _cached_response(token_key, url)
+    if cached:
+        headers["If-None-Match"] = cached[0]
 
     for attempt in range(retries):
         try:
-            r = requests.get(url, headers=headers)
+            with _request_slots:
+                r = _session.get(url, headers=headers)
+            response_headers = getattr(r, "headers", None) or {}
+
+            # Not modified since the stored copy (does not count against the rate limit)
+            if r.status_code == 304 and cached:
+                return GHResponse(cached[1], response_headers)
 
             # GitHub stats endpoints sometimes return 202 while processing
             if r.status_code == 202:
@@ -38,16 +96,20 @@ def gh_get(token: str, url: str, retries: int = 6, delay: int = 2):
 
                     # If JSON body is empty then it is a graceful empty, so return {}
                     if err_json == {}:
-                        return {}
+                        return GHResponse({}, {})
 
                     # If JSON body has content, failure, return []
-                    return []
+                    return GHResponse([], {})
                 except Exception:
                     # If body is not JSON, treat as failure, return []
                     print("Error fetching metrics: No details")
-                    return []
+                    return GHResponse([], {})
 
-            return r.json()
+            data = r.json()
+            etag = response_headers.get("ETag")
+            if etag:
+                _store_response(token_key, url, etag, data)
+            return GHResponse(data, response_headers)
 
         except Exception as e:
             print(f"[GitHub] Exception during API call: {e}")
@@ -55,24 +117,86 @@ def gh_get(token: str, url: str, retries: int = 6, delay: int = 2):
 
     # After retries, still processing or repeated failure
     print(f"[GitHub] Warning: API did not return data after {retries} retries. URL: {url}")
-    return {}
+    return GHResponse({}, {})
+
+
+def _cached_response(token_key, url):
+    if not GITHUB_HTTP_CACHE or os.getenv("APP_DB_PATH", "local_storage.db") == ":memory:":
+        return None
+    try:
+        conn = connect()
+    except Exception:
+        return None
+    try:
+        return get_github_http_cache(conn, token_key, url)
+    finally:
+        conn.close()
+
+
+def _store_response(token_key, url, etag, data):
+    if not GITHUB_HTTP_CACHE or os.getenv("APP_DB_PATH", "local_storage.db") == ":memory:":
+        return
+    try:
+        conn = connect()
+    except Exception:
+        return
+    try:
+        store_github_http_cache(
+            conn, token_key, url, etag, data,
+            max_entries=GITHUB_HTTP_CACHE_MAX_ENTRIES,
+            ttl_seconds=GITHUB_HTTP_CACHE_TTL_SECONDS,
+        )
+    finally:
+        conn.close()
 
-def paginated_gh_get(token, base_url):
-    page = 1
-    results = []
 
-    while True:
-        sep = "&" if "?" in base_url else "?"
-        url = f"{base_url}{sep}per_page=100&page={page}"
+def _last_page(headers) -> int:
+    """Page count from a Link header's rel="last" URL; 0 when there is no such link."""
+    match = _LAST_PAGE_RE.search(headers.get("Link", "") if headers else "")
+    if not match:
+        return 0
+    page = re.search(r"[?&]page=(\d+)", match.group(1))
+    return int(page.group(1)) if page else 0
+
+
+def _page_url(base_url, page):
+    sep = "&" if "?" in base_url else "?"
+    return f"{base_url}{sep}per_page={PER_PAGE}&page={page}"
 
-        data = gh_get(token, url)
+
+def paginated_gh_get(token, base_url):
+    first = gh_get_response(token, _page_url(base_url, 1))
+    data = first.data
+    if not data or isinstance(data, dict):
+        return []
+    results = list(data)
+    if len(data) < PER_PAGE:
+        return results
+
+    last_page = _last_page(first.headers)
+    if last_page > 1:
+        # Page count known: fetch the rest concurrently, keeping page order
+        pages = range(2, last_page + 1)
+        with ThreadPoolExecutor(max_workers=min(GITHUB_MAX_CONCURRENCY, len(pages))) as pool:
+            for data in pool.map(lambda page: gh_get(token, _page_url(base_url, page)), pages):
+                if not data or isinstance(data, dict):
+                    break
+                results.extend(data)
+                if len(data) < PER_PAGE:
+                    break
+        return results
+
+    # No Link header: walk the pages in order
+    page = 2
+    while True:
+        data = gh_get(token, _page_url(base_url, page))
 
         if not data or isinstance(data, dict):
             break
 
         results.extend(data)
 
-        if len(data) < 100:
+        if len(data) < PER_PAGE:
             break
 
         page += 1
@@ -122,67 +246,43 @@ def get_gh_repo_metadata(owner, repo, token):
     return data.get("id"), data.get("default_branch")
 
 def get_gh_repo_commit_activity(token, owner, repo, username):
-    page = 1
     daily = defaultdict(int)
 
-    while True:
-        url = f"https://api.github.com/repos/{owner}/{repo}/commits?author={username}&per_page=100&page={page}"
-        data = gh_get(token, url)
-
-        # sometimes stats take longer to get, keep retrying until github api is returns data (as stated in the GitHub REST API documentation)
-        if data is None: return {"processing": True}
-
-        # no morepages
-        if isinstance(data, list) and len(data) == 0: break
-
-        for commit in data:
-            date_str = commit["commit"]["author"]["date"].split("T")[0]
-            daily[date_str] += 1
-
-        page += 1
+    url = f"https://api.github.com/repos/{owner}/{repo}/commits?author={username}"
+    for commit in paginated_gh_get(token, url):
+        date_str = commit["commit"]["author"]["date"].split("T")[0]
+        daily[date_str] += 1
 
     return dict(daily)
 
 # gets PRs and issues, so aggregate this function to only get issues
 def get_gh_repo_issues(token, owner, repo, github_username, all_issue_comments):
-    page = 1
     opened = defaultdict(int)
     closed = defaultdict(int)
     user_issues = []
 
-    while True:
-        url = f"https://api.github.com/repos/{owner}/{repo}/issues?state=all&per_page=100&page={page}"
-        data = gh_get(token, url)
-
-        if not data:
-            break
+    url = f"https://api.github.com/repos/{owner}/{repo}/issues?state=all"
+    for issue in paginated_gh_get(token, url):
+        if "pull_request" in issue:
+            continue
 
-        for issue in data:
-            if "pull_request" in issue:
-                continue
+        created_at = issue.get("created_at", "").split("T")[0]
+        closed_at = issue.get("closed_at")
 
-            created_at = issue.get("created_at", "").split("T")[0]
-            closed_at = issue.get("closed_at")
-
-            opened[created_at] += 1
-            if closed_at:
-                closed[closed_at.split("T")[0]] += 1
-
-            # Collect user-assigned issues for detailed storage (only assigned, not authored)
-            assignees = [a.get("login", "") for a in issue.get("assignees", [])]
-            if github_username in assignees:
-                user_issues.append({
-                    "title": issue.get("title", ""),
-                    "body": issue.get("body", "") or "",
-                    "labels": [l.get("name", "").lower() for l in issue.get("labels", [])],
-                    "created_at": created_at,
-                    "closed_at": closed_at.split("T")[0] if closed_at else None
-                })
-
-        if len(data) < 100:
-            break
+        opened[created_at] += 1
+        if closed_at:
+            closed[closed_at.split("T")[0]] += 1
 
-        page += 1
+        # Collect user-assigned issues for detailed storage (only assigned, not authored)
+        assignees = [a.get("login", "") for a in issue.get("assignees", [])]
+        if github_username in assignees:
+            user_issues.append({
+                "title": issue.get("title", ""),
+                "body": issue.get("body", "") or "",
+                "labels": [l.get("name", "").lower() for l in issue.get("labels", [])],
+                "created_at": created_at,
+                "closed_at": closed_at.split("T")[0] if closed_at else None
+            })
 
     # get comment counts from ALL comments
     total_issue_comments = len(all_issue_comments)
@@ -308,70 +408,47 @@ def get_gh_reviews_for_repo(token, owner, repo, pulls):
     
     pulls: list[int] of PR numbers
     """
-    review_data = {}
-
-    for pr in pulls:
-        review_data[pr] = {
-            "reviews": get_gh_pr_reviews(token, owner, repo, pr),
-            "review_comments": get_gh_pr_review_comments(token, owner, repo, pr),
+    pulls = list(pulls)
+    if not pulls:
+        return {}
+
+    # Both calls for every PR are independent; the shared request slots bound the parallelism.
+    with ThreadPoolExecutor(max_workers=min(GITHUB_MAX_CONCURRENCY, 2 * len(pulls))) as pool:
+        reviews = {pr: pool.submit(get_gh_pr_reviews, token, owner, repo, pr) for pr in pulls}
+        comments = {pr: pool.submit(get_gh_pr_review_comments, token, owner, repo, pr) for pr in pulls}
+
+        return {
+            pr: {
+                "reviews": reviews[pr].result(),
+                "review_comments": comments[pr].result(),
+            }
+            for pr in pulls
         }
 
-    return review_data  
-
 def get_repo_commit_timestamps(token, owner, repo):
     """
     Fetch timestamps for ALL commits in the repo.
     Returns a list of datetime objects.
     Preserves all existing gh_get error-handling semantics.
     """
-    page = 1
     timestamps = []
 
-    while True:
-        url = f"https://api.github.com/repos/{owner}/{repo}/commits?per_page=100&page={page}"
-        data = gh_get(token, url)
-
-        # If GitHub gives nothing or returns an error object, stop
-        if not data or isinstance(data, dict): break
-
-        for commit in data:
-            ts_str = commit["commit"]["author"]["date"]  # e.g. "2024-06-01T14:22:12Z"
-
-            # Convert ISO timestamp string into datetime
-            try:
-                # Remove 'Z' because Python's fromisoformat doesn't accept it
-                clean = ts_str.replace("Z", "")
-                ts_dt = datetime.fromisoformat(clean)
-                timestamps.append(ts_dt)
-            except Exception:
-                # ignore malformed timestamps
-                continue
-
-        # No more pages
-        if len(data) < 100:
-            break
+    url = f"https://api.github.com/repos/{owner}/{repo}/commits"
+    for commit in paginated_gh_get(token, url):
+        ts_str = commit["commit"]["author"]["date"]  # e.g. "2024-06-01T14:22:12Z"
 
-        page += 1
+        # Convert ISO timestamp string into datetime
+        try:
+            # Remove 'Z' because Python's fromisoformat doesn't accept it
+            clean = ts_str.replace("Z", "")
+            ts_dt = datetime.fromisoformat(clean)
+            timestamps.append(ts_dt)
+        except Exception:
+            # ignore malformed timestamps
+            continue
 
     return timestamps
 
 def get_pr_numbers_for_repo(token, owner, repo):
-    page = 1
-    pr_numbers = []
-
-    while True:
-        url = f"https://api.github.com/repos/{owner}/{repo}/pulls?state=all&per_page=100&page={page}"
-        data = gh_get(token, url)
-
-        if not data or isinstance(data, dict):
-            break
-
-        for pr in data:
-            pr_numbers.append(pr["number"])
-
-        if len(data) < 100:
-            break
-
-        page += 1
-
-    return pr_numbers
+    url = f"https://api.github.com/repos/{owner}/{repo}/pulls?state=all"
+    return [pr["number"] for pr in paginated_gh_get(token, url)]
@@ -1,4 +1,4 @@
-import requests
+from .github_api import http_session
 
 GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
 
@@ -8,7 +8,7 @@ def gh_graphql(token: str, query: str, variables: dict):
         "Content-Type": "application/json"
     }
 
-    resp = requests.post(
+    resp = http_session().post(
         GITHUB_GRAPHQL_URL,
         headers=headers,
         json={
@@ -18,4 +18,7 @@ def gh_graphql(token: str, query: str, variables: dict):
     )
 
     resp.raise_for_status()
-    return resp.json()["data"]
\ No newline at end of file
+    payload = resp.json()
+    if payload.get("errors") and not payload.get("data"):
+        raise RuntimeError(f"GitHub GraphQL error: {payload['errors'][0].get('message', payload['errors'])}")
+    return payload["data"]
@@ -1,9 +1,93 @@
 # NOTE: PR comments (pr.comments) are regular discussion messages.
 # PR reviews (pr.reviews) are formal submissions (approve/comment/request-changes).
+PR_ACTIVITY_FRAGMENT = """
+fragment PullRequestActivity on PullRequest {
+  number
+  title
+  body
+  createdAt
+  updatedAt
+  mergedAt
+  state
+  merged
+  author {
+    login
+  }
+  labels(first: 10) {
+    nodes {
+      name
+    }
+  }
+  comments(first: 50) {
+    nodes {
+      author {
+        login
+      }
+    }
+  }
+
+  reviews(first: 50) {
+    nodes {
+      author {
+        login
+      }
+      submittedAt
+      comments(first: 20) {
+        nodes {
+          author {
+            login
+          }
+          body
+        }
+      }
+    }
+  }
+}
+"""
+
 PR_REVIEW_QUERY = """
 query RepoPRs($owner: String!, $repo: String!, $cursor: String) {
   repository(owner: $owner, name: $repo) {
     pullRequests(first: 100, after: $cursor, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        ...PullRequestActivity
+      }
+    }
+  }
+}
+""" + PR_ACTIVITY_FRAGMENT
+
+# Everything the collaboration metrics need from a repository, one page of each connection per
+# request. Each connection has its own cursor; @include drops the ones already fully read.
+# Delta syncs pass issuesSince and stop reading PRs (newest update first) once they reach the
+# previous sync's watermark; a null watermark reads the whole connection. Commit history is not
+# filtered by date (a merge can bring in commits committed before the watermark): delta syncs
+# walk it from HEAD until every parent reached is already stored.
+REPO_ACTIVITY_QUERY = """
+query RepoActivity(
+  $owner: String!, $repo: String!,
+  $withPrs: Boolean!, $prCursor: String,
+  $withIssues: Boolean!, $issueCursor: String, $issuesSince: DateTime,
+  $withCommits: Boolean!, $commitCursor: String
+) {
+  repository(owner: $owner, name: $repo) {
+    pullRequests(first: 100, after: $prCursor, orderBy: {field: UPDATED_AT, direction: DESC}) @include(if: $withPrs) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        ...PullRequestActivity
+      }
+    }
+    issues(
+      first: 100, after: $issueCursor,
+      orderBy: {field: CREATED_AT, direction: DESC}, filterBy: {since: $issuesSince}
+    ) @include(if: $withIssues) {
       pageInfo {
         hasNextPage
         endCursor
@@ -13,37 +97,51 @@ query RepoPRs($owner: String!, $repo: String!, $cursor: String) {
         title
         body
         createdAt
-        mergedAt
-        state
-        merged
-        author {
-          login
-        }
+        updatedAt
+        closedAt
         labels(first: 10) {
           nodes {
             name
           }
         }
-        comments(first: 50) {
+        assignees(first: 20) {
           nodes {
-            author {
-              login
-            }
+            login
           }
         }
-
-        reviews(first: 50) {
+        comments(first: 100) {
+          totalCount
           nodes {
             author {
               login
             }
-            submittedAt
-            comments(first: 20) {
-              nodes {
-                author {
+            body
+            createdAt
+          }
+        }
+      }
+    }
+    defaultBranchRef @include(if: $withCommits) {
+      target {
+        ... on Commit {
+          history(first: 100, after: $commitCursor) {
+            pageInfo {
+              hasNextPage
+              endCursor
+            }
+            nodes {
+              oid
+              authoredDate
+              committedDate
+              parents(first: 10) {
+                nodes {
+                  oid
+                }
+              }
+              author {
+                user {
                   login
                 }
-                body
               }
             }
           }
@@ -52,4 +150,4 @@ query RepoPRs($owner: String!, $repo: String!, $cursor: String) {
     }
   }
 }
-"""
\ No newline at end of file
+""" + PR_ACTIVITY_FRAGMENT
@@ -1,4 +1,6 @@
-from typing import Optional
+from typing import Iterable, Optional
+
+from .drive_fetch import authorized_http, batch_get_revisions, drive_workers, execute, list_revisions, map_bounded
 
 
 def _count_words(text: Optional[str]) -> int:
@@ -7,13 +9,13 @@ def _count_words(text: Optional[str]) -> int:
     return len([tok for tok in text.split() if tok.strip()])
 
 
-def _fetch_current_doc_text(docs_service, drive_file_id: str) -> str:
+def _fetch_current_doc_text(docs_service, drive_file_id: str, http=None) -> str:
     """
     Best-effort fallback to fetch the current document content when a specific
     revision export is unavailable. Returns an empty string on failure.
     """
     try:
-        doc_content = docs_service.documents().get(documentId=drive_file_id).execute().get("body", {}).get("content", [])
+        doc_content = execute(docs_service.documents().get(documentId=drive_file_id), http).get("body", {}).get("content", [])
     except Exception:
         return ""
 
@@ -26,25 +28,37 @@ def _fetch_current_doc_text(docs_service, drive_file_id: str) -> str:
     return "".join(text_chunks)
 
 
-def analyze_google_doc(drive_service, docs_service, drive_file_id, user_email, creds: Optional[object] = None):
+def analyze_google_doc(drive_service, docs_service, drive_file_id, user_email, creds: Optional[object] = None,
+                       skip_revision_ids: Iterable[str] = ()):
     """
     Analyze a Google Doc file for all revisions by a single user.
+    Revisions listed in skip_revision_ids (already stored) are counted but not downloaded again.
     Returns:
-      - list of user revisions with revision_id, raw_text, word_count, timestamp
+      - list of newly fetched user revisions with revision_id, raw_text, word_count, timestamp
+      - skipped_revision_ids: the user's revisions that were skipped
       - total_revision_count (all users)
       - user_revision_count (for user_email)
     """
     from googleapiclient.errors import HttpError
 
     try:
-        revisions = drive_service.revisions().list(
-            fileId=drive_file_id,
-            fields="revisions(id,modifiedTime,lastModifyingUser(emailAddress,displayName))"
-        ).execute().get("revisions", [])
+        http = authorized_http(creds)
+        revisions = list_revisions(
+            drive_service,
+            drive_file_id,
+            "id,modifiedTime,lastModifyingUser(emailAddress,displayName)",
+            http=http,
+        )
         total_revision_count = len(revisions)
-        user_revisions = []
 
         target_email = (user_email or "").strip().lower()
+        own_revisions = [
+            rev for rev in revisions
+            if (rev.get("lastModifyingUser", {}).get("emailAddress") or "").strip().lower() == target_email
+        ]
+        skip = set(skip_revision_ids or ())
+        skipped_ids = [rev.get("id") for rev in own_revisions if rev.get("id") in skip]
+        to_fetch = [rev for rev in own_revisions if rev.get("id") not in skip]
 
         session = None
         if creds is not None:
@@ -53,51 +67,55 @@ def analyze_google_doc(drive_service, docs_service, drive_file_id, user_email, c
                 session = AuthorizedSession(creds)
             except Exception:
                 session = None
-        
-        for rev in revisions:
-            rev_id = rev.get("id")
-            rev_timestamp = rev.get("modifiedTime")
-            rev_user_email = (rev.get("lastModifyingUser", {}).get("emailAddress") or "").strip().lower()
 
-            if rev_user_email == target_email:
-                revision_text = None
-                text_source = "no_export_session"
+        # One batch request per 100 revisions instead of a revisions().get() round trip each
+        export_links = {}
+        if session and to_fetch:
+            try:
+                details = batch_get_revisions(
+                    drive_service, drive_file_id, [rev.get("id") for rev in to_fetch], "exportLinks", http=http
+                )
+                export_links = {
+                    rev_id: d.get("exportLinks", {}).get("text/plain") for rev_id, d in details.items()
+                }
+            except Exception:
+                export_links = {}
 
-                if session:
-                    try:
-                        rev_details = drive_service.revisions().get(
-                            fileId=drive_file_id,
-                            revisionId=rev_id,
-                            fields="exportLinks"
-                        ).execute()
-                        export_url = rev_details.get("exportLinks", {}).get("text/plain")
-                        if export_url:
-                            response = session.get(export_url)
-                            response.raise_for_status()
-                            revision_text = response.text
-                            text_source = "export_links"
-                    except Exception:
-                        revision_text = None
-
-                if revision_text is None:
-                    revision_text = _fetch_current_doc_text(docs_service, drive_file_id)
-                    text_source = "current_doc_fallback"
-
-                revision_text = revision_text or ""
-                char_count = len(revision_text)
-                revision_size = _count_words(revision_text)
-
-                user_revisions.append({
-                    "revision_id": rev_id,
-                    "raw_text": revision_text,
-                    "word_count": revision_size,
-                    "timestamp": rev_timestamp
-                })
+        def export_text(rev):
+            export_url = export_links.get(rev.get("id"))
+            if not export_url:
+                return None
+            try:
+                response = session.get(export_url)
+                response.raise_for_status()
+                return response.text
+            except Exception:
+                return None
+
+        texts = map_bounded(export_text, to_fetch, drive_workers(creds) if session else 1)
+
+        current_doc_text = None
+        user_revisions = []
+        for rev, revision_text in zip(to_fetch, texts):
+            if revision_text is None:
+                # Same current document for every revision without an export: fetch it once
+                if current_doc_text is None:
+                    current_doc_text = _fetch_current_doc_text(docs_service, drive_file_id, http=http)
+                revision_text = current_doc_text
+
+            revision_text = revision_text or ""
+            user_revisions.append({
+                "revision_id": rev.get("id"),
+                "raw_text": revision_text,
+                "word_count": _count_words(revision_text),
+                "timestamp": rev.get("modifiedTime")
+            })
 
         return {
             "status": "analyzed",
-            "revisions": user_revisions,       # all of this user’s revisions
-            "revision_count": len(user_revisions),
+            "revisions": user_revisions,       # this user's revisions fetched now
+            "skipped_revision_ids": skipped_ids,
+            "revision_count": len(own_revisions),
             "total_revision_count": total_revision_count
         }
 
@@ -105,7 +123,7 @@ def analyze_google_doc(drive_service, docs_service, drive_file_id, user_email, c
         return {"status": "failed", "error": str(e)}
 
 
-def fetch_drive_comments(drive_service, file_id, user_email, user_display_name=None):
+def fetch_drive_comments(drive_service, file_id, user_email, user_display_name=None, http=None):
     """
     Fetch all comments and replies from a Google Drive file.
     Matches by email if available, otherwise by displayName.
@@ -116,10 +134,10 @@ def fetch_drive_comments(drive_service, file_id, user_email, user_display_name=N
         
     try:
         # Fetch all comments for the file
-        comments_response = drive_service.comments().list(
+        comments_response = execute(drive_service.comments().list(
             fileId=file_id,
             fields="comments(id,content,author(displayName,emailAddress),createdTime,replies(id,content,author(displayName,emailAddress),createdTime),resolved)"
-        ).execute()
+        ), http)
         
         comments = comments_response.get("comments", [])
         target_email = (user_email or "").strip().lower()
@@ -2,6 +2,7 @@ import sqlite3
 from typing import Any, Dict
 import src.db as db
 from .api_calls import analyze_google_doc
+from .drive_fetch import drive_workers, map_bounded
 try:
     from src import constants
 except ModuleNotFoundError:
@@ -21,6 +22,7 @@ def process_project_files(conn: sqlite3.Connection, creds, drive_service, docs_s
     files = db.get_project_drive_files(conn, user_id, project_name)
 
     doc_file_ids = []  # Collect only Google Docs file IDs for collaboration analysis
+    files_to_analyze = []
 
     for f in files:
         file_id = f["drive_file_id"]
@@ -41,24 +43,40 @@ def process_project_files(conn: sqlite3.Connection, creds, drive_service, docs_s
         if constants.VERBOSE:
             print(f"Analyzing file: {f['drive_file_name']} ({file_id})")
 
-        result = analyze_drive_file(
+        files_to_analyze.append(f)
+
+    # Revisions already stored are not downloaded again
+    stored_revisions = {
+        f["drive_file_id"]: db.get_text_contribution_revision_words(conn, user_id, f["drive_file_id"])
+        for f in files_to_analyze
+    }
+
+    def analyze(f):
+        return analyze_drive_file(
             creds=creds,
             drive_service=drive_service,
             docs_service=docs_service,
             conn=conn,
             user_id=user_id,
             project_name=project_name,
-            drive_file_id=file_id,
+            drive_file_id=f["drive_file_id"],
             drive_file_name=f["drive_file_name"],
-            mime_type=mime_type,
+            mime_type=f["mime_type"],
             user_email=user_email,
+            known_revision_ids=stored_revisions[f["drive_file_id"]],
         )
 
+    # Fetch files concurrently (network only), then store from this thread's connection
+    results = map_bounded(analyze, files_to_analyze, drive_workers(creds))
+
+    for f, result in zip(files_to_analyze, results):
+        file_id = f["drive_file_id"]
+
         if result.get("status") == "failed":
             print(f"Failed to analyze {f['drive_file_name']}: {result.get('error')}")
             continue
 
-        # Store all user revisions
+        # Store the newly fetched user revisions
         for rev in result.get("revisions", []):
             revision_entry = {
                 "user_id": user_id,
@@ -70,7 +88,9 @@ def process_project_files(conn: sqlite3.Connection, creds, drive_service, docs_s
             }
             db.store_text_contribution_revision(conn, revision_entry)
 
+        known = stored_revisions[file_id]
         total_words = sum(rev.get("word_count", 0) for rev in result.get("revisions", []))
+        total_words += sum(known.get(rev_id, 0) for rev_id in result.get("skipped_revision_ids", []))
         summary_entry = {
             "user_id": user_id,
             "project_key": project_key,
@@ -93,7 +113,8 @@ def process_project_files(conn: sqlite3.Connection, creds, drive_service, docs_s
                 drive_service=drive_service,
                 file_ids=doc_file_ids,
                 user_email=user_email,
-                user_display_name=user_display_name
+                user_display_name=user_display_name,
+                creds=creds
             )
             return {
                 "status": "success",
@@ -105,10 +126,11 @@ def process_project_files(conn: sqlite3.Connection, creds, drive_service, docs_s
     return {"status": "success"}
 
 
-def analyze_drive_file(creds, drive_service, docs_service, conn, user_id, project_name, drive_file_id, drive_file_name, mime_type, user_email) -> Dict[str, Any]:
+def analyze_drive_file(creds, drive_service, docs_service, conn, user_id, project_name, drive_file_id, drive_file_name, mime_type, user_email, known_revision_ids=()) -> Dict[str, Any]:
     """
     Analyze a single linked Drive file.
     Routes to Google Doc analysis or non-Google Doc analysis.
+    Revisions in known_revision_ids are already stored and are not fetched again.
     """
     _ = (conn, user_id, project_name, drive_file_name)
     if mime_type == "application/vnd.google-apps.document":
@@ -117,7 +139,8 @@ def analyze_drive_file(creds, drive_service, docs_service, conn, user_id, projec
             drive_service=drive_service,
             docs_service=docs_service,
             drive_file_id=drive_file_id,
-            user_email=user_email
+            user_email=user_email,
+            skip_revision_ids=known_revision_ids
         )
     # Unsupported mime type ( Add pdf, txt,docx analysis later)
     return {
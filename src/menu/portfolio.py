@@ -9,7 +9,7 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple
 
 from src.insights.rank_projects.rank_project_importance import collect_project_data
-from src.db import get_project_summary_row
+from src.db import get_project_summary_row, load_portfolio_projects
 from src.insights.portfolio import (
     format_languages,
     format_frameworks,
@@ -127,7 +127,8 @@ def _display_portfolio(conn, user_id: int, username: str) -> bool:
     Returns True if portfolio was displayed, False if no projects.
     """
     try:
-        projects = build_portfolio_data(conn, user_id)
+        portfolio_projects = load_portfolio_projects(conn, user_id)
+        projects = build_portfolio_data(conn, user_id, portfolio_projects)
 
         if not projects:
             print(f"\n{'=' * 80}")
@@ -144,7 +145,7 @@ def _display_portfolio(conn, user_id: int, username: str) -> bool:
             project_type = project["project_type"]
             project_mode = project["project_mode"]
 
-            row = get_project_summary_row(conn, user_id, project_name)
+            row = portfolio_projects.get(project_name)
             summary = (row["summary"] or {}) if row else {}
 
             print(f"[{rank}] {project['display_name']} — Score {project['score']:.3f}")
@@ -167,7 +168,7 @@ def _display_portfolio(conn, user_id: int, username: str) -> bool:
 
             # Summary block (LLM vs non-LLM)
             for line in format_summary_block(
-                project_type, project_mode, summary, conn, user_id, project_name
+                project_type, project_mode, summary, conn, user_id, project_name, preloaded=row
             ):
                 print(f"  {line}")
 
@@ -35,9 +35,9 @@ from src.analysis.text_collaborative.text_collab_analysis import analyze_collabo
 from src.analysis.code_individual.code_llm_analyze import run_code_llm_analysis
 from src.analysis.code_individual.code_non_llm_analysis import run_code_non_llm_analysis, prompt_manual_code_project_summary
 from src.analysis.code_collaborative.code_collaborative_analysis import (
+    CodeRun,
     analyze_code_project,
     print_code_portfolio_summary,
-    set_manual_descs_store,
     prompt_collab_descriptions,
 )
 from src.analysis.code_collaborative.code_collaborative_analysis_helper import prompt_key_role
@@ -318,10 +318,9 @@ def send_to_analysis(conn, user_id, assignments, current_ext_consent, zip_path,
             # prompt_collab_descriptions expects list[(project_name, something)];
             projects_for_desc = [(name, "") for name in unique_code_names]
             project_descs = prompt_collab_descriptions(projects_for_desc, current_ext_consent)
-            set_manual_descs_store(project_descs)
         else:
-            # no code collab → clear any previous state
-            set_manual_descs_store({})
+            project_descs = {}
+        code_run = CodeRun(project_descs)
 
                 # 1) run all CODE collab
         github_prompted: set[str] = set()  # ask "Enhance with GitHub?" only once per project
@@ -351,6 +350,7 @@ def send_to_analysis(conn, user_id, assignments, current_ext_consent, zip_path,
                 summary,
                 version_key=vk,
                 skip_github_prompt=skip_github,
+                code_run=code_run,
             )
             github_prompted.add(project_name)
             _load_skills_into_summary(conn, user_id, project_name, summary)
@@ -371,7 +371,7 @@ def send_to_analysis(conn, user_id, assignments, current_ext_consent, zip_path,
 
         # print summary right after all CODE collab finished
         if code_collab:
-            print_code_portfolio_summary()
+            print_code_portfolio_summary(code_run.metrics)
 
         # 2) run all TEXT collab
         for project_name, project_type, vk in text_collab:
@@ -458,10 +458,12 @@ def get_individual_contributions(
     allow_prompts: bool = True,
     api_inputs: dict | None = None,
     skip_github_prompt: bool = False,
+    code_run: CodeRun | None = None,
 ):
     """
     Analyze collaborative projects to get specific user contributions in a collaborative project.
     The process used to get the individual contributions changes depending on the type of project (code/text).
+    Code projects record their metrics in `code_run` for the run's portfolio summary.
     """
     if constants.VERBOSE:
         print(f"[COLLABORATIVE] Preparing contribution analysis for '{project_name}' ({project_type})")
@@ -489,7 +491,8 @@ def get_individual_contributions(
             version_key=version_key,
             allow_prompts=allow_prompts,
             api_inputs=api_inputs,
-            skip_github_prompt=skip_github_prompt
+            skip_github_prompt=skip_github_prompt,
+            code_run=code_run,
         )
     else:
         print(f"[COLLABORATIVE] Unknown project type for '{project_name}', skipping.")
@@ -717,6 +720,7 @@ def analyze_code_contributions(
     allow_prompts: bool = True,
     api_inputs: dict | None = None,
     skip_github_prompt: bool = False,
+    code_run: CodeRun | None = None,
 ):
     """Collaborative code analysis: Git data + LLM summary."""
     if constants.VERBOSE:
@@ -732,6 +736,7 @@ def analyze_code_contributions(
         allow_prompts=allow_prompts,
         api_inputs=api_inputs,
         skip_github_prompt=skip_github_prompt,
+        code_run=code_run,
     )
 
     # activity-type summary for collaborative code (version-scoped when version_key given)
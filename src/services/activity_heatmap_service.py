@@ -4,7 +4,7 @@ from typing import Any, Dict, Literal, Tuple
 from src.db.project_summaries import get_project_summary_by_id
 from src.db.projects import get_project_key
 from src.analysis.visualizations.activity_heatmap import (
-    write_project_activity_heatmap,
+    get_project_activity_heatmap_png,
     build_project_activity_heatmap_matrix,
 )
 
@@ -20,14 +20,15 @@ def _resolve_project_name_from_project_id(
     return row.get("project_name") if row else None
 
 
-def get_activity_heatmap_png_path(
+def get_activity_heatmap_png_bytes(
     conn: Connection,
     user_id: int,
     project_id: int,
     mode: HeatmapMode = "diff",
     normalize: bool = True,
     include_unclassified_text: bool = True,
-) -> Tuple[str, str]:
+) -> Tuple[str, bytes]:
+    """(project_name, PNG bytes), drawn with the Pillow renderer and cached per version set."""
     project_name = _resolve_project_name_from_project_id(conn, user_id, project_id)
     if project_name is None:
         raise ValueError("Project not found")
@@ -38,15 +39,16 @@ def get_activity_heatmap_png_path(
         # In case project_summaries exists but projects row is missing
         raise ValueError("Project not found")
 
-    path = write_project_activity_heatmap(
+    png = get_project_activity_heatmap_png(
         conn,
         user_id,
         project_name,
         mode=mode,
         normalize=normalize,
         include_unclassified_text=include_unclassified_text,
+        renderer="pillow",
     )
-    return project_name, path
+    return project_name, png
 
 
 def build_activity_heatmap_png_url(
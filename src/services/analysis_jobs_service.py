@@ -0,0 +1,214 @@
+"""
+src/services/analysis_jobs_service.py
+
+Background execution for POST /projects/upload/{upload_id}/run (mode="queue").
+
+The analysis_jobs table is the queue: the request only inserts a row and returns its job_id,
+and a bounded thread pool claims rows and runs `execute_upload_run` with its own SQLite
+connection. Failed attempts are retried with a delay up to `max_attempts`; cancellation is
+cooperative and takes effect at the next project boundary.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+
+from src.db.analysis_jobs import (
+    claim_analysis_job,
+    create_analysis_job,
+    finish_analysis_job,
+    get_active_job_for_upload,
+    get_analysis_job,
+    is_analysis_job_cancel_requested,
+    list_analysis_jobs_for_upload,
+    list_job_ids_by_status,
+    request_analysis_job_cancel,
+    requeue_analysis_job,
+    update_analysis_job_progress,
+)
+from src.db.connection import connect
+from src.db.consent import get_latest_external_consent
+from src.db.uploads import get_upload_by_id
+from src.services.uploads_run_execute_service import AnalysisCancelled
+from src.services.uploads_run_service import execute_upload_run, upload_has_executable_artifacts
+
+
+ANALYSIS_JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", "2"))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", "2"))
+ANALYSIS_JOB_RETRY_DELAY_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_DELAY_SECONDS", "5"))
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, ANALYSIS_JOB_WORKERS),
+                thread_name_prefix="analysis-job",
+            )
+        return _executor
+
+
+def shutdown_analysis_workers(wait: bool = False) -> None:
+    """Stop the worker pool. Queued rows stay in the table and are picked up on next start."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _submit(job_id: int, delay_seconds: float = 0.0) -> None:
+    if delay_seconds > 0:
+        timer = threading.Timer(delay_seconds, _submit, args=(job_id,))
+        timer.daemon = True
+        timer.start()
+        return
+    _get_executor().submit(_run_job, job_id)
+
+
+def enqueue_analysis_job(
+    conn: sqlite3.Connection,
+    user_id: int,
+    upload_id: int,
+    scope: str,
+    *,
+    force_rerun: bool = False,
+) -> Dict[str, Any]:
+    """
+    Persist a queued job for the upload scope and hand it to the worker pool.
+    Only one queued/running job is allowed per upload.
+    """
+    active = get_active_job_for_upload(conn, upload_id)
+    if active:
+        raise HTTPException(
+            status_code=409,
+            detail={"code": "analysis_job_active", "job_id": active["job_id"]},
+        )
+
+    job_id = create_analysis_job(
+        conn,
+        user_id,
+        upload_id,
+        scope,
+        force_rerun=force_rerun,
+        max_attempts=ANALYSIS_JOB_MAX_ATTEMPTS,
+    )
+    _submit(job_id)
+    return get_analysis_job(conn, job_id)
+
+
+def recover_analysis_jobs() -> int:
+    """
+    Re-submit jobs left queued or running by a previous process (call once at startup).
+    Assumes a single API process owns the queue. Returns the number of jobs resubmitted.
+    """
+    conn = connect()
+    try:
+        for job_id in list_job_ids_by_status(conn, {"running"}):
+            requeue_analysis_job(conn, job_id, error="interrupted by server restart")
+        job_ids = list_job_ids_by_status(conn, {"queued"})
+    except sqlite3.OperationalError:
+        # Schema not initialised yet (fresh database): nothing to recover.
+        return 0
+    finally:
+        conn.close()
+
+    for job_id in job_ids:
+        _submit(job_id)
+    return len(job_ids)
+
+
+def get_analysis_job_for_upload(
+    conn: sqlite3.Connection,
+    user_id: int,
+    upload_id: int,
+    job_id: int,
+) -> Dict[str, Any]:
+    job = get_analysis_job(conn, job_id)
+    if not job or job["user_id"] != user_id or job["upload_id"] != upload_id:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return job
+
+
+def list_analysis_jobs(
+    conn: sqlite3.Connection,
+    user_id: int,
+    upload_id: int,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    upload = get_upload_by_id(conn, upload_id)
+    if not upload or upload["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return list_analysis_jobs_for_upload(conn, upload_id, limit=limit)
+
+
+def cancel_analysis_job(
+    conn: sqlite3.Connection,
+    user_id: int,
+    upload_id: int,
+    job_id: int,
+) -> Dict[str, Any]:
+    job = get_analysis_job_for_upload(conn, user_id, upload_id, job_id)
+    if job["status"] in {"queued", "running"}:
+        request_analysis_job_cancel(conn, job_id)
+    return get_analysis_job(conn, job_id)
+
+
+def _run_job(job_id: int) -> None:
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    try:
+        if not claim_analysis_job(conn, job_id):
+            return
+
+        job = get_analysis_job(conn, job_id)
+        upload = get_upload_by_id(conn, job["upload_id"])
+        if not upload:
+            finish_analysis_job(conn, job_id, "failed", error="Upload not found")
+            return
+
+        if not upload_has_executable_artifacts(conn, job["user_id"], upload, job["scope"]):
+            finish_analysis_job(conn, job_id, "succeeded", result={"executed_projects": [], "executed_count": 0})
+            return
+
+        final_attempt = job["attempts"] >= job["max_attempts"]
+
+        def _progress(done: int, total: int, current_project: str | None) -> None:
+            update_analysis_job_progress(conn, job_id, done=done, total=total, current_project=current_project)
+
+        try:
+            result = execute_upload_run(
+                conn,
+                job["user_id"],
+                upload,
+                job["scope"],
+                external_consent=get_latest_external_consent(conn, job["user_id"]),
+                final_attempt=final_attempt,
+                progress_cb=_progress,
+                should_cancel=lambda: is_analysis_job_cancel_requested(conn, job_id),
+                force_rerun=job["force_rerun"],
+            )
+        except AnalysisCancelled:
+            finish_analysis_job(conn, job_id, "cancelled")
+        except Exception as exc:
+            traceback.print_exc()
+            if final_attempt:
+                finish_analysis_job(conn, job_id, "failed", error=str(exc))
+            else:
+                requeue_analysis_job(conn, job_id, error=str(exc))
+                _submit(job_id, delay_seconds=ANALYSIS_JOB_RETRY_DELAY_SECONDS * job["attempts"])
+        else:
+            finish_analysis_job(conn, job_id, "succeeded", result=result)
+    finally:
+        conn.close()
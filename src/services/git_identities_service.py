@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import subprocess
 from typing import List, Tuple
 from sqlite3 import Connection
 from fastapi import HTTPException
@@ -57,6 +58,13 @@ def _resolve_api_repo_dir(
     return None
 
 
+def _collect_repo_authors(repo_dir: str) -> List[Tuple[str, str, int]]:
+    try:
+        return collect_repo_authors(repo_dir) or []
+    except subprocess.TimeoutExpired:
+        raise HTTPException(status_code=504, detail="Reading the Git history timed out")
+
+
 def _build_options_from_authors(
     authors: List[Tuple[str, str, int]],
     allow_collaborators: bool,
@@ -129,7 +137,7 @@ def get_git_identities(
         raise HTTPException(status_code=404, detail="No local Git repo found for this project")
 
     allow_collaborators = classification == "collaborative"
-    authors = collect_repo_authors(repo_dir) or []
+    authors = _collect_repo_authors(repo_dir)
     options = _build_options_from_authors(authors, allow_collaborators)
     commit_count_hint = int(sum((a[2] or 0) for a in authors))
     author_count_hint = len(authors)
@@ -227,7 +235,7 @@ def save_git_identities(
         )
         raise HTTPException(status_code=404, detail="No local Git repo found for this project")
 
-    authors = collect_repo_authors(repo_dir) or []
+    authors = _collect_repo_authors(repo_dir)
     options = _build_options_from_authors(authors, allow_collaborators=True)
     commit_count_hint = int(sum((a[2] or 0) for a in authors))
     author_count_hint = len(authors)
@@ -4,12 +4,7 @@ from typing import Any, Dict, List, Optional, Set
 
 from src.insights.rank_projects.rank_project_importance import collect_project_data
 from src.db import (
-    get_project_summary_row,
-    get_code_activity_percentages,
-    get_code_collaborative_duration,
-    get_code_collaborative_non_llm_summary,
-    get_text_duration,
-    get_code_individual_duration,
+    load_portfolio_projects,
     get_project_summary_by_name,
     update_project_summary_json,
 )
@@ -75,27 +70,25 @@ def _resolve_display_name(summary: Dict[str, Any], project_name: str) -> str:
     return name or project_name
 
 
-def _resolve_summary_text(summary: Dict[str, Any], conn, user_id: int, project_name: str, project_type: str, project_mode: str) -> Optional[str]:
+def _resolve_summary_text(summary: Dict[str, Any], row: Dict[str, Any], project_type: str, project_mode: str) -> Optional[str]:
     overrides = summary.get("manual_overrides") or {}
     text = (overrides.get("summary_text") or summary.get("summary_text") or "").strip()
     if text:
         return text
     if project_type == "code" and project_mode == "collaborative":
-        return get_code_collaborative_non_llm_summary(conn, user_id, project_name)
+        return row.get("non_llm_summary")
     return None
 
 
-def _get_dates(conn, user_id: int, project_name: str, project_type: Optional[str], project_mode: Optional[str]):
+def _get_dates(row: Dict[str, Any], project_type: Optional[str], project_mode: Optional[str]):
+    pair = None
     if project_type == "text":
-        pair = get_text_duration(conn, user_id, project_name)
-        return (pair[0], pair[1]) if pair else (None, None)
-    if project_type == "code" and project_mode == "collaborative":
-        pair = get_code_collaborative_duration(conn, user_id, project_name)
-        return (pair[0], pair[1]) if pair else (None, None)
-    if project_type == "code":
-        pair = get_code_individual_duration(conn, user_id, project_name)
-        return (pair[0], pair[1]) if pair else (None, None)
-    return (None, None)
+        pair = row.get("text_duration")
+    elif project_type == "code" and project_mode == "collaborative":
+        pair = row.get("collaborative_duration")
+    elif project_type == "code":
+        pair = row.get("individual_duration")
+    return (pair[0], pair[1]) if pair else (None, None)
 
   
   
@@ -104,9 +97,10 @@ def get_portfolio(conn, user_id: int) -> List[Dict[str, Any]]:
     if not project_scores:
         return []
 
+    portfolio_projects = load_portfolio_projects(conn, user_id)
     items: List[Dict[str, Any]] = []
     for rank, (project_name, score) in enumerate(project_scores, start=1):
-        row = get_project_summary_row(conn, user_id, project_name)
+        row = portfolio_projects.get(project_name)
         if row is None:
             continue
 
@@ -115,13 +109,11 @@ def get_portfolio(conn, user_id: int) -> List[Dict[str, Any]]:
         project_mode = row.get("project_mode") or summary.get("project_mode")
 
         display_name = _resolve_display_name(summary, project_name)
-        start_date, end_date = _get_dates(conn, user_id, project_name, project_type, project_mode)
+        start_date, end_date = _get_dates(row, project_type, project_mode)
         languages = list(summary.get("languages") or [])
         frameworks = _normalize_frameworks(summary.get("frameworks"))
         skills = _extract_skills(summary)
-        summary_text = _resolve_summary_text(
-            summary, conn, user_id, project_name, project_type or "", project_mode or ""
-        )
+        summary_text = _resolve_summary_text(summary, row, project_type or "", project_mode or "")
 
         text_type: Optional[str] = None
         contribution_percent: Optional[float] = None
@@ -137,7 +129,7 @@ def get_portfolio(conn, user_id: int) -> List[Dict[str, Any]]:
         activities: List[Dict[str, Any]] = []
         if project_type == "code":
             scope = project_mode or "individual"
-            percents = get_code_activity_percentages(conn, user_id, project_name, scope, "combined")
+            percents = row["activity_percentages"].get(scope)
             if percents:
                 activities = [{"name": name, "percent": round(pct, 2)} for name, pct in percents]
             else:
@@ -176,23 +168,27 @@ class CorruptProjectDataError(Exception):
 def build_portfolio_data(
     conn,
     user_id: int,
+    portfolio_projects: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Optional[List[Dict[str, Any]]]:
     """
     Build structured portfolio project data from all ranked projects.
     Returns a list of project dicts, or None if no projects found.
     Respects user skill highlighting preferences for portfolio context.
 
+    `portfolio_projects` is the output of load_portfolio_projects, loaded here if not given.
     Shared by the API route and the CLI menu.
     """
     project_scores = collect_project_data(conn, user_id)
     if not project_scores:
         return None
 
+    if portfolio_projects is None:
+        portfolio_projects = load_portfolio_projects(conn, user_id)
     projects: List[Dict[str, Any]] = []
 
     for project_name, score in project_scores:
 
-        row = get_project_summary_row(conn, user_id, project_name)
+        row = portfolio_projects.get(project_name)
         if row is None:
             continue
 
@@ -202,11 +198,15 @@ def build_portfolio_data(
         created_at = row.get("created_at") or ""
 
         display_name = resolve_portfolio_display_name(summary, project_name)
-        duration = format_duration(project_type, project_mode, created_at, user_id, project_name, conn)
-        activity = format_activity_line(project_type, project_mode, conn, user_id, project_name, summary)
+        duration = format_duration(
+            project_type, project_mode, created_at, user_id, project_name, conn, preloaded=row,
+        )
+        activity = format_activity_line(
+            project_type, project_mode, conn, user_id, project_name, summary, preloaded=row,
+        )
         summary_text = resolve_portfolio_summary_text(summary)
         contribution_bullets = resolve_portfolio_contribution_bullets(
-            summary, project_type, project_mode, conn, user_id, project_name,
+            summary, project_type, project_mode, conn, user_id, project_name, preloaded=row,
         )
 
         # Extract languages and frameworks as lists
@@ -225,7 +225,7 @@ def build_portfolio_data(
         # Extract skills as list, filtered by per-project user preferences
         all_project_skills = get_all_skills_from_summary(summary)
 
-        pk = get_project_key(conn, user_id, project_name)
+        pk = row["project_key"]
         highlighted_skills = get_highlighted_skills_for_display(
             conn=conn, user_id=user_id, context="portfolio", project_key=pk,
         ) if pk else None
@@ -263,11 +263,14 @@ def render_portfolio_text(
     projects: List[Dict[str, Any]],
     conn,
     user_id: int,
+    portfolio_projects: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> str:
     """
     Build a plain-text rendered portfolio from structured project data.
     Respects per-project skill highlighting preferences.
     """
+    if portfolio_projects is None:
+        portfolio_projects = load_portfolio_projects(conn, user_id)
     lines: List[str] = []
     lines.append(f"Portfolio — {name}")
     lines.append("=" * 80)
@@ -275,7 +278,7 @@ def render_portfolio_text(
 
     for rank, project in enumerate(projects, start=1):
         project_name = project["project_name"]
-        row = get_project_summary_row(conn, user_id, project_name)
+        row = portfolio_projects.get(project_name)
         summary = (row["summary"] or {}) if row else {}
         project_type = project["project_type"]
         project_mode = project["project_mode"]
@@ -289,14 +292,17 @@ def render_portfolio_text(
         lines.append(f"  {project['activity']}")
 
         # Get per-project highlighted skills
-        pk = get_project_key(conn, user_id, project_name)
+        pk = row["project_key"] if row else None
         highlighted_skills = get_highlighted_skills_for_display(
             conn=conn, user_id=user_id, context="portfolio", project_key=pk,
         ) if pk else None
 
         for line in format_skills_block(summary, highlighted_skills if highlighted_skills else None):
             lines.append(f"  {line}")
-        for line in format_summary_block(project_type, project_mode, summary, conn, user_id, project_name):
+        summary_lines = format_summary_block(
+            project_type, project_mode, summary, conn, user_id, project_name, preloaded=row,
+        )
+        for line in summary_lines:
             lines.append(f"  {line}")
         lines.append("")
 
@@ -313,11 +319,12 @@ def generate_portfolio(
     Generate a portfolio view from all ranked projects.
     Returns a dict with 'projects' list and 'rendered_text', or None if no projects.
     """
-    projects = build_portfolio_data(conn, user_id)
+    portfolio_projects = load_portfolio_projects(conn, user_id)
+    projects = build_portfolio_data(conn, user_id, portfolio_projects)
     if not projects:
         return None
 
-    rendered_text = render_portfolio_text(name, projects, conn, user_id)
+    rendered_text = render_portfolio_text(name, projects, conn, user_id, portfolio_projects)
 
     return {
         "projects": projects,
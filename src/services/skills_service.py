@@ -139,11 +139,12 @@ def get_activity_by_date_grid(conn, user_id: int, year: Optional[int] = None, pr
     When year is set: shows only that calendar year (Jan 1 - Dec 31).
     Returns available_years (years that contain data) for the year selector.
     """
-    from src.db.activity_by_date import get_activity_counts_by_date
-    from datetime import date, datetime, timedelta
+    from src.db.activity_by_date import load_activity_by_date
+    from datetime import date, timedelta
+    import numpy as np
 
-    counts, projects_by_date = get_activity_counts_by_date(conn, user_id, project_ids=project_ids)
-    if not counts:
+    activity = load_activity_by_date(conn, user_id, project_ids=project_ids)
+    if not activity:
         return {
             "title": "Activity by Date",
             "row_labels": ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"],
@@ -153,9 +154,8 @@ def get_activity_by_date_grid(conn, user_id: int, year: Optional[int] = None, pr
             "projects_by_date": {},
         }
 
-    # Derive available years from dates that have data
-    all_dates = list(counts.keys())
-    available_years = sorted(set(int(d[:4]) for d in all_dates if len(d) >= 4))
+    # Years that contain data
+    available_years = activity.years
 
     row_labels = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
 
@@ -177,8 +177,7 @@ def get_activity_by_date_grid(conn, user_id: int, year: Optional[int] = None, pr
         days_since_sun = (end.weekday() + 1) % 7
         end_sunday = end - timedelta(days=days_since_sun)
 
-        min_date_str = min(all_dates)
-        start = datetime.strptime(min_date_str[:10], "%Y-%m-%d").date()
+        start = activity.first_day
         days_back = (start.weekday() + 1) % 7
         start_sunday = start - timedelta(days=days_back)
 
@@ -188,24 +187,19 @@ def get_activity_by_date_grid(conn, user_id: int, year: Optional[int] = None, pr
         if total_weeks > max_weeks:
             start_sunday = end_sunday - timedelta(weeks=max_weeks - 1)
 
-    col_labels = []
-    matrix = [[0] * num_weeks for _ in range(7)]
-
-    for w in range(num_weeks):
-        week_start = start_sunday + timedelta(weeks=w)
-        col_labels.append(week_start.strftime("%Y-%m-%d")[:10])
-        for d in range(7):
-            day_date = week_start + timedelta(days=d)
-            key = day_date.strftime("%Y-%m-%d")
-            matrix[d][w] = counts.get(key, 0)
+    # One count per day of the grid, week by week, then turned into day-of-week rows
+    last_day = start_sunday + timedelta(days=7 * num_weeks - 1)
+    counts = activity.counts_between(start_sunday, last_day).reshape(num_weeks, 7)
+    week_starts = np.datetime64(start_sunday, "D") + 7 * np.arange(num_weeks)
 
     return {
         "title": "Activity by Date",
         "row_labels": row_labels,
-        "col_labels": col_labels,
-        "matrix": matrix,
+        "col_labels": np.datetime_as_string(week_starts).tolist(),
+        "matrix": counts.T.tolist(),
         "available_years": available_years,
-        "projects_by_date": projects_by_date,
+        # Tooltips are only needed for the days on the grid
+        "projects_by_date": activity.projects_between(start_sunday, last_day),
     }
 
 
@@ -9,8 +9,8 @@ from src.db.uploads import get_upload_by_id, patch_upload_state
 from src.utils.parsing import ZIP_DATA_DIR
 from src.services.uploads_run_state_service import merge_project_run_inputs
 from src.services.uploads_file_roles_util import safe_relpath
-from src.utils.helpers import extract_text_file, normalize_pdf_paragraphs
-from src.analysis.text_collaborative.text_sections import extract_document_sections
+from src.utils.helpers import extract_text_file, iter_normalized_paragraphs, iter_text_file_pages
+from src.analysis.text_collaborative.text_sections import iter_document_sections
 
 
 _ALLOWED_SECTION_STATUSES = {"needs_file_roles", "needs_summaries", "analyzing", "done"}
@@ -219,18 +219,47 @@ def _derive_main_file_sections(
     if not abs_path.exists():
         raise HTTPException(status_code=404, detail={"message": "Main file not found on disk", "relpath": relpath})
 
-    raw = extract_text_file(str(abs_path), conn, user_id) or ""
-    if not raw.strip():
+    # EXACTLY what CLI does before extract_document_sections(), streamed: pages are normalized
+    # and split into sections while the rest of the document is still being extracted.
+    has_text = False
+
+    def _pages():
+        nonlocal has_text
+        for page in _main_file_pages(conn, user_id, abs_path):
+            has_text = has_text or bool(page.strip())
+            yield page
+
+    pages = _pages()
+    sections = list(iter_document_sections(_paragraph_lines(iter_normalized_paragraphs(pages))))
+    # Anything the sectioning left unread still counts towards "has text"
+    for _ in pages:
+        pass
+
+    # Readable text that yields no sections is a valid, empty result
+    if not has_text:
         raise HTTPException(
             status_code=422,
             detail={"message": "Main file could not be extracted or is empty", "relpath": relpath},
         )
+    return sections
+
+
+def _main_file_pages(conn: sqlite3.Connection, user_id: int, abs_path: Path):
+    """Page texts of the main file: streamed for PDF/DOCX, the whole text otherwise."""
+    if abs_path.suffix.lower() in (".pdf", ".docx"):
+        yield from iter_text_file_pages(str(abs_path), conn, user_id)
+        return
+    raw = extract_text_file(str(abs_path), conn, user_id)
+    if isinstance(raw, str) and raw:
+        yield raw
 
-    # EXACTLY what CLI does before extract_document_sections()
-    normalized_paragraphs = normalize_pdf_paragraphs(raw) or []
-    normalized_text = "\n\n".join(normalized_paragraphs).strip()
 
-    return extract_document_sections(normalized_text) or []
+def _paragraph_lines(paragraphs):
+    """Lines of "\n\n".join(paragraphs), without building the joined text."""
+    for index, paragraph in enumerate(paragraphs):
+        if index:
+            yield ""
+        yield from paragraph.split("\n")
 
 
 # -----------------------
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from typing import Any
+from typing import Any, Callable
 
 from src.models.project_summary import ProjectSummary
 from src.project_analysis import (
@@ -13,7 +13,17 @@ from src.project_analysis import (
     _load_text_metrics_into_summary,
 )
 from src.db.project_summaries import save_project_summary
-from src.analysis.code_collaborative.code_collaborative_analysis import print_code_portfolio_summary
+from src.analysis.code_collaborative.code_collaborative_analysis import CodeRun, print_code_portfolio_summary
+from src.utils.analysis_pool import (
+    ANALYSIS_PROJECT_WORKERS,
+    database_path,
+    open_worker_connection,
+    run_in_pool,
+)
+
+
+class AnalysisCancelled(Exception):
+    """Raised between projects when a background run has been asked to stop."""
 
 
 def execute_upload_scope_analysis(
@@ -25,96 +35,208 @@ def execute_upload_scope_analysis(
     classifications: dict[str, str],
     resolved_types: dict[str, str],
     external_consent: str | None,
+    progress_cb: Callable[[int, int, str | None], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    workers: int | None = None,
+    executor_kind: str | None = None,
 ) -> dict[str, Any]:
     """
     Execute analysis for all projects in scope in non-interactive API mode.
     Assumes readiness checks have already passed.
+
+    Projects are independent, so with `workers` > 1 (default: ANALYSIS_PROJECT_WORKERS) they run
+    concurrently on a thread or process pool, each worker on its own connection to the same DB.
+
+    `progress_cb(done, total, current_project)` is called before and after each project,
+    and `should_cancel()` is polled at project boundaries (raises AnalysisCancelled).
     """
     state = upload.get("state") or {}
     zip_path = upload.get("zip_path") or state.get("zip_path")
     if not isinstance(zip_path, str) or not zip_path.strip():
         raise ValueError("missing zip_path")
 
-    executed_projects: list[str] = []
-    ran_collab_code = False
+    total = len(projects_in_scope)
+    workers = max(1, int(workers or ANALYSIS_PROJECT_WORKERS))
+    db_path = database_path(conn) if workers > 1 and total > 1 else None
 
-    for project_name in projects_in_scope:
-        project_type = resolved_types.get(project_name)
-        classification = classifications.get(project_name)
-        if project_type not in {"code", "text"}:
-            continue
-        if classification not in {"individual", "collaborative"}:
-            continue
-
-        summary = ProjectSummary(
-            project_name=project_name,
-            project_type=project_type,
-            project_mode=classification,
+    outcomes: list[tuple[bool, list[dict]] | None]
+    if db_path is None:
+        outcomes = []
+        for index, project_name in enumerate(projects_in_scope):
+            if should_cancel is not None and should_cancel():
+                raise AnalysisCancelled(f"cancelled before {project_name}")
+            if progress_cb is not None:
+                progress_cb(index, total, project_name)
+            outcomes.append(
+                _analyze_upload_project(
+                    conn,
+                    user_id,
+                    project_name,
+                    project_type=resolved_types.get(project_name),
+                    classification=classifications.get(project_name),
+                    zip_path=zip_path,
+                    state=state,
+                    external_consent=external_consent,
+                )
+            )
+    else:
+        done_count = 0
+
+        def _on_done(index: int, _outcome) -> None:
+            nonlocal done_count
+            done_count += 1
+            if progress_cb is not None:
+                progress_cb(done_count, total, projects_in_scope[index])
+
+        if progress_cb is not None:
+            progress_cb(0, total, None)
+        outcomes = run_in_pool(
+            _analyze_upload_project_in_worker,
+            [
+                (
+                    db_path,
+                    user_id,
+                    project_name,
+                    resolved_types.get(project_name),
+                    classifications.get(project_name),
+                    zip_path,
+                    state,
+                    external_consent,
+                )
+                for project_name in projects_in_scope
+            ],
+            workers=workers,
+            executor_kind=executor_kind,
+            on_done=_on_done,
+            should_cancel=should_cancel,
         )
+        if should_cancel is not None and any(o is None for o in outcomes) and should_cancel():
+            raise AnalysisCancelled("cancelled before all projects started")
+
+    executed_projects = [
+        name for name, outcome in zip(projects_in_scope, outcomes) if outcome and outcome[0]
+    ]
+    # Each project returns its own collaborative code metrics, so concurrent runs never mix.
+    code_metrics = [metrics for outcome in outcomes if outcome for metrics in outcome[1]]
+
+    if progress_cb is not None:
+        progress_cb(total, total, None)
+
+    print_code_portfolio_summary(code_metrics)
+
+    return {
+        "executed_projects": executed_projects,
+        "executed_count": len(executed_projects),
+    }
 
-        version_key = (state.get("dedup_version_keys") or {}).get(project_name)
-        api_inputs = _build_project_api_inputs(state, project_name)
 
-        if classification == "individual":
-            run_individual_analysis(
+def _analyze_upload_project(
+    conn: sqlite3.Connection,
+    user_id: int,
+    project_name: str,
+    *,
+    project_type: str | None,
+    classification: str | None,
+    zip_path: str,
+    state: dict,
+    external_consent: str | None,
+) -> tuple[bool, list[dict]]:
+    """
+    Run and persist the analysis for one project of the upload.
+    Returns (executed, collaborative code metrics recorded for the portfolio summary).
+    """
+    if project_type not in {"code", "text"}:
+        return False, []
+    if classification not in {"individual", "collaborative"}:
+        return False, []
+
+    summary = ProjectSummary(
+        project_name=project_name,
+        project_type=project_type,
+        project_mode=classification,
+    )
+
+    version_key = (state.get("dedup_version_keys") or {}).get(project_name)
+    api_inputs = _build_project_api_inputs(state, project_name)
+    code_run = CodeRun()
+
+    if classification == "individual":
+        run_individual_analysis(
+            conn,
+            user_id,
+            project_name,
+            project_type,
+            external_consent,
+            zip_path,
+            summary,
+            version_key=version_key,
+            allow_prompts=False,
+            api_inputs=api_inputs,
+        )
+        _load_skills_into_summary(conn, user_id, project_name, summary)
+        _load_text_metrics_into_summary(conn, user_id, project_name, summary)
+        if project_type == "text":
+            _load_text_activity_type_into_summary(
                 conn,
                 user_id,
                 project_name,
-                project_type,
-                external_consent,
-                zip_path,
                 summary,
-                version_key=version_key,
-                allow_prompts=False,
-                api_inputs=api_inputs,
+                is_collaborative=False,
             )
-            _load_skills_into_summary(conn, user_id, project_name, summary)
-            _load_text_metrics_into_summary(conn, user_id, project_name, summary)
-            if project_type == "text":
-                _load_text_activity_type_into_summary(
-                    conn,
-                    user_id,
-                    project_name,
-                    summary,
-                    is_collaborative=False,
-                )
-        else:
-            get_individual_contributions(
+    else:
+        get_individual_contributions(
+            conn,
+            user_id,
+            project_name,
+            project_type,
+            external_consent,
+            zip_path,
+            summary,
+            version_key=version_key,
+            allow_prompts=False,
+            api_inputs=api_inputs,
+            code_run=code_run,
+        )
+        _load_skills_into_summary(conn, user_id, project_name, summary)
+        _load_text_metrics_into_summary(conn, user_id, project_name, summary)
+        if project_type == "text":
+            _load_text_activity_type_into_summary(
                 conn,
                 user_id,
                 project_name,
-                project_type,
-                external_consent,
-                zip_path,
                 summary,
-                version_key=version_key,
-                allow_prompts=False,
-                api_inputs=api_inputs,
+                is_collaborative=True,
             )
-            _load_skills_into_summary(conn, user_id, project_name, summary)
-            _load_text_metrics_into_summary(conn, user_id, project_name, summary)
-            if project_type == "text":
-                _load_text_activity_type_into_summary(
-                    conn,
-                    user_id,
-                    project_name,
-                    summary,
-                    is_collaborative=True,
-                )
-            if project_type == "code":
-                ran_collab_code = True
 
-        save_project_summary(conn, user_id, project_name, json.dumps(summary.__dict__, default=str))
-        executed_projects.append(project_name)
+    save_project_summary(conn, user_id, project_name, json.dumps(summary.__dict__, default=str))
+    return True, code_run.metrics
 
-    if ran_collab_code:
-        # Clear run-level aggregator used by collaborative code analysis.
-        print_code_portfolio_summary()
 
-    return {
-        "executed_projects": executed_projects,
-        "executed_count": len(executed_projects),
-    }
+def _analyze_upload_project_in_worker(
+    db_path: str,
+    user_id: int,
+    project_name: str,
+    project_type: str | None,
+    classification: str | None,
+    zip_path: str,
+    state: dict,
+    external_consent: str | None,
+) -> tuple[bool, list[dict]]:
+    """Pool entry point: same as _analyze_upload_project but on the worker's own connection."""
+    conn = open_worker_connection(db_path)
+    try:
+        return _analyze_upload_project(
+            conn,
+            user_id,
+            project_name,
+            project_type=project_type,
+            classification=classification,
+            zip_path=zip_path,
+            state=state,
+            external_consent=external_consent,
+        )
+    finally:
+        conn.close()
 
 
 def has_executable_files_for_scope(
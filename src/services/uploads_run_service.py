@@ -3,14 +3,16 @@ from __future__ import annotations
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from fastapi import HTTPException
 
 from src.db import get_latest_consent, get_latest_external_consent
+from src.db.analysis_jobs import get_active_job_for_upload
 from src.db.uploads import get_upload_by_id, set_upload_state
 from src.services.uploads_file_roles_util import build_file_item_from_row
 from src.services.uploads_run_execute_service import (
+    AnalysisCancelled,
     execute_upload_scope_analysis,
     has_executable_files_for_scope,
 )
@@ -21,6 +23,7 @@ _SCOPE_VALUES = {"all", "individual", "collaborative"}
 _PROJECT_TYPE_VALUES = {"code", "text"}
 _CLASSIFICATION_VALUES = {"individual", "collaborative"}
 _RUNNABLE_STATUSES = {"needs_file_roles", "needs_summaries", "done"}
+_MODE_VALUES = {"run", "check", "queue"}
 
 
 def run_analysis_preflight(
@@ -42,7 +45,9 @@ def run_analysis_preflight(
             status_code=422,
             detail={"invalid_scope": scope, "allowed_scopes": sorted(list(_SCOPE_VALUES))},
         )
-    mode_norm = "check" if (mode or "").strip().lower() == "check" else "run"
+    mode_norm = (mode or "").strip().lower()
+    if mode_norm not in _MODE_VALUES:
+        mode_norm = "run"
 
     internal_consent = get_latest_consent(conn, user_id)
     external_consent = get_latest_external_consent(conn, user_id)
@@ -55,10 +60,7 @@ def run_analysis_preflight(
         external_consent=external_consent,
     )
     state = upload.get("state") or {}
-    known_projects = _known_projects(state)
     classifications, _ = _classifications(state)
-    projects_in_scope = _projects_in_scope(known_projects, classifications, scope_norm)
-    resolved_types, _ = _resolved_project_types(state, projects_in_scope)
 
     run_state = state.get("run_state") or {}
     if not isinstance(run_state, dict):
@@ -98,75 +100,37 @@ def run_analysis_preflight(
             detail={"code": "scope_already_completed", "scope": scope_norm},
         )
 
-    # Some unit tests create synthetic uploads with no persisted files.
-    # For real uploads, executable artifacts exist and we run the pipeline.
-    zip_path = (state.get("zip_path") or upload.get("zip_path") or "").strip()
-    should_execute = bool(zip_path) and Path(zip_path).exists() and has_executable_files_for_scope(
-        conn,
-        user_id,
-        state=state,
-        projects_in_scope=projects_in_scope,
-    )
+    if mode_norm == "queue":
+        # Local import: the job service imports execute_upload_run from this module.
+        from src.services.analysis_jobs_service import enqueue_analysis_job
 
-    if should_execute:
-        started_state = dict(state)
-        started_run_state = dict(run_state)
-        started_run_state.update(
-            {
-                "last_requested_scope": scope_norm,
-                "last_started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-            }
-        )
-        started_state["run_state"] = started_run_state
-        set_upload_state(conn, upload_id, started_state, status="analyzing")
+        job = enqueue_analysis_job(conn, user_id, upload_id, scope_norm, force_rerun=force_rerun)
+        return {
+            "upload_id": upload_id,
+            "scope": scope_norm,
+            "ready": True,
+            "warnings": warnings,
+            "errors": [],
+            "job_id": job["job_id"],
+        }
 
+    if upload_has_executable_artifacts(conn, user_id, upload, scope_norm):
         try:
-            execute_upload_scope_analysis(
+            execute_upload_run(
                 conn,
                 user_id,
-                upload=upload,
-                projects_in_scope=projects_in_scope,
-                classifications=classifications,
-                resolved_types=resolved_types,
+                upload,
+                scope_norm,
                 external_consent=external_consent,
+                warnings=warnings,
+                force_rerun=force_rerun,
             )
         except Exception as exc:
-            failed_state = dict(started_state)
-            failed_run_state = dict(failed_state.get("run_state") or {})
-            failed_run_state["last_error"] = str(exc)
-            failed_run_state["last_failed_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
-            failed_state["run_state"] = failed_run_state
-            set_upload_state(conn, upload_id, failed_state, status="failed")
             raise HTTPException(
                 status_code=500,
                 detail={"code": "analysis_execution_failed", "message": "Run execution failed"},
             ) from exc
 
-        completed_scopes |= target_scopes
-        required_scopes = {
-            cls
-            for cls in classifications.values()
-            if cls in _CLASSIFICATION_VALUES
-        }
-        is_done = bool(required_scopes) and required_scopes.issubset(completed_scopes)
-
-        resume_status = upload.get("status")
-        if resume_status not in {"needs_file_roles", "needs_summaries"}:
-            resume_status = "needs_file_roles"
-
-        final_state = dict(started_state)
-        final_run_state = dict(final_state.get("run_state") or {})
-        final_run_state.update(
-            {
-                "completed_scopes": sorted(completed_scopes),
-                "last_completed_scope": scope_norm,
-                "last_completed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-                "last_warnings": warnings,
-            }
-        )
-        final_state["run_state"] = final_run_state
-        set_upload_state(conn, upload_id, final_state, status="done" if is_done else resume_status)
-
     return {
         "upload_id": upload_id,
         "scope": scope_norm,
@@ -176,6 +140,150 @@ def run_analysis_preflight(
     }
 
 
+def upload_has_executable_artifacts(
+    conn: sqlite3.Connection,
+    user_id: int,
+    upload: dict,
+    scope: str,
+) -> bool:
+    """
+    Some unit tests create synthetic uploads with no persisted files.
+    For real uploads, executable artifacts exist and we run the pipeline.
+    """
+    state = upload.get("state") or {}
+    zip_path = (state.get("zip_path") or upload.get("zip_path") or "").strip()
+    if not zip_path or not Path(zip_path).exists():
+        return False
+
+    classifications, _ = _classifications(state)
+    projects_in_scope = _projects_in_scope(_known_projects(state), classifications, scope)
+    return has_executable_files_for_scope(
+        conn,
+        user_id,
+        state=state,
+        projects_in_scope=projects_in_scope,
+    )
+
+
+def execute_upload_run(
+    conn: sqlite3.Connection,
+    user_id: int,
+    upload: dict,
+    scope: str,
+    *,
+    external_consent: str | None,
+    warnings: list[dict[str, Any]] | None = None,
+    final_attempt: bool = True,
+    progress_cb: Callable[[int, int, str | None], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    force_rerun: bool = False,
+) -> dict[str, Any]:
+    """
+    Run the analysis for one scope of an upload and advance the uploads state machine:
+    `analyzing` while running, then `done` (all scopes complete) or back to the wizard step.
+
+    If the scope is already completed (e.g. a job requeued after a restart that had finished),
+    the result recorded for it is returned without re-running, unless `force_rerun` is set.
+
+    On error the upload is marked `failed` (or, when `final_attempt` is False, returned to its
+    previous status so a retry can pick it up) and the exception is re-raised.
+    On AnalysisCancelled the upload is returned to its previous status.
+    """
+    upload_id = upload["upload_id"]
+    state = upload.get("state") or {}
+    run_state = state.get("run_state") or {}
+    if not isinstance(run_state, dict):
+        run_state = {}
+
+    known_projects = _known_projects(state)
+    classifications, _ = _classifications(state)
+    projects_in_scope = _projects_in_scope(known_projects, classifications, scope)
+    resolved_types, _ = _resolved_project_types(state, projects_in_scope)
+    completed_scopes = {
+        s for s in (run_state.get("completed_scopes") or []) if s in _CLASSIFICATION_VALUES
+    }
+    target_scopes = _target_completion_scopes(scope, classifications)
+
+    scope_results = run_state.get("scope_results") or {}
+    if not isinstance(scope_results, dict):
+        scope_results = {}
+    if not force_rerun and target_scopes and target_scopes.issubset(completed_scopes):
+        cached = scope_results.get(scope)
+        return cached if isinstance(cached, dict) else {"executed_projects": [], "executed_count": 0}
+
+    resume_status = upload.get("status")
+    if resume_status not in {"needs_file_roles", "needs_summaries"}:
+        resume_status = "needs_file_roles"
+
+    started_state = dict(state)
+    started_run_state = dict(run_state)
+    started_run_state.update(
+        {
+            "last_requested_scope": scope,
+            "last_started_at": _utc_now_iso(),
+        }
+    )
+    started_state["run_state"] = started_run_state
+    set_upload_state(conn, upload_id, started_state, status="analyzing")
+
+    try:
+        result = execute_upload_scope_analysis(
+            conn,
+            user_id,
+            upload=upload,
+            projects_in_scope=projects_in_scope,
+            classifications=classifications,
+            resolved_types=resolved_types,
+            external_consent=external_consent,
+            progress_cb=progress_cb,
+            should_cancel=should_cancel,
+        )
+    except AnalysisCancelled:
+        cancelled_state = dict(started_state)
+        cancelled_run_state = dict(cancelled_state.get("run_state") or {})
+        cancelled_run_state["last_cancelled_at"] = _utc_now_iso()
+        cancelled_state["run_state"] = cancelled_run_state
+        set_upload_state(conn, upload_id, cancelled_state, status=upload.get("status") or resume_status)
+        raise
+    except Exception as exc:
+        failed_state = dict(started_state)
+        failed_run_state = dict(failed_state.get("run_state") or {})
+        failed_run_state["last_error"] = str(exc)
+        failed_run_state["last_failed_at"] = _utc_now_iso()
+        failed_state["run_state"] = failed_run_state
+        set_upload_state(
+            conn,
+            upload_id,
+            failed_state,
+            status="failed" if final_attempt else (upload.get("status") or resume_status),
+        )
+        raise
+
+    completed_scopes |= target_scopes
+    required_scopes = {
+        cls
+        for cls in classifications.values()
+        if cls in _CLASSIFICATION_VALUES
+    }
+    is_done = bool(required_scopes) and required_scopes.issubset(completed_scopes)
+
+    final_state = dict(started_state)
+    final_run_state = dict(final_state.get("run_state") or {})
+    result = result if isinstance(result, dict) else {}
+    final_run_state.update(
+        {
+            "completed_scopes": sorted(completed_scopes),
+            "scope_results": {**scope_results, scope: result},
+            "last_completed_scope": scope,
+            "last_completed_at": _utc_now_iso(),
+            "last_warnings": warnings or [],
+        }
+    )
+    final_state["run_state"] = final_run_state
+    set_upload_state(conn, upload_id, final_state, status="done" if is_done else resume_status)
+    return result
+
+
 def evaluate_run_readiness(
     conn: sqlite3.Connection,
     user_id: int,
@@ -200,6 +308,11 @@ def evaluate_run_readiness(
     if status == "analyzing":
         errors.append({"code": "already_analyzing"})
         return errors, warnings
+
+    active_job = get_active_job_for_upload(conn, upload["upload_id"])
+    if active_job:
+        errors.append({"code": "analysis_job_active", "job_id": active_job["job_id"]})
+        return errors, warnings
     
     if status not in _RUNNABLE_STATUSES:
         errors.append({"code": "upload_not_ready", "status": status})
@@ -272,6 +385,10 @@ def evaluate_run_readiness(
     return errors, warnings
 
 
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
 def _target_completion_scopes(scope: str, classifications: dict[str, str]) -> set[str]:
     if scope == "all":
         return {
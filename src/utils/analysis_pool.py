@@ -0,0 +1,275 @@
+"""
+src/utils/analysis_pool.py
+
+Runs independent project analyses concurrently.
+
+A ZIP usually holds several unrelated projects. Each one can be analysed on its own worker:
+a thread pool suits the I/O- and LLM-bound flows, a process pool suits the CPU-bound ones
+(radon/lizard, regex detectors). Every worker opens its own SQLite connection to the same
+database file (WorkerConnection); WAL mode lets their reads proceed side by side, while write
+transactions are funnelled through a single write gate: a connection takes the gate at its
+first write statement and hands it back when the transaction ends, so exactly one worker writes
+at a time and the others queue in-process instead of contending for SQLite's lock until the
+busy timeout fails them with "database is locked". Thread workers share an in-process lock;
+process workers receive one cross-process lock when the pool starts.
+
+Configuration (environment):
+ - ANALYSIS_PROJECT_WORKERS: max projects analysed at once (default 1 = sequential)
+ - ANALYSIS_PROJECT_EXECUTOR: "thread" (default) or "process"
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, Sequence
+
+from src.db.connection import connect
+
+
+ANALYSIS_PROJECT_WORKERS = int(os.getenv("ANALYSIS_PROJECT_WORKERS", "1"))
+ANALYSIS_PROJECT_EXECUTOR = os.getenv("ANALYSIS_PROJECT_EXECUTOR", "thread").strip().lower()
+
+# Seconds a worker connection waits for the database write lock (held by a connection outside
+# the pool, e.g. the caller's own, since pool workers take turns through the write gate).
+WORKER_BUSY_TIMEOUT = 60.0
+
+# One writer at a time among the worker connections of this process (or, inside a process-pool
+# worker, among all the pool's processes: see _install_write_gate).
+_write_gate: Any = threading.Lock()
+
+_LEADING_COMMENTS = re.compile(r"^(\s*(--[^\n]*(\n|$)|/\*.*?\*/))*\s*", re.S)
+_WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER", "BEGIN"}
+
+
+def _is_write(sql: str) -> bool:
+    keyword = _LEADING_COMMENTS.sub("", sql, count=1)[:8].split(None, 1)
+    return bool(keyword) and keyword[0].upper().rstrip("(;") in _WRITE_KEYWORDS
+
+
+class _WorkerCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=(), /):
+        self.connection._before(sql)
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.connection._settle()
+
+    def executemany(self, sql, seq_of_parameters, /):
+        self.connection._before(sql)
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.connection._settle()
+
+    def executescript(self, script, /):
+        self.connection._before("BEGIN")
+        try:
+            return super().executescript(script)
+        finally:
+            self.connection._settle()
+
+
+class WorkerConnection(sqlite3.Connection):
+    """
+    Connection whose write transactions pass through the pool's write gate: the gate is taken
+    before the first write statement and released once the transaction is committed or rolled
+    back (or the connection closes). Reads never wait for it.
+    """
+
+    _holds_gate = False
+
+    def cursor(self, factory=_WorkerCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script, /):
+        return self.cursor().executescript(script)
+
+    def commit(self):
+        try:
+            super().commit()
+        finally:
+            self._settle()
+
+    def rollback(self):
+        try:
+            super().rollback()
+        finally:
+            self._settle()
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._release()
+
+    def __exit__(self, *exc):
+        try:
+            return super().__exit__(*exc)
+        finally:
+            self._settle()
+
+    def _before(self, sql: str) -> None:
+        if not self._holds_gate and _is_write(sql):
+            _write_gate.acquire()
+            self._holds_gate = True
+
+    def _settle(self) -> None:
+        if self._holds_gate and not self.in_transaction:
+            self._release()
+
+    def _release(self) -> None:
+        if self._holds_gate:
+            self._holds_gate = False
+            _write_gate.release()
+
+
+def _install_write_gate(gate: Any) -> None:
+    """Process-pool initializer: share the parent's cross-process write gate."""
+    global _write_gate
+    _write_gate = gate
+
+
+def database_path(conn: sqlite3.Connection) -> str | None:
+    """Return the file backing `conn`'s main database, or None for in-memory/temporary databases."""
+    for row in conn.execute("PRAGMA database_list").fetchall():
+        if row[1] == "main":
+            return row[2] or None
+    return None
+
+
+def open_worker_connection(db_path: str) -> sqlite3.Connection:
+    """Connection for a pool worker; mirrors the API's get_db() settings."""
+    conn = connect(db_path, timeout=WORKER_BUSY_TIMEOUT, factory=WorkerConnection)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _make_executor(kind: str, workers: int) -> Executor:
+    if kind == "process":
+        # spawn: workers must not inherit the parent's open SQLite handles or lock state.
+        context = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_install_write_gate,
+            initargs=(context.Lock(),),
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="project-analysis")
+
+
+def run_in_pool(
+    fn: Callable[..., Any],
+    jobs: Sequence[tuple],
+    *,
+    workers: int | None = None,
+    executor_kind: str | None = None,
+    on_done: Callable[[int, Any], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> list[Any]:
+    """
+    Call fn(*args) for each args tuple in `jobs` with at most `workers` calls in flight.
+
+    Returns results in input order. `on_done(index, result)` runs on the calling thread as each
+    job completes, so callers can use their own connection there. `should_cancel()` is polled
+    before each submission: once it returns True nothing new is started, in-flight jobs finish,
+    and unstarted entries are None in the result. The first worker exception is re-raised after
+    in-flight jobs settle. With process executors `fn` and its arguments must be picklable.
+    """
+    workers = max(1, int(workers or ANALYSIS_PROJECT_WORKERS))
+    kind = (executor_kind or ANALYSIS_PROJECT_EXECUTOR or "thread").strip().lower()
+    results: list[Any] = [None] * len(jobs)
+
+    if workers == 1 or len(jobs) <= 1:
+        for index, args in enumerate(jobs):
+            if should_cancel is not None and should_cancel():
+                break
+            results[index] = fn(*args)
+            if on_done is not None:
+                on_done(index, results[index])
+        return results
+
+    first_error: BaseException | None = None
+    with _make_executor(kind, min(workers, len(jobs))) as executor:
+        pending: dict[Any, int] = {}
+        next_index = 0
+
+        while next_index < len(jobs) or pending:
+            while (
+                first_error is None
+                and next_index < len(jobs)
+                and len(pending) < workers
+                and not (should_cancel is not None and should_cancel())
+            ):
+                pending[executor.submit(fn, *jobs[next_index])] = next_index
+                next_index += 1
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except BaseException as exc:
+                    if first_error is None:
+                        first_error = exc
+                    continue
+                if on_done is not None:
+                    on_done(index, results[index])
+
+            if first_error is not None or (should_cancel is not None and should_cancel()):
+                next_index = len(jobs)
+
+    if first_error is not None:
+        raise first_error
+    return results
+
+
+def iter_in_pool(
+    fn: Callable[..., Any],
+    jobs: Sequence[tuple],
+    *,
+    workers: int | None = None,
+    executor_kind: str | None = None,
+) -> Iterator[Any]:
+    """
+    Yield fn(*args) for each args tuple in `jobs`, in input order, as soon as each result and
+    all the ones before it are ready.
+
+    At most `workers` jobs are in flight or waiting to be consumed, so a slow consumer bounds the
+    memory held in finished results. A worker exception is raised when its result is reached.
+    Closing the generator early cancels the jobs that have not started.
+    """
+    workers = max(1, int(workers or ANALYSIS_PROJECT_WORKERS))
+    kind = (executor_kind or ANALYSIS_PROJECT_EXECUTOR or "thread").strip().lower()
+
+    if workers == 1 or len(jobs) <= 1:
+        for args in jobs:
+            yield fn(*args)
+        return
+
+    with _make_executor(kind, min(workers, len(jobs))) as executor:
+        in_flight: deque = deque()
+        next_index = 0
+        try:
+            while next_index < len(jobs) or in_flight:
+                while next_index < len(jobs) and len(in_flight) < workers:
+                    in_flight.append(executor.submit(fn, *jobs[next_index]))
+                    next_index += 1
+                yield in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
@@ -0,0 +1,167 @@
+"""
+src/utils/csv_profile.py
+
+Single-pass, bounded-memory structural profile of a CSV file.
+
+Both CSV consumers (extractfromcsv for the text pipeline, analyze_all_csv for the data-collection
+detector) only need the shape, headers, dtypes, null counts and a few sample rows, yet each read
+the whole file into one DataFrame (extractfromcsv twice). profile_csv streams the file through
+pandas in fixed-size chunks instead, so peak memory is one chunk regardless of file size, and
+combines the per-chunk dtypes into the dtype a full read would have inferred.
+
+Profiles are remembered in-process under the file's content hash, so the same CSV seen by both
+consumers, or unchanged across project versions, is parsed once.
+
+Configuration (environment):
+ - CSV_PROFILE_CHUNK_ROWS: rows parsed per chunk (default 50000)
+ - CSV_PROFILE_CACHE_SIZE: profiles kept in memory, least recently used evicted (default 256)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+from src.utils.deduplication.fingerprints import current_content_hash
+
+CSV_PROFILE_CHUNK_ROWS = max(1, int(os.getenv("CSV_PROFILE_CHUNK_ROWS", "50000")))
+CSV_PROFILE_CACHE_SIZE = max(0, int(os.getenv("CSV_PROFILE_CACHE_SIZE", "256")))
+
+# What read_csv reports for a column of strings: "str" on pandas 3, "object" before.
+_TEXT_DTYPE = str(pd.Series(["x"]).dtype)
+
+_profiles: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _chunk_kinds(dtype: str, nulls: int, rows: int, negative: bool = False) -> Set[str]:
+    """
+    The kinds of value ("null", "bool", "int", "uint", "float", "text") one chunk of a column held,
+    plus "negative" when an int64 chunk had a value below zero.
+    """
+    kinds = {"null"} if nulls else set()
+    if nulls == rows:
+        return kinds
+    if dtype == "object" and _TEXT_DTYPE != "object":
+        # Booleans with gaps
+        kinds.add("bool")
+    elif dtype == "uint64":
+        # Integers above the int64 range
+        kinds.add("uint")
+    elif dtype in ("bool", "int64", "float64"):
+        kinds.add(dtype[:-2] if dtype != "bool" else "bool")
+        if negative:
+            kinds.add("negative")
+    else:
+        kinds.add("text")
+    return kinds
+
+
+def _combine_kinds(kinds: Set[str]) -> str:
+    """The dtype a whole-file read infers for a column holding these kinds of value."""
+    values = kinds - {"null", "negative"}
+    if not values:
+        return "float64"
+    if "text" in values or ("bool" in values and len(values) > 1):
+        return _TEXT_DTYPE
+    if values == {"bool"}:
+        return "object" if "null" in kinds else "bool"
+    if "float" in values or "null" in kinds:
+        return "float64"
+    if "uint" in values:
+        # No integer dtype holds both values above int64 and values below zero
+        return _TEXT_DTYPE if "negative" in kinds else "uint64"
+    return "int64"
+
+
+def profile_csv(path: str, sample_rows: int = 5, chunksize: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Profile a CSV in one streaming pass.
+
+    Returns:
+    {
+        "headers": [...],
+        "dtypes": {header: dtype},
+        "sample_rows": [...],   # first `sample_rows` records
+        "row_count": int,
+        "col_count": int,
+        "null_cells": int,      # missing values across all cells
+        "missing_rows": int,    # rows with at least one missing value
+    }
+
+    Raises whatever pandas raises for an unreadable file.
+    """
+    headers: List[str] = []
+    kinds: Dict[Any, Set[str]] = {}
+    first_dtypes: Dict[Any, str] = {}
+    sample: List[Dict[str, Any]] = []
+    row_count = null_cells = missing_rows = 0
+
+    with pd.read_csv(path, chunksize=chunksize or CSV_PROFILE_CHUNK_ROWS) as reader:
+        for chunk in reader:
+            if not headers:
+                headers = list(chunk.columns)
+                first_dtypes = chunk.dtypes.astype(str).to_dict()
+                sample = chunk.head(sample_rows).to_dict(orient="records")
+            nulls = chunk.isnull()
+            row_count += len(chunk)
+            null_cells += int(nulls.values.sum())
+            missing_rows += int(nulls.any(axis=1).sum())
+            null_counts = nulls.sum(axis=0)
+            for column, dtype in chunk.dtypes.items():
+                negative = str(dtype) == "int64" and bool((chunk[column] < 0).any())
+                kinds.setdefault(column, set()).update(
+                    _chunk_kinds(str(dtype), int(null_counts[column]), len(chunk), negative)
+                )
+
+    if row_count:
+        dtypes = {c: _combine_kinds(kinds[c]) for c in headers}
+    else:
+        # Header line only: the single empty chunk already carries read_csv's dtypes
+        dtypes = first_dtypes
+
+    return {
+        "headers": headers,
+        "dtypes": dtypes,
+        "sample_rows": sample,
+        "row_count": row_count,
+        "col_count": len(headers),
+        "null_cells": null_cells,
+        "missing_rows": missing_rows,
+    }
+
+
+def cached_csv_profile(path: str, sample_rows: int = 5) -> Dict[str, Any]:
+    """profile_csv(path), reused while another file with the same content hash is in the cache."""
+    if not CSV_PROFILE_CACHE_SIZE:
+        return profile_csv(path, sample_rows)
+    try:
+        key = (current_content_hash(path), sample_rows)
+    except OSError:
+        return profile_csv(path, sample_rows)
+
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+            return profile
+
+    # Parsed outside the lock so other files are not held up; a concurrent miss on the same
+    # content just parses it twice.
+    profile = profile_csv(path, sample_rows)
+    with _profiles_lock:
+        _profiles[key] = profile
+        _profiles.move_to_end(key)
+        while len(_profiles) > CSV_PROFILE_CACHE_SIZE:
+            _profiles.popitem(last=False)
+    return profile
+
+
+def clear_csv_profile_cache() -> None:
+    """Forget every remembered profile."""
+    with _profiles_lock:
+        _profiles.clear()
@@ -1,6 +1,9 @@
 from .helpers import should_ignore_path
+from collections import OrderedDict
 from pathlib import Path
 import hashlib
+import os
+import threading
 
 TEXT_EXTS = {
     ".py",".js",".ts",".tsx",".jsx",".java",".kt",".c",".cpp",".h",".hpp",
@@ -24,23 +27,116 @@ def _normalize_path_for_fingerprint(rel_path: str) -> str:
         return "/".join(parts[1:])
     return rel_path
 
+# Bytes read per chunk when hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Hashes computed while a ZIP was being extracted, keyed by absolute path.
+# Each entry carries the (size, mtime_ns) it was recorded against so edited files are re-read.
+# At most STREAMED_HASHES_MAX are kept; the least recently used is dropped first.
+STREAMED_HASHES_MAX = max(0, int(os.getenv("STREAMED_HASHES_MAX", "50000")))
+_STREAMED_HASHES: "OrderedDict[str, tuple[int, int, str]]" = OrderedDict()
+_STREAMED_HASHES_LOCK = threading.Lock()
+
+
+class ContentHasher:
+    """
+    Incremental form of file_content_hash: feed the bytes in chunks, get the same digest.
+    A trailing CR is held back until the next chunk so CRLF pairs split across chunks still normalize.
+    """
+
+    def __init__(self, ext: str, normalize_text: bool = True):
+        self._h = hashlib.sha256()
+        self._normalize = normalize_text and ext.lower() in TEXT_EXTS
+        self._pending_cr = False
+
+    def update(self, chunk: bytes) -> None:
+        if not self._normalize:
+            self._h.update(chunk)
+            return
+        if self._pending_cr:
+            chunk = b"\r" + chunk
+            self._pending_cr = False
+        if chunk.endswith(b"\r"):
+            chunk = chunk[:-1]
+            self._pending_cr = True
+        self._h.update(chunk.replace(b"\r\n", b"\n"))
+
+    def hexdigest(self) -> str:
+        h = self._h.copy()
+        if self._pending_cr:
+            h.update(b"\r")
+        return h.hexdigest()
+
+
+def remember_content_hash(path, digest: str) -> None:
+    """Record the hash of a file just written to disk so project_fingerprints need not read it back."""
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    with _STREAMED_HASHES_LOCK:
+        _STREAMED_HASHES[key] = (st.st_size, st.st_mtime_ns, digest)
+        _STREAMED_HASHES.move_to_end(key)
+        while len(_STREAMED_HASHES) > STREAMED_HASHES_MAX:
+            _STREAMED_HASHES.popitem(last=False)
+
+
+def forget_content_hashes(root) -> None:
+    """Drop remembered hashes for files under `root` (e.g. before it is re-extracted)."""
+    prefix = os.path.join(os.path.abspath(root), "")
+    with _STREAMED_HASHES_LOCK:
+        for key in [k for k in _STREAMED_HASHES if k.startswith(prefix)]:
+            del _STREAMED_HASHES[key]
+
+
+def _remembered_content_hash(path: Path) -> str | None:
+    key = os.path.abspath(path)
+    with _STREAMED_HASHES_LOCK:
+        entry = _STREAMED_HASHES.get(key)
+    if entry is None:
+        return None
+    st = path.stat()
+    with _STREAMED_HASHES_LOCK:
+        # Re-checked under the lock: another thread may have replaced or dropped the entry meanwhile
+        if _STREAMED_HASHES.get(key) != entry:
+            return None
+        if (st.st_size, st.st_mtime_ns) != entry[:2]:
+            del _STREAMED_HASHES[key]
+            return None
+        _STREAMED_HASHES.move_to_end(key)
+    return entry[2]
+
+
+def current_content_hash(path) -> str:
+    """file_content_hash(path), reusing the digest recorded at extraction while the file is unchanged."""
+    path = Path(path)
+    return _remembered_content_hash(path) or file_content_hash(path, normalize_text=True)
+
+
 def file_content_hash(path, normalize_text = True) -> str:
     """
     Returns hex SHA-256 of file contents. If normalize_text = True end ext looks like text, normalize CRLF -> LF.
+    The file is read in fixed-size chunks, so memory use does not grow with file size.
     """
 
-    ext = path.suffix.lower()
-    h = hashlib.sha256()
+    path = Path(path)
+    hasher = ContentHasher(path.suffix, normalize_text=normalize_text)
 
     with open(path, "rb") as f:
-        data = f.read()
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
 
-    if normalize_text and ext in TEXT_EXTS:
-        # normalize windows line endings
-        data = data.replace(b"\r\n", b"\n")
+    return hasher.hexdigest()
 
-    h.update(data)
-    return h.hexdigest()
+def zip_member_hash_key(info, normalize_text = True) -> tuple[int, str, int, int]:
+    """
+    file_hash_cache key for a ZIP member: (size, modified, CRC32, normalized), all read from the
+    central directory, so a cache hit costs no decompression or hashing.
+    """
+    ext = Path(info.filename).suffix.lower()
+    modified = "%04d-%02d-%02d %02d:%02d:%02d" % info.date_time
+    return (info.file_size, modified, info.CRC, int(normalize_text and ext in TEXT_EXTS))
 
 def project_fingerprints(project_root):
     """
@@ -70,8 +166,8 @@ def project_fingerprints(project_root):
         # This ensures same project detected as duplicate regardless of classification folder
         rel_str = _normalize_path_for_fingerprint(rel_str)
 
-        # hash the file contents
-        h = file_content_hash(p, normalize_text=True)
+        # hash the file contents (reuse the hash taken during ZIP extraction when we have it)
+        h = current_content_hash(p)
         entries.append((rel_str, h))
 
     # Build the strict fingerprint: "relpath:hash" for every file, sorted deterministically
@@ -0,0 +1,77 @@
+"""
+MinHash signatures and LSH banding for near-duplicate project lookup.
+
+A version is summarised by the set of its relpaths and file hashes (the same two sets
+register_project scores with). Two versions whose sets overlap by Jaccard J agree on each
+signature slot with probability J; grouping the slots into bands and indexing each band lets
+us fetch likely matches with a handful of equality lookups instead of comparing against every
+project. With 32 bands of 2 rows a pair at J=0.35 (the "new project" cut-off) is returned with
+~98% probability, so exact Jaccard only runs on the few candidates that come back.
+
+The seeds below are persisted implicitly in every stored band: changing NUM_PERM, ROWS_PER_BAND
+or _SEED requires re-indexing (delete version_minhash / version_lsh_bands rows; they are rebuilt lazily).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable
+
+import numpy as np
+
+NUM_PERM = 64
+ROWS_PER_BAND = 2
+NUM_BANDS = NUM_PERM // ROWS_PER_BAND
+
+_SEED = 20240117
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_rng = np.random.default_rng(_SEED)
+_XOR_SEEDS = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+_MUL_SEEDS = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+
+
+def version_tokens(entries: Iterable[tuple[str, str]]) -> set[str]:
+    """Token set for a version: its relpaths and its file hashes, kept apart by prefix."""
+    tokens: set[str] = set()
+    for rel, h in entries:
+        tokens.add("p:" + rel)
+        tokens.add("h:" + h)
+    return tokens
+
+
+def _token_ids(tokens: Iterable[str]) -> np.ndarray:
+    ids = [
+        int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little")
+        for t in tokens
+    ]
+    return np.array(ids, dtype=np.uint64)
+
+
+def minhash_signature(tokens: Iterable[str]) -> np.ndarray:
+    """NUM_PERM-slot MinHash signature (uint64). An empty token set gives an all-max signature."""
+    ids = _token_ids(tokens)
+    if ids.size == 0:
+        return np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+    with np.errstate(over="ignore"):
+        # Per-slot multiply/xorshift hash; uint64 arithmetic wraps, which is what we want here.
+        vals = (ids[:, None] ^ _XOR_SEEDS[None, :]) * _MUL_SEEDS[None, :]
+        vals ^= vals >> np.uint64(31)
+        vals *= _MIX
+        vals ^= vals >> np.uint64(29)
+    return vals.min(axis=0)
+
+
+def lsh_band_keys(signature: np.ndarray) -> list[tuple[int, int]]:
+    """(band, bucket) pairs for a signature; bucket is a signed 64-bit int so SQLite stores it as INTEGER."""
+    keys: list[tuple[int, int]] = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(rows.tobytes(), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "little", signed=True)))
+    return keys
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Fraction of agreeing slots: an unbiased estimate of the Jaccard similarity of the token sets."""
+    return float(np.mean(sig_a == sig_b))
@@ -2,6 +2,8 @@ from .fingerprints import project_fingerprints
 from .helpers import jaccard_similarity
 
 from src.db import (
+    find_lsh_candidate_versions,
+    find_versions_sharing_files,
     find_existing_version_by_strict_fp,
     find_existing_version_by_loose_fp,
     get_latest_versions,
@@ -96,6 +98,15 @@ def register_project(
             insert_version_files(conn, vk, entries)
         return {"kind": "new_project", "project_key": pk, "version_key": vk}
     
+    # Narrow the comparison to LSH candidates (likely Jaccard matches) instead of every project.
+    # Small uploads are scored on single-file overlaps below, so they also keep any version that
+    # shares an exact relpath or hash; LSH alone would miss those weak-but-relevant matches.
+    candidates = find_lsh_candidate_versions(conn, entries, latest.values())
+    if candidates is not None:
+        if len(entries) < noisy_file_count:
+            candidates |= find_versions_sharing_files(conn, entries, latest.values())
+        latest = {pk: vk for pk, vk in latest.items() if vk in candidates}
+
     # Find best match by Jaccard similarity
     best_pk = None
     best_score = -1.0
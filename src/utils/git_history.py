@@ -0,0 +1,339 @@
+"""
+src/utils/git_history.py
+
+One streaming pass over a repository's history, shared by the individual and collaborative git analyzers.
+
+`git log` runs once per repository with per-commit status (--raw, rename detection on) and line
+counts (--numstat), NUL-separated (-z) so paths never need unquoting, and its output is parsed into
+GitCommit records as it arrives. Every metric (counts, authors, first/last dates, weekly changes,
+per-file stats) is derived from those records.
+
+Parsed histories are cached per (repository, HEAD commit): history reachable from a commit never
+changes, so analyzers reading the same repo in one run, or a re-run with no new commits, reuse it.
+Analyzers that stored the commit they last saw can instead read only the commits made since
+(read_git_commits_since), as long as that commit is still an ancestor of HEAD.
+
+Configuration (environment):
+ - GIT_HISTORY_CACHE_SIZE: parsed histories kept in memory (default 8)
+ - GIT_LOG_IDLE_TIMEOUT: seconds `git log` may go without producing output before it is killed
+   (default 300; 0 disables). Long walks of large repositories are fine as long as output flows.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import subprocess
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+GIT_HISTORY_CACHE_SIZE = int(os.getenv("GIT_HISTORY_CACHE_SIZE", "8"))
+GIT_LOG_IDLE_TIMEOUT = float(os.getenv("GIT_LOG_IDLE_TIMEOUT", "300"))
+
+# Record/field separators for the --format header; neither occurs in real commit metadata.
+_RS, _US = "\x1e", "\x1f"
+_FORMAT = _RS + _US.join(["%H", "%an", "%ae", "%aI", "%ai", "%P", "%s", "%B"]) + _US
+_READ_SIZE = 64 * 1024
+
+_HISTORY_CACHE: "OrderedDict[Tuple[str, str], Tuple[GitCommit, ...]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FileChange:
+    path: str  # path after the commit (the new name for renames)
+    additions: int
+    deletions: int
+    is_binary: bool
+
+
+@dataclass(frozen=True)
+class GitCommit:
+    hash: str
+    author_name: str
+    author_email: str
+    authored_at: Optional[dt.datetime]  # timezone-aware author date
+    date: str  # author date as git's "%ai", e.g. "2024-01-01 10:00:00 -0500"
+    parents: Tuple[str, ...]
+    subject: str
+    body: str  # full message, including trailers such as Co-authored-by
+    files: Tuple[FileChange, ...]
+    name_status: Dict[str, int]  # counts of A / M / D / R changes
+
+    @property
+    def is_merge(self) -> bool:
+        return len(self.parents) > 1
+
+    def as_dict(self) -> dict:
+        """Plain-dict form consumed by the collaborative metrics."""
+        return {
+            "hash": self.hash,
+            "author_name": self.author_name,
+            "author_email": self.author_email,
+            "authored_at": self.authored_at,
+            "parents": list(self.parents),
+            "is_merge": self.is_merge,
+            "subject": self.subject,
+            "body": self.body,
+            "files": [
+                {"path": f.path, "additions": f.additions, "deletions": f.deletions, "is_binary": f.is_binary}
+                for f in self.files
+            ],
+            "name_status": dict(self.name_status),
+        }
+
+
+def _parse_changes(diff: str) -> Tuple[Tuple[FileChange, ...], Dict[str, int]]:
+    """
+    Parse the -z --raw --numstat section of one commit. Line counts are attributed to the path
+    after the commit: numstat rows naming the old side of a --raw rename pair are moved to the new
+    name, whichever form git prints them in.
+    """
+    tokens = diff.split("\0")
+    files: List[FileChange] = []
+    name_status: Counter = Counter()
+    renamed: Dict[str, str] = {}  # old path -> new path
+    i = 0
+    while i < len(tokens):
+        token = tokens[i].lstrip("\n")
+        i += 1
+        if not token:
+            continue
+
+        if token.startswith(":"):
+            # ":<modes> <shas> <status>" followed by one path, or two for renames/copies.
+            status = token.rsplit(" ", 1)[-1]
+            if status.startswith("R") and i + 1 < len(tokens):
+                renamed[tokens[i]] = tokens[i + 1]
+            i += 2 if status[:1] in ("R", "C") else 1
+            if status.startswith("R"):
+                name_status["R"] += 1
+            elif status in ("A", "M", "D"):
+                name_status[status] += 1
+            continue
+
+        parts = token.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        add_s, del_s, path = parts
+        if not path:
+            # Renamed: "<added>\t<deleted>\t" then the old and new paths as separate fields.
+            path = tokens[i + 1] if i + 1 < len(tokens) else ""
+            i += 2
+        elif path in renamed and path not in renamed.values():
+            path = renamed[path]
+        if add_s == "-" or del_s == "-":
+            files.append(FileChange(path, 0, 0, True))
+        else:
+            try:
+                files.append(FileChange(path, int(add_s), int(del_s), False))
+            except ValueError:
+                files.append(FileChange(path, 0, 0, False))
+
+    return tuple(files), dict(name_status)
+
+
+def _parse_record(record: str) -> Optional[GitCommit]:
+    fields = record.split(_US, 8)
+    if len(fields) < 9:
+        return None
+    commit_hash, author_name, author_email, iso_date, date, parents, subject, body, diff = fields
+    try:
+        authored_at = dt.datetime.fromisoformat(iso_date.replace("Z", "+00:00"))
+    except ValueError:
+        authored_at = None
+    files, name_status = _parse_changes(diff)
+    return GitCommit(
+        hash=commit_hash,
+        author_name=author_name,
+        author_email=author_email,
+        authored_at=authored_at,
+        date=date,
+        parents=tuple(parents.split()),
+        subject=subject,
+        body=body.rstrip("\n"),
+        files=files,
+        name_status=name_status,
+    )
+
+
+def iter_git_commits(repo_dir: str, revisions: Optional[str] = None) -> Iterator[GitCommit]:
+    """
+    Stream the history reachable from HEAD (or the `revisions` range, e.g. "<sha>..HEAD"), newest
+    first, one GitCommit per commit.
+    Raises subprocess.CalledProcessError (after the parsed commits) if git exits with an error,
+    and subprocess.TimeoutExpired if git produces no output for GIT_LOG_IDLE_TIMEOUT seconds.
+    """
+    cmd = ["git", "-C", repo_dir, "log", "-z", "--raw", "--numstat", "-M", f"--format={_FORMAT}"]
+    if revisions:
+        cmd += [revisions, "--"]
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+        errors="replace",
+    ) as proc:
+        # A hung git (e.g. a locked or network-backed repository) must not block a worker forever.
+        # Only the reads are timed, so a slow consumer of this generator never trips it.
+        watchdog = _ReadWatchdog(proc, GIT_LOG_IDLE_TIMEOUT)
+        try:
+            pending = ""
+            while True:
+                with watchdog:
+                    chunk = proc.stdout.read(_READ_SIZE)
+                if not chunk:
+                    break
+                pending += chunk
+                *complete, pending = pending.split(_RS)
+                for record in complete:
+                    commit = _parse_record(record)
+                    if commit is not None:
+                        yield commit
+            if watchdog.fired:
+                raise subprocess.TimeoutExpired(cmd, GIT_LOG_IDLE_TIMEOUT)
+            commit = _parse_record(pending)
+            if commit is not None:
+                yield commit
+
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, output=stderr)
+        finally:
+            watchdog.stop()
+            if proc.poll() is None:
+                proc.kill()
+
+
+class _ReadWatchdog:
+    """Kills `proc` when a read wrapped in `with watchdog:` blocks for more than `timeout` seconds."""
+
+    def __init__(self, proc: subprocess.Popen, timeout: float):
+        self.fired = False
+        self._proc = proc
+        self._timeout = timeout
+        self._deadline: Optional[float] = None
+        self._stopped = threading.Event()
+        if timeout > 0:
+            threading.Thread(target=self._watch, daemon=True).start()
+
+    def __enter__(self) -> None:
+        self._deadline = time.monotonic() + self._timeout
+
+    def __exit__(self, *exc) -> None:
+        self._deadline = None
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(min(1.0, self._timeout / 4)):
+            deadline = self._deadline
+            if deadline is not None and time.monotonic() > deadline:
+                self.fired = True
+                self._proc.kill()
+                return
+
+
+def head_commit(repo_dir: str) -> Optional[str]:
+    """SHA of HEAD, or None for a repository without commits (or not a repository)."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", repo_dir, "rev-parse", "--verify", "--quiet", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def repository_head(repo_dir: str) -> Optional[str]:
+    """
+    HEAD of the repository rooted at `repo_dir`; None when the directory has no .git of its own
+    (it may still sit inside some other repository's work tree) or no commits.
+    """
+    if not os.path.exists(os.path.join(repo_dir, ".git")):
+        return None
+    return head_commit(repo_dir)
+
+
+def is_ancestor(repo_dir: str, commit: str, descendant: str = "HEAD") -> bool:
+    """True when `commit` exists and is reachable from `descendant` (history was not rewritten past it)."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", repo_dir, "merge-base", "--is-ancestor", commit, descendant],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0
+
+
+def read_git_commits_since(repo_dir: str, since: str) -> Optional[Tuple[str, Tuple[GitCommit, ...]]]:
+    """
+    (HEAD, commits in since..HEAD, newest first) for resuming an analysis that stopped at `since`.
+    Returns None when `since` is no longer part of HEAD's history (rebase, force-push, a different
+    repository) or git fails; callers then rebuild from the full history.
+    """
+    head = head_commit(repo_dir)
+    if head is None or not is_ancestor(repo_dir, since, head):
+        return None
+    if head == since:
+        return head, ()
+    try:
+        return head, tuple(iter_git_commits(repo_dir, f"{since}..{head}"))
+    except subprocess.CalledProcessError as e:
+        print(f"[git error] {' '.join(e.cmd)}\n{e.output}")
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"[git error] {e}")
+    return None
+
+
+def read_git_commits(repo_dir: str) -> Tuple[GitCommit, ...]:
+    """
+    Full history reachable from HEAD (newest first), parsed once per HEAD commit and cached.
+    Returns an empty tuple when the repo has no commits or git fails (the error is printed).
+    Raises subprocess.TimeoutExpired when git log hangs, so a stalled walk is never mistaken for
+    a repository without commits.
+    """
+    head = head_commit(repo_dir)
+    if head is None:
+        return ()
+
+    key = (os.path.realpath(repo_dir), head)
+    with _CACHE_LOCK:
+        cached = _HISTORY_CACHE.get(key)
+        if cached is not None:
+            _HISTORY_CACHE.move_to_end(key)
+            return cached
+
+    try:
+        commits = tuple(iter_git_commits(repo_dir))
+    except subprocess.CalledProcessError as e:
+        print(f"[git error] {' '.join(e.cmd)}\n{e.output}")
+        return ()
+    except OSError as e:
+        print(f"[git error] {e}")
+        return ()
+
+    with _CACHE_LOCK:
+        _HISTORY_CACHE[key] = commits
+        _HISTORY_CACHE.move_to_end(key)
+        while len(_HISTORY_CACHE) > max(GIT_HISTORY_CACHE_SIZE, 0):
+            _HISTORY_CACHE.popitem(last=False)
+    return commits
+
+
+def clear_git_history_cache() -> None:
+    with _CACHE_LOCK:
+        _HISTORY_CACHE.clear()
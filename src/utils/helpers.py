@@ -1,14 +1,12 @@
 import sqlite3
 import shutil
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 import os
 import subprocess
-import pandas as pd
 import re
 
 # Text extraction
 import docx2txt
-import fitz  # PyMuPDF
 from pypdf import PdfReader
 try:
     from src import constants
@@ -126,7 +124,7 @@ def is_git_repo(path: str) -> bool:
 
 ## Text Extraction
 
-def extract_text_file(filepath: str, conn: sqlite3.Connection, user_id: int) -> Optional[str]:
+def _text_file_extension(filepath: str, conn: sqlite3.Connection, user_id: int) -> Optional[str]:
     # Skip DB lookup if conn or user_id not provided
     if conn is None or user_id is None:
         # fallback: infer from file extension
@@ -136,6 +134,14 @@ def extract_text_file(filepath: str, conn: sqlite3.Connection, user_id: int) ->
 
     if not extension:
         print(f"Warning: No extension found in DB for {filepath}, skipping.")
+    return extension
+
+
+def extract_text_file(filepath: str, conn: sqlite3.Connection, user_id: int) -> Optional[str]:
+    from src.utils.text_extraction_cache import cached_extraction
+
+    extension = _text_file_extension(filepath, conn, user_id)
+    if not extension:
         return None
     
     try:
@@ -143,31 +149,52 @@ def extract_text_file(filepath: str, conn: sqlite3.Connection, user_id: int) ->
             case '.txt' | '.md':
                 return extractfromtxt(filepath)
             case '.pdf':
-                return extractfrompdf(filepath)
+                return cached_extraction(conn, filepath, extension, extractfrompdf)
             case '.docx':
-                return extractfromdocx(filepath)
+                return cached_extraction(conn, filepath, extension, extractfromdocx)
             case '.csv':
-                return extractfromcsv(filepath)
+                return cached_extraction(conn, filepath, extension, extractfromcsv)
             case _:
                 print(f"Unsupported text extension '{extension}' for {filepath}")
                 return None
     except Exception as e:
         print(f"Error extracting from {filepath}: {e}")
         return None
-    
+
+
+def iter_text_file_pages(filepath: str, conn: sqlite3.Connection, user_id: int) -> Iterator[str]:
+    """
+    extract_text_file() as a stream: PDF and DOCX files yield their page texts as they are
+    extracted (see src.utils.page_extraction), other text files yield their whole text.
+    "\n".join of the pages is what extract_text_file returns. Extraction errors end the stream.
+    """
+    from src.utils.page_extraction import iter_docx_pages, iter_pdf_pages
+    from src.utils.text_extraction_cache import cached_page_extraction
+
+    extension = _text_file_extension(filepath, conn, user_id)
+    if extension not in (".pdf", ".docx"):
+        text = extract_text_file(filepath, conn, user_id) if extension else None
+        if isinstance(text, str) and text:
+            yield text
+        return
+
+    try:
+        iter_pages = iter_pdf_pages if extension == ".pdf" else iter_docx_pages
+        yield from cached_page_extraction(conn, filepath, extension, iter_pages)
+    except Exception as e:
+        print(f"Error extracting from {filepath}: {e}")
+
 
 def extractfromtxt(filepath:str)->str:
     with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
         return f.read()
 
 def extractfrompdf(filepath:str)->str:
-    text=[]
+    from src.utils.page_extraction import iter_pdf_pages
+
     try:
-        pdf=fitz.open(filepath)
-        for page in pdf:
-            text.append(page.get_text())
-        pdf.close()
-        return '\n'.join(text)
+        # Large PDFs are split across worker processes
+        return '\n'.join(iter_pdf_pages(filepath))
     except Exception as e:
         print(f"Error: {e}")
         return ""
@@ -182,21 +209,22 @@ def extractfromdocx (filepath: str)->str:
         
 
 def extractfromcsv(filepath: str, sample_rows: int = 5) -> dict:
+    from src.utils.csv_profile import cached_csv_profile
+
     try:
-        df = pd.read_csv(filepath, nrows=sample_rows)
-        full_df = pd.read_csv(filepath)
-        total_rows = len(full_df)
-        total_cols = len(full_df.columns)
-        null_ratio = (full_df.isnull().sum().sum() / (total_rows * total_cols)) * 100
-        dtypes = full_df.dtypes.astype(str).to_dict()
-        headers = list(full_df.columns)
+        # One chunked pass instead of a sample read plus a full read
+        profile = cached_csv_profile(filepath, sample_rows)
+        total_rows = profile["row_count"]
+        total_cols = profile["col_count"]
+        total_cells = total_rows * total_cols
+        null_ratio = (profile["null_cells"] / total_cells * 100) if total_cells else 0
 
         #extracts the column headers, data types, sample rows, total rows, total columns, and missing value percentage
         return {
             "filename": os.path.basename(filepath),
-            "headers": headers,
-            "dtypes": dtypes,
-            "sample_rows": df.head(sample_rows).to_dict(orient="records"),
+            "headers": profile["headers"],
+            "dtypes": profile["dtypes"],
+            "sample_rows": profile["sample_rows"],
             "row_count": total_rows,
             "col_count": total_cols,
             "missing_pct": round(null_ratio, 2),
@@ -299,32 +327,40 @@ def normalize_pdf_paragraphs(text: str):
     - Detects standard academic headers.
     - Splits paragraphs cleanly.
     """
+    return list(iter_normalized_paragraphs([text]))
 
-    # Remove double/triple newlines
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
 
-    paragraphs = []
+def iter_normalized_paragraphs(pages: Iterable[str]) -> Iterator[str]:
+    """
+    normalize_pdf_paragraphs() over a stream of page texts (e.g. iter_pdf_pages), yielding each
+    paragraph as soon as the next section header closes it. The pages are treated as if joined
+    with "\n", so the paragraphs are the same as for the whole text.
+    """
     current = []
 
     def is_header(line):
         low = line.lower().rstrip(":")
         return any(low.startswith(h) for h in SECTION_HEADERS)
 
-    for line in lines:
-        # New section header → commit previous paragraph
-        if is_header(line):
-            if current:
-                paragraphs.append(" ".join(current).strip())
-                current = []
-            current.append(line)  # header itself becomes a new paragraph start
-            continue
+    for page in pages:
+        # Remove double/triple newlines
+        for line in page.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
 
-        # Normal continuation → append to the current paragraph
-        current.append(line)
+            # New section header → commit previous paragraph
+            if is_header(line):
+                if current:
+                    yield " ".join(current).strip()
+                    current = []
+                current.append(line)  # header itself becomes a new paragraph start
+                continue
+
+            # Normal continuation → append to the current paragraph
+            current.append(line)
 
     # Final paragraph
     if current:
-        paragraphs.append(" ".join(current).strip())
-
-    return paragraphs
+        yield " ".join(current).strip()
 
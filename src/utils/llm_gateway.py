@@ -0,0 +1,354 @@
+"""
+src/utils/llm_gateway.py
+
+Single entry point for Groq chat completions.
+
+Every LLM call site goes through this gateway, which looks the request up in a persistent
+response cache (llm_response_cache in the app database) before calling the API. Requests are
+content-addressed by (model, SHA-256 of the messages, max_tokens, temperature), so re-analysing
+an identical version, or one whose prompt context did not change, reuses the earlier answer.
+Entries expire after a TTL and the least recently used ones are evicted past a size limit.
+Failed requests are never cached.
+
+Requests that miss the cache run on one asyncio event loop in a background thread, shared by
+every analysis thread in the process. The loop caps the number of requests in flight, paces them
+with requests-per-minute and tokens-per-minute token buckets, and retries 429/5xx responses and
+connection errors with jittered exponential backoff. A 429 pauses the whole gateway for the
+retry delay, not just the request that got it. Callers can block on one request
+(chat_completion), submit several and collect them together (submit, chat_completion_batch), or
+await them from async code (achat_completion, achat_completion_batch). Both the sync Groq client
+and AsyncGroq are accepted; sync clients run on worker threads.
+
+Configuration (environment):
+ - LLM_CACHE_ENABLED: "0" disables the cache (default "1")
+ - LLM_CACHE_MAX_ENTRIES: cached responses kept (default 5000)
+ - LLM_CACHE_TTL_DAYS: age after which a cached response is ignored and evicted (default 30)
+ - LLM_MAX_CONCURRENCY: requests in flight at once (default 4)
+ - LLM_REQUESTS_PER_MINUTE: request rate limit (default 0 = unlimited)
+ - LLM_TOKENS_PER_MINUTE: token rate limit, prompt estimate plus max_tokens (default 0 = unlimited)
+ - LLM_MAX_RETRIES: retries after a 429/5xx or connection error (default 4)
+ - LLM_RETRY_BASE_DELAY: seconds before the first retry, doubled each time (default 1.0)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from groq import APIConnectionError
+
+from src.db.connection import connect
+from src.db.llm_cache import LLMCacheKey, get_cached_llm_response, store_cached_llm_response
+
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1").strip() not in ("0", "false", "no")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30")) * 86400
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+
+# Longest single wait between retries, whatever the backoff or a Retry-After header asks for.
+_RETRY_MAX_DELAY = 60.0
+_RETRY_STATUSES = {408, 409, 429}
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def cache_key(model: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float) -> LLMCacheKey:
+    """(model, prompt_hash, max_tokens, temperature) identifying a chat completion request."""
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    prompt_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return model, prompt_hash, int(max_tokens), round(float(temperature), 4)
+
+
+def chat_completion(
+    client: Any,
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """
+    Return the assistant message for a chat completion request, from the cache when possible.
+    `client` is the caller's Groq or AsyncGroq client; errors left after retrying are raised.
+    """
+    return submit(
+        client, model=model, messages=messages, temperature=temperature, max_tokens=max_tokens
+    ).result()
+
+
+def submit(client: Any, **request: Any) -> concurrent.futures.Future:
+    """Queue a chat completion request (chat_completion keywords) without waiting for it."""
+    return asyncio.run_coroutine_threadsafe(get_gateway().complete(client, **request), _gateway_loop())
+
+
+def chat_completion_batch(
+    client: Any,
+    requests: Sequence[Dict[str, Any]],
+) -> List[Union[str, Exception]]:
+    """
+    Run several requests concurrently and return their answers in order.
+    A request that failed has its exception in its slot instead, so one error doesn't lose the rest.
+    """
+    futures = [submit(client, **request) for request in requests]
+    results: List[Union[str, Exception]] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+async def achat_completion(client: Any, **request: Any) -> str:
+    """chat_completion for async callers, whatever event loop they run on."""
+    return await asyncio.wrap_future(submit(client, **request))
+
+
+async def achat_completion_batch(
+    client: Any,
+    requests: Sequence[Dict[str, Any]],
+) -> List[Union[str, BaseException]]:
+    """chat_completion_batch for async callers."""
+    return await asyncio.gather(
+        *(achat_completion(client, **request) for request in requests),
+        return_exceptions=True,
+    )
+
+
+class TokenBucket:
+    """
+    Holds up to `per_minute` tokens, refilled continuously at `per_minute` a minute.
+    acquire() waits until enough tokens are available; waiters are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # A request larger than the bucket waits for a full bucket rather than forever.
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class LLMGateway:
+    """
+    Concurrency limit, rate limits and retries shared by every request on the gateway loop.
+    Settings default to the LLM_* environment variables.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_base_delay: Optional[float] = None,
+    ):
+        rpm = LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        tpm = LLM_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.max_concurrency = max(1, int(max_concurrency or LLM_MAX_CONCURRENCY))
+        self.max_retries = LLM_MAX_RETRIES if max_retries is None else max(0, int(max_retries))
+        self.retry_base_delay = LLM_RETRY_BASE_DELAY if retry_base_delay is None else float(retry_base_delay)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._request_bucket = TokenBucket(rpm) if rpm > 0 else None
+        self._token_bucket = TokenBucket(tpm) if tpm > 0 else None
+        # time.monotonic() before which nothing is sent, set when the API answers 429
+        self._paused_until = 0.0
+
+    async def complete(
+        self,
+        client: Any,
+        *,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        key = cache_key(model, messages, max_tokens, temperature)
+        cached = await asyncio.to_thread(_lookup, key)
+        if cached is not None:
+            _count("hits")
+            return cached
+
+        _count("misses")
+        request = {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+        content = await self._send(client, request, estimate_tokens(messages, max_tokens))
+        # Empty answers are not worth keeping; a retry may do better.
+        if isinstance(content, str) and content.strip():
+            await asyncio.to_thread(_store, key, content)
+        return content
+
+    async def _send(self, client: Any, request: Dict[str, Any], tokens: int) -> str:
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._wait_for_capacity(tokens)
+                try:
+                    completion = await _create(client, request)
+                    return completion.choices[0].message.content
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+                    delay = _retry_delay(e, attempt, self.retry_base_delay)
+                    if _status_code(e) == 429:
+                        # Everyone shares the quota: hold back the other requests too.
+                        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _wait_for_capacity(self, tokens: int) -> None:
+        while (pause := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(pause)
+        if self._request_bucket:
+            await self._request_bucket.acquire(1)
+        if self._token_bucket:
+            await self._token_bucket.acquire(tokens)
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Rough token cost of a request for the tokens-per-minute bucket: ~4 characters a token."""
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return prompt_chars // 4 + int(max_tokens)
+
+
+_loop_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_gateway: Optional[LLMGateway] = None
+
+
+def get_gateway() -> LLMGateway:
+    """The process-wide gateway, created from the environment on first use."""
+    global _gateway
+    with _loop_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
+
+
+def configure_gateway(**settings: Any) -> LLMGateway:
+    """Replace the process-wide gateway (LLMGateway keywords); requests already queued keep the old one."""
+    global _gateway
+    with _loop_lock:
+        _gateway = LLMGateway(**settings)
+        return _gateway
+
+
+def _gateway_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+async def _create(client: Any, request: Dict[str, Any]) -> Any:
+    create = client.chat.completions.create
+    if inspect.iscoroutinefunction(create):
+        return await create(**request)
+    result = await asyncio.to_thread(create, **request)
+    return await result if inspect.isawaitable(result) else result
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    code = _status_code(exc)
+    if code is not None:
+        return code in _RETRY_STATUSES or code >= 500
+    return isinstance(exc, APIConnectionError)
+
+
+def _retry_delay(exc: BaseException, attempt: int, base: float) -> float:
+    # Honour the server's Retry-After; otherwise back off exponentially. Jitter spreads out
+    # requests that failed together so they don't retry in lockstep.
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None:
+        return min(_RETRY_MAX_DELAY, retry_after + random.uniform(0, base))
+    backoff = min(_RETRY_MAX_DELAY, base * (2 ** attempt))
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def cache_stats() -> Dict[str, int]:
+    """Cache hits and misses counted by the gateway in this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats() -> None:
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def _count(outcome: str) -> None:
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def _lookup(key: LLMCacheKey) -> Optional[str]:
+    if not LLM_CACHE_ENABLED:
+        return None
+    conn = _open()
+    if conn is None:
+        return None
+    try:
+        return get_cached_llm_response(conn, key, LLM_CACHE_TTL_SECONDS)
+    finally:
+        conn.close()
+
+
+def _store(key: LLMCacheKey, response: str) -> None:
+    if not LLM_CACHE_ENABLED:
+        return
+    conn = _open()
+    if conn is None:
+        return
+    try:
+        store_cached_llm_response(conn, key, response, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+    finally:
+        conn.close()
+
+
+def _open():
+    # A short-lived connection per lookup keeps the gateway safe to call from any thread.
+    if os.getenv("APP_DB_PATH", "local_storage.db") == ":memory:":
+        return None
+    try:
+        return connect()
+    except Exception:
+        return None
@@ -0,0 +1,77 @@
+"""
+src/utils/page_extraction.py
+
+Page-streaming text extraction for PDF and DOCX files.
+
+extractfrompdf walked every page on one core and joined them into a single string before
+anything downstream could run. iter_pdf_pages yields the page texts in order instead, so
+paragraph normalisation and section detection (iter_normalized_paragraphs,
+iter_document_sections) can consume a long document while the rest is still being extracted.
+Documents with at least PAGE_EXTRACTION_PARALLEL_MIN_PAGES pages are split into contiguous page
+ranges that spawned worker processes extract concurrently (PyMuPDF is not thread-safe); the
+pages still come out in document order, and "\\n".join of them is exactly extractfrompdf's text.
+
+DOCX files have no stored page structure (pages are a layout decision), so a DOCX is yielded as
+a single page.
+
+Configuration (environment):
+ - PAGE_EXTRACTION_WORKERS: processes used for large PDFs (default min(4, CPU count); 1 = serial)
+ - PAGE_EXTRACTION_PARALLEL_MIN_PAGES: page count from which a PDF is split (default 64)
+ - PAGE_EXTRACTION_BATCH_PAGES: pages extracted per worker job (default 16)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Iterator, List, Optional
+
+import docx2txt
+import fitz  # PyMuPDF
+
+PAGE_EXTRACTION_WORKERS = max(1, int(os.getenv("PAGE_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1)))))
+PAGE_EXTRACTION_PARALLEL_MIN_PAGES = int(os.getenv("PAGE_EXTRACTION_PARALLEL_MIN_PAGES", "64"))
+PAGE_EXTRACTION_BATCH_PAGES = max(1, int(os.getenv("PAGE_EXTRACTION_BATCH_PAGES", "16")))
+
+
+def extract_pdf_page_range(filepath: str, start: int, stop: int) -> List[str]:
+    """Texts of pages [start, stop) of a PDF. Runs in a worker process, so it opens its own handle."""
+    with fitz.open(filepath) as pdf:
+        return [pdf[number].get_text() for number in range(start, stop)]
+
+
+def iter_pdf_pages(filepath: str, workers: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF, in order.
+
+    Small documents are read page by page in this process; large ones are extracted in
+    PAGE_EXTRACTION_BATCH_PAGES-page ranges across `workers` processes. Raises what PyMuPDF
+    raises for an unreadable file.
+    """
+    # Imported here so spawned workers, which import this module, do not load src.db
+    from src.utils.analysis_pool import iter_in_pool
+
+    workers = max(1, int(workers or PAGE_EXTRACTION_WORKERS))
+    pdf = fitz.open(filepath)
+    try:
+        page_count = pdf.page_count
+        if workers == 1 or page_count < max(PAGE_EXTRACTION_PARALLEL_MIN_PAGES, 2):
+            for page in pdf:
+                yield page.get_text()
+            return
+    finally:
+        pdf.close()
+
+    ranges = [
+        (filepath, start, min(start + PAGE_EXTRACTION_BATCH_PAGES, page_count))
+        for start in range(0, page_count, PAGE_EXTRACTION_BATCH_PAGES)
+    ]
+    for texts in iter_in_pool(extract_pdf_page_range, ranges, workers=workers, executor_kind="process"):
+        yield from texts
+
+
+def iter_docx_pages(filepath: str) -> Iterator[str]:
+    """Yield a DOCX's text as one page (nothing if it has no text)."""
+    text = docx2txt.process(filepath)
+    if text:
+        yield text
+
@@ -15,7 +15,20 @@ import warnings
 warnings.filterwarnings("ignore", message="Duplicate name:")
 # This is just to silence the warning in unit test (system doesn't know that we purposefully created a duplicate file for testing)
 
-from src.db import connect, store_parsed_files, get_or_create_user, get_or_create_version_key_for_project
+from src.db import (
+    connect,
+    store_parsed_files,
+    get_or_create_user,
+    get_or_create_version_key_for_project,
+    get_cached_content_hashes,
+    store_cached_content_hashes,
+)
+from src.utils.deduplication.fingerprints import (
+    ContentHasher,
+    forget_content_hashes,
+    remember_content_hash,
+    zip_member_hash_key,
+)
 
 CURR_DIR = os.path.dirname(os.path.abspath(__file__)) # Gives the location of the script itself, not where user is running the command from
 REPO_ROOT = os.path.abspath(os.path.join(CURR_DIR, "..")) # Moves up one level into main repository directory
@@ -29,8 +42,14 @@ SUPPORTED_EXTENSIONS = TEXT_EXTENSIONS.union(CODE_EXTENSIONS)
 UNSUPPORTED_LOG_PATH = os.path.join(ZIP_DATA_DIR, "unsupported_files.json")
 DUPLICATE_LOG_PATH = os.path.join(ZIP_DATA_DIR, "duplicate_files.json")
 
+# Bytes copied per read when streaming a ZIP member to disk
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
 def parse_zip_file(zip_path, user_id: int | None = None, conn=None, *, persist_to_db: bool = True):
-    """Extract a ZIP archive and (optionally) persist file metadata to the database."""
+    """
+    Extract a ZIP archive and (optionally) persist file metadata to the database.
+    Members are streamed to disk in one pass that also classifies and hashes them (see _stream_zip_members).
+    """
     zip_path = str(zip_path)
 
     if not os.path.exists(zip_path):
@@ -50,41 +69,19 @@ def parse_zip_file(zip_path, user_id: int | None = None, conn=None, *, persist_t
     os.makedirs(ZIP_DATA_DIR, exist_ok=True)                         # ensure src/analysis/zip_data exists
     os.makedirs(RAWDATA_DIR, exist_ok=True)
     
+    zip_name = os.path.splitext(os.path.basename(zip_path))[0]
+    target_dir = os.path.join(ZIP_DATA_DIR, zip_name)
+
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        names = zip_ref.namelist()
-        if len(names) == 0:
+        if len(zip_ref.infolist()) == 0:
             return []
-        
-        seen = {}
-        duplicate_names = []
-        for name in names:
-            if name.endswith("/"):
-                continue
-            
-            info = zip_ref.getinfo(name)
-            filename = os.path.basename(name)
-            size = info.file_size
-            
-            key = (filename, size)
-            if key in seen:
-                if constants.VERBOSE:
-                    print(f"Duplicate found in ZIP: {name}")
-                duplicate_names.append(name)
-            else:
-                seen[key] = True
-
-        if duplicate_names:
-            if constants.VERBOSE:
-                print(f"Duplicate files found in ZIP: {len(duplicate_names)} duplicates detected")
 
-        zip_name = os.path.splitext(os.path.basename(zip_path))[0]
-        target_dir = os.path.join(ZIP_DATA_DIR, zip_name)
         if os.path.isdir(target_dir):
             shutil.rmtree(target_dir)
+        forget_content_hashes(target_dir)
         os.makedirs(target_dir, exist_ok=True)
-        zip_ref.extractall(target_dir)
+        files_info = _stream_zip_members(zip_ref, target_dir, conn)
 
-    files_info = collect_file_info(target_dir, zip_path)
     layout = analyze_project_layout(files_info)
     _annotate_projects_on_files(files_info, layout)
 
@@ -120,6 +117,119 @@ def parse_zip_file(zip_path, user_id: int | None = None, conn=None, *, persist_t
     return files_info
 
 
+def _stream_zip_members(zip_ref: zipfile.ZipFile, target_dir: str, conn=None) -> list[dict]:
+    """
+    Single pass over the archive: each member is read once, written under target_dir, and
+    hashed on the way through, and its metadata comes straight from the central directory.
+    The hashes are handed to the dedup fingerprinting so it does not read the files back.
+    Members already in file_hash_cache (same size, modified time and CRC32) are copied
+    without rehashing. __MACOSX resource forks are never written since no later stage looks at them.
+    """
+    entries: dict[str, dict] = {}
+    seen = set()
+    duplicate_names = []
+
+    cache_conn = conn if conn is not None else connect()
+    try:
+        cached_hashes = get_cached_content_hashes(
+            cache_conn, [zip_member_hash_key(info) for info in zip_ref.infolist() if not info.is_dir()]
+        )
+        new_hashes: dict[tuple, str] = {}
+
+        for info in zip_ref.infolist():
+            parts = _safe_member_parts(info.filename)
+            if not parts or any("__MACOSX" in part for part in parts):
+                continue
+
+            full_path = os.path.join(target_dir, *parts)
+            if info.is_dir():
+                os.makedirs(full_path, exist_ok=True)
+                continue
+
+            key = (parts[-1], info.file_size)
+            if key in seen:
+                if constants.VERBOSE:
+                    print(f"Duplicate found in ZIP: {info.filename}")
+                duplicate_names.append(info.filename)
+            else:
+                seen.add(key)
+
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            cache_key = zip_member_hash_key(info)
+            digest = cached_hashes.get(cache_key) or new_hashes.get(cache_key)
+            with zip_ref.open(info) as src, open(full_path, "wb") as dst:
+                if digest is not None:
+                    shutil.copyfileobj(src, dst, _STREAM_CHUNK_SIZE)
+                else:
+                    hasher = ContentHasher(os.path.splitext(info.filename)[1])
+                    while True:
+                        chunk = src.read(_STREAM_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        hasher.update(chunk)
+                        dst.write(chunk)
+                    digest = hasher.hexdigest()
+                    new_hashes[cache_key] = digest
+            remember_content_hash(full_path, digest)
+
+            # ZIP only stores the modified time
+            modified_time = time.ctime(time.mktime(info.date_time + (0, 0, -1)))
+            rel_path = os.path.join(*parts)
+            # A repeated member name overwrites the earlier file on disk, so it replaces its entry too
+            entries.pop(rel_path, None)
+            entry = _build_file_entry(rel_path, parts[-1], info.file_size, modified_time, modified_time)
+            if entry is not None:
+                entries[rel_path] = entry
+
+        if duplicate_names and constants.VERBOSE:
+            print(f"Duplicate files found in ZIP: {len(duplicate_names)} duplicates detected")
+
+        store_cached_content_hashes(cache_conn, [key + (digest,) for key, digest in new_hashes.items()])
+    finally:
+        if cache_conn is not conn:
+            cache_conn.close()
+
+    return list(entries.values())
+
+
+def _safe_member_parts(name: str) -> list[str]:
+    """Path components of a ZIP member with absolute/parent segments removed (as ZipFile.extract does)."""
+    name = name.replace("\\", "/")
+    return [part for part in name.split("/") if part not in ("", ".", "..")]
+
+
+def _build_file_entry(rel_path: str, file_name: str, size: int, created_time: str, modified_time: str) -> dict | None:
+    """Classify one file into a files_info entry, or None if it is unsupported."""
+    extension = os.path.splitext(file_name)[1].lower()
+
+    # detect configuration/dependency files (stored in config_files, not the files table)
+    if file_name in CONFIG_FILES:
+        return {
+            "file_path": rel_path,
+            "file_name": file_name,
+            "extension": extension,
+            "file_type": "config",  # you can use a special type
+            "size_bytes": size,
+            "created": created_time,
+            "modified": modified_time
+        }
+
+    if extension not in SUPPORTED_EXTENSIONS or not is_valid_mime(rel_path, extension):
+        if constants.VERBOSE:
+            print(f"Unsupported file skipped: {file_name}")
+        return None
+
+    return {
+        "file_path": rel_path,
+        "file_name": file_name,
+        "extension": extension,
+        "file_type": classify_file(extension),
+        "size_bytes": size,
+        "created": created_time,
+        "modified": modified_time
+    }
+
+
 def classify_file(extension: str) -> str:
     if extension in TEXT_EXTENSIONS:
         return "text"
@@ -192,7 +302,6 @@ def collect_file_info(root_dir, zip_path=None):
 
         for file in files:
             full_path = os.path.join(folder, file)
-            extension = os.path.splitext(file)[1].lower()
             rel_path = os.path.relpath(full_path, root_dir)
 
             # Get timestamp from ZIP metadata if available, otherwise use file system
@@ -206,37 +315,11 @@ def collect_file_info(root_dir, zip_path=None):
                 created_time = time.ctime(stats.st_ctime)
                 modified_time = time.ctime(stats.st_mtime)
 
-            # detect configuration/dependency files
-            if file in CONFIG_FILES:
-                collected.append({
-                    "file_path": rel_path,
-                    "file_name": file,
-                    "extension": extension,
-                    "file_type": "config",  # you can use a special type
-                    "size_bytes": os.stat(full_path).st_size,
-                    "created": created_time,
-                    "modified": modified_time
-                })
-                #skip storing config files in files table
-                continue
-
-            if extension not in SUPPORTED_EXTENSIONS or not is_valid_mime(full_path, extension):
-                if constants.VERBOSE:
-                    print(f"Unsupported file skipped: {file}")
-                continue
-
             stats = os.stat(full_path)
+            entry = _build_file_entry(rel_path, file, stats.st_size, created_time, modified_time)
+            if entry is not None:
+                collected.append(entry)
 
-            collected.append({
-                "file_path": rel_path,
-                "file_name": file,
-                "extension": extension,
-                "file_type": classify_file(extension),
-                "size_bytes": stats.st_size,
-                "created": created_time,
-                "modified": modified_time
-            })
-            
     # Log the unsupported files (feedback to users)
     if unsupported_files:
         print(f"Unsupported files logged at: {UNSUPPORTED_LOG_PATH}")
@@ -0,0 +1,112 @@
+"""
+src/utils/text_extraction_cache.py
+
+Persistent cache of the text extracted from PDF, DOCX and CSV files.
+
+Opening a PDF with PyMuPDF or a DOCX with docx2txt costs far more than hashing the file, and the
+same unchanged files come back with every new version of a project and whenever the text
+pipeline, the collaborative flow or the main-file section endpoints need them. Extractions are
+stored in extracted_text_cache (app database) under the file's content hash, the digest dedup
+stores in version_files.file_hash (current_content_hash reuses the one recorded while the ZIP
+was extracted), compressed with zlib and evicted least recently used past a size budget.
+Empty or failed extractions are never cached. Page-streamed extractions (cached_page_extraction)
+share the same entries: a hit is yielded as one page, a miss is stored once the last page is out.
+
+Configuration (environment):
+ - EXTRACTED_TEXT_CACHE_ENABLED: "0" disables the cache (default "1")
+ - EXTRACTED_TEXT_CACHE_MAX_MB: compressed extractions kept before LRU eviction (default 256)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from src.db.extracted_text_cache import get_cached_extracted_text, store_cached_extracted_text
+from src.utils.deduplication.fingerprints import current_content_hash
+
+EXTRACTED_TEXT_CACHE_ENABLED = os.getenv("EXTRACTED_TEXT_CACHE_ENABLED", "1").strip() not in ("0", "false", "no")
+EXTRACTED_TEXT_CACHE_MAX_BYTES = int(float(os.getenv("EXTRACTED_TEXT_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+# Plain-text formats are read directly; caching them would cost as much as reading them.
+CACHED_EXTENSIONS = {".pdf", ".docx", ".csv"}
+
+
+def cached_extraction(
+    conn: Optional[sqlite3.Connection],
+    filepath: str,
+    extension: str,
+    extract: Callable[[str], Any],
+) -> Any:
+    """
+    extract(filepath), served from extracted_text_cache when a file with the same content was
+    extracted before. CSV profiles (dicts) are stored as JSON without their "filename", which
+    belongs to the file being read, not to the content.
+    """
+    if not (
+        EXTRACTED_TEXT_CACHE_ENABLED
+        and extension in CACHED_EXTENSIONS
+        and isinstance(conn, sqlite3.Connection)
+    ):
+        return extract(filepath)
+
+    try:
+        file_hash = current_content_hash(filepath)
+    except OSError:
+        return extract(filepath)
+
+    cached = get_cached_extracted_text(conn, file_hash, extension)
+    if cached is not None:
+        if extension != ".csv":
+            return cached
+        return {"filename": os.path.basename(filepath), **json.loads(cached)}
+
+    result = extract(filepath)
+    if result:
+        if extension == ".csv":
+            payload = json.dumps({k: v for k, v in result.items() if k != "filename"}, default=str)
+        else:
+            payload = result
+        store_cached_extracted_text(conn, file_hash, extension, payload, EXTRACTED_TEXT_CACHE_MAX_BYTES)
+    return result
+
+
+def cached_page_extraction(
+    conn: Optional[sqlite3.Connection],
+    filepath: str,
+    extension: str,
+    iter_pages: Callable[[str], Iterable[str]],
+) -> Iterator[str]:
+    """
+    Yield iter_pages(filepath), or the cached text as a single page. The pages are cached as
+    "\n".join(pages), the same entry cached_extraction reads, once the stream completes.
+    """
+    if not (
+        EXTRACTED_TEXT_CACHE_ENABLED
+        and extension in CACHED_EXTENSIONS
+        and extension != ".csv"
+        and isinstance(conn, sqlite3.Connection)
+    ):
+        yield from iter_pages(filepath)
+        return
+
+    try:
+        file_hash = current_content_hash(filepath)
+    except OSError:
+        yield from iter_pages(filepath)
+        return
+
+    cached = get_cached_extracted_text(conn, file_hash, extension)
+    if cached is not None:
+        yield cached
+        return
+
+    pages = []
+    for page in iter_pages(filepath):
+        pages.append(page)
+        yield page
+    text = "\n".join(pages)
+    if text:
+        store_cached_extracted_text(conn, file_hash, extension, text, EXTRACTED_TEXT_CACHE_MAX_BYTES)
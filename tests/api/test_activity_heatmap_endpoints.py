@@ -40,13 +40,10 @@ def client():
     return TestClient(app)
 
 
-def test_get_activity_heatmap_png_success(client, tmp_path):
-    png_path = tmp_path / "heatmap.png"
-    png_path.write_bytes(SAMPLE_PNG_BYTES)
-
+def test_get_activity_heatmap_png_success(client):
     with patch(
-        "src.api.routes.activity_heatmap.get_activity_heatmap_png_path",
-        return_value=("MyProject", str(png_path)),
+        "src.api.routes.activity_heatmap.get_activity_heatmap_png_bytes",
+        return_value=("MyProject", SAMPLE_PNG_BYTES),
     ):
         resp = client.get("/projects/123/activity-heatmap.png?mode=diff&normalize=true")
 
@@ -57,7 +54,7 @@ def test_get_activity_heatmap_png_success(client, tmp_path):
 
 def test_get_activity_heatmap_png_project_not_found(client):
     with patch(
-        "src.api.routes.activity_heatmap.get_activity_heatmap_png_path",
+        "src.api.routes.activity_heatmap.get_activity_heatmap_png_bytes",
         side_effect=ValueError("Project not found"),
     ):
         resp = client.get("/projects/999/activity-heatmap.png?mode=diff")
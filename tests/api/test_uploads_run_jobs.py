@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.db.analysis_jobs import get_analysis_job
+from src.db.uploads import create_upload
+import src.services.analysis_jobs_service as jobs_service
+
+
+TERMINAL = {"succeeded", "failed", "cancelled"}
+
+
+@pytest.fixture(autouse=True)
+def _fast_job_pool(monkeypatch):
+    monkeypatch.setattr(jobs_service, "ANALYSIS_JOB_RETRY_DELAY_SECONDS", 0.0)
+    yield
+    jobs_service.shutdown_analysis_workers(wait=True)
+
+
+def _ready_upload(seed_conn, tmp_path, *, user_id: int = 1) -> int:
+    now = datetime.now(timezone.utc).isoformat()
+    seed_conn.execute(
+        "INSERT INTO consent_log(user_id, status, timestamp) VALUES (?, 'accepted', ?)",
+        (user_id, now),
+    )
+    seed_conn.execute(
+        "INSERT INTO external_consent(user_id, status, timestamp) VALUES (?, 'accepted', ?)",
+        (user_id, now),
+    )
+    seed_conn.commit()
+
+    zip_path = tmp_path / "ready.zip"
+    zip_path.write_bytes(b"placeholder")
+    return create_upload(
+        seed_conn,
+        user_id=user_id,
+        zip_name="ready.zip",
+        zip_path=str(zip_path),
+        status="needs_file_roles",
+        state={
+            "zip_path": str(zip_path),
+            "dedup_project_keys": {"BuddyCart": 1, "Notes": 2},
+            "dedup_version_keys": {"BuddyCart": 11, "Notes": 12},
+            "classifications": {"BuddyCart": "individual", "Notes": "individual"},
+            "project_types_auto": {"BuddyCart": "code", "Notes": "code"},
+            "project_types_mixed": [],
+            "project_types_unknown": [],
+        },
+    )
+
+
+def _wait_for_job(seed_conn, job_id: int, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = get_analysis_job(seed_conn, job_id)
+        if job and job["status"] in TERMINAL:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish: {get_analysis_job(seed_conn, job_id)}")
+
+
+def _queue(client, auth_headers, upload_id: int, scope: str = "individual", force_rerun: bool = False):
+    return client.post(
+        f"/projects/upload/{upload_id}/run",
+        headers=auth_headers,
+        json={"scope": scope, "force_rerun": force_rerun, "mode": "queue"},
+    )
+
+
+def test_queue_mode_returns_job_id_and_runs_in_background(client, auth_headers, seed_conn, monkeypatch, tmp_path):
+    upload_id = _ready_upload(seed_conn, tmp_path)
+    release = threading.Event()
+
+    def _fake_execute(*args, progress_cb=None, projects_in_scope=(), **kwargs):
+        release.wait(5)
+        for i, name in enumerate(projects_in_scope):
+            progress_cb(i, len(projects_in_scope), name)
+        progress_cb(len(projects_in_scope), len(projects_in_scope), None)
+        return {"executed_projects": list(projects_in_scope), "executed_count": len(projects_in_scope)}
+
+    monkeypatch.setattr("src.services.uploads_run_service.has_executable_files_for_scope", lambda *a, **k: True)
+    monkeypatch.setattr("src.services.uploads_run_service.execute_upload_scope_analysis", _fake_execute)
+
+    res = _queue(client, auth_headers, upload_id)
+    assert res.status_code == 200
+    job_id = res.json()["data"]["job_id"]
+    assert isinstance(job_id, int)
+
+    # The request returned before the analysis finished.
+    in_flight = client.get(f"/projects/upload/{upload_id}/jobs/{job_id}", headers=auth_headers).json()["data"]
+    assert in_flight["status"] in {"queued", "running"}
+
+    release.set()
+    job = _wait_for_job(seed_conn, job_id)
+    assert job["status"] == "succeeded"
+    assert job["progress_done"] == job["progress_total"] == 2
+    assert job["result"]["executed_count"] == 2
+
+    upload = client.get(f"/projects/upload/{upload_id}", headers=auth_headers).json()["data"]
+    assert upload["status"] == "done"
+    assert upload["state"]["run_state"]["completed_scopes"] == ["individual"]
+
+    listed = client.get(f"/projects/upload/{upload_id}/jobs", headers=auth_headers).json()["data"]["jobs"]
+    assert [j["job_id"] for j in listed] == [job_id]
+
+
+def test_queue_mode_blocks_second_job_while_active(client, auth_headers, seed_conn, monkeypatch, tmp_path):
+    upload_id = _ready_upload(seed_conn, tmp_path)
+    release = threading.Event()
+
+    monkeypatch.setattr("src.services.uploads_run_service.has_executable_files_for_scope", lambda *a, **k: True)
+    monkeypatch.setattr(
+        "src.services.uploads_run_service.execute_upload_scope_analysis",
+        lambda *a, **k: release.wait(5) and {"executed_count": 2},
+    )
+
+    first = _queue(client, auth_headers, upload_id)
+    job_id = first.json()["data"]["job_id"]
+
+    second = _queue(client, auth_headers, upload_id)
+    assert second.status_code == 409
+    errors = second.json()["detail"]["errors"]
+    assert errors[0]["code"] in {"analysis_job_active", "already_analyzing"}
+
+    release.set()
+    assert _wait_for_job(seed_conn, job_id)["status"] == "succeeded"
+
+
+def test_failed_attempt_is_retried_then_succeeds(client, auth_headers, seed_conn, monkeypatch, tmp_path):
+    upload_id = _ready_upload(seed_conn, tmp_path)
+    calls = {"n": 0}
+
+    def _flaky(*args, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("transient")
+        return {"executed_count": 2}
+
+    monkeypatch.setattr(jobs_service, "ANALYSIS_JOB_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr("src.services.uploads_run_service.has_executable_files_for_scope", lambda *a, **k: True)
+    monkeypatch.setattr("src.services.uploads_run_service.execute_upload_scope_analysis", _flaky)
+
+    job_id = _queue(client, auth_headers, upload_id).json()["data"]["job_id"]
+    job = _wait_for_job(seed_conn, job_id)
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 2
+    assert calls["n"] == 2
+
+
+def test_job_fails_after_last_attempt_and_marks_upload_failed(client, auth_headers, seed_conn, monkeypatch, tmp_path):
+    upload_id = _ready_upload(seed_conn, tmp_path)
+
+    def _boom(*args, **kwargs):
+        raise RuntimeError("analysis exploded")
+
+    monkeypatch.setattr(jobs_service, "ANALYSIS_JOB_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr("src.services.uploads_run_service.has_executable_files_for_scope", lambda *a, **k: True)
+    monkeypatch.setattr("src.services.uploads_run_service.execute_upload_scope_analysis", _boom)
+
+    job_id = _queue(client, auth_headers, upload_id).json()["data"]["job_id"]
+    job = _wait_for_job(seed_conn, job_id)
+    assert job["status"] == "failed"
+    assert job["error"] == "analysis exploded"
+
+    upload = client.get(f"/projects/upload/{upload_id}", headers=auth_headers).json()["data"]
+    assert upload["status"] == "failed"
+    assert upload["state"]["run_state"]["last_error"] == "analysis exploded"
+
+
+def test_forced_rerun_job_skips_the_cached_result(client, auth_headers, seed_conn, monkeypatch, tmp_path):
+    upload_id = _ready_upload(seed_conn, tmp_path)
+    calls = {"n": 0}
+
+    def _count(*args, **kwargs):
+        calls["n"] += 1
+        return {"executed_projects": ["BuddyCart", "Notes"], "executed_count": 2, "run": calls["n"]}
+
+    monkeypatch.setattr("src.services.uploads_run_service.has_executable_files_for_scope", lambda *a, **k: True)
+    monkeypatch.setattr("src.services.uploads_run_service.execute_upload_scope_analysis", _count)
+
+    first = _wait_for_job(seed_conn, _queue(client, auth_headers, upload_id).json()["data"]["job_id"])
+    assert first["result"]["run"] == 1
+
+    # A job for the completed scope that is not forced (e.g. requeued after a restart)
+    # returns the recorded result without running the analysis again.
+    cached = _wait_for_job(seed_conn, jobs_service.enqueue_analysis_job(seed_conn, 1, upload_id, "individual")["job_id"])
+    assert cached["status"] == "succeeded"
+    assert cached["result"]["run"] == 1
+    assert calls["n"] == 1
+
+    forced = _queue(client, auth_headers, upload_id, force_rerun=True)
+    assert forced.status_code == 200
+    job = _wait_for_job(seed_conn, forced.json()["data"]["job_id"])
+    assert job["force_rerun"] is True
+    assert job["status"] == "succeeded"
+    assert job["result"]["run"] == 2
+    assert calls["n"] == 2
+
+
+def test_cancel_running_job_stops_at_project_boundary(client, auth_headers, seed_conn, monkeypatch, tmp_path):
+    upload_id = _ready_upload(seed_conn, tmp_path)
+    started = threading.Event()
+    release = threading.Event()
+
+    from src.services.uploads_run_execute_service import AnalysisCancelled
+
+    def _slow(*args, should_cancel=None, **kwargs):
+        started.set()
+        release.wait(5)
+        if should_cancel():
+            raise AnalysisCancelled("stop")
+        return {"executed_count": 2}
+
+    monkeypatch.setattr("src.services.uploads_run_service.has_executable_files_for_scope", lambda *a, **k: True)
+    monkeypatch.setattr("src.services.uploads_run_service.execute_upload_scope_analysis", _slow)
+
+    job_id = _queue(client, auth_headers, upload_id).json()["data"]["job_id"]
+    assert started.wait(5)
+
+    res = client.post(f"/projects/upload/{upload_id}/jobs/{job_id}/cancel", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.json()["data"]["cancel_requested"] is True
+
+    release.set()
+    assert _wait_for_job(seed_conn, job_id)["status"] == "cancelled"
+
+    upload = client.get(f"/projects/upload/{upload_id}", headers=auth_headers).json()["data"]
+    assert upload["status"] == "needs_file_roles"
+    assert "last_cancelled_at" in upload["state"]["run_state"]
+
+
+def test_job_endpoints_404_for_other_upload(client, auth_headers, seed_conn, tmp_path):
+    upload_id = _ready_upload(seed_conn, tmp_path)
+    res = client.get(f"/projects/upload/{upload_id}/jobs/999", headers=auth_headers)
+    assert res.status_code == 404
+
+    res = client.get("/projects/upload/999999/jobs", headers=auth_headers)
+    assert res.status_code == 404
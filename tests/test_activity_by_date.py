@@ -0,0 +1,77 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+import src.db as db
+from src.db.activity_by_date import ActivityByDate, get_activity_counts_by_date
+from src.services.skills_service import get_activity_by_date_grid
+
+
+def _activity(intervals):
+    names = list(intervals)
+    return ActivityByDate(
+        names,
+        np.array([intervals[n][0] for n in names], dtype="datetime64[D]"),
+        np.array([intervals[n][1] for n in names], dtype="datetime64[D]"),
+    )
+
+
+def _naive(intervals, day):
+    return sorted(name for name, (start, end) in intervals.items() if start <= day <= end)
+
+
+def test_interval_sweep_matches_a_day_by_day_walk():
+    rng = random.Random(7)
+    base = date(2020, 1, 1)
+    intervals = {}
+    for i in range(25):
+        start = base + timedelta(days=rng.randrange(0, 1500))
+        intervals[f"p{i:02d}"] = (start, start + timedelta(days=rng.randrange(0, 400)))
+    activity = _activity(intervals)
+
+    window_start, window_end = date(2020, 6, 1), date(2022, 3, 15)
+    counts = activity.counts_between(window_start, window_end)
+    by_date = activity.projects_between(window_start, window_end)
+
+    assert len(counts) == (window_end - window_start).days + 1
+    for offset, count in enumerate(counts):
+        day = window_start + timedelta(days=offset)
+        expected = _naive(intervals, day)
+        assert count == len(expected)
+        assert by_date.get(day.isoformat(), []) == expected
+        assert activity.projects_on(day) == expected
+
+    years = {y for start, end in intervals.values() for y in range(start.year, end.year + 1)}
+    assert activity.years == sorted(years)
+    assert activity.first_day == min(start for start, _ in intervals.values())
+
+
+def test_windows_outside_every_project_are_empty():
+    activity = _activity({"a": (date(2024, 1, 1), date(2024, 1, 3))})
+
+    assert activity.counts_between("2023-01-01", "2023-12-31").sum() == 0
+    assert activity.projects_between("2025-01-01", "2025-01-31") == {}
+    assert activity.counts_between("2024-01-03", "2024-01-05").tolist() == [1, 0, 0]
+
+
+def test_grid_only_carries_tooltips_for_days_on_the_grid():
+    conn = db.connect()
+    user_id = db.get_or_create_user(conn, "heatmap-user")
+    for name, start, end in (("Old", "2019-03-01", "2019-03-02"), ("New", "2024-01-01", "2024-01-07")):
+        db.save_project_summary(conn, user_id, name, "{}")
+        db.set_project_dates(conn, user_id, name, start, end)
+    conn.commit()
+
+    grid = get_activity_by_date_grid(conn, user_id, year=2024)
+
+    assert grid["available_years"] == [2019, 2024]
+    assert grid["col_labels"][0] == "2023-12-31"  # the Sunday on or before Jan 1
+    assert len(grid["matrix"]) == 7 and len(grid["matrix"][0]) == len(grid["col_labels"])
+    assert sum(map(sum, grid["matrix"])) == 7
+    assert grid["matrix"][1][0] == 1  # Monday 2024-01-01, first week
+    assert set(grid["projects_by_date"]) == {f"2024-01-0{d}" for d in range(1, 8)}
+
+    counts, projects_by_date = get_activity_counts_by_date(conn, user_id)
+    assert len(counts) == 9
+    assert projects_by_date["2019-03-02"] == ["Old"]
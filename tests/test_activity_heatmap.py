@@ -1,13 +1,20 @@
+import io
 import sqlite3
 from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pytest
+from PIL import Image
 
+import src.analysis.visualizations.activity_heatmap as heatmap
 from src.analysis.visualizations.activity_heatmap import (
     build_project_activity_heatmap_matrix,
+    get_project_activity_heatmap_png,
     render_heatmap_png,
+    render_heatmap_png_fast,
 )
+from src.db import insert_project_version
 
 # -------- fixtures --------
 
@@ -179,4 +186,39 @@ def test_heatmap_negative_no_versions_raises(conn):
     _insert_project(conn, user_id, project_name, "code")
 
     with pytest.raises(ValueError, match=r"no versions"):
-        build_project_activity_heatmap_matrix(conn, user_id, project_name, mode="diff", normalize=True)
\ No newline at end of file
+        build_project_activity_heatmap_matrix(conn, user_id, project_name, mode="diff", normalize=True)
+
+def test_fast_renderer_draws_the_same_buckets():
+    mat = np.array([[0.0, 100.0], [50.0, 0.0]])
+
+    png = render_heatmap_png_fast(mat, ["Feature Coding", "Testing"], ["v1", "v2"], "Demo")
+
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    img = Image.open(io.BytesIO(png)).convert("RGB")
+    colors = {"#%02x%02x%02x" % rgb for _count, rgb in img.getcolors(maxcolors=1 << 16)}
+    assert {heatmap.GITHUB_COLORS[0], heatmap.GITHUB_COLORS[-1]} <= colors
+
+
+def test_rendered_png_is_cached_until_a_version_is_added(conn):
+    user_id = _insert_user(conn, "cache_user")
+    project_name = "HeatmapCache"
+    pk = _insert_project(conn, user_id, project_name, "code")
+    v1 = _insert_version(conn, pk, "fp_v1")
+    _add_file(conn, v1, f"{project_name}/src/app.py", "A1")
+
+    with patch.object(heatmap, "render_heatmap_png_fast", wraps=heatmap.render_heatmap_png_fast) as render:
+        first = get_project_activity_heatmap_png(conn, user_id, project_name, mode="diff")
+        assert get_project_activity_heatmap_png(conn, user_id, project_name, mode="diff") == first
+        assert render.call_count == 1
+
+        # Other options are cached separately
+        get_project_activity_heatmap_png(conn, user_id, project_name, mode="diff", normalize=False)
+        assert render.call_count == 2
+
+        v2 = insert_project_version(conn, pk, None, "fp_v2", "fp_v2")
+        _add_file(conn, v2, f"{project_name}/tests/test_app.py", "T1")
+        assert conn.execute("SELECT COUNT(*) FROM activity_heatmap_cache").fetchone()[0] == 0
+
+        get_project_activity_heatmap_png(conn, user_id, project_name, mode="diff")
+        assert render.call_count == 3
+        assert render.call_args.args[2] == ["v1", "v2"]
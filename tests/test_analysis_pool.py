@@ -0,0 +1,224 @@
+import operator
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import src.db as db
+import src.utils.analysis_pool as analysis_pool
+from src.utils.analysis_pool import database_path, iter_in_pool, open_worker_connection, run_in_pool
+import src.services.uploads_run_execute_service as execute_service
+
+
+def test_run_in_pool_returns_results_in_input_order():
+    def slow_square(x):
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    assert run_in_pool(slow_square, [(i,) for i in range(5)], workers=3) == [0, 1, 4, 9, 16]
+
+
+def test_run_in_pool_limits_in_flight_work():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def track(_):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+
+    run_in_pool(track, [(i,) for i in range(8)], workers=2)
+    assert state["peak"] == 2
+
+
+def test_run_in_pool_stops_submitting_after_cancel():
+    started = []
+    cancel = threading.Event()
+
+    def work(i):
+        started.append(i)
+        time.sleep(0.02)
+        return i
+
+    results = run_in_pool(
+        work,
+        [(i,) for i in range(6)],
+        workers=2,
+        on_done=lambda index, result: cancel.set(),
+        should_cancel=cancel.is_set,
+    )
+    assert len(started) == 2
+    assert results[2:] == [None] * 4
+
+
+def test_run_in_pool_reraises_first_worker_error():
+    def work(i):
+        if i == 1:
+            raise ValueError("bad project")
+        return i
+
+    with pytest.raises(ValueError, match="bad project"):
+        run_in_pool(work, [(i,) for i in range(4)], workers=2)
+
+
+def test_run_in_pool_process_executor():
+    assert run_in_pool(operator.mul, [(2, 3), (4, 5)], workers=2, executor_kind="process") == [6, 20]
+
+
+def test_iter_in_pool_streams_results_in_input_order():
+    started = []
+
+    def slow_square(x):
+        started.append(x)
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    results = iter_in_pool(slow_square, [(i,) for i in range(5)], workers=2)
+    assert next(results) == 0
+    assert len(started) <= 3  # bounded look-ahead
+    assert list(results) == [1, 4, 9, 16]
+
+
+def _write_rows(db_path, worker, rows):
+    conn = open_worker_connection(db_path)
+    try:
+        for i in range(rows):
+            conn.execute("INSERT INTO t (worker, n) VALUES (?, ?)", (worker, i))
+            time.sleep(0.001)  # hold the write transaction open, as real analyses do
+            conn.execute("UPDATE t SET n = n WHERE worker = ?", (worker,))
+            conn.commit()
+        with conn:
+            conn.executemany("INSERT INTO t (worker, n) VALUES (?, ?)", [(worker, -1), (worker, -2)])
+        return conn.execute("SELECT COUNT(*) FROM t WHERE worker = ?", (worker,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_worker_writes_go_through_one_writer(tmp_path, monkeypatch):
+    # Without the write gate, workers would fail on SQLite's lock as soon as the timeout is hit
+    monkeypatch.setattr(analysis_pool, "WORKER_BUSY_TIMEOUT", 0.001)
+    db_path = str(tmp_path / "writers.db")
+    with sqlite3.connect(db_path) as setup:
+        setup.execute("CREATE TABLE t (worker INTEGER, n INTEGER)")
+
+    counts = run_in_pool(_write_rows, [(db_path, w, 30) for w in range(4)], workers=4, executor_kind="thread")
+
+    assert counts == [32] * 4
+    assert not analysis_pool._write_gate.locked()
+
+
+def test_worker_writes_go_through_one_writer_across_processes(tmp_path):
+    db_path = str(tmp_path / "writers.db")
+    with sqlite3.connect(db_path) as setup:
+        setup.execute("CREATE TABLE t (worker INTEGER, n INTEGER)")
+
+    counts = run_in_pool(_write_rows, [(db_path, w, 10) for w in range(2)], workers=2, executor_kind="process")
+
+    assert counts == [12] * 2
+
+
+def test_failed_write_releases_the_write_gate(tmp_path):
+    conn = open_worker_connection(str(tmp_path / "gate.db"))
+    conn.execute("CREATE TABLE t (n INTEGER PRIMARY KEY)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    assert analysis_pool._write_gate.locked()
+    with pytest.raises(sqlite3.IntegrityError):
+        with conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+    assert not analysis_pool._write_gate.locked()
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    conn.close()
+
+
+def test_database_path_is_none_for_memory_db():
+    conn = sqlite3.connect(":memory:")
+    try:
+        assert database_path(conn) is None
+    finally:
+        conn.close()
+
+
+def test_execute_upload_scope_analysis_runs_projects_on_separate_connections(monkeypatch, tmp_path):
+    conn = db.connect()
+    user_id = db.get_or_create_user(conn, "parallel-user")
+    zip_path = tmp_path / "upload.zip"
+    zip_path.write_bytes(b"zip")
+
+    seen = {}
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_run_individual(worker_conn, uid, project_name, *args, **kwargs):
+        # Both projects must be in flight at the same time on distinct connections.
+        barrier.wait()
+        seen[project_name] = id(worker_conn)
+
+    monkeypatch.setattr(execute_service, "run_individual_analysis", fake_run_individual)
+    monkeypatch.setattr(execute_service, "_load_skills_into_summary", lambda *a, **k: None)
+    monkeypatch.setattr(execute_service, "_load_text_metrics_into_summary", lambda *a, **k: None)
+
+    progress = []
+    result = execute_service.execute_upload_scope_analysis(
+        conn,
+        user_id,
+        upload={"zip_path": str(zip_path), "state": {}},
+        projects_in_scope=["Alpha", "Beta"],
+        classifications={"Alpha": "individual", "Beta": "individual"},
+        resolved_types={"Alpha": "code", "Beta": "code"},
+        external_consent=None,
+        progress_cb=lambda done, total, name: progress.append((done, total)),
+        workers=2,
+        executor_kind="thread",
+    )
+
+    assert result == {"executed_projects": ["Alpha", "Beta"], "executed_count": 2}
+    assert len({seen["Alpha"], seen["Beta"], id(conn)}) == 3
+    assert progress[0] == (0, 2) and progress[-1] == (2, 2)
+
+    names = {
+        row[0]
+        for row in conn.execute(
+            """
+            SELECT p.display_name
+            FROM project_summaries s JOIN projects p ON p.project_key = s.project_key
+            WHERE s.user_id = ?
+            """,
+            (user_id,),
+        ).fetchall()
+    }
+    assert names == {"Alpha", "Beta"}
+
+
+def test_execute_upload_scope_analysis_collects_code_metrics_per_project(monkeypatch, tmp_path):
+    conn = db.connect()
+    user_id = db.get_or_create_user(conn, "parallel-collab-user")
+    zip_path = tmp_path / "upload.zip"
+    zip_path.write_bytes(b"zip")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_contributions(worker_conn, uid, project_name, *args, code_run, **kwargs):
+        barrier.wait()
+        code_run.add_metrics({"project": project_name})
+
+    printed = []
+    monkeypatch.setattr(execute_service, "get_individual_contributions", fake_contributions)
+    monkeypatch.setattr(execute_service, "print_code_portfolio_summary", printed.append)
+    monkeypatch.setattr(execute_service, "_load_skills_into_summary", lambda *a, **k: None)
+    monkeypatch.setattr(execute_service, "_load_text_metrics_into_summary", lambda *a, **k: None)
+
+    execute_service.execute_upload_scope_analysis(
+        conn,
+        user_id,
+        upload={"zip_path": str(zip_path), "state": {}},
+        projects_in_scope=["Alpha", "Beta"],
+        classifications={"Alpha": "collaborative", "Beta": "collaborative"},
+        resolved_types={"Alpha": "code", "Beta": "code"},
+        external_consent=None,
+        workers=2,
+        executor_kind="thread",
+    )
+
+    assert printed == [[{"project": "Alpha"}, {"project": "Beta"}]]
@@ -318,21 +318,25 @@ def test_portfolio_summary_keywords(tmp_sqlite_conn, temp_zip_layout, monkeypatc
     monkeypatch.setattr(cc, "read_git_history", _fake_commits_me)
 
     # Analyze two separate collaborative CODE projects
+    code_run = cc.CodeRun()
     m1 = cc.analyze_code_project(
         conn=tmp_sqlite_conn,
         user_id=7,
         project_name=proj1,
         zip_path=temp_zip_layout["zip_path"],
+        code_run=code_run,
     )
     m2 = cc.analyze_code_project(
         conn=tmp_sqlite_conn,
         user_id=7,
         project_name=proj2,
         zip_path=temp_zip_layout["zip_path"],
+        code_run=code_run,
     )
 
     # Now print the combined summary
-    cc.print_code_portfolio_summary()
+    assert code_run.metrics == [m1, m2]
+    cc.print_code_portfolio_summary(code_run.metrics)
 
     out = capsys.readouterr().out
 
@@ -6,6 +6,8 @@ from src.db import (
     insert_code_collaborative_metrics,
     get_metrics_id,
     insert_code_collaborative_summary,
+    get_code_collaborative_checkpoint,
+    store_code_collaborative_checkpoint,
 )
 from src.db.projects import get_project_key
 
@@ -152,6 +154,26 @@ def test_insert_code_collaborative_metrics_updates_on_conflict():
     assert loc_added == 999
 
 
+def test_code_collaborative_checkpoint_round_trip():
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    user_id = 1
+    project_name = "test_project"
+
+    assert get_code_collaborative_checkpoint(conn, user_id, project_name) is None
+
+    insert_code_collaborative_metrics(conn, user_id, project_name, _make_fake_payload())
+    assert get_code_collaborative_checkpoint(conn, user_id, project_name) is None
+
+    state = {"version": 1, "totals": {"commits_all": 10}}
+    store_code_collaborative_checkpoint(conn, user_id, project_name, "abc123", state)
+    assert get_code_collaborative_checkpoint(conn, user_id, project_name) == ("abc123", state)
+
+    # Re-analysis overwrites the metrics but keeps the checkpoint until a new one is stored
+    insert_code_collaborative_metrics(conn, user_id, project_name, _make_fake_payload())
+    assert get_code_collaborative_checkpoint(conn, user_id, project_name) == ("abc123", state)
+
+
 # -------------------------------------------------------------------
 # 3. Missing / partial metrics: safely handle empty JSON lists
 # -------------------------------------------------------------------
@@ -418,3 +418,34 @@ def test_display_complexity_results_lizard_only(capsys):
     assert 'QUALITY METRICS:' in out
     assert 'Average Complexity (CCN): 6.2' in out
     assert 'ADDITIONAL METRICS:' in out
+
+
+def test_complexity_cache_reuses_results_for_unchanged_content(tmp_sqlite_conn, tmp_path, monkeypatch):
+    """
+    A file whose content was analysed before (even under another path/name) is served from
+    file_complexity_cache; only new content reaches radon/lizard.
+    """
+    init_schema(tmp_sqlite_conn)
+    v1 = tmp_path / "v1.py"
+    v2 = tmp_path / "v2.py"
+    changed = tmp_path / "changed.py"
+    v1.write_text("def hello():\n    return 'world'\n")
+    v2.write_text("def hello():\n    return 'world'\n")
+    changed.write_text("def hello(x):\n    if x:\n        return 1\n    return 2\n")
+
+    first = cca._complexity_for_files(tmp_sqlite_conn, [(str(v1), 'v1.py', True, '.py')])
+    assert first[0][0]['file_name'] == 'v1.py'
+
+    analysed = []
+    real_analyze = cca._analyze_file
+    monkeypatch.setattr(cca, '_analyze_file', lambda fp, fn, is_py: analysed.append(fn) or real_analyze(fp, fn, is_py))
+
+    second = cca._complexity_for_files(
+        tmp_sqlite_conn,
+        [(str(v2), 'v2.py', True, '.py'), (str(changed), 'changed.py', True, '.py')],
+    )
+
+    assert analysed == ['changed.py']
+    assert second[0][0] == {**first[0][0], 'file_name': 'v2.py'}
+    assert second[0][1]['nloc'] == first[0][1]['nloc']
+    assert second[1][0]['average_complexity'] == 2
@@ -426,3 +426,48 @@ def test_evidence_format():
         assert item["file"] == "test.py"
         assert isinstance(item["line"], int)
         assert item["line"] > 0
+
+
+# SCAN ENGINE
+
+SCAN_SAMPLE = '''
+# IMPORTANT: this comment mentions cache.get and SELECT
+import os
+from functools import lru_cache
+
+class Service(Base):
+    @lru_cache
+    def load(self):
+        token = os.environ["TOKEN"]
+        try:
+            rows = cursor.execute("SELECT * FROM t")
+        except Exception:
+            raise
+        return json.dumps(sorted(set(rows)))
+'''.split("\n")
+
+
+def test_scan_code_files_matches_individual_detectors():
+    from src.analysis.skills.detectors.code.code_detector_registry import CODE_DETECTOR_FUNCTIONS
+    from src.analysis.skills.detectors.code.line_scanner import scan_code_files
+
+    files = [("svc.py", SCAN_SAMPLE), ("empty.py", [""]), ("unicode.py", ["İİ = 1", "assert İİ"])]
+    results = scan_code_files(files, CODE_DETECTOR_FUNCTIONS, workers=1)
+
+    for (file_name, lines), result in zip(files, results):
+        assert list(result) == list(CODE_DETECTOR_FUNCTIONS)
+        for name, detector in CODE_DETECTOR_FUNCTIONS.items():
+            assert result[name] == detector(lines, file_name), name
+
+
+def test_scan_code_files_process_pool_keeps_order(monkeypatch):
+    import src.analysis.skills.detectors.code.line_scanner as line_scanner
+
+    monkeypatch.setattr(line_scanner, "CODE_SCAN_PROCESS_MIN_FILES", 2)
+    detectors = {name: line_scanner.CODE_DETECTOR_FUNCTIONS[name] for name in ("detect_classes", "detect_caching")}
+    files = [(f"f{i}.py", SCAN_SAMPLE if i % 2 else ["x = 1"]) for i in range(6)]
+
+    results = line_scanner.scan_code_files(files, detectors, workers=2)
+
+    assert [r["detect_classes"][0] for r in results] == [False, True] * 3
+    assert results[1]["detect_caching"] == (True, [{"file": "f1.py", "line": 7}])
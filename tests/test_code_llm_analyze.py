@@ -23,6 +23,15 @@ def mock_parsed_files_empty():
     ]
 
 
+def _llm_call_prompt(mock_client, system_marker):
+    """User prompt of the LLM call whose system message contains `system_marker`.
+    The project and contribution prompts are sent concurrently, so call order isn't fixed."""
+    for _, kwargs in mock_client.chat.completions.create.call_args_list:
+        if system_marker in kwargs["messages"][0]["content"]:
+            return kwargs["messages"][1]["content"]
+    raise AssertionError(f"no LLM call with system prompt containing {system_marker!r}")
+
+
 @pytest.fixture
 def mock_llm_response_factory():
     def _make(content: str):
@@ -106,8 +115,7 @@ def test_run_code_llm_analysis_no_readable_context(
     assert mock_client.chat.completions.create.call_count == 2
 
     # Project summary prompt should include TECH STACK evidence block
-    _, kwargs0 = mock_client.chat.completions.create.call_args_list[0]
-    prompt0 = kwargs0["messages"][1]["content"]
+    prompt0 = _llm_call_prompt(mock_client, "project summaries")
     assert "TECH STACK (evidence-based):" in prompt0
 
 
@@ -170,12 +178,11 @@ def test_contribution_summary_uses_top_files_only(
             focus_file_paths=focus_paths,
         )
 
-        # LLM called twice: [0]=project summary, [1]=contribution summary
+        # LLM called twice: project summary and contribution summary
         assert mock_client.chat.completions.create.call_count == 2
 
-        # Check contribution call specifically (second call)
-        _, kwargs = mock_client.chat.completions.create.call_args_list[1]
-        prompt_text = kwargs["messages"][1]["content"]
+        # Check contribution call specifically
+        prompt_text = _llm_call_prompt(mock_client, "résumé writer")
 
         assert "B FILE CONTENT" in prompt_text
         assert "SHOULD NOT APPEAR" not in prompt_text
@@ -225,9 +232,8 @@ def test_no_project_readme_does_not_fallback_to_zip_root_readme(
             project_name="portfolio-site",
         )
 
-        # First LLM call = project summary
-        _, kwargs = mock_client.chat.completions.create.call_args_list[0]
-        prompt_text = kwargs["messages"][1]["content"]
+        # Project summary call
+        prompt_text = _llm_call_prompt(mock_client, "project summaries")
 
         # Ensure zip-root README is NOT used
         assert "ROOT README SHOULD NOT BE USED" not in prompt_text
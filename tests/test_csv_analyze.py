@@ -1,8 +1,11 @@
 import pandas as pd
 import numpy as np
 import os
+import threading
 import pytest
 from src.analysis.text_individual import csv_analyze as ca
+from src.utils import csv_profile
+from src.utils.csv_profile import cached_csv_profile, clear_csv_profile_cache, profile_csv
 
 
 # analyze_single_csv()
@@ -115,3 +118,96 @@ def test_analyze_all_csv(tmp_path, monkeypatch):
     assert result["growth_trend_present"] is True
     assert "data" in result["growth_trends"]
     assert result["files"][0]["col_count"] == 1
+
+
+# profile_csv() / summarize_csv_profile()
+def test_streamed_profile_matches_full_read(tmp_path):
+    path = tmp_path / "survey.csv"
+    path.write_text(
+        "id,score,answer,flag,late\n"
+        "1,3,yes,True,1\n"
+        "2,,no,False,2\n"
+        "3,4.5,,True,x\n"
+        "4,5,maybe,,3\n"
+        "5,2,yes,True,4\n"
+    )
+    df = pd.read_csv(path)
+
+    for chunksize in (1, 2, 50000):
+        profile = profile_csv(str(path), chunksize=chunksize)
+        assert ca.summarize_csv_profile(profile) == ca.analyze_single_csv(df)
+        assert profile["null_cells"] == df.isnull().sum().sum()
+        assert profile["sample_rows"][0]["answer"] == "yes"
+
+
+def test_uint64_columns_keep_their_dtype_across_chunks(tmp_path):
+    big = 2**63 + 5
+    path = tmp_path / "ids.csv"
+    path.write_text(f"id,neg,score,n\n{big},{big},{big},1\n7,-1,2.5,2\n")
+    full = pd.read_csv(path).dtypes.astype(str).to_dict()
+
+    for chunksize in (1, 50000):
+        dtypes = profile_csv(str(path), chunksize=chunksize)["dtypes"]
+        assert dtypes == full
+        assert dtypes["id"] == "uint64" and dtypes["score"] == "float64"
+
+    assert csv_profile._combine_kinds({"uint", "null"}) == "float64"
+    assert csv_profile._combine_kinds({"uint", "int"}) == "uint64"
+
+
+def test_header_only_csv_profile(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("a,b\n")
+
+    summary = ca.summarize_csv_profile(profile_csv(str(path)))
+
+    assert summary == ca.analyze_single_csv(pd.read_csv(path))
+    assert summary["row_count"] == 0 and summary["missing_pct"] == 0
+
+
+def test_profiles_are_cached_by_content(tmp_path, monkeypatch):
+    clear_csv_profile_cache()
+    first = tmp_path / "a.csv"
+    first.write_text("A\n1\n2\n")
+    copy = tmp_path / "b.csv"
+    copy.write_bytes(first.read_bytes())
+
+    calls = []
+    real = csv_profile.profile_csv
+    monkeypatch.setattr(csv_profile, "profile_csv", lambda *a, **k: calls.append(a) or real(*a, **k))
+
+    assert cached_csv_profile(str(first)) == cached_csv_profile(str(copy))
+    assert len(calls) == 1
+
+    copy.write_text("A\n1\n2\n3\n")
+    assert cached_csv_profile(str(copy))["row_count"] == 3
+    assert len(calls) == 2
+
+
+def test_profile_cache_is_safe_across_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_profile, "CSV_PROFILE_CACHE_SIZE", 5)
+    clear_csv_profile_cache()
+    paths = []
+    for i in range(12):
+        path = tmp_path / f"t{i}.csv"
+        path.write_text(f"A,B\n{i},x\n")
+        paths.append(str(path))
+    errors = []
+
+    def worker(offset):
+        try:
+            for _ in range(20):
+                for path in paths[offset::3]:
+                    assert cached_csv_profile(path)["row_count"] == 1
+        except Exception as e:  # pragma: no cover - only on a race
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(csv_profile._profiles) <= 5
+    clear_csv_profile_cache()
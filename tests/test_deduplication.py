@@ -1,7 +1,9 @@
 import pytest
+import threading
 from pathlib import Path
 from src.utils.deduplication.helpers import should_ignore_path, jaccard_similarity
-from src.utils.deduplication.fingerprints import file_content_hash, project_fingerprints
+import src.utils.deduplication.fingerprints as fingerprints
+from src.utils.deduplication.fingerprints import ContentHasher, file_content_hash, project_fingerprints
 from src.utils.deduplication.rules import IGNORE_DIRS, IGNORE_FILE_SUFFIXES
 
 
@@ -109,7 +111,69 @@ def test_file_content_hash_binary_no_normalization(tmp_path):
     # Non-text files should differ even with normalize_text=True
     assert file_content_hash(p1, normalize_text=True) != file_content_hash(p2, normalize_text=True)
 
+def test_content_hasher_matches_file_hash_across_chunk_boundaries(tmp_path):
+    data = b"a\r\nb\r\r\nc\r"
+    p = tmp_path / "file.txt"
+    p.write_bytes(data)
+
+    # Feed one byte at a time so every CRLF pair straddles a chunk boundary
+    hasher = ContentHasher(".txt")
+    for i in range(len(data)):
+        hasher.update(data[i:i + 1])
+    assert hasher.hexdigest() == file_content_hash(p)
+
 # project_fingerprints tests
+def test_remembered_hashes_are_bounded_least_recently_used_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(fingerprints, "STREAMED_HASHES_MAX", 2)
+    monkeypatch.setattr(fingerprints, "_STREAMED_HASHES", fingerprints.OrderedDict())
+    paths = []
+    for name in ("a.txt", "b.txt", "c.txt"):
+        path = tmp_path / name
+        path.write_text(name)
+        paths.append(path)
+
+    fingerprints.remember_content_hash(paths[0], "h-a")
+    fingerprints.remember_content_hash(paths[1], "h-b")
+    assert fingerprints.current_content_hash(paths[0]) == "h-a"  # now more recent than b
+    fingerprints.remember_content_hash(paths[2], "h-c")
+
+    assert len(fingerprints._STREAMED_HASHES) == 2
+    assert fingerprints.current_content_hash(paths[1]) == file_content_hash(paths[1])
+    assert fingerprints.current_content_hash(paths[0]) == "h-a"
+    assert fingerprints.current_content_hash(paths[2]) == "h-c"
+
+
+def test_remembered_hashes_survive_concurrent_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(fingerprints, "STREAMED_HASHES_MAX", 20)
+    monkeypatch.setattr(fingerprints, "_STREAMED_HASHES", fingerprints.OrderedDict())
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"f{i}.txt"
+        path.write_text(str(i))
+        paths.append(path)
+    errors = []
+
+    def worker(offset):
+        try:
+            for round_ in range(50):
+                for path in paths[offset::4]:
+                    fingerprints.remember_content_hash(path, f"h-{path.name}")
+                    fingerprints.current_content_hash(path)
+                if round_ % 10 == 0:
+                    fingerprints.forget_content_hashes(tmp_path)
+        except Exception as e:  # pragma: no cover - only on a race
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(fingerprints._STREAMED_HASHES) <= 20
+
+
 def test_project_fingerprints_single_file(tmp_path):
     root = create_project_structure(tmp_path / "project", {"main.py": "print('hello')"})
     fp_strict, fp_loose, entries = project_fingerprints(root)
@@ -225,4 +289,17 @@ def test_project_fingerprints_cross_classification_match(tmp_path):
     
     # Both should have identical fingerprints despite different classification folders
     assert fp1_strict == fp2_strict
-    assert fp1_loose == fp2_loose
\ No newline at end of file
+    assert fp1_loose == fp2_loose
+
+
+# minhash tests
+def test_minhash_estimates_jaccard_and_shares_bands_for_similar_sets():
+    from src.utils.deduplication.minhash import estimate_jaccard, lsh_band_keys, minhash_signature
+
+    a = {f"t{i}" for i in range(100)}
+    b = {f"t{i}" for i in range(20, 120)}  # Jaccard = 80 / 120
+    sig_a, sig_b = minhash_signature(a), minhash_signature(b)
+
+    assert abs(estimate_jaccard(sig_a, sig_b) - 80 / 120) < 0.2
+    assert set(lsh_band_keys(sig_a)) & set(lsh_band_keys(sig_b))
+    assert (minhash_signature(a) == sig_a).all()  # deterministic across calls
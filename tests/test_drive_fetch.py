@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+import time
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import googleapiclient
+import pytest
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build_from_document
+
+import src.db as db
+import src.integrations.google_drive.drive_fetch as drive_fetch
+import src.integrations.google_drive.process_project_files as ppf
+from src.integrations.google_drive.api_calls import analyze_google_doc
+
+USER = "user@example.com"
+
+
+def _discovery(name, root_url):
+    path = os.path.join(os.path.dirname(googleapiclient.__file__), "discovery_cache", "documents", name)
+    with open(path) as f:
+        doc = json.load(f)
+    doc["rootUrl"] = root_url
+    doc["baseUrl"] = root_url + doc.get("servicePath", "")
+    doc.pop("mtlsRootUrl", None)
+    return doc
+
+
+class _FakeDrive:
+    """Local Drive v3 + Docs v1 endpoints: paginated revisions, batch revision lookups, exports."""
+
+    def __init__(self, docs, page_size=4, delay=0.0, broken_exports=()):
+        self.docs = docs  # {file_id: [(revision_id, email), ...]}
+        self.page_size = page_size
+        self.delay = delay
+        self.broken_exports = set(broken_exports)
+        self.hits = {"list": 0, "batch": 0, "batched_gets": 0, "get": 0, "export": 0, "document": 0}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type="application/json"):
+                data = body if isinstance(body, bytes) else body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                time.sleep(fake.delay)
+                try:
+                    status, body, ctype = fake.route("GET", self.path)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+                self._send(status, body, ctype)
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers["Content-Length"]))
+                message = BytesParser().parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + raw
+                )
+                with fake._lock:
+                    fake.hits["batch"] += 1
+                parts = []
+                for part in message.get_payload():
+                    request_line = part.get_payload().splitlines()[0]
+                    method, path, _ = request_line.split(" ", 2)
+                    with fake._lock:
+                        fake.hits["batched_gets"] += 1
+                    status, body, _ = fake.route(method, path, count=False)
+                    content_id = part["Content-ID"].strip("<>")
+                    parts.append(
+                        "--BOUNDARY\r\nContent-Type: application/http\r\n"
+                        f"Content-ID: <response-{content_id}>\r\n\r\n"
+                        f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n\r\n{body}\r\n"
+                    )
+                self._send(200, "".join(parts) + "--BOUNDARY--", "multipart/mixed; boundary=BOUNDARY")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.creds = Credentials(token="test-token")
+        self.drive = build_from_document(_discovery("drive.v3.json", self.url), credentials=self.creds)
+        self.docs_service = build_from_document(_discovery("docs.v1.json", self.url), credentials=self.creds)
+
+    def route(self, method, path, count=True):
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        segments = url.path.strip("/").split("/")
+
+        def hit(kind):
+            if count:
+                with self._lock:
+                    self.hits[kind] += 1
+
+        if segments[:2] == ["export", segments[1]] and len(segments) == 3:
+            hit("export")
+            if segments[2] in self.broken_exports:
+                return 500, "{}", "application/json"
+            return 200, f"text of {segments[2]} in {segments[1]}", "text/plain"
+        if segments[:2] == ["v1", "documents"]:
+            hit("document")
+            content = [{"paragraph": {"elements": [{"textRun": {"content": "current doc text"}}]}}]
+            return 200, json.dumps({"body": {"content": content}}), "application/json"
+        file_id = segments[3]
+        if segments[4] == "comments":
+            return 200, json.dumps({"comments": []}), "application/json"
+        revisions = self.docs[file_id]
+        if len(segments) == 5:
+            hit("list")
+            start = int(query.get("pageToken", ["0"])[0])
+            page = revisions[start:start + self.page_size]
+            body = {"revisions": [
+                {"id": rev_id, "modifiedTime": "2025-01-01T00:00:00Z", "lastModifyingUser": {"emailAddress": email}}
+                for rev_id, email in page
+            ]}
+            if start + self.page_size < len(revisions):
+                body["nextPageToken"] = str(start + self.page_size)
+            return 200, json.dumps(body), "application/json"
+        hit("get")
+        rev_id = segments[5]
+        links = {"text/plain": f"{self.url}export/{file_id}/{rev_id}"}
+        return 200, json.dumps({"exportLinks": links}), "application/json"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_drive():
+    servers = []
+
+    def _make(*args, **kwargs):
+        servers.append(_FakeDrive(*args, **kwargs))
+        return servers[-1]
+
+    yield _make
+    for server in servers:
+        server.close()
+
+
+def test_revision_lookups_are_batched_and_stored_ids_skipped(fake_drive, monkeypatch):
+    monkeypatch.setattr(drive_fetch, "DRIVE_BATCH_SIZE", 3)
+    revisions = [(f"r{i}", USER) for i in range(6)] + [("other", "other@example.com")]
+    server = fake_drive({"doc": revisions}, broken_exports={"r4", "r5"})
+
+    result = analyze_google_doc(
+        server.drive, server.docs_service, "doc", USER, creds=server.creds, skip_revision_ids={"r0", "r1"}
+    )
+
+    assert result["status"] == "analyzed"
+    assert result["total_revision_count"] == 7
+    assert result["revision_count"] == 6
+    assert result["skipped_revision_ids"] == ["r0", "r1"]
+    assert [r["revision_id"] for r in result["revisions"]] == ["r2", "r3", "r4", "r5"]
+    assert result["revisions"][0]["raw_text"] == "text of r2 in doc"
+    assert result["revisions"][3]["raw_text"] == "current doc text"
+
+    assert server.hits["list"] == 2  # 7 revisions, 4 per page
+    assert server.hits["batch"] == 2  # 4 lookups, 3 per batch
+    assert server.hits["batched_gets"] == 4
+    assert server.hits["get"] == 0
+    assert server.hits["export"] == 4
+    assert server.hits["document"] == 1  # fallback text fetched once per file
+
+
+def test_process_project_files_fetches_files_concurrently_and_resumes(fake_drive, monkeypatch):
+    docs = {f"doc{n}": [(f"r{i}", USER) for i in range(3)] for n in range(4)}
+    server = fake_drive(docs, delay=0.05)
+
+    conn = db.connect()
+    user_id = db.get_or_create_user(conn, "drive-user")
+    db.insert_project(conn, user_id, "proj")
+    linked = [
+        {"drive_file_id": file_id, "drive_file_name": file_id, "mime_type": "application/vnd.google-apps.document"}
+        for file_id in docs
+    ]
+    monkeypatch.setattr(ppf, "ENABLE_REVISION_HISTORY", True)
+    monkeypatch.setattr(ppf, "analyze_google_doc", analyze_google_doc)
+    monkeypatch.setattr(ppf.db, "get_project_drive_files", lambda *a: linked)
+
+    def run():
+        return ppf.process_project_files(
+            conn, server.creds, server.drive, server.docs_service, user_id, "proj", USER, "Drive User"
+        )
+
+    assert run()["status"] == "success"
+    assert server.max_in_flight > 1
+    assert server.hits["export"] == 12
+    assert conn.execute("SELECT COUNT(*) FROM text_contribution_revisions").fetchone()[0] == 12
+
+    # Second run: every revision is already stored, so nothing is looked up or downloaded again
+    run()
+    assert server.hits["batch"] == 4
+    assert server.hits["export"] == 12
+    assert conn.execute("SELECT COUNT(*) FROM text_contribution_revisions").fetchone()[0] == 12
+    summary = conn.execute(
+        "SELECT user_revision_count, total_word_count FROM text_contribution_summary WHERE drive_file_id = 'doc0'"
+    ).fetchone()
+    assert tuple(summary) == (3, 15)  # stored word counts still add up
@@ -0,0 +1,213 @@
+import datetime as dt
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import src.utils.git_history as gh
+from src.analysis.code_collaborative.code_collaborative_analysis_helper import (
+    accumulate_history,
+    collect_repo_authors,
+    merge_history_states,
+    metrics_from_history,
+    read_git_history,
+    resume_history,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    gh.clear_git_history_cache()
+    yield
+    gh.clear_git_history_cache()
+
+
+def _git(repo, *args, author="Ann", date="2024-03-01T10:00:00+00:00"):
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": author, "GIT_AUTHOR_EMAIL": f"{author.lower()}@example.com",
+        "GIT_COMMITTER_NAME": author, "GIT_COMMITTER_EMAIL": f"{author.lower()}@example.com",
+        "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date,
+    }
+    subprocess.run(["git", *args], cwd=repo, check=True, env=env, capture_output=True)
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    if not shutil.which("git"):
+        pytest.skip("git not installed")
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+
+    (repo / "app.py").write_text("".join(f"line {i}\n" for i in range(20)))
+    (repo / "logo.png").write_bytes(b"\x89PNG\x00\x00\x01")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "Initial\n\nCo-authored-by: Bob <bob@example.com>")
+
+    _git(repo, "mv", "app.py", "src app.py")
+    with open(repo / "src app.py", "a") as f:
+        f.write("extra\n")
+    _git(repo, "commit", "-q", "-am", "Move app", author="Bob", date="2024-03-02T10:00:00+00:00")
+
+    _git(repo, "checkout", "-q", "-b", "feature")
+    (repo / "feature.txt").write_text("f\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "Feature", date="2024-03-03T10:00:00+00:00")
+    _git(repo, "checkout", "-q", "main")
+    _git(repo, "merge", "-q", "--no-ff", "-m", "Merge feature", "feature", date="2024-03-04T10:00:00+00:00")
+    return repo
+
+
+def test_read_git_commits_parses_one_pass(repo):
+    commits = gh.read_git_commits(str(repo))
+
+    assert [c.subject for c in commits] == ["Merge feature", "Feature", "Move app", "Initial"]
+    merge, feature, move, initial = commits
+
+    assert merge.is_merge and merge.files == ()
+    assert feature.name_status == {"A": 1}
+
+    # Rename detection: one R entry and the numstat row under the new path.
+    assert move.name_status == {"R": 1}
+    assert move.files == (gh.FileChange("src app.py", 1, 0, False),)
+    assert move.author_name == "Bob"
+
+    assert initial.name_status == {"A": 2}
+    assert {f.path: (f.additions, f.is_binary) for f in initial.files} == {
+        "app.py": (20, False),
+        "logo.png": (0, True),
+    }
+    assert "Co-authored-by: Bob <bob@example.com>" in initial.body
+    assert initial.authored_at.isoformat() == "2024-03-01T10:00:00+00:00"
+    assert initial.date == "2024-03-01 10:00:00 +0000"
+
+
+def test_renamed_file_lines_are_attributed_to_the_new_path(repo):
+    state = accumulate_history(read_git_history(str(repo)), {"emails": {"bob@example.com"}, "names": set()})
+    assert state["file_loc"] == {"src app.py": 1}
+
+    # Numstat rows naming the old side of a rename (older git output) move to the new name too
+    raw = ":100644 100644 aaa bbb R090\0f.py\0h.py\0"
+    files, name_status = gh._parse_changes(raw + "3\t1\tf.py\0")
+    assert files == (gh.FileChange("h.py", 3, 1, False),) and name_status == {"R": 1}
+
+
+def test_hung_git_log_is_killed_after_the_idle_timeout(repo, monkeypatch):
+    real_popen = subprocess.Popen
+    monkeypatch.setattr(gh, "GIT_LOG_IDLE_TIMEOUT", 0.2)
+    monkeypatch.setattr(
+        gh.subprocess,
+        "Popen",
+        lambda cmd, *a, **kw: real_popen(["sleep", "30"] if "log" in cmd else cmd, *a, **kw),
+    )
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(gh.iter_git_commits(str(repo)))
+    # Reported to the caller, never turned into an empty history
+    with pytest.raises(subprocess.TimeoutExpired):
+        gh.read_git_commits(str(repo))
+
+
+def test_slow_but_steady_git_log_is_not_killed(repo, monkeypatch):
+    real_popen = subprocess.Popen
+    monkeypatch.setattr(gh, "GIT_LOG_IDLE_TIMEOUT", 0.5)
+    monkeypatch.setattr(gh, "_READ_SIZE", 1)
+    # Output trickles in for longer than the idle timeout, but never pauses that long
+    slow_log = "git \"$@\" | while IFS= read -r -d '' part; do printf '%s\\0' \"$part\"; sleep 0.05; done"
+    monkeypatch.setattr(
+        gh.subprocess,
+        "Popen",
+        lambda cmd, *a, **kw: real_popen(["bash", "-c", slow_log, "_", *cmd[1:]] if "log" in cmd else cmd, *a, **kw),
+    )
+
+    commits = list(gh.iter_git_commits(str(repo)))
+
+    assert len(commits) == 4
+
+
+def test_history_is_cached_per_head(repo, monkeypatch):
+    walks = []
+    real_popen = subprocess.Popen
+
+    def counting_popen(cmd, *args, **kwargs):
+        if "log" in cmd:
+            walks.append(cmd)
+        return real_popen(cmd, *args, **kwargs)
+
+    monkeypatch.setattr(gh.subprocess, "Popen", counting_popen)
+
+    history = read_git_history(str(repo))
+    authors = collect_repo_authors(str(repo))
+    assert len(walks) == 1
+    assert history[0]["is_merge"] is True
+    assert authors == [("Ann", "ann@example.com", 3), ("Bob", "bob@example.com", 1)]
+
+    (repo / "new.txt").write_text("n\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "New", date="2024-03-05T10:00:00+00:00")
+
+    assert len(read_git_history(str(repo))) == 5
+    assert len(walks) == 2
+
+
+def test_read_git_commits_outside_repo_is_empty(tmp_path):
+    assert gh.read_git_commits(str(tmp_path)) == ()
+
+
+def test_read_git_commits_since_returns_only_new_commits(repo):
+    start = gh.head_commit(str(repo))
+    assert gh.read_git_commits_since(str(repo), start) == (start, ())
+
+    (repo / "new.txt").write_text("n\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "New", date="2024-03-05T10:00:00+00:00")
+
+    head, commits = gh.read_git_commits_since(str(repo), start)
+    assert head == gh.head_commit(str(repo))
+    assert [c.subject for c in commits] == ["New"]
+
+
+def test_read_git_commits_since_rewritten_history_is_none(repo):
+    start = gh.head_commit(str(repo))
+    _git(repo, "commit", "-q", "--amend", "-m", "Merge feature (reworded)")
+
+    assert gh.read_git_commits_since(str(repo), start) is None
+    assert gh.read_git_commits_since(str(repo), "0" * 40) is None
+
+
+def test_resumed_collaborative_metrics_match_full_rebuild(repo):
+    aliases = {"emails": {"ann@example.com"}, "names": {"ann"}}
+    start = gh.head_commit(str(repo))
+    # Stored states go through JSON between runs
+    stored = json.loads(json.dumps(accumulate_history(read_git_history(str(repo)), aliases)))
+
+    for day, name in ((5, "later.py"), (6, "docs/notes.md")):
+        (repo / name).parent.mkdir(exist_ok=True)
+        (repo / name).write_text("x\ny\n")
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", f"Add {name}", date=f"2024-03-0{day}T22:00:00-05:00")
+
+    resumed = resume_history(str(repo), start, stored, aliases)
+    full = accumulate_history(read_git_history(str(repo)), aliases)
+    assert metrics_from_history("p", "r", resumed) == metrics_from_history("p", "r", full)
+    assert resumed["totals"]["commits_all"] == 6
+
+    # Counted for someone else: the stored state can't be reused
+    assert resume_history(str(repo), start, stored, {"emails": {"bob@example.com"}, "names": set()}) is None
+
+
+def test_merged_recent_commits_are_sorted_and_summed(repo):
+    aliases = {"emails": {"ann@example.com"}, "names": {"ann"}}
+    state = json.loads(json.dumps(accumulate_history(read_git_history(str(repo)), aliases)))
+    now = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+    a, b, c = (now - dt.timedelta(days=d) for d in (1, 2, 3))
+    # Distinct commits on either side of the boundary can share an author timestamp (cherry-picks)
+    newer = {**state, "recent": [b.isoformat(), b.isoformat()]}
+    older = {**state, "recent": [c.isoformat(), b.isoformat(), a.astimezone(dt.timezone(dt.timedelta(hours=-5))).isoformat()]}
+
+    merged = [dt.datetime.fromisoformat(t) for t in merge_history_states(newer, older)["recent"]]
+
+    assert merged == [a, b, b, b, c]
@@ -1,4 +1,6 @@
+import json
 import os
+import shutil
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, Mock
@@ -6,14 +8,32 @@ import subprocess
 import src.analysis.code_individual.git_individual_analyzer as gia
 
 
-# Helper to create subprocess result
-def make_subprocess_result(stdout="", stderr="", returncode=0):
-    """Create a mock subprocess.CompletedProcess result."""
-    result = Mock()
-    result.stdout = stdout
-    result.stderr = stderr
-    result.returncode = returncode
-    return result
+# Helper to create a real repository with dated commits
+def make_git_repo(tmp_path, commits):
+    """
+    Create tmp_path/repo with one commit per (date, author, message, {path: text or bytes}) entry.
+    """
+    if not shutil.which("git"):
+        pytest.skip("git not installed")
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    for date, author, message, files in commits:
+        for rel, content in files.items():
+            path = repo / rel
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+        env = {
+            **os.environ,
+            "GIT_AUTHOR_NAME": author, "GIT_AUTHOR_EMAIL": f"{author.lower()}@example.com",
+            "GIT_COMMITTER_NAME": author, "GIT_COMMITTER_EMAIL": f"{author.lower()}@example.com",
+            "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date,
+        }
+        subprocess.run(["git", "add", "-A"], cwd=repo, check=True, env=env)
+        subprocess.run(["git", "commit", "-q", "-m", message], cwd=repo, check=True, env=env)
+    return repo
 
 import os
 from pathlib import Path
@@ -120,143 +140,173 @@ def test_analyze_git_individual_project_with_repo(tmp_sqlite_conn, tmp_path, mon
     assert 'Analyzing Git Repository' in out
 
 
-def test_get_commit_statistics_success(tmp_path, monkeypatch):
+def test_get_commit_statistics_success(tmp_path):
     """
-    Test get_commit_statistics with successful git commands.
+    Test get_commit_statistics on a real repository (merge commits excluded).
     """
-    fake_repo = tmp_path / "repo"
-    fake_repo.mkdir()
+    repo = make_git_repo(tmp_path, [
+        ("2024-01-01 10:00:00 -0500", "Author1", "First commit", {"a.py": "a\n"}),
+        ("2024-01-02 11:00:00 -0500", "Author2", "Second commit", {"b.py": "b\n"}),
+        ("2024-05-30 09:00:00 -0500", "Author1", "Previous commit", {"a.py": "a\nb\n"}),
+        ("2024-06-01 10:00:00 -0500", "Author1", "Latest commit", {"c.py": "c\n"}),
+    ])
 
-    # Mock subprocess.run for different git commands
-    def mock_subprocess_run(cmd, **kwargs):
-        if 'rev-list' in cmd:
-            # Total commit count
-            return make_subprocess_result(stdout="50\n")
-        elif 'log' in cmd and '--reverse' in cmd:
-            # First commit date
-            return make_subprocess_result(stdout="2024-01-01 10:00:00 -0500\n2024-01-02 11:00:00 -0500\n")
-        elif 'log' in cmd and '--max-count=1' in cmd and '%ai' in ' '.join(cmd):
-            # Last commit date
-            return make_subprocess_result(stdout="2024-06-01 10:00:00 -0500\n")
-        elif 'log' in cmd and '%an' in ' '.join(cmd):
-            # Authors
-            return make_subprocess_result(stdout="Author1\nAuthor2\nAuthor1\n")
-        elif 'log' in cmd and '%ai|%s' in ' '.join(cmd):
-            # Commit messages
-            return make_subprocess_result(stdout="2024-06-01 10:00:00 -0500|Latest commit\n2024-05-30 09:00:00 -0500|Previous commit\n")
-        return make_subprocess_result()
-
-    monkeypatch.setattr(subprocess, 'run', mock_subprocess_run)
+    result = gia.get_commit_statistics(str(repo))
 
-    result = gia.get_commit_statistics(str(fake_repo))
-
-    assert result['total_commits'] == 50
+    assert result['total_commits'] == 4
     assert result['first_commit_date'] == '2024-01-01 10:00:00 -0500'
     assert result['last_commit_date'] == '2024-06-01 10:00:00 -0500'
-    assert result['time_span_days'] == 152 
+    assert result['time_span_days'] == 152
     assert result['average_commits_per_week'] > 0
     assert result['average_commits_per_month'] > 0
     assert result['unique_authors'] == 2
-    assert len(result['recent_commits']) == 2
-    assert result['recent_commits'][0]['message'] == 'Latest commit'
+    assert len(result['recent_commits']) == 4
+    assert result['recent_commits'][0] == {'date': '2024-06-01 10:00:00 -0500', 'message': 'Latest commit'}
 
 
-def test_get_commit_statistics_no_commits(tmp_path, monkeypatch, capsys):
+def test_get_commit_statistics_no_commits(tmp_path):
     """
     Test get_commit_statistics when repository has no commits.
-    Function should handle empty output gracefully and return empty dict.
     """
-    fake_repo = tmp_path / "repo"
-    fake_repo.mkdir()
+    repo = make_git_repo(tmp_path, [])
 
-    def mock_subprocess_run(cmd, **kwargs):
-        # Simulate empty repository - this causes int('') to fail
-        return make_subprocess_result(stdout="", returncode=0)
+    result = gia.get_commit_statistics(str(repo))
 
-    monkeypatch.setattr(subprocess, 'run', mock_subprocess_run)
-
-    result = gia.get_commit_statistics(str(fake_repo))
+    assert result['total_commits'] == 0
+    assert result['first_commit_date'] is None
+    assert result['recent_commits'] == []
 
-    # Function returns empty dict on error (including int('') error)
-    assert result == {}
 
-    # Should print an error message
-    out = capsys.readouterr().out
-    assert 'Error getting commit statistics' in out
-
-def test_get_commit_statistics_error_handling(tmp_path, monkeypatch):
+def test_get_commit_statistics_error_handling(tmp_path):
     """
-    Test get_commit_statistics handles subprocess errors gracefully.
+    Test get_commit_statistics when the directory is not a git repository.
     """
     fake_repo = tmp_path / "repo"
     fake_repo.mkdir()
 
-    def mock_subprocess_run(cmd, **kwargs):
-        # Simulate git command failure
-        return make_subprocess_result(stdout="", stderr="fatal: not a git repository", returncode=128)
-
-    monkeypatch.setattr(subprocess, 'run', mock_subprocess_run)
-
     result = gia.get_commit_statistics(str(fake_repo))
     assert result['total_commits'] == 0
     assert result['unique_authors'] == 0
 
-def test_get_lines_timeline_success(tmp_path, monkeypatch):
+
+def test_get_lines_timeline_success(tmp_path):
     """
-    Test get_lines_timeline with successful parsing.
+    Test get_lines_timeline sums numstat per commit, oldest first.
     """
-    fake_repo = tmp_path / "repo"
-    fake_repo.mkdir()
+    repo = make_git_repo(tmp_path, [
+        ("2024-01-01 10:00:00 -0500", "Author1", "one", {
+            "file1.py": "".join(f"{i}\n" for i in range(10)),
+            "file2.py": "".join(f"{i}\n" for i in range(20)),
+        }),
+        ("2024-01-02 11:00:00 -0500", "Author1", "two", {
+            "file1.py": "".join(f"{i}\n" for i in range(5)) + "new\n" * 3,
+        }),
+    ])
+
+    result = gia.get_lines_timeline(str(repo))
 
-    # Mock git log --numstat output
-    git_output = """abc1234|2024-01-01 10:00:00 -0500
-10\t5\tfile1.py
-20\t3\tfile2.py
+    assert len(result) == 2
+    assert result[0]['date'] == '2024-01-01 10:00:00 -0500'
+    assert len(result[0]['commit_hash']) == 7
+    assert result[0]['lines_added'] == 30  # 10 + 20
+    assert result[0]['lines_deleted'] == 0
+    assert result[0]['net_lines'] == 30
+    assert result[1]['lines_added'] == 3
+    assert result[1]['lines_deleted'] == 5
+    assert result[1]['net_lines'] == -2
 
-def5678|2024-01-02 11:00:00 -0500
-15\t2\tfile3.py
-"""
 
-    def mock_subprocess_run(cmd, **kwargs):
-        return make_subprocess_result(stdout=git_output)
+def test_get_lines_timeline_binary_files(tmp_path):
+    """
+    Test get_lines_timeline counts binary files (numstat '-') as 0 lines.
+    """
+    repo = make_git_repo(tmp_path, [
+        ("2024-01-01 10:00:00 -0500", "Author1", "one", {
+            "binary.png": b"\x89PNG\x00\x01\x02",
+            "file1.py": "".join(f"{i}\n" for i in range(10)),
+        }),
+    ])
 
-    monkeypatch.setattr(subprocess, 'run', mock_subprocess_run)
+    result = gia.get_lines_timeline(str(repo))
+
+    assert len(result) == 1
+    assert result[0]['lines_added'] == 10  # Only counts file1.py
+    assert result[0]['lines_deleted'] == 0
 
-    result = gia.get_lines_timeline(str(fake_repo))
 
-    assert len(result) == 2
-    assert result[0]['commit_hash'] == 'abc1234'
-    assert result[0]['lines_added'] == 30  # 10 + 20
-    assert result[0]['lines_deleted'] == 8  # 5 + 3
-    assert result[0]['net_lines'] == 22  # 30 - 8
-    assert result[1]['commit_hash'] == 'def5678'
-    assert result[1]['lines_added'] == 15
-    assert result[1]['lines_deleted'] == 2
+def _commit_all(repo, date, author, message, amend=False):
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": author, "GIT_AUTHOR_EMAIL": f"{author.lower()}@example.com",
+        "GIT_COMMITTER_NAME": author, "GIT_COMMITTER_EMAIL": f"{author.lower()}@example.com",
+        "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date,
+    }
+    subprocess.run(["git", "add", "-A"], cwd=repo, check=True, env=env)
+    extra = ["--amend"] if amend else []
+    subprocess.run(["git", "commit", "-q", *extra, "-m", message], cwd=repo, check=True, env=env)
+    return subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
 
 
-def test_get_lines_timeline_binary_files(tmp_path, monkeypatch):
+def test_resume_history_state_matches_full_rebuild(tmp_path):
     """
-    Test get_lines_timeline handles binary files (non-digit additions/deletions).
+    Test resume_history_state folds only the commits after the stored HEAD into the stored state.
     """
-    fake_repo = tmp_path / "repo"
-    fake_repo.mkdir()
+    repo = make_git_repo(tmp_path, [
+        ("2024-01-01 10:00:00 -0500", "Author1", "one", {"a.py": "a\n"}),
+    ])
+    (repo / "b.py").write_text("b\n")
+    start = _commit_all(repo, "2024-01-02 11:00:00 -0500", "Author2", "two")
+    # Stored states go through JSON between runs
+    stored = json.loads(json.dumps(gia.build_history_state(gia.read_git_commits(str(repo)))))
+
+    # Same day as "two": timeline ties must keep the full-walk order
+    (repo / "c.py").write_text("c\nd\n")
+    _commit_all(repo, "2024-01-02 18:00:00 -0500", "Author3", "three")
+
+    resumed = gia.resume_history_state(str(repo), start, stored)
+    assert resumed == gia.build_history_state(gia.read_git_commits(str(repo)))
+    assert gia.commit_statistics_from_state(resumed) == gia.get_commit_statistics(str(repo))
+    assert resumed['total_commits'] == 3
+    assert resumed['authors'] == ['Author1', 'Author2', 'Author3']
+
+
+def test_merge_history_states_keeps_the_ten_newest_recent_commits():
+    """
+    Test merge_history_states orders recent commits by date before keeping the last 10.
+    """
+    def state(dates):
+        return {
+            'total_commits': len(dates), 'first_commit_date': dates[-1], 'last_commit_date': dates[0],
+            'authors': [], 'timeline': [],
+            'recent_commits': [{'date': d, 'message': d} for d in dates],
+        }
 
-    # Binary files show as '-' instead of numbers
-    git_output = """abc1234|2024-01-01 10:00:00 -0500
--\t-\tbinary.png
-10\t5\tfile1.py
-"""
+    newer = state([f"2024-03-{day:02d} 10:00:00 +0000" for day in range(12, 2, -1)])
+    # Older range, but one commit carries a later (rebased) author date
+    older = state(["2024-03-20 09:00:00 -0500", "2024-03-01 10:00:00 +0000"])
 
-    def mock_subprocess_run(cmd, **kwargs):
-        return make_subprocess_result(stdout=git_output)
+    merged = gia.merge_history_states(newer, older)['recent_commits']
 
-    monkeypatch.setattr(subprocess, 'run', mock_subprocess_run)
+    assert len(merged) == 10
+    assert merged[0]['date'] == "2024-03-20 09:00:00 -0500"
+    assert merged[-1]['date'] == "2024-03-04 10:00:00 +0000"
 
-    result = gia.get_lines_timeline(str(fake_repo))
 
-    assert len(result) == 1
-    assert result[0]['lines_added'] == 10  # Only counts file1.py
-    assert result[0]['lines_deleted'] == 5
+def test_resume_history_state_rewritten_history(tmp_path):
+    """
+    Test resume_history_state gives up (full rebuild) when the stored HEAD was rewritten away.
+    """
+    repo = make_git_repo(tmp_path, [
+        ("2024-01-01 10:00:00 -0500", "Author1", "one", {"a.py": "a\n"}),
+    ])
+    (repo / "b.py").write_text("b\n")
+    stored_head = _commit_all(repo, "2024-01-02 11:00:00 -0500", "Author1", "two")
+    stored = gia.build_history_state(gia.read_git_commits(str(repo)))
+
+    _commit_all(repo, "2024-01-02 11:00:00 -0500", "Author1", "two (reworded)", amend=True)
+
+    assert gia.resume_history_state(str(repo), stored_head, stored) is None
+    assert gia.resume_history_state(str(repo), stored_head, {"version": 0}) is None
 
 
 def test_calculate_weekly_changes_success(monkeypatch):
@@ -1,6 +1,10 @@
 import pytest
 import src.integrations.github.github_api as api
 import requests
+import time
+
+from src.db.connection import connect
+from src.db.github_http_cache import get_github_http_cache, store_github_http_cache
 
 class FakeResp:
     def __init__(self, status, data):
@@ -12,7 +16,7 @@ class FakeResp:
 
 def fake_get_sequence(monkeypatch, responses):
     seq = iter(responses)
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: next(seq))
+    monkeypatch.setattr(api.http_session(), "get", lambda *a, **k: next(seq))
 
 def test_list_user_repos(monkeypatch):
     personal = [{"full_name": "me/one"}, {"full_name": "me/Two"}]
@@ -28,7 +32,7 @@ def test_list_user_repos(monkeypatch):
         if "orgs/MyOrg/repos" in url: return FakeResp(200, org_repos)
         return FakeResp(200, [])
 
-    monkeypatch.setattr(api.requests, "get", fake_get)
+    monkeypatch.setattr(api.http_session(), "get", fake_get)
 
     assert api.list_user_repos("x") == ["me/one", "me/Two", "MyOrg/alpha"]
 
@@ -39,7 +43,7 @@ def test_list_user_repos_empty(monkeypatch):
     assert api.list_user_repos("t") == []
 
 def test_gh_get_success(monkeypatch):
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: FakeResp(200, {"ok": True}))
+    monkeypatch.setattr(api.http_session(), "get", lambda *a, **k: FakeResp(200, {"ok": True}))
     assert api.gh_get("T", "x") == {"ok": True}
 
 def test_gh_get_missing_token():
@@ -47,13 +51,13 @@ def test_gh_get_missing_token():
         api.gh_get("", "x")
 
 def test_gh_get_failure(monkeypatch):
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: FakeResp(500, {"err": True}))
+    monkeypatch.setattr(api.http_session(), "get", lambda *a, **k: FakeResp(500, {"err": True}))
     data = api.gh_get("T", "x")
     assert data == []
 
 def test_get_authenticated_user(monkeypatch):
     data = {"login": "me", "id":1, "name":"A", "email":"b", "html_url":"url"}
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: FakeResp(200, data))
+    monkeypatch.setattr(api.http_session(), "get", lambda *a, **k: FakeResp(200, data))
     res = api.get_authenticated_user("T")
     assert res["login"] == "me"
     assert res["profile_url"] == "url"
@@ -82,7 +86,7 @@ def test_get_issues(monkeypatch):
         },
         {"pull_request":{}, "user":{"login":"me"}}
     ]
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: FakeResp(200, fake))
+    monkeypatch.setattr(api.http_session(), "get", lambda *a, **k: FakeResp(200, fake))
     res = api.get_gh_repo_issues("T","o","r","me", [])
     assert res["total_opened"] == 1
     assert len(res["user_issues"]) == 1
@@ -112,7 +116,7 @@ def test_gh_get_graceful_failure(monkeypatch):
         status_code = 500
         text = "server error"
         def json(self): return {}
-    monkeypatch.setattr(requests, "get", lambda *a, **k: FakeResp())
+    monkeypatch.setattr(api.http_session(), "get", lambda *a, **k: FakeResp())
     data = api.gh_get("fake", "fake")
     assert data == {}  # No crash, returns empty
 
@@ -120,12 +124,12 @@ def test_gh_get_graceful_failure(monkeypatch):
 def test_get_gh_pr_reviews_calls_correct_url(monkeypatch):
     captured = {}
 
-    def fake_gh_get(token, url, retries=6, delay=2):
+    def fake_gh_get_response(token, url, retries=6, delay=2):
         captured["token"] = token
         captured["url"] = url
-        return ["ok"]
+        return api.GHResponse(["ok"], {})
 
-    monkeypatch.setattr(api, "gh_get", fake_gh_get)
+    monkeypatch.setattr(api, "gh_get_response", fake_gh_get_response)
 
     result = api.get_gh_pr_reviews("TOKEN", "owner", "repo", 5)
 
@@ -136,12 +140,12 @@ def test_get_gh_pr_reviews_calls_correct_url(monkeypatch):
 def test_get_gh_pr_review_comments_calls_correct_url(monkeypatch):
     captured = {}
 
-    def fake_gh_get(token, url, retries=6, delay=2):
+    def fake_gh_get_response(token, url, retries=6, delay=2):
         captured["token"] = token
         captured["url"] = url
-        return ["ok"]
+        return api.GHResponse(["ok"], {})
 
-    monkeypatch.setattr(api, "gh_get", fake_gh_get)
+    monkeypatch.setattr(api, "gh_get_response", fake_gh_get_response)
 
     result = api.get_gh_pr_review_comments("TOKEN", "owner", "repo", 7)
 
@@ -176,11 +180,12 @@ def test_get_gh_reviews_for_repo_aggregates(monkeypatch):
         },
     }
 
-    assert calls == [
-        ("reviews", 1),
+    # PRs are fetched concurrently, so only the set of calls is fixed
+    assert sorted(calls) == [
         ("comments", 1),
-        ("reviews", 2),
         ("comments", 2),
+        ("reviews", 1),
+        ("reviews", 2),
     ]
 
 def test_get_repo_commit_timestamps(monkeypatch):
@@ -194,10 +199,73 @@ def test_get_repo_commit_timestamps(monkeypatch):
     ]
 
     seq = iter(fake_data)
-    monkeypatch.setattr(api.requests, "get", lambda *a, **k: next(seq))
+    monkeypatch.setattr(api.http_session(), "get", lambda *a, **k: next(seq))
 
     timestamps = api.get_repo_commit_timestamps("T", "o", "r")
 
     assert len(timestamps) == 2
     assert timestamps[0].year == 2024 and timestamps[0].month == 3 and timestamps[0].day == 1
-    assert timestamps[1].day == 2
\ No newline at end of file
+    assert timestamps[1].day == 2
+
+
+class HeaderResp(FakeResp):
+    def __init__(self, status, data, headers=None):
+        super().__init__(status, data)
+        self.headers = headers or {}
+
+
+def test_paginated_gh_get_fetches_remaining_pages_from_link_header(monkeypatch):
+    pages = {1: list(range(100)), 2: list(range(100, 200)), 3: list(range(200, 250))}
+    link = '<https://api.github.com/x?per_page=100&page=3>; rel="last"'
+    requested = []
+
+    def fake_get(url, headers):
+        page = int(url.rsplit("page=", 1)[1])
+        requested.append(page)
+        return HeaderResp(200, pages[page], {"Link": link} if page == 1 else {})
+
+    monkeypatch.setattr(api.http_session(), "get", fake_get)
+
+    assert api.paginated_gh_get("T", "https://api.github.com/x") == list(range(250))
+    assert sorted(requested) == [1, 2, 3]
+
+
+def test_gh_get_revalidates_with_etag(monkeypatch):
+    seen = []
+
+    def fake_get(url, headers):
+        seen.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == '"v1"':
+            return HeaderResp(304, None, {"ETag": '"v1"'})
+        return HeaderResp(200, [{"id": 1}], {"ETag": '"v1"'})
+
+    monkeypatch.setattr(api.http_session(), "get", fake_get)
+
+    assert api.gh_get("T", "https://api.github.com/repos/o/r/issues") == [{"id": 1}]
+    assert api.gh_get("T", "https://api.github.com/repos/o/r/issues") == [{"id": 1}]
+    # Another token doesn't see the first token's copy
+    assert api.gh_get("U", "https://api.github.com/repos/o/r/issues") == [{"id": 1}]
+    assert seen == [None, '"v1"', None]
+
+
+def test_http_cache_lru_and_ttl_eviction():
+    conn = connect()
+    conn.execute("DELETE FROM github_http_cache")
+    conn.commit()
+    urls = [f"https://api.github.com/cache-eviction/{i}" for i in range(3)]
+    store_github_http_cache(conn, "T", urls[0], '"e0"', [0])
+    time.sleep(0.01)
+    store_github_http_cache(conn, "T", urls[1], '"e1"', [1])
+    time.sleep(0.01)
+    assert get_github_http_cache(conn, "T", urls[0]) == ('"e0"', [0])  # now more recent than urls[1]
+    store_github_http_cache(conn, "T", urls[2], '"e2"', [2], max_entries=2)
+
+    assert get_github_http_cache(conn, "T", urls[1]) is None
+    assert get_github_http_cache(conn, "T", urls[0]) == ('"e0"', [0])
+
+    conn.execute("UPDATE github_http_cache SET fetched_at = datetime('now', '-100 seconds') WHERE url = ?", (urls[0],))
+    conn.commit()
+    store_github_http_cache(conn, "T", urls[1], '"e1"', [1], ttl_seconds=50)
+    assert get_github_http_cache(conn, "T", urls[0]) is None
+    assert get_github_http_cache(conn, "T", urls[2]) == ('"e2"', [2])
+    conn.close()
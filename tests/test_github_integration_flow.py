@@ -84,6 +84,32 @@ def insert_repo(conn, user=USER, proj=PROJ, owner=OWNER, repo=REPO):
     )
 
 def mock_metrics(monkeypatch, commits=2, issues=3, prs=1, contrib=5):
+    monkeypatch.setattr(
+        "src.integrations.github.github_analysis.fetch_repo_activity_graphql",
+        lambda *a: {
+            "commits": [
+                {"authoredDate": "2024-01-01T10:00:00Z", "author": {"user": {"login": "username"}}}
+                for _ in range(commits)
+            ] + [{"authoredDate": "2024-01-02T10:00:00Z", "author": {"user": None}}],
+            "issues": [
+                {"number": i, "title": f"Issue {i}", "createdAt": "2024-01-01T00:00:00Z", "closedAt": None,
+                 "assignees": {"nodes": [{"login": "username"}] if i == 0 else []},
+                 "comments": {"totalCount": 1, "nodes": [{"author": {"login": "username"}, "body": "hi", "createdAt": "2024-01-03T00:00:00Z"}]}}
+                for i in range(issues)
+            ],
+            "prs": [
+                {"number": i, "title": "PR", "createdAt": "2024-01-01T00:00:00Z", "state": "MERGED", "merged": True,
+                 "author": {"login": "username"}, "labels": {"nodes": []}, "comments": {"nodes": []}, "reviews": {"nodes": []}}
+                for i in range(prs)
+            ],
+        },
+    )
+    monkeypatch.setattr(
+        "src.integrations.github.github_analysis.get_gh_repo_contributions",
+        lambda *a: {"commits": contrib}
+    )
+
+def mock_rest_metrics(monkeypatch, commits=2, issues=3, prs=1):
     monkeypatch.setattr(
         "src.integrations.github.github_analysis.get_gh_repo_commit_activity",
         lambda *a: {"2024-01-01": commits}
@@ -92,14 +118,12 @@ def mock_metrics(monkeypatch, commits=2, issues=3, prs=1, contrib=5):
         "src.integrations.github.github_analysis.get_gh_repo_issues",
         lambda *a: {"total_opened": issues}
     )
+    monkeypatch.setattr("src.integrations.github.github_analysis.get_all_issue_comments", lambda *a: [])
+    monkeypatch.setattr("src.integrations.github.github_analysis.get_repo_commit_timestamps", lambda *a: [])
     monkeypatch.setattr(
         "src.integrations.github.github_analysis.fetch_pr_collaboration_graphql",
         lambda *a: {"prs_opened": prs, "team_total_prs": prs, "team_total_reviews": 0, "user_prs": [], "reviews": {}}
     )
-    monkeypatch.setattr(
-        "src.integrations.github.github_analysis.get_gh_repo_contributions",
-        lambda *a: {"commits": contrib}
-    )
 
 # DB tests: store & retrieve metrics
 def test_store_and_get_github_metrics(conn):
@@ -167,10 +191,213 @@ def test_fetch_github_metrics(monkeypatch):
     assert result["repository"] == f"{OWNER}/{REPO}"
     assert result["username"] == "username"
     assert result["commits"] == {"2024-01-01": 2}
-    assert result["issues"] == {"total_opened": 3}
+    assert len(result["commit_timestamps"]) == 3
+    assert result["issues"]["total_opened"] == 3
+    assert result["issues"]["total_issue_comments"] == 3
+    assert [c["issue_number"] for c in result["issues"]["user_issue_comments"]] == [0, 1, 2]
+    assert [i["title"] for i in result["issues"]["user_issues"]] == ["Issue 0"]
     assert result["pull_requests"]["total_opened"] == 1
+    assert result["pull_requests"]["total_merged"] == 1
     assert result["contributions"] == {"commits": 5}
 
+def test_fetch_github_metrics_falls_back_to_rest(monkeypatch):
+    mock_metrics(monkeypatch)
+    mock_rest_metrics(monkeypatch, commits=7)
+
+    def failing_collector(*a):
+        raise RuntimeError("GraphQL unavailable")
+
+    monkeypatch.setattr("src.integrations.github.github_analysis.fetch_repo_activity_graphql", failing_collector)
+
+    result = fetch_github_metrics("TOKEN", OWNER, REPO, "username")
+
+    assert result["commits"] == {"2024-01-01": 7}
+    assert result["issues"] == {"total_opened": 3}
+    assert result["pull_requests"]["total_opened"] == 1
+
+def test_fetch_repo_activity_graphql_paginates_connections_independently(monkeypatch):
+    from src.integrations.github import github_analysis_graphql as gql
+
+    def page(nodes, cursor):
+        return {"nodes": nodes, "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor}}
+
+    calls = []
+
+    def fake_graphql(token, query, variables):
+        calls.append(dict(variables))
+        repository = {}
+        if variables["withPrs"]:
+            repository["pullRequests"] = page([{"number": 1}], None)
+        if variables["withIssues"]:
+            first = variables["issueCursor"] is None
+            repository["issues"] = page([{"number": 10 if first else 11}], "i1" if first else None)
+        if variables["withCommits"]:
+            step = {None: ("c1", 1), "c1": ("c2", 2), "c2": (None, 3)}[variables["commitCursor"]]
+            repository["defaultBranchRef"] = {"target": {"history": page([{"n": step[1]}], step[0])}}
+        return {"repository": repository}
+
+    monkeypatch.setattr(gql, "gh_graphql", fake_graphql)
+
+    activity = gql.fetch_repo_activity_graphql("TOKEN", OWNER, REPO)
+
+    assert [p["number"] for p in activity["prs"]] == [1]
+    assert [i["number"] for i in activity["issues"]] == [10, 11]
+    assert [c["n"] for c in activity["commits"]] == [1, 2, 3]
+    # One request per page of the longest connection
+    assert len(calls) == 3
+    assert [c["withPrs"] for c in calls] == [True, False, False]
+    assert [c["withIssues"] for c in calls] == [True, True, False]
+
+def test_fetch_repo_activity_graphql_stops_prs_at_watermark(monkeypatch):
+    from src.integrations.github import github_analysis_graphql as gql
+
+    calls = []
+
+    def fake_graphql(token, query, variables):
+        calls.append(dict(variables))
+        nodes = [{"number": 3, "updatedAt": "2024-02-02T00:00:00Z"}, {"number": 2, "updatedAt": "2024-01-01T00:00:00Z"}]
+        page = {"nodes": nodes, "pageInfo": {"hasNextPage": True, "endCursor": "p1"}}
+        return {"repository": {"pullRequests": page} if variables["withPrs"] else {}}
+
+    monkeypatch.setattr(gql, "gh_graphql", fake_graphql)
+
+    since = {"prs": "2024-02-01T00:00:00Z", "issues": "2024-02-01T00:00:00Z", "commits": "2024-02-01T00:00:00Z"}
+    activity = gql.fetch_repo_activity_graphql("TOKEN", OWNER, REPO, since)
+
+    assert [p["number"] for p in activity["prs"]] == [3]
+    assert len(calls) == 1
+    assert calls[0]["issuesSince"] == since["issues"]
+    assert "commitsSince" not in calls[0]
+
+
+def test_fetch_repo_activity_graphql_walks_commits_until_parents_are_known(monkeypatch):
+    from src.integrations.github import github_analysis_graphql as gql
+
+    def node(oid, *parents, day="2024-03-01"):
+        return {"oid": oid, "committedDate": f"{day}T00:00:00Z", "parents": {"nodes": [{"oid": p} for p in parents]}}
+
+    # "m" merges a side branch whose commit "s" was committed before the last sync ("k" is known)
+    pages = {
+        None: ([node("m", "k", "s"), node("k", "j")], "h1"),
+        "h1": ([node("j", "i"), node("s", "j", day="2024-01-01")], "h2"),
+        "h2": ([node("i")], None),
+    }
+    cursors = []
+
+    def fake_graphql(token, query, variables):
+        cursors.append(variables["commitCursor"])
+        nodes, cursor = pages[variables["commitCursor"]]
+        page = {"nodes": nodes, "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor}}
+        return {"repository": {"defaultBranchRef": {"target": {"history": page}}} if variables["withCommits"] else {}}
+
+    monkeypatch.setattr(gql, "gh_graphql", fake_graphql)
+
+    activity = gql.fetch_repo_activity_graphql("TOKEN", OWNER, REPO, {}, known_commits={"k", "j", "i"})
+
+    assert [c["oid"] for c in activity["commits"]] == ["m", "s"]
+    # The walk ends once "s" is read; the page holding only known history is never requested
+    assert cursors == [None, "h1"]
+
+
+# Delta sync: watermarks, upserts and rebuilding metrics from the DB
+def _commit(oid, login="username", day="2024-01-01"):
+    return {"oid": oid, "authoredDate": f"{day}T10:00:00Z", "committedDate": f"{day}T10:00:00Z",
+            "author": {"user": {"login": login}}}
+
+
+def _pr(number, state="OPEN", updated="2024-01-01T00:00:00Z"):
+    return {"number": number, "title": f"PR {number}", "createdAt": "2024-01-01T00:00:00Z", "updatedAt": updated,
+            "state": state, "merged": state == "MERGED", "author": {"login": "username"},
+            "labels": {"nodes": []}, "comments": {"nodes": []}, "reviews": {"nodes": []}}
+
+
+def _issue(number, closed_at=None):
+    return {"number": number, "title": f"Issue {number}", "createdAt": "2024-01-01T00:00:00Z",
+            "updatedAt": closed_at or "2024-01-01T00:00:00Z", "closedAt": closed_at,
+            "assignees": {"nodes": [{"login": "username"}]}, "comments": {"totalCount": 0, "nodes": []}}
+
+
+@pytest.fixture
+def sync_conn():
+    from src.db import connect
+    from src.db.deduplication import insert_project
+    from src.db.users import get_or_create_user
+
+    conn = connect()
+    user_id = get_or_create_user(conn, "sync-user")
+    insert_project(conn, user_id, PROJ)
+    return conn, user_id
+
+
+def test_sync_github_metrics_fetches_deltas_and_upserts(monkeypatch, sync_conn):
+    from src.integrations.github.github_analysis import github_metrics_from_db, sync_github_metrics
+    from src.integrations.github.db_repo_metrics import get_github_sync_watermarks
+
+    conn, user_id = sync_conn
+    contributions = {"user": {"additions": 1, "deletions": 0}, "team": {"total_commits": 3}}
+    fetches = []
+    responses = [
+        {"commits": [_commit("a"), _commit("b")], "issues": [_issue(1)], "prs": [_pr(1), _pr(2)]},
+        {"commits": [_commit("c", day="2024-01-05")], "issues": [_issue(1, closed_at="2024-01-06T00:00:00Z")],
+         "prs": [_pr(2, state="MERGED", updated="2024-01-07T00:00:00Z")]},
+    ]
+
+    def fake_collector(token, owner, repo, since, known_commits):
+        fetches.append((dict(since), set(known_commits)))
+        return responses[len(fetches) - 1]
+
+    monkeypatch.setattr("src.integrations.github.github_analysis.fetch_repo_activity_graphql", fake_collector)
+    monkeypatch.setattr("src.integrations.github.github_analysis.get_gh_repo_contributions", lambda *a: contributions)
+
+    first = sync_github_metrics(conn, user_id, PROJ, "TOKEN", OWNER, REPO, "username")
+    watermarks = get_github_sync_watermarks(conn, user_id, PROJ, OWNER, REPO)
+    second = sync_github_metrics(conn, user_id, PROJ, "TOKEN", OWNER, REPO, "username")
+
+    # First sync reads everything, the second only asks for changes since the watermarks
+    assert fetches[0] == ({}, set())
+    assert set(watermarks) == {"prs", "issues", "commits"}
+    assert fetches[1] == (watermarks, {"a", "b"})
+
+    assert first["commits"] == {"2024-01-01": 2}
+    assert first["pull_requests"]["total_merged"] == 0
+    assert second["commits"] == {"2024-01-01": 2, "2024-01-05": 1}
+    assert second["issues"]["total_opened"] == 1
+    assert second["issues"]["total_closed"] == 1
+    assert second["pull_requests"]["total_opened"] == 2
+    assert second["pull_requests"]["total_merged"] == 1
+    assert second["contributions"] == contributions
+
+    # Recomputed from the DB alone
+    monkeypatch.setattr("src.integrations.github.github_analysis.fetch_repo_activity_graphql", None)
+    assert github_metrics_from_db(conn, user_id, PROJ, OWNER, REPO, "username") == second
+
+
+def test_sync_github_metrics_full_resync_replaces_items(monkeypatch, sync_conn):
+    from src.integrations.github.github_analysis import sync_github_metrics
+
+    conn, user_id = sync_conn
+    responses = [{"commits": [_commit("a"), _commit("b")], "issues": [], "prs": []},
+                 {"commits": [_commit("a")], "issues": [], "prs": []}]
+    monkeypatch.setattr(
+        "src.integrations.github.github_analysis.fetch_repo_activity_graphql",
+        lambda token, owner, repo, since, known_commits: responses.pop(0),
+    )
+    monkeypatch.setattr("src.integrations.github.github_analysis.get_gh_repo_contributions", lambda *a: {})
+
+    sync_github_metrics(conn, user_id, PROJ, "TOKEN", OWNER, REPO, "username")
+    result = sync_github_metrics(conn, user_id, PROJ, "TOKEN", OWNER, REPO, "username", full=True)
+
+    # The rewritten history no longer has commit "b"
+    assert result["commits"] == {"2024-01-01": 1}
+
+
+def test_github_metrics_from_db_never_synced(sync_conn):
+    from src.integrations.github.github_analysis import github_metrics_from_db
+
+    conn, user_id = sync_conn
+    assert github_metrics_from_db(conn, user_id, PROJ, OWNER, REPO, "username") is None
+
+
 # _enhance_with_github skip path
 def test_enhance_with_github_skips(monkeypatch, conn):
     monkeypatch.setattr("builtins.input", lambda *a: "n")
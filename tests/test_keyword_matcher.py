@@ -0,0 +1,41 @@
+import random
+import re
+
+from src.analysis.skills.detectors.text import text_detectors
+from src.analysis.skills.detectors.text.keyword_matcher import KeywordAutomaton
+from src.analysis.skills.detectors.text.text_document import TextDocument
+
+
+def _all_starts(text, keyword):
+    return [m.start() for m in re.finditer(f"(?={re.escape(keyword)})", text)]
+
+
+def test_scan_reports_every_overlapping_occurrence():
+    automaton = KeywordAutomaton(["he", "she", "his", "hers", "result", "results in", "results"])
+
+    hits = automaton.scan("ushers said the results in hers")
+
+    assert hits["she"] == [1]
+    assert hits["he"] == [2, 13, 27]
+    assert hits["hers"] == [2, 27]
+    assert hits["result"] == hits["results"] == hits["results in"] == [16]
+    assert "his" not in hits
+
+
+def test_detector_lookups_match_substring_and_whole_word_search():
+    rng = random.Random(3)
+    vocabulary = list(text_detectors._KEYWORDS.keywords)
+    filler = ["the", "models", "a_concept", "theory2", "résumé", "ïnterpretation", "\n\n", ",", "Thus"]
+    for _ in range(40):
+        pieces = [rng.choice(vocabulary + filler) for _ in range(rng.randrange(1, 60))]
+        doc = TextDocument(rng.choice(["", " ", "_"]).join(pieces))
+        lower = doc.lower
+
+        hits = doc.keyword_hits(text_detectors._KEYWORDS)
+        for keyword in vocabulary:
+            assert hits.get(keyword, []) == _all_starts(lower, keyword)
+
+        assert text_detectors._found(doc, vocabulary) == [k for k in vocabulary if k in lower]
+        assert text_detectors._found_whole_words(doc, text_detectors.ABSTRACT_KEYWORDS) == [
+            k for k in text_detectors.ABSTRACT_KEYWORDS if re.search(rf"\b{k}\b", lower)
+        ]
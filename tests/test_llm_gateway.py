@@ -0,0 +1,230 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+from groq import APIStatusError, AsyncGroq
+
+import src.utils.llm_gateway as gw
+from src.db.connection import connect
+from src.db.llm_cache import get_cached_llm_response, store_cached_llm_response
+
+
+def _client(*answers):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [
+        MagicMock(choices=[MagicMock(message=MagicMock(content=a))]) for a in answers
+    ]
+    return client
+
+
+def _ask(client, prompt="hello", **overrides):
+    kwargs = dict(model="m", messages=[{"role": "user", "content": prompt}], temperature=0.2, max_tokens=50)
+    kwargs.update(overrides)
+    return gw.chat_completion(client, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    gw.reset_cache_stats()
+
+
+def test_identical_request_is_served_from_cache():
+    client = _client("first", "second")
+
+    assert _ask(client) == "first"
+    assert _ask(client) == "first"
+    assert client.chat.completions.create.call_count == 1
+    assert gw.cache_stats() == {"hits": 1, "misses": 1}
+
+
+def test_key_covers_prompt_model_max_tokens_and_temperature():
+    client = _client("a", "b", "c", "d", "e")
+
+    _ask(client)
+    _ask(client, prompt="other")
+    _ask(client, model="m2")
+    _ask(client, max_tokens=51)
+    _ask(client, temperature=0.3)
+    assert client.chat.completions.create.call_count == 5
+
+
+def test_errors_and_empty_answers_are_not_cached():
+    client = MagicMock()
+    client.chat.completions.create.side_effect = RuntimeError("rate limited")
+    with pytest.raises(RuntimeError):
+        _ask(client)
+
+    client = _client("  ", "ok")
+    assert _ask(client) == "  "
+    assert _ask(client) == "ok"
+    assert client.chat.completions.create.call_count == 2
+
+
+def test_cache_disabled(monkeypatch):
+    monkeypatch.setattr(gw, "LLM_CACHE_ENABLED", False)
+    client = _client("a", "b")
+    assert _ask(client) == "a"
+    assert _ask(client) == "b"
+
+
+def test_lru_and_ttl_eviction():
+    conn = connect()
+    keys = [("m", f"h{i}", 10, 0.0) for i in range(3)]
+    store_cached_llm_response(conn, keys[0], "r0")
+    time.sleep(0.01)
+    store_cached_llm_response(conn, keys[1], "r1")
+    time.sleep(0.01)
+    assert get_cached_llm_response(conn, keys[0]) == "r0"  # now more recent than keys[1]
+    store_cached_llm_response(conn, keys[2], "r2", max_entries=2)
+
+    assert get_cached_llm_response(conn, keys[1]) is None
+    assert get_cached_llm_response(conn, keys[0]) == "r0"
+    assert get_cached_llm_response(conn, keys[2]) == "r2"
+
+    conn.execute("UPDATE llm_response_cache SET created_at = created_at - 100 WHERE prompt_hash = 'h0'")
+    conn.commit()
+    assert get_cached_llm_response(conn, keys[0], ttl_seconds=50) is None
+    conn.close()
+
+
+# -------------------------------------------------------------------
+# Async gateway against a local fake Groq server
+# -------------------------------------------------------------------
+class _FakeGroq:
+    """OpenAI-style chat completions endpoint answering 'echo: <prompt>' after scripted failures."""
+
+    def __init__(self, failures=(), failing_prompts=(), delay=0.05):
+        self.failures = list(failures)  # (status, headers) answered before any success
+        self.failing_prompts = set(failing_prompts)  # always answered with a 500
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake._lock:
+                    fake.requests += 1
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                    failure = fake.failures.pop(0) if fake.failures else None
+                if body["messages"][-1]["content"] in fake.failing_prompts:
+                    failure = (500, {})
+                time.sleep(fake.delay)
+                with fake._lock:
+                    fake.in_flight -= 1
+                if failure:
+                    status, headers = failure
+                    payload = {"error": {"message": "slow down", "type": "rate_limit"}}
+                else:
+                    status, headers = 200, {}
+                    payload = {
+                        "id": "chatcmpl-test",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": body["model"],
+                        "choices": [{
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": "echo: " + body["messages"][-1]["content"]},
+                        }],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                    }
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = AsyncGroq(
+            api_key="test", base_url=f"http://127.0.0.1:{self.server.server_address[1]}", max_retries=0
+        )
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_groq():
+    servers = []
+
+    def _make(**kwargs):
+        servers.append(_FakeGroq(**kwargs))
+        return servers[-1]
+
+    yield _make
+    for server in servers:
+        server.close()
+    gw.configure_gateway()
+
+
+def _request(prompt):
+    return dict(model="m", messages=[{"role": "user", "content": prompt}], temperature=0.0, max_tokens=5)
+
+
+def test_batch_runs_concurrently_up_to_the_limit(fake_groq):
+    server = fake_groq(delay=0.1)
+    gw.configure_gateway(max_concurrency=3, retry_base_delay=0.01)
+
+    results = gw.chat_completion_batch(server.client, [_request(f"p{i}") for i in range(6)])
+
+    assert results == [f"echo: p{i}" for i in range(6)]
+    assert server.requests == 6
+    assert 1 < server.max_in_flight <= 3
+
+
+def test_429_and_5xx_are_retried(fake_groq):
+    server = fake_groq(failures=[(429, {"retry-after": "0"}), (503, {})])
+    gw.configure_gateway(max_concurrency=1, retry_base_delay=0.01)
+
+    assert gw.chat_completion(server.client, **_request("hi")) == "echo: hi"
+    assert server.requests == 3
+    # Answered from the cache now
+    assert gw.chat_completion(server.client, **_request("hi")) == "echo: hi"
+    assert server.requests == 3
+
+
+def test_retries_give_up_and_errors_stay_per_request(fake_groq):
+    server = fake_groq(failing_prompts={"a"})
+    gw.configure_gateway(max_concurrency=2, max_retries=1, retry_base_delay=0.01)
+
+    first, second = gw.chat_completion_batch(server.client, [_request("a"), _request("b")])
+
+    assert isinstance(first, APIStatusError) and first.status_code == 500
+    assert second == "echo: b"
+    assert server.requests == 3  # "a" tried twice
+
+
+def test_async_callers_await_batches(fake_groq):
+    server = fake_groq()
+    gw.configure_gateway(max_concurrency=2, retry_base_delay=0.01)
+
+    results = asyncio.run(gw.achat_completion_batch(server.client, [_request("x"), _request("y")]))
+    assert results == ["echo: x", "echo: y"]
+
+
+def test_token_bucket_paces_requests():
+    async def run():
+        bucket = gw.TokenBucket(per_minute=1200)  # 20 tokens a second
+        await bucket.acquire(1200)
+        start = time.monotonic()
+        await bucket.acquire(4)
+        return time.monotonic() - start
+
+    assert 0.15 <= asyncio.run(run()) < 1.0
@@ -0,0 +1,101 @@
+import fitz
+import pytest
+from fastapi import HTTPException
+
+import src.db as db
+import src.utils.analysis_pool as analysis_pool
+import src.utils.page_extraction as page_extraction
+import src.services.uploads_contribution_service as contribution_service
+from src.analysis.text_collaborative.text_sections import extract_document_sections, iter_document_sections
+from src.utils import helpers
+from src.utils.deduplication.fingerprints import file_content_hash
+
+
+def _write_pdf(path, pages):
+    pdf = fitz.open()
+    for text in pages:
+        pdf.new_page().insert_text((72, 72), text)
+    pdf.save(str(path))
+    pdf.close()
+
+
+def _serial_text(path):
+    with fitz.open(str(path)) as pdf:
+        return "\n".join(page.get_text() for page in pdf)
+
+
+def test_pdf_pages_stream_in_order(tmp_path):
+    path = tmp_path / "report.pdf"
+    _write_pdf(path, [f"Page {i} body" for i in range(5)])
+
+    pages = page_extraction.iter_pdf_pages(str(path), workers=1)
+
+    first = next(pages)
+    assert "Page 0" in first
+    assert "\n".join([first, *pages]) == _serial_text(path)
+    assert helpers.extractfrompdf(str(path)) == _serial_text(path)
+
+
+def test_large_pdfs_are_split_across_processes(tmp_path, monkeypatch):
+    path = tmp_path / "thesis.pdf"
+    _write_pdf(path, [f"Chapter {i}" for i in range(7)])
+    monkeypatch.setattr(page_extraction, "PAGE_EXTRACTION_PARALLEL_MIN_PAGES", 4)
+    monkeypatch.setattr(page_extraction, "PAGE_EXTRACTION_BATCH_PAGES", 3)
+
+    calls = []
+    real_pool = analysis_pool.iter_in_pool
+    monkeypatch.setattr(
+        analysis_pool, "iter_in_pool", lambda fn, jobs, **kw: calls.append(jobs) or real_pool(fn, jobs, **kw)
+    )
+
+    pages = list(page_extraction.iter_pdf_pages(str(path), workers=2))
+
+    assert [job[1:] for job in calls[0]] == [(0, 3), (3, 6), (6, 7)]
+    assert "\n".join(pages) == _serial_text(path)
+
+
+def test_sections_stream_from_pages_like_the_joined_text():
+    pages = [
+        "Title line\nAbstract: short summary\nIntroduction",
+        "continues the intro\n\nMethods\nwe did things\nResults\n",
+        "Findings here",
+    ]
+    text = "\n".join(pages)
+    paragraphs = list(helpers.iter_normalized_paragraphs(pages))
+
+    assert paragraphs == helpers.normalize_pdf_paragraphs(text)
+    normalized = "\n\n".join(paragraphs)
+    assert list(iter_document_sections(normalized.split("\n"))) == extract_document_sections(normalized)
+
+    # Without headers the paragraph-preview fallback still applies
+    assert [s["text"] for s in iter_document_sections(["one two", "", "three"])] == ["one two", "three"]
+
+
+def test_main_file_without_sections_is_an_empty_result_not_an_error(tmp_path, monkeypatch):
+    conn = db.connect()
+    monkeypatch.setattr(contribution_service, "extract_text_file", lambda path, c, u: open(path).read())
+    blank = tmp_path / "blank.txt"
+    blank.write_text("  \n\n ")
+    notes = tmp_path / "notes.txt"
+    notes.write_text("Just some notes\n")
+
+    with pytest.raises(HTTPException) as excinfo:
+        contribution_service._derive_main_file_sections(conn, 1, blank, "blank.txt")
+    assert excinfo.value.status_code == 422
+
+    assert [s["text"] for s in contribution_service._derive_main_file_sections(conn, 1, notes, "notes.txt")] == ["Just some notes"]
+    monkeypatch.setattr(contribution_service, "iter_document_sections", lambda lines: iter(()))
+    assert contribution_service._derive_main_file_sections(conn, 1, notes, "notes.txt") == []
+
+
+def test_streamed_pages_fill_the_extraction_cache(tmp_path):
+    conn = db.connect()
+    path = tmp_path / "paper.pdf"
+    _write_pdf(path, ["First page", "Second page"])
+
+    streamed = list(helpers.iter_text_file_pages(str(path), conn, None))
+
+    assert len(streamed) == 2
+    assert db.get_cached_extracted_text(conn, file_content_hash(path), ".pdf") == "\n".join(streamed)
+    # A cache hit comes back as one page with the same text
+    assert list(helpers.iter_text_file_pages(str(path), conn, None)) == ["\n".join(streamed)]
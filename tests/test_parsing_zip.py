@@ -45,6 +45,19 @@ def create_sample_zip_with_various_types(tmp_dir):
     return zip_path
 
 
+@pytest.fixture()
+def isolated_zip_data(tmp_path, monkeypatch):
+    """Point parse_zip_file's extraction and log directories at a temp dir."""
+    import src.utils.parsing as parsing
+
+    zip_data = tmp_path / "zip_data"
+    monkeypatch.setattr(parsing, "ZIP_DATA_DIR", str(zip_data))
+    monkeypatch.setattr(parsing, "RAWDATA_DIR", str(zip_data / "parsed_zip_rawdata"))
+    monkeypatch.setattr(parsing, "UNSUPPORTED_LOG_PATH", str(zip_data / "unsupported_files.json"))
+    monkeypatch.setattr(parsing, "DUPLICATE_LOG_PATH", str(zip_data / "duplicate_files.json"))
+    return zip_data
+
+
 # Tests
 def test_parse_zip_file_handles_all_supported_types(tmp_path, test_user_id):
     zip_path = create_sample_zip_with_various_types(tmp_path)
@@ -266,3 +279,53 @@ def test_parse_zip_file_stores_config_files(tmp_path, test_user_id):
         ("requirements.txt", "package.json")
     ).fetchall()
     assert len(file_rows) == 0
+
+
+def test_parse_zip_file_streams_members_once_and_skips_macosx(tmp_path, test_user_id, monkeypatch, isolated_zip_data):
+    """Fingerprinting an extracted project reuses the hashes taken during extraction."""
+    from src.utils.deduplication import fingerprints
+
+    zip_path = tmp_path / "streamed.zip"
+    with zipfile.ZipFile(zip_path, "w") as z:
+        z.writestr("App/src/main.py", "print('a')\r\n")
+        z.writestr("App/README.md", "# App")
+        z.writestr("__MACOSX/App/._README.md", "resource fork")
+
+    result = parse_zip_file(str(zip_path), user_id=test_user_id, persist_to_db=False)
+    assert {f["file_name"] for f in result} == {"main.py", "README.md"}
+
+    target_dir = isolated_zip_data / "streamed"
+    assert not (target_dir / "__MACOSX").exists()
+
+    main_hash = fingerprints.file_content_hash(target_dir / "App" / "src" / "main.py")
+
+    def _no_reads(*args, **kwargs):
+        raise AssertionError("file was read back from disk")
+
+    monkeypatch.setattr(fingerprints, "file_content_hash", _no_reads)
+    _, _, entries = fingerprints.project_fingerprints(target_dir / "App")
+    assert dict(entries)["src/main.py"] == main_hash
+
+
+def test_parse_zip_file_reuses_hash_cache_for_unchanged_members(tmp_path, test_user_id, monkeypatch, isolated_zip_data):
+    import src.utils.parsing as parsing
+
+    info = zipfile.ZipInfo("App/main.py", date_time=(2024, 1, 2, 3, 4, 6))
+    for name in ("first_upload.zip", "second_upload.zip"):
+        with zipfile.ZipFile(tmp_path / name, "w") as z:
+            z.writestr(info, "print('unchanged')\r\n")
+
+    parse_zip_file(str(tmp_path / "first_upload.zip"), user_id=test_user_id, persist_to_db=False)
+
+    class _NoHashing:
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("unchanged member was rehashed")
+
+    monkeypatch.setattr(parsing, "ContentHasher", _NoHashing)
+    result = parse_zip_file(str(tmp_path / "second_upload.zip"), user_id=test_user_id, persist_to_db=False)
+    assert [f["file_name"] for f in result] == ["main.py"]
+
+    from src.utils.deduplication.fingerprints import project_fingerprints, file_content_hash
+    app_dir = isolated_zip_data / "second_upload" / "App"
+    _, _, entries = project_fingerprints(app_dir)
+    assert entries == [("main.py", file_content_hash(app_dir / "main.py"))]
@@ -30,8 +30,7 @@ def test_export_portfolio_docx_no_projects(monkeypatch, tmp_path, conn):
     from src.export import portfolio_docx as mod
 
     monkeypatch.setattr(mod, "collect_project_data", lambda _conn, _user_id: [])
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {})
 
     docx_path = mod.export_portfolio_to_docx(
         conn=conn,
@@ -66,8 +65,7 @@ def test_export_portfolio_docx_happy_path_includes_project_text_and_long_summary
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda summary, project_name: "My Fiction Project")
 
@@ -147,7 +145,7 @@ def test_export_portfolio_docx_with_thumbnail_does_not_crash(monkeypatch, tmp_pa
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     # Write a real tiny valid PNG
     thumb_path = tmp_path / "thumb.png"
@@ -159,8 +157,7 @@ def test_export_portfolio_docx_with_thumbnail_does_not_crash(monkeypatch, tmp_pa
         b"\x00\x00\x00\x00IEND\xaeB`\x82"
     )
 
-    monkeypatch.setattr(mod, "get_project_key", lambda *_args, **_kwargs: 1)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: str(thumb_path))
+    fake_row["thumbnail_path"] = str(thumb_path)
 
     # UPDATED: exporter uses resolvers
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda *_args, **_kwargs: "Project With Thumb")
@@ -205,7 +202,7 @@ def test_export_portfolio_docx_thumbnail_removed_still_exports(monkeypatch, tmp_
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda *_args, **_kwargs: "Thumb Project")
     monkeypatch.setattr(mod, "format_date_range", lambda *_args, **_kwargs: "N/A")
@@ -216,7 +213,6 @@ def test_export_portfolio_docx_thumbnail_removed_still_exports(monkeypatch, tmp_
     monkeypatch.setattr(mod, "resolve_portfolio_contribution_bullets", lambda *_args, **_kwargs: ["ok"])
 
     # 1) With thumbnail
-    monkeypatch.setattr(mod, "get_project_key", lambda *_args, **_kwargs: 1)
     thumb_path = tmp_path / "thumb.png"
     thumb_path.write_bytes(
         b"\x89PNG\r\n\x1a\n"
@@ -225,13 +221,13 @@ def test_export_portfolio_docx_thumbnail_removed_still_exports(monkeypatch, tmp_
         b"\x00\x00\x00\x0bIDATx\x9cc``\x00\x00\x00\x02\x00\x01\xe2!\xbc3"
         b"\x00\x00\x00\x00IEND\xaeB`\x82"
     )
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: str(thumb_path))
+    fake_row["thumbnail_path"] = str(thumb_path)
 
     docx1 = mod.export_portfolio_to_docx(conn=conn, user_id=1, username="Jordan", out_dir=str(tmp_path))
     assert docx1.exists() and docx1.stat().st_size > 0
 
     # 2) Thumbnail removed
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    fake_row["thumbnail_path"] = None
 
     docx2 = mod.export_portfolio_to_docx(conn=conn, user_id=1, username="Jordan", out_dir=str(tmp_path))
     assert docx2.exists() and docx2.stat().st_size > 0
@@ -256,8 +252,7 @@ def test_export_portfolio_docx_reflects_edited_summary_text(monkeypatch, tmp_pat
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda *_args, **_kwargs: "Edited Summary Project")
     monkeypatch.setattr(mod, "format_date_range", lambda *_args, **_kwargs: "N/A")
@@ -291,8 +286,7 @@ def test_export_portfolio_docx_reflects_edited_contribution_bullets(monkeypatch,
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda *_args, **_kwargs: "Edited Bullets Project")
     monkeypatch.setattr(mod, "format_date_range", lambda *_args, **_kwargs: "N/A")
@@ -330,15 +324,16 @@ def test_export_portfolio_docx_before_after_edit_display_name_summary_and_contri
 
     # One project
     monkeypatch.setattr(mod, "collect_project_data", lambda _conn, _user_id: [("proj_a", 0.5)])
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_a, **_k: None)
     monkeypatch.setattr(
         mod,
-        "get_project_summary_row",
+        "load_portfolio_projects",
         lambda *_a, **_k: {
-            "summary": {},
-            "project_type": "code",
-            "project_mode": "individual",
-            "created_at": "2025-01-01",
+            "proj_a": {
+                "summary": {},
+                "project_type": "code",
+                "project_mode": "individual",
+                "created_at": "2025-01-01",
+            },
         },
     )
 
@@ -410,8 +405,7 @@ def test_export_portfolio_docx_uses_full_name_from_profile(monkeypatch, tmp_path
     conn.commit()
 
     monkeypatch.setattr(mod, "collect_project_data", lambda _conn, _user_id: [])
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {})
 
     docx_path = mod.export_portfolio_to_docx(
         conn=conn,
@@ -0,0 +1,130 @@
+import json
+
+import src.db as db
+from src.menu.portfolio import build_portfolio_data
+from src.services.portfolio_service import get_portfolio
+
+
+def _add_project(conn, user_id, name, project_type, project_mode):
+    summary = {
+        "project_name": name,
+        "project_type": project_type,
+        "project_mode": project_mode,
+        "summary_text": f"{name} summary",
+        "metrics": {},
+        "contributions": {},
+    }
+    db.save_project_summary(conn, user_id, name, json.dumps(summary))
+    pk = db.get_project_key(conn, user_id, name)
+
+    if project_type == "text":
+        for start, end in (("2024-01-01", "2024-02-01"), ("2024-03-01", "2024-04-01")):
+            cur = conn.execute(
+                "INSERT INTO project_versions (project_key, fingerprint_strict) VALUES (?, ?)",
+                (pk, f"{name}-{start}"),
+            )
+            conn.execute(
+                "INSERT INTO text_activity_contribution (version_key, start_date, end_date) VALUES (?, ?, ?)",
+                (cur.lastrowid, start, end),
+            )
+    elif project_mode == "collaborative":
+        cur = conn.execute(
+            """
+            INSERT INTO code_collaborative_metrics (user_id, project_key, repo_path, first_commit_at, last_commit_at)
+            VALUES (?, ?, 'repo', '2024-05-01T10:00:00', '2024-06-01T10:00:00')
+            """,
+            (user_id, pk),
+        )
+        for content, created_at in (("older", "2024-06-01"), ("latest", "2024-06-02")):
+            conn.execute(
+                """
+                INSERT INTO code_collaborative_summary (metrics_id, user_id, project_key, summary_type, content, created_at)
+                VALUES (?, ?, ?, 'non-llm', ?, ?)
+                """,
+                (cur.lastrowid, user_id, pk, content, created_at),
+            )
+    else:
+        conn.execute(
+            "INSERT INTO git_individual_metrics (user_id, project_key, first_commit_date) VALUES (?, ?, '2024-07-01')",
+            (user_id, pk),
+        )
+        conn.execute(
+            "UPDATE project_summaries SET manual_end_date = '2024-09-30' WHERE user_id = ? AND project_key = ?",
+            (user_id, pk),
+        )
+
+    if project_type == "code":
+        for activity_type, percent in (("testing", 25.0), ("feature_coding", 75.0), ("debugging", 0.0)):
+            conn.execute(
+                """
+                INSERT INTO code_activity_metrics
+                    (user_id, project_key, scope, source, activity_type, event_count, total_events, percent)
+                VALUES (?, ?, ?, 'combined', ?, 1, 4, ?)
+                """,
+                (user_id, pk, project_mode, activity_type, percent),
+            )
+    conn.commit()
+
+
+def _seed(conn, user_id, count):
+    kinds = [("code", "collaborative"), ("code", "individual"), ("text", "individual")]
+    for i in range(count):
+        project_type, project_mode = kinds[i % len(kinds)]
+        _add_project(conn, user_id, f"proj{i}", project_type, project_mode)
+
+
+def _count_queries(conn, fn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        fn()
+    finally:
+        conn.set_trace_callback(None)
+    return len(statements)
+
+
+def test_loader_matches_single_project_getters():
+    conn = db.connect()
+    user_id = db.get_or_create_user(conn, "loader-user")
+    _seed(conn, user_id, 3)
+    db.upsert_project_thumbnail(conn, user_id, db.get_project_key(conn, user_id, "proj0"), "/tmp/thumb.png")
+
+    projects = db.load_portfolio_projects(conn, user_id)
+
+    assert sorted(projects) == ["proj0", "proj1", "proj2"]
+    for name, project in projects.items():
+        row = db.get_project_summary_row(conn, user_id, name)
+        assert {k: project[k] for k in row} == row
+        assert project["text_duration"] == db.get_text_duration(conn, user_id, name)
+        assert project["collaborative_duration"] == db.get_code_collaborative_duration(conn, user_id, name)
+        assert project["individual_duration"] == db.get_code_individual_duration(conn, user_id, name)
+        assert project["non_llm_summary"] == db.get_code_collaborative_non_llm_summary(conn, user_id, name)
+        for scope in ("individual", "collaborative"):
+            assert project["activity_percentages"].get(scope, []) == db.get_code_activity_percentages(
+                conn, user_id, name, scope
+            )
+
+    assert projects["proj0"]["non_llm_summary"] == "latest"
+    assert projects["proj0"]["thumbnail_path"] == "/tmp/thumb.png"
+    assert projects["proj1"]["individual_duration"] == ("2024-07-01", "2024-09-30")
+    assert projects["proj2"]["text_duration"] == ("2024-03-01", "2024-04-01")
+
+
+def test_portfolio_query_count_does_not_grow_with_projects():
+    conn = db.connect()
+    small = db.get_or_create_user(conn, "small")
+    large = db.get_or_create_user(conn, "large")
+    _seed(conn, small, 3)
+    _seed(conn, large, 12)
+
+    assert _count_queries(conn, lambda: db.load_portfolio_projects(conn, small)) == _count_queries(
+        conn, lambda: db.load_portfolio_projects(conn, large)
+    )
+
+    # Scores are computed and stored on first use
+    get_portfolio(conn, small)
+    get_portfolio(conn, large)
+    assert _count_queries(conn, lambda: get_portfolio(conn, small)) == _count_queries(
+        conn, lambda: get_portfolio(conn, large)
+    )
+    assert len(build_portfolio_data(conn, large)) == 12
@@ -48,9 +48,8 @@ def test_export_portfolio_pdf_no_projects(monkeypatch, tmp_path, conn):
     # No projects
     monkeypatch.setattr(mod, "collect_project_data", lambda _conn, _user_id: [])
 
-    # DB getters won't be called, but safe to patch anyway
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    # The loader won't be called, but safe to patch anyway
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {})
 
     pdf_path = mod.export_portfolio_to_pdf(
         conn=conn,
@@ -86,10 +85,9 @@ def test_export_portfolio_pdf_happy_path_includes_project_text_and_long_summary(
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     # No thumbnail
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
 
     # Make formatting deterministic (UPDATED for new exporter structure)
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda summary, project_name: "My Project")
@@ -176,13 +174,12 @@ def test_export_portfolio_pdf_with_thumbnail_does_not_crash(monkeypatch, tmp_pat
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     # Pretend a thumbnail exists
-    monkeypatch.setattr(mod, "get_project_key", lambda *_args, **_kwargs: 1)
     thumb_path = tmp_path / "thumb.png"
     thumb_path.write_text("not-a-real-image")  # doesn't matter; we won't decode it
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: str(thumb_path))
+    fake_row["thumbnail_path"] = str(thumb_path)
 
     # Track that the loader is called
     called = {"n": 0}
@@ -236,7 +233,7 @@ def test_export_portfolio_pdf_thumbnail_removed_still_exports(monkeypatch, tmp_p
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda *_args, **_kwargs: "Thumb Project")
     monkeypatch.setattr(mod, "format_date_range", lambda *_args, **_kwargs: "N/A")
@@ -258,17 +255,16 @@ def test_export_portfolio_pdf_thumbnail_removed_still_exports(monkeypatch, tmp_p
     monkeypatch.setattr(mod, "_load_image_preserve_aspect", fake_loader)
 
     # 1) With thumbnail
-    monkeypatch.setattr(mod, "get_project_key", lambda *_args, **_kwargs: 1)
     thumb_path = tmp_path / "thumb.png"
     thumb_path.write_text("not-a-real-image")
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: str(thumb_path))
+    fake_row["thumbnail_path"] = str(thumb_path)
 
     pdf1 = mod.export_portfolio_to_pdf(conn=conn, user_id=1, username="Salma", out_dir=str(tmp_path))
     assert pdf1.exists() and pdf1.stat().st_size > 0
     assert called["n"] == 1
 
     # 2) Thumbnail removed
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    fake_row["thumbnail_path"] = None
 
     pdf2 = mod.export_portfolio_to_pdf(conn=conn, user_id=1, username="Salma", out_dir=str(tmp_path))
     assert pdf2.exists() and pdf2.stat().st_size > 0
@@ -294,8 +290,7 @@ def test_export_portfolio_pdf_reflects_edited_summary_text(monkeypatch, tmp_path
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda *_args, **_kwargs: "Edited Summary Project")
     monkeypatch.setattr(mod, "format_date_range", lambda *_args, **_kwargs: "N/A")
@@ -329,8 +324,7 @@ def test_export_portfolio_pdf_reflects_edited_contribution_bullets(monkeypatch,
         "project_mode": "individual",
         "created_at": "2025-01-01",
     }
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: fake_row)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {"proj_a": fake_row})
 
     monkeypatch.setattr(mod, "resolve_portfolio_display_name", lambda *_args, **_kwargs: "Edited Bullets Project")
     monkeypatch.setattr(mod, "format_date_range", lambda *_args, **_kwargs: "N/A")
@@ -368,15 +362,16 @@ def test_export_portfolio_pdf_before_after_edit_display_name_summary_and_contrib
 
     # One project
     monkeypatch.setattr(mod, "collect_project_data", lambda _conn, _user_id: [("proj_a", 0.5)])
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_a, **_k: None)
     monkeypatch.setattr(
         mod,
-        "get_project_summary_row",
+        "load_portfolio_projects",
         lambda *_a, **_k: {
-            "summary": {},
-            "project_type": "code",
-            "project_mode": "individual",
-            "created_at": "2025-01-01",
+            "proj_a": {
+                "summary": {},
+                "project_type": "code",
+                "project_mode": "individual",
+                "created_at": "2025-01-01",
+            },
         },
     )
 
@@ -446,8 +441,7 @@ def test_export_portfolio_pdf_uses_full_name_from_profile(monkeypatch, tmp_path,
     conn.commit()
 
     monkeypatch.setattr(mod, "collect_project_data", lambda _conn, _user_id: [])
-    monkeypatch.setattr(mod, "get_project_summary_row", lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(mod, "get_project_thumbnail_path", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(mod, "load_portfolio_projects", lambda *_args, **_kwargs: {})
 
     pdf_path = mod.export_portfolio_to_pdf(
         conn=conn,
@@ -38,41 +38,31 @@ def stub_portfolio_db_helpers(monkeypatch):
     """
     Keep portfolio tests small by stubbing all the "extra" data sources once.
 
-    These functions normally pull from other tables (git metrics, activity, etc.),
-    but for high-level menu tests we just want them to return something sensible.
+    These normally come from other tables (git metrics, activity, etc.) via the bulk
+    portfolio loader, but for high-level menu tests we just want something sensible.
     """
-    mp = monkeypatch.setattr
-
-    # Activity: always say 100% feature_coding for any project
-    mp(
-        "src.insights.portfolio.formatters.get_code_activity_percentages",
-        lambda *a, **k: [("feature_coding", 100.0)],
-        raising=False,
-    )
-
-    # Durations: return a dummy date range for any project/mode
-    mp(
-        "src.insights.portfolio.formatters.get_text_duration",
-        lambda *a, **k: ("2025-01-01", "2025-01-31"),
-        raising=False,
-    )
-    mp(
-        "src.insights.portfolio.formatters.get_code_collaborative_duration",
-        lambda *a, **k: ("2025-02-01", "2025-02-28"),
-        raising=False,
-    )
-    mp(
-        "src.insights.portfolio.formatters.get_code_individual_duration",
-        lambda *a, **k: ("2025-03-01", "2025-03-31"),
-        raising=False,
-    )
-
-    # Non-LLM summary: default to None unless overridden in a specific test
-    mp(
-        "src.insights.portfolio.formatters.get_code_collaborative_non_llm_summary",
-        lambda *a, **k: None,
-        raising=False,
-    )
+    from src.db import load_portfolio_projects
+
+    def _load(conn, user_id):
+        projects = load_portfolio_projects(conn, user_id)
+        for project in projects.values():
+            project.update(
+                # Activity: always say 100% feature_coding for any project
+                activity_percentages={
+                    "individual": [("feature_coding", 100.0)],
+                    "collaborative": [("feature_coding", 100.0)],
+                },
+                # Durations: a dummy date range for any project/mode
+                text_duration=("2025-01-01", "2025-01-31"),
+                collaborative_duration=("2025-02-01", "2025-02-28"),
+                individual_duration=("2025-03-01", "2025-03-31"),
+                # Non-LLM summary: none
+                non_llm_summary=None,
+            )
+        return projects
+
+    monkeypatch.setattr("src.menu.portfolio.load_portfolio_projects", _load)
+    monkeypatch.setattr("src.services.portfolio_service.load_portfolio_projects", _load)
 
 
 def test_portfolio_no_projects(conn, capsys, monkeypatch):
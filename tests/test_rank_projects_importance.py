@@ -88,3 +88,35 @@ def test_collect_project_data_text_project(setup_user):
     results = collect_project_data(conn, user_id)
     assert len(results) == 1
     assert results[0][0] == "TextProj"
+
+
+def test_scores_are_stored_and_recomputed_only_after_summary_writes(setup_user, monkeypatch):
+    """Stored scores are reused until the project's summary is rewritten."""
+    import src.insights.rank_projects.rank_project_importance as rpi
+    from src.db import update_project_summary_json
+
+    conn, user_id = setup_user
+    high = _summary_dict(project_name="A", metrics={"skills_detailed": [{"score": 0.9}], "activity_type": {"writing": 1}})
+    low = _summary_dict(project_name="B", metrics={"skills_detailed": [{"score": 0.2}], "activity_type": {"writing": 1}})
+    save_project_summary(conn, user_id, "A", json.dumps(high))
+    save_project_summary(conn, user_id, "B", json.dumps(low))
+
+    assert rpi.refresh_project_scores(conn, user_id) == 2
+    assert rpi.refresh_project_scores(conn, user_id) == 0
+
+    scored = []
+    original = rpi.score_project_summary
+    monkeypatch.setattr(rpi, "score_project_summary", lambda *a: scored.append(a) or original(*a))
+
+    assert [name for name, _ in collect_project_data(conn, user_id)] == ["A", "B"]
+    assert scored == []
+
+    update_project_summary_json(conn, user_id, "B", json.dumps({**low, "metrics": high["metrics"]}))
+    results = collect_project_data(conn, user_id)
+    assert len(scored) == 1
+    assert results[0][1] == results[1][1]
+
+    # A scoring change invalidates every stored score
+    monkeypatch.setattr(rpi, "RANKING_SCORE_VERSION", rpi.RANKING_SCORE_VERSION + 1)
+    collect_project_data(conn, user_id)
+    assert len(scored) == 3
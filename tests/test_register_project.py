@@ -79,4 +79,51 @@ def test_register_project_small_project_structure_match_prompts(conn, tmp_path):
     result2 = register_project(conn, 1, "Calc v2", str(proj_dir2))
     assert result2["kind"] == "ask"
     assert result2["best_match_project_key"] == result1["project_key"]
-    assert result2.get("path_similarity") is not None
\ No newline at end of file
+    assert result2.get("path_similarity") is not None
+
+@pytest.fixture
+def indexed_conn():
+    import sqlite3
+    from src.db import init_schema
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    conn.execute("INSERT INTO users(user_id, username) VALUES (1, 'lsh-user')")
+    return conn
+
+def test_register_project_only_scores_lsh_candidates(indexed_conn, tmp_path, monkeypatch):
+    import src.utils.deduplication.register_project as rp
+
+    for i in range(15):
+        files = {f"mod{i}_{j}.py": f"unrelated {i} {j}" for j in range(12)}
+        register_project(indexed_conn, 1, f"Other{i}", str(create_project(tmp_path / f"other{i}", files)))
+
+    base = {f"src/file{j}.py": f"shared body {j}" for j in range(20)}
+    first = register_project(indexed_conn, 1, "Base", str(create_project(tmp_path / "base", base)))
+
+    scored = []
+    real_hash_set = rp.get_hash_set_for_version
+    monkeypatch.setattr(rp, "get_hash_set_for_version", lambda c, vk: scored.append(vk) or real_hash_set(c, vk))
+
+    # 18 of 20 files unchanged: content Jaccard 0.82, path Jaccard 1.0
+    edited = dict(base, **{"src/file0.py": "edited", "src/file1.py": "edited too"})
+    result = register_project(indexed_conn, 1, "Base v2", str(create_project(tmp_path / "base2", edited)))
+
+    assert result["kind"] == "ask"
+    assert result["best_match_project_key"] == first["project_key"]
+    assert scored == [first["version_key"]]
+
+def test_candidate_lookups_only_return_the_given_versions(indexed_conn, tmp_path, monkeypatch):
+    import src.db.deduplication as dd
+
+    base = {f"src/file{j}.py": f"shared body {j}" for j in range(20)}
+    versions = [
+        register_project(indexed_conn, 1, f"Copy{i}", str(create_project(tmp_path / f"copy{i}", dict(base, marker=str(i)))))["version_key"]
+        for i in range(5)
+    ]
+    _, _, entries = project_fingerprints(str(create_project(tmp_path / "probe", base)))
+    # Batches smaller than the key set still find every matching version
+    monkeypatch.setattr(dd, "_SQL_BATCH", 2)
+
+    assert dd.find_lsh_candidate_versions(indexed_conn, entries, versions[1:4]) == set(versions[1:4])
+    assert dd.find_versions_sharing_files(indexed_conn, entries, versions[1:4]) == set(versions[1:4])
+    assert dd.find_versions_sharing_files(indexed_conn, entries, []) == set()
@@ -95,4 +95,39 @@ def test_config_files_inserted_into_config_table(conn, tmp_path):
     assert cfg_row is not None
     assert cfg_row[0] == "requirements.txt"
     assert cfg_row[1] == user_id
-    assert cfg_row[2] is not None  # project_key set (default project created when project_name was None)
\ No newline at end of file
+    assert cfg_row[2] is not None  # project_key set (default project created when project_name was None)
+
+
+def test_store_parsed_files_bulk_insert_resolves_project_once(conn, monkeypatch):
+    import src.db.projects as projects_db
+
+    user_id = get_or_create_user(conn, "BulkUser")
+    conn.execute("INSERT INTO projects (user_id, display_name) VALUES (?, 'Mono')", (user_id,))
+    pk = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    conn.execute(
+        "INSERT INTO project_versions (project_key, upload_id, fingerprint_strict, fingerprint_loose) VALUES (?, 1, 'fp', 'fp')",
+        (pk,),
+    )
+    vk = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    conn.commit()
+
+    files_info = [
+        {"file_name": f"m{i}.py", "file_path": f"Mono/m{i}.py", "extension": ".py", "file_type": "code",
+         "size_bytes": 1, "created": "c", "modified": "m", "project_name": "Mono", "version_key": vk}
+        for i in range(500)
+    ] + [
+        {"file_name": "package.json", "file_path": f"Mono/pkg{i}/package.json", "file_type": "config", "project_name": "Mono"}
+        for i in range(20)
+    ]
+
+    lookups = []
+    real_lookup = projects_db._get_or_create_project_key
+    monkeypatch.setattr(projects_db, "_get_or_create_project_key", lambda *a: lookups.append(a) or real_lookup(*a))
+
+    stats = store_parsed_files(conn, files_info, user_id)
+
+    assert len(lookups) == 1
+    assert stats["files"] == 500 and stats["config_files"] == 20
+    assert stats["rows_per_second"] > 0
+    assert conn.execute("SELECT COUNT(*) FROM files WHERE version_key = ?", (vk,)).fetchone()[0] == 500
+    assert conn.execute("SELECT COUNT(*) FROM config_files WHERE project_key = ?", (pk,)).fetchone()[0] == 20
@@ -11,7 +11,7 @@ FAKE_REVISIONS = [
 ]
 
 # Mock analyze_google_doc
-def fake_analyze_google_doc(drive_service, docs_service, drive_file_id, user_email, creds=None):
+def fake_analyze_google_doc(drive_service, docs_service, drive_file_id, user_email, creds=None, skip_revision_ids=()):
     return {
         "status": "analyzed",
         "revisions": FAKE_REVISIONS,
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import src.analysis.skills.detectors.text.text_document as text_document
+from src.analysis.skills.detectors.text.text_detector_registry import TEXT_DETECTOR_FUNCTIONS
+from src.analysis.skills.detectors.text.text_document import TextDocument
+
+SAMPLE = """Introduction
+
+This paper argues that remote work changes team habits. According to Smith (Smith, 2020), the study shows
+a clear trend. Therefore the framework and model matter; this suggests an underlying principle.
+
+- first point
+- second point
+
+1. Method overview. The data from the survey indicates an increase in output [1]. Jones argues otherwise.
+Thus the results in Figure 2 show a correlation. This shows the implication is real. This means more.
+
+In conclusion, the analysis holds. Overall, the theory and concept hold under that assumption and perspective.
+"""
+
+STOPWORDS = frozenset({"the", "a", "an", "and", "in", "of", "that", "this", "is", "under"})
+
+
+def _fake_complexity(text):
+    return {
+        "word_count": len(text.split()),
+        "flesch_kincaid_grade": 11.0,
+        "reading_level": "High School",
+        "lexical_diversity": 0.5,
+    }
+
+
+def test_detectors_give_the_same_results_from_a_shared_document():
+    with patch.object(text_document, "analyze_linguistic_complexity", side_effect=_fake_complexity) as ling, \
+            patch.object(text_document, "english_stopwords", return_value=STOPWORDS):
+        from_text = {name: fn(SAMPLE, "MAIN") for name, fn in TEXT_DETECTOR_FUNCTIONS.items()}
+        ling.reset_mock()
+
+        doc = TextDocument(SAMPLE)
+        from_doc = {name: fn(doc, "MAIN") for name, fn in TEXT_DETECTOR_FUNCTIONS.items()}
+        assert doc.linguistic_complexity["flesch_kincaid_grade"] == 11.0
+
+    assert from_doc == from_text
+    assert ling.call_count == 1  # readability computed once for every detector and the stored metrics
+
+
+def test_document_views_are_memoised():
+    doc = TextDocument(SAMPLE)
+
+    assert doc.lower is doc.lower
+    assert doc.sentences is doc.sentences
+    assert doc.paragraphs[0] == "Introduction"
+    assert len(doc.paragraphs) == 5
+    assert doc.term_counts["hold"] == 1
+    assert doc.words[:2] == ["introduction", "this"]
@@ -0,0 +1,84 @@
+import json
+import time
+import zlib
+from unittest.mock import patch
+
+import fitz
+
+import src.db as db
+import src.utils.helpers as helpers
+from src.utils.deduplication.fingerprints import file_content_hash
+
+
+def _write_pdf(path, text):
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), text)
+    pdf.save(str(path))
+    pdf.close()
+
+
+def test_pdf_text_is_extracted_once_per_content(tmp_path):
+    conn = db.connect()
+    thesis = tmp_path / "thesis.pdf"
+    _write_pdf(thesis, "Chapter one of the thesis")
+    copy = tmp_path / "v2" / "thesis.pdf"
+    copy.parent.mkdir()
+    copy.write_bytes(thesis.read_bytes())
+
+    with patch.object(helpers, "extractfrompdf", wraps=helpers.extractfrompdf) as extract:
+        first = helpers.extract_text_file(str(thesis), conn, None)
+        assert "Chapter one" in first
+        # Same bytes in a later version: served from the cache
+        assert helpers.extract_text_file(str(copy), conn, None) == first
+        assert extract.call_count == 1
+
+        # Edited file: new content hash, extracted again
+        _write_pdf(thesis, "Chapter one, revised")
+        assert "revised" in helpers.extract_text_file(str(thesis), conn, None)
+        assert extract.call_count == 2
+
+        # Without a database connection nothing is cached
+        helpers.extract_text_file(str(copy), None, None)
+        assert extract.call_count == 3
+
+    row = conn.execute(
+        "SELECT extension, length(payload) FROM extracted_text_cache WHERE file_hash = ?",
+        (file_content_hash(copy),),
+    ).fetchone()
+    assert row[0] == ".pdf" and row[1] > 0
+
+
+def test_csv_profiles_round_trip_through_the_cache(tmp_path):
+    conn = db.connect()
+    data = tmp_path / "survey.csv"
+    data.write_text("a,b\n1,x\n2,\n")
+
+    first = helpers.extract_text_file(str(data), conn, None)
+    with patch.object(helpers, "extractfromcsv") as extract:
+        cached = helpers.extract_text_file(str(data), conn, None)
+    extract.assert_not_called()
+    assert json.dumps(cached) == json.dumps(first)  # NaN for the missing cell survives the round trip
+    assert first["missing_pct"] == 25.0
+
+    # Same content under another name reports its own filename
+    renamed = tmp_path / "survey_v2.csv"
+    renamed.write_bytes(data.read_bytes())
+    with patch.object(helpers, "extractfromcsv") as extract:
+        assert helpers.extract_text_file(str(renamed), conn, None)["filename"] == "survey_v2.csv"
+    extract.assert_not_called()
+
+
+def test_least_recently_used_extractions_are_evicted(monkeypatch):
+    conn = db.connect()
+    text = "x" * 5000
+    budget = 2 * len(zlib.compress(text.encode(), 6))
+    clock = iter([1000.0, 1001.0, 1002.0, 1003.0])
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+
+    db.store_cached_extracted_text(conn, "a", ".pdf", text, max_bytes=budget)
+    db.store_cached_extracted_text(conn, "b", ".pdf", text, max_bytes=budget)
+    assert db.get_cached_extracted_text(conn, "a", ".pdf") == text  # "a" is now more recent than "b"
+    db.store_cached_extracted_text(conn, "c", ".pdf", text, max_bytes=budget)
+
+    kept = {row[0] for row in conn.execute("SELECT file_hash FROM extracted_text_cache")}
+    assert kept == {"a", "c"}